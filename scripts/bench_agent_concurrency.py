@@ -0,0 +1,117 @@
+"""
+워커 1개가 동시에 처리할 수 있는 에이전트 대화 수 비교:
+- sync : Agent().run을 스레드풀(기본 40 = Starlette/anyio 기본 스레드 상한)에서 실행
+- async: Agent(asynchronous=True).arun을 이벤트 루프 하나에서 asyncio.gather
+
+로컬 가짜 OpenAI 서버(요청마다 --llm-latency 초 지연, 1단계 tool_call → 2단계 답변)와
+가짜 검색(--tool-latency 초)을 쓴다. 대화 1개 = LLM 2회 + 도구 1회.
+
+    PYTHONPATH=src python scripts/bench_agent_concurrency.py --conversations 50 200 --llm-latency 0.3
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import mercari_ai_shopper.scraping.mercari_client as mc
+from mercari_ai_shopper.agent.agent import Agent
+from mercari_ai_shopper.models.listing import ListingRecord
+
+ARGS = '{"keywords": ["スイッチ"], "budget_max": 30000}'
+
+
+def fake_llm(latency: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            time.sleep(latency)
+            if body["messages"][-1]["role"] == "tool":
+                message = {"role": "assistant", "content": "i1"}
+            else:
+                message = {"role": "assistant", "content": None, "tool_calls": [
+                    {"id": "c1", "type": "function", "function": {"name": "search_mercari", "arguments": ARGS}}]}
+            data = json.dumps({"id": "c", "object": "chat.completion", "created": 0, "model": "fake",
+                               "choices": [{"index": 0, "message": message, "finish_reason": "stop"}]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    ThreadingHTTPServer.request_queue_size = 1024
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    srv.daemon_threads = True
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv
+
+
+def patch_search(latency: float) -> None:
+    rec = ListingRecord.create(title="Switch 有機EL", price_jpy=25000, url="https://jp.mercari.com/item/m1")
+
+    def iter_search(session, q, **kw):
+        time.sleep(latency)
+        yield rec
+
+    async def aiter_search(q, client=None, **kw):
+        await asyncio.sleep(latency)
+        yield rec
+
+    mc.iter_search = iter_search
+    mc.aiter_search = aiter_search
+
+
+def run_sync(n: int, threads: int) -> float:
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda _: Agent().run("switch"), range(n)))
+    return time.perf_counter() - t0
+
+
+def run_async(n: int) -> float:
+    async def main() -> None:
+        await asyncio.gather(*(Agent(asynchronous=True).arun("switch") for _ in range(n)))
+
+    t0 = time.perf_counter()
+    asyncio.run(main())
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--conversations", type=int, nargs="+", default=[50, 200])
+    ap.add_argument("--llm-latency", type=float, default=0.3)
+    ap.add_argument("--tool-latency", type=float, default=0.1)
+    ap.add_argument("--threads", type=int, default=40)
+    args = ap.parse_args()
+
+    srv = fake_llm(args.llm_latency)
+    os.environ.update({
+        "LLM_PROVIDER": "openai",
+        "OPENAI_API_KEY": "bench",
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{srv.server_address[1]}/v1",
+        # 매 대화가 LLM 2회를 거치도록 규칙 파서/질의 캐시 우회는 끈다
+        "AGENT_RULE_PARSER_ENABLED": "false",
+        "QUERY_CACHE_ENABLED": "false",
+    })
+    patch_search(args.tool_latency)
+    floor = 2 * args.llm_latency + args.tool_latency
+    print(f"per-conversation floor: {floor:.2f}s (2 LLM calls + 1 tool)")
+    print(f"{'convs':>6} {'sync wall s':>12} {'sync conv/s':>12} {'async wall s':>13} {'async conv/s':>13}")
+    for n in args.conversations:
+        ts = run_sync(n, args.threads)
+        ta = run_async(n)
+        print(f"{n:>6} {ts:>12.2f} {n / ts:>12.1f} {ta:>13.2f} {n / ta:>13.1f}")
+    srv.shutdown()
+
+
+if __name__ == "__main__":
+    main()
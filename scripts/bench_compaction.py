@@ -0,0 +1,76 @@
+"""
+에이전트 검색 도구 결과의 프롬프트 크기 비교: 기존(Listing 전체 dump, {"ok", "result"} 래핑) vs
+compaction(점수 상위 N개, null/공통 열 제거, 짧은 ID 표 형식, 토큰 예산).
+
+측정: 결과 문자열 길이(문자), 추정 토큰(agent.compaction.estimate_tokens), 압축에 드는 시간(ms).
+현실적인 필드 분포(판매자 정보 없음, 배송 표기 대부분 동일, 일부 좋아요/설명)로 합성한다.
+
+    PYTHONPATH=src python scripts/bench_compaction.py --items 30 100 --top-n 20 --budget 1500
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from mercari_ai_shopper.agent.compaction import ItemRefs, compact_search_result, estimate_tokens
+from mercari_ai_shopper.models.listing import ListingRecord
+from mercari_ai_shopper.models.query import SearchQuery
+from mercari_ai_shopper.utils.serialization import tool_result_json
+
+QUERY = SearchQuery(
+    raw_text="switch oled white",
+    keywords=["switch", "有機EL"],
+    budget_max=35000,
+    condition=["未使用に近い", "目立った傷や汚れなし"],
+)
+TITLES = [
+    "Nintendo Switch 有機ELモデル ホワイト 本体 美品 付属品完備",
+    "【新品未開封】Switch 有機EL ネオンブルー/ネオンレッド",
+    "ニンテンドースイッチ 有機EL 本体のみ 動作確認済み",
+    "Switch Lite グレー 箱あり",
+]
+CONDITIONS = ["新品、未使用", "未使用に近い", "目立った傷や汚れなし", "やや傷や汚れあり"]
+
+
+def records(n: int, seed: int = 0) -> list:
+    rnd = random.Random(seed)
+    out = []
+    for i in range(n):
+        out.append(ListingRecord.create(
+            title=rnd.choice(TITLES),
+            price_jpy=rnd.randint(18000, 45000),
+            url=f"https://jp.mercari.com/item/m{rnd.randint(10**10, 10**11 - 1)}",
+            image_url=f"https://static.mercdn.net/item/detail/orig/photos/m{i}_1.jpg",
+            condition=rnd.choice(CONDITIONS),
+            shipping="送料込み" if rnd.random() < 0.9 else None,
+            likes=rnd.randint(0, 40) if rnd.random() < 0.5 else None,
+        ))
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--items", type=int, nargs="+", default=[30, 100])
+    ap.add_argument("--top-n", type=int, default=20)
+    ap.add_argument("--budget", type=int, default=1500)
+    ap.add_argument("--rounds", type=int, default=50)
+    args = ap.parse_args()
+
+    print(f"{'items':>6} {'legacy chars':>13} {'legacy tok':>11} {'compact chars':>14} {'compact tok':>12} "
+          f"{'rows':>5} {'ratio':>6} {'ms':>6}")
+    for n in args.items:
+        recs = records(n)
+        legacy = tool_result_json({"ok": True, "result": [r.to_listing() for r in recs]})
+        t0 = time.perf_counter()
+        for _ in range(args.rounds):
+            out = compact_search_result(recs, QUERY, ItemRefs(), top_n=args.top_n, token_budget=args.budget)
+        ms = (time.perf_counter() - t0) / args.rounds * 1000
+        compact = tool_result_json({"ok": True, "result": out})
+        lt, ct = estimate_tokens(legacy), estimate_tokens(compact)
+        print(f"{n:>6} {len(legacy):>13} {lt:>11} {len(compact):>14} {ct:>12} "
+              f"{out['shown']:>5} {lt / ct:>5.1f}x {ms:>6.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+QueryMatcher 전략 비교: 패턴별 부분 문자열 검색 vs Aho-Corasick 한 번 순회.
+
+패턴 수를 늘려 가며 리스팅 1건(정규화 포함) 스캔 시간을 잰다.
+두 경로 결과가 같은지도 확인한다. AUTOMATON_MIN_PATTERNS 기준값 산정용.
+
+    PYTHONPATH=src python scripts/bench_matcher.py --patterns 8 64 128 256 512
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import timeit
+
+import mercari_ai_shopper.utils.matcher as mt
+
+TITLE = "Nintendo Switch 有機ELモデル ホワイト 本体 美品 箱あり"
+DESC = "購入後数回使用しました。付属品完備です。" * 4
+VOCAB = ["nintendo", "sony", "apple", "ホワイト", "ブラック", "限定", "oled", "ps5", "switch", "美品", "ケース", "本体"]
+
+
+def _terms(n: int, seed: int = 0) -> list[str]:
+    rnd = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyzアイウエオカキクケコ"
+    extra = ["".join(rnd.sample(letters, rnd.randint(3, 7))) for _ in range(max(0, n - len(VOCAB)))]
+    return (extra + VOCAB)[-n:]
+
+
+def _matcher(terms: list[str], threshold: int) -> mt.QueryMatcher:
+    mt.AUTOMATON_MIN_PATTERNS = threshold
+    return mt.QueryMatcher(terms, [], [])
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--patterns", type=int, nargs="+", default=[8, 32, 64, 128, 256, 512])
+    ap.add_argument("--number", type=int, default=5000)
+    args = ap.parse_args()
+
+    default = mt.AUTOMATON_MIN_PATTERNS
+    print(f"{'patterns':>8} {'substring us':>13} {'automaton us':>13}  same")
+    for n in args.patterns:
+        terms = _terms(n)
+        plain, auto = _matcher(terms, 10**9), _matcher(terms, 0)
+        # _scan 직접 호출(스캔 캐시 제외)
+        t_plain = timeit.timeit(lambda: plain._scan(TITLE, DESC), number=args.number) / args.number
+        t_auto = timeit.timeit(lambda: auto._scan(TITLE, DESC), number=args.number) / args.number
+        same = plain._scan(TITLE, DESC) == auto._scan(TITLE, DESC)
+        print(f"{n:>8} {t_plain * 1e6:13.1f} {t_auto * 1e6:13.1f}  {same}")
+    mt.AUTOMATON_MIN_PATTERNS = default
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,71 @@
+"""
+검색 카드 파서 속도 비교: 레거시(_parse_listing_cards) vs 단일 패스(parse_listing_cards).
+
+저장된 검색 페이지(tests/fixtures/mercari_search.html)의 상품 카드를 복제해
+카드 수를 늘려가며 측정한다.
+
+    PYTHONPATH=src python scripts/bench_parsers.py --cards 6 60 240 --repeat 5
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import statistics
+import time
+import warnings
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from mercari_ai_shopper.scraping.mercari_client import _parse_listing_cards
+from mercari_ai_shopper.scraping.parsers import parse_listing_cards
+
+FIXTURE = Path(__file__).resolve().parents[1] / "tests" / "fixtures" / "mercari_search.html"
+CELL_RE = re.compile(r'<li data-testid="item-cell">.*?</li>', re.S)
+
+
+def scaled_page(html: str, n_cards: int) -> str:
+    """픽스처의 카드들을 ID만 바꿔 n_cards개가 될 때까지 복제."""
+    cells = CELL_RE.findall(html)
+    out = []
+    for i in range(n_cards):
+        cell = cells[i % len(cells)]
+        out.append(re.sub(r"m1000000000(\d)", lambda m: f"m{i:06d}{m.group(1)}", cell))
+    first, last = html.find(cells[0]), html.rfind(cells[-1]) + len(cells[-1])
+    return html[:first] + "\n".join(out) + html[last:]
+
+
+def _time(fn, html: str, repeat: int) -> tuple[float, int]:
+    samples = []
+    n = 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        n = len(fn(html))
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples), n
+
+
+def legacy(html: str):
+    return _parse_listing_cards(BeautifulSoup(html, "lxml"))
+
+
+def main() -> int:
+    p = argparse.ArgumentParser()
+    p.add_argument("--cards", type=int, nargs="*", default=[6, 60, 240])
+    p.add_argument("--repeat", type=int, default=5)
+    args = p.parse_args()
+
+    base = FIXTURE.read_text(encoding="utf-8")
+    warnings.simplefilter("ignore")  # soupsieve ':contains' deprecation
+    print(f"{'cards':>6} {'legacy(ms)':>12} {'single(ms)':>12} {'speedup':>8} {'items':>6}")
+    for n in args.cards:
+        html = scaled_page(base, n)
+        t_old, n_old = _time(legacy, html, args.repeat)
+        t_new, n_new = _time(parse_listing_cards, html, args.repeat)
+        assert n_old == n_new, (n_old, n_new)
+        print(f"{n:>6} {t_old * 1e3:>12.2f} {t_new * 1e3:>12.2f} {t_old / t_new:>7.1f}x {n_new:>6}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
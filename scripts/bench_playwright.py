@@ -0,0 +1,169 @@
+"""
+Playwright 렌더링 비교: 기존 방식(domcontentloaded + wait_for_selector("img")) vs 경량 모드
+(요청 차단 + 앵커/검색 API 기반 조기 완료).
+
+실제 머카리 대신 로컬 픽스처 사이트를 띄워 측정한다.
+- /search          : 앱 셸(HTML) + 폰트 CSS + 분석 스크립트 + 앱 스크립트
+- /static/app.js   : /v2/entities:search 를 호출한 뒤 상품 카드(앵커 + 이미지)를 그림
+- /v2/entities:search : 검색 API(JSON), --api-delay 만큼 지연
+- /img/*, /static/font.woff2, /gtm.js : 무거운 리소스(차단 대상)
+서버가 실제로 내보낸 바이트/요청 수와 결과가 나오기까지의 시간을 모드별로 비교한다.
+
+    PYTHONPATH=src python scripts/bench_playwright.py --items 60 --repeat 5
+
+Chromium이 필요하다(playwright install chromium).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from mercari_ai_shopper.scraping.browser_pool import BrowserPool
+from mercari_ai_shopper.scraping.mercari_playwright import _parse_render, render_search
+
+APP_JS = """
+fetch('/v2/entities:search?keyword=switch').then(r => r.json()).then(data => {
+  const ul = document.getElementById('grid');
+  for (const it of data.items) {
+    const li = document.createElement('li');
+    li.setAttribute('data-testid', 'item-cell');
+    li.innerHTML = `<a href="/item/${it.id}"><img src="/img/${it.id}.jpg">` +
+      `<span data-testid="thumbnail-item-name">${it.name}</span><div>¥${it.price}</div></a>`;
+    ul.appendChild(li);
+  }
+});
+"""
+
+SHELL = """<!doctype html><html><head><meta charset="utf-8">
+<link rel="stylesheet" href="/static/font.css">
+<script src="/gtm.js"></script>
+</head><body><ul id="grid"></ul><script src="/static/app.js"></script></body></html>"""
+
+FONT_CSS = "@font-face{font-family:F;src:url(/static/font.woff2)} body{font-family:F}"
+
+
+class Stats:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.bytes: Counter = Counter()
+        self.requests: Counter = Counter()
+
+    def add(self, kind: str, n: int) -> None:
+        with self.lock:
+            self.bytes[kind] += n
+            self.requests[kind] += 1
+
+    def reset(self) -> None:
+        with self.lock:
+            self.bytes.clear()
+            self.requests.clear()
+
+    def snapshot(self) -> tuple[int, int]:
+        with self.lock:
+            return sum(self.bytes.values()), sum(self.requests.values())
+
+
+def make_handler(stats: Stats, n_items: int, api_delay: float, image_kb: int):
+    items = [{"id": f"m{i:08d}", "name": f"Nintendo Switch {i}", "price": str(10000 + i * 100)} for i in range(n_items)]
+    api_body = json.dumps({"items": items, "meta": {"nextPageToken": ""}}).encode()
+    image = b"\xff\xd8" + b"\0" * (image_kb * 1024)
+    font = b"\0" * (200 * 1024)
+    gtm = b"/*analytics*/" + b" " * (80 * 1024)
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):  # noqa: D401 - 조용히
+            pass
+
+        def _send(self, kind: str, body: bytes, ctype: str) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                return
+            stats.add(kind, len(body))
+
+        def do_GET(self):  # noqa: N802
+            path = urlsplit(self.path).path
+            if path == "/search":
+                self._send("html", SHELL.encode(), "text/html; charset=utf-8")
+            elif path == "/static/app.js":
+                self._send("script", APP_JS.encode(), "application/javascript")
+            elif path == "/static/font.css":
+                self._send("css", FONT_CSS.encode(), "text/css")
+            elif path == "/static/font.woff2":
+                self._send("font", font, "font/woff2")
+            elif path == "/gtm.js":
+                self._send("analytics", gtm, "application/javascript")
+            elif path.startswith("/v2/entities:search"):
+                time.sleep(api_delay)
+                self._send("api", api_body, "application/json")
+            elif path.startswith("/img/"):
+                time.sleep(0.01)
+                self._send("image", image, "image/jpeg")
+            else:
+                self.send_error(404)
+
+    return Handler
+
+
+def run_mode(pool: BrowserPool, stats: Stats, url: str, lean: bool, repeat: int, min_items: int):
+    times, sizes, reqs, counts, ready = [], [], [], [], Counter()
+    for _ in range(repeat):
+        stats.reset()
+        t0 = time.perf_counter()
+        result = pool.run(lambda page: render_search(page, url, lean=lean, min_items=min_items, timeout=15))
+        parsed = _parse_render(result, url)
+        times.append(time.perf_counter() - t0)
+        b, r = stats.snapshot()
+        sizes.append(b)
+        reqs.append(r)
+        counts.append(len(parsed.items))
+        ready[result.ready] += 1
+    return {
+        "median_ms": statistics.median(times) * 1000,
+        "kb": statistics.median(sizes) / 1024,
+        "requests": statistics.median(reqs),
+        "items": statistics.median(counts),
+        "ready": dict(ready),
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--items", type=int, default=60)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--api-delay", type=float, default=0.15, help="검색 API 응답 지연(초)")
+    ap.add_argument("--image-kb", type=int, default=30)
+    ap.add_argument("--min-items", type=int, default=20)
+    args = ap.parse_args()
+
+    stats = Stats()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(stats, args.items, args.api_delay, args.image_kb))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/search?keyword=switch"
+
+    pool = BrowserPool(size=1, recycle_after=10_000).start()
+    try:
+        pool.run(lambda page: page.goto("about:blank"))  # 워밍업(브라우저 기동 시간 제외)
+        print(f"{'mode':<8} {'median ms':>10} {'KB':>10} {'requests':>9} {'items':>6}  ready")
+        for lean in (False, True):
+            r = run_mode(pool, stats, url, lean, args.repeat, args.min_items)
+            name = "lean" if lean else "legacy"
+            print(f"{name:<8} {r['median_ms']:>10.1f} {r['kb']:>10.1f} {r['requests']:>9} {r['items']:>6}  {r['ready']}")
+    finally:
+        pool.close()
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,59 @@
+"""
+질의 캐시(agent.query_cache) 조회 지연 측정.
+N개 요청문을 저장한 뒤 정확 일치 / 근사 일치 / 미스 조회 시간을 잰다.
+
+    PYTHONPATH=src python scripts/bench_query_cache.py [N]
+"""
+from __future__ import annotations
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from mercari_ai_shopper.agent.query_cache import QueryCache
+
+PRODUCTS = ["닌텐도 스위치", "스위치 OLED", "PS5 본체", "아이패드 미니", "에어팟 프로", "갤럭시 버즈",
+            "포켓몬 카드", "레고 테크닉", "다이슨 청소기", "캐논 카메라", "소니 헤드폰", "애플워치"]
+COLORS = ["화이트", "블랙", "블루", "레드", "그레이", ""]
+TAILS = ["이하", "이하로", "이하 상태 좋은 것", "정도", "이하 미개봉"]
+
+
+def _texts(n: int, rnd: random.Random) -> list[str]:
+    return [
+        f"{rnd.choice(PRODUCTS)} {rnd.choice(COLORS)} {rnd.randrange(5, 200) * 1000}엔 {rnd.choice(TAILS)}"
+        for _ in range(n)
+    ]
+
+
+def _bench(label: str, fn, texts: list[str]) -> None:
+    t0 = time.perf_counter()
+    hits = sum(fn(t) is not None for t in texts)
+    dt = time.perf_counter() - t0
+    print(f"{label:>6}: {dt / len(texts) * 1e6:8.1f} µs/lookup  hits={hits}/{len(texts)}")
+
+
+def main(n: int = 10000) -> None:
+    rnd = random.Random(0)
+    with tempfile.TemporaryDirectory() as d:
+        cache = QueryCache(str(Path(d) / "q.sqlite"), max_entries=n * 2)
+        stored = _texts(n, rnd)
+        t0 = time.perf_counter()
+        for t in stored:
+            cache.store(t, {"keywords": t.split()[:2]})
+        print(f"store : {(time.perf_counter() - t0) / n * 1e6:8.1f} µs/entry  ({n} entries)")
+
+        sample = rnd.sample(stored, 1000)
+        _bench("exact", cache.lookup, sample)
+        _bench("near", cache.lookup, [t.replace(" ", "", 1) + "요" for t in sample])
+        _bench("miss", cache.lookup, [f"전혀 다른 요청 {i}" for i in range(1000)])
+
+        t0 = time.perf_counter()
+        QueryCache(cache.path, max_entries=n * 2).close()
+        print(f"reopen: {(time.perf_counter() - t0) * 1e3:8.1f} ms (역색인 재구성)")
+        cache.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,144 @@
+"""
+규칙 기반 요청 파서(agent.query_parser) 커버리지/정확도/지연 측정.
+라벨 붙인 한/영/일 요청문 코퍼스로 임계값 이상(LLM 우회) 비율, 우회한 것 중 인자가 맞은 비율,
+LLM으로 가야 할 모호한 요청이 잘못 우회된 수, 파싱 1회 시간을 잰다.
+
+    PYTHONPATH=src python scripts/bench_query_parser.py [THRESHOLD]
+"""
+from __future__ import annotations
+
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from mercari_ai_shopper.agent.query_parser import parse_query
+
+NEW, LIKE_NEW, GOOD = "新品、未使用", "未使用に近い", "目立った傷や汚れなし"
+
+# (요청문, 기대 인자 — 적은 필드는 완전 일치(keywords는 순서까지) / None이면 LLM으로 가야 함)
+CORPUS: List[Tuple[str, Optional[Dict[str, Any]]]] = [
+    # ── 한국어 ──
+    ("닌텐도 스위치 OLED 화이트 30000엔 이하", {"keywords": ["Nintendo", "スイッチ", "有機EL"], "budget_max": 30000, "color": ["ホワイト"], "brand": ["Nintendo"]}),
+    ("스위치 라이트 2만엔 이하", {"keywords": ["スイッチ", "ライト"], "budget_max": 20000}),
+    ("ps5 본체 5만엔 이하 미개봉", {"keywords": ["PS5", "本体"], "budget_max": 50000, "condition": [NEW]}),
+    ("ps5 3만~5만엔", {"keywords": ["PS5"], "budget_min": 30000, "budget_max": 50000}),
+    ("아이패드 미니 6 4만엔 이하", {"keywords": ["iPad", "mini", "6"], "budget_max": 40000}),
+    ("에어팟 프로 1만엔대 상태 좋은 것", {"keywords": ["AirPods", "Pro"], "budget_min": 10000, "budget_max": 19999,
+                                  "condition": [NEW, LIKE_NEW, GOOD]}),
+    ("포켓몬 카드 싼 순", {"keywords": ["ポケモン", "カード"], "sort": "price_asc"}),
+    ("레고 테크닉 최신순", {"keywords": ["LEGO", "テクニック"], "brand": ["LEGO"], "sort": "new"}),
+    ("다이슨 청소기 3만엔 이하", {"keywords": ["dyson", "掃除機"], "brand": ["dyson"], "budget_max": 30000}),
+    ("캐논 카메라 블랙", {"keywords": ["Canon", "カメラ"], "brand": ["Canon"], "color": ["ブラック"]}),
+    ("소니 헤드폰 블랙 2만엔 이하", {"keywords": ["SONY", "ヘッドホン"], "budget_max": 20000, "color": ["ブラック"]}),
+    ("애플워치 새상품", {"keywords": ["Apple Watch"], "condition": [NEW]}),
+    ("나이키 운동화 270 화이트", {"keywords": ["NIKE", "スニーカー", "270"], "color": ["ホワイト"], "brand": ["NIKE"]}),
+    ("닌텐도 스위치 게임 소프트 5000엔 이하", {"keywords": ["Nintendo", "スイッチ", "ゲーム", "ソフト"], "budget_max": 5000}),
+    ("갤럭시 버즈 미개봉 만엔 이하", {"keywords": ["Galaxy", "Buds"], "budget_max": 10000, "condition": [NEW]}),
+    ("아이폰 13 128gb 블루", {"keywords": ["iPhone", "13", "128gb"], "color": ["ブルー"]}),
+    ("스위치 프로 컨트롤러 5천엔 이하", {"keywords": ["スイッチ", "Pro", "コントローラー"], "budget_max": 5000}),
+    ("샤넬 가방 블랙 10만엔 이하", {"keywords": ["CHANEL", "バッグ"], "brand": ["CHANEL"], "color": ["ブラック"], "budget_max": 100000}),
+    ("게임보이 어드밴스 레드", {"keywords": ["ゲームボーイ", "アドバンス"], "color": ["レッド"]}),
+    ("닌텐도 스위치 높은 가격순", {"keywords": ["Nintendo", "スイッチ"], "sort": "price_desc"}),
+    # ── English ──
+    ("nintendo switch oled white under 30000 yen", {"keywords": ["Nintendo", "スイッチ", "有機EL"], "budget_max": 30000, "color": ["ホワイト"]}),
+    ("ps5 between 30000 and 50000 yen", {"keywords": ["PS5"], "budget_min": 30000, "budget_max": 50000}),
+    ("iphone 13 128gb black cheapest", {"keywords": ["iPhone", "13", "128gb"], "color": ["ブラック"], "sort": "price_asc"}),
+    ("airpods pro new unopened", {"keywords": ["AirPods", "Pro"], "condition": [NEW]}),
+    ("sony headphones black under 20000 yen", {"keywords": ["SONY", "ヘッドホン"], "color": ["ブラック"], "budget_max": 20000}),
+    ("lego technic newest", {"keywords": ["LEGO", "テクニック"], "sort": "new"}),
+    ("canon camera lens", {"keywords": ["Canon", "カメラ", "レンズ"]}),
+    ("dyson vacuum max 40000 yen", {"keywords": ["dyson", "掃除機"], "budget_max": 40000}),
+    ("pokemon cards over 5000 yen", {"keywords": ["ポケモンカード"], "budget_min": 5000}),
+    ("switch lite blue like new", {"keywords": ["スイッチ", "ライト"], "color": ["ブルー"], "condition": [LIKE_NEW]}),
+    ("gucci wallet black", {"keywords": ["GUCCI", "財布"], "brand": ["GUCCI"], "color": ["ブラック"]}),
+    ("ipad air 5 under 50000 yen", {"keywords": ["iPad", "Air", "5"], "budget_max": 50000}),
+    ("apple watch series 8", {"keywords": ["Apple Watch", "series", "8"]}),
+    ("nike sneakers white 27cm", {"keywords": ["NIKE", "スニーカー", "27cm"], "color": ["ホワイト"]}),
+    ("nintendo switch highest price", {"keywords": ["Nintendo", "スイッチ"], "sort": "price_desc"}),
+    # ── 日本語 ──
+    ("ニンテンドースイッチ 有機EL ホワイト 3万円以下", {"keywords": ["Nintendo", "スイッチ", "有機EL"], "budget_max": 30000, "color": ["ホワイト"]}),
+    ("スイッチ 有機EL 2万円以下 新品", {"keywords": ["スイッチ", "有機EL"], "budget_max": 20000, "condition": [NEW]}),
+    ("ps5 本体 5万円以下", {"keywords": ["PS5", "本体"], "budget_max": 50000}),
+    ("ポケモンカード 安い順", {"keywords": ["ポケモンカード"], "sort": "price_asc"}),
+    ("iPhone 13 ブルー 未使用に近い", {"keywords": ["iPhone", "13"], "color": ["ブルー"], "condition": [LIKE_NEW]}),
+    ("ダイソン 掃除機 2万円から3万円", {"keywords": ["dyson", "掃除機"], "budget_min": 20000, "budget_max": 30000}),
+    ("レゴ テクニック 新着順", {"keywords": ["LEGO", "テクニック"], "sort": "new"}),
+    ("ソニー ヘッドホン ブラック", {"keywords": ["SONY", "ヘッドホン"], "color": ["ブラック"]}),
+    ("エアポッズプロ 1万円台", {"keywords": ["エアポッズプロ"], "budget_min": 10000, "budget_max": 19999}),
+    ("キャノン カメラ 10万円以下", {"keywords": ["Canon", "カメラ"], "budget_max": 100000}),
+    # 띄어쓰기 없는 일본어 문장(조사/활용어 처리)
+    ("3万円以下でスイッチが欲しい", {"keywords": ["スイッチ"], "budget_max": 30000}),
+    ("任天堂スイッチを探しています", {"keywords": ["Nintendo", "スイッチ"], "brand": ["Nintendo"]}),
+    ("1万円以下のゲーム", {"keywords": ["ゲーム"], "budget_max": 10000}),
+    ("新品のiPhone 13が欲しいです", {"keywords": ["iPhone", "13"], "condition": [NEW]}),
+    ("スイッチのケース 黒色", {"keywords": ["スイッチ", "ケース"], "color": ["ブラック"]}),
+    ("ポケモンカードを安い順で", {"keywords": ["ポケモンカード"], "sort": "price_asc"}),
+    ("ps5を探しています 5万円まで", {"keywords": ["PS5"], "budget_max": 50000}),
+    ("ゲームボーイアドバンスを探してる", {"keywords": ["ゲームボーイ", "アドバンス"]}),
+    # ── LLM으로 가야 하는 요청(부정/비교/질문, 원화, 사전 밖 한국어, 통화 없는 금액) ──
+    ("스위치 말고 PS5 추천", None),
+    ("아이패드 50만원 이하", None),
+    ("선물용으로 괜찮은 가성비 무선 이어폰 추천해줘", None),
+    ("switch 30000", None),
+    ("not nintendo, something like a retro handheld", None),
+    ("ps5 vs xbox which is cheaper", None),
+    ("スイッチ以外のゲーム機", None),
+    ("아이 장난감 중에 안전한 거", None),
+    ("예쁜 원피스 여름용 파란색 계열", None),
+    ("스위치 2만원 정도", None),
+    ("갖고 싶은데 돈이 없어요 싼 거", None),
+    ("heavy duty camping stove for winter hiking trips in snowy mountains", None),
+    ("레트로 감성 필름카메라 입문용", None),
+    ("부모님 선물 안마기", None),
+    ("캠핑 의자 가벼운 거", None),
+    ("昔のかわいいぬいぐるみ", None),
+    ("子供でも使いやすいカメラ", None),
+    ("スイッチとPS5どっちがいい", None),
+    # 영어 색상/상태어가 상품명 일부
+    ("red dead redemption 2 ps4", None),
+    ("new 3ds ll", None),
+    ("gold ship plush", None),
+]
+
+
+def _matches(args: Dict[str, Any], expected: Dict[str, Any]) -> bool:
+    return all(args.get(k) == v for k, v in expected.items())
+
+
+def main(threshold: float = 0.8) -> None:
+    bypass_ok, bypass_bad, missed, false_bypass = 0, [], [], []
+    for text, expected in CORPUS:
+        p = parse_query(text)
+        bypass = p.confidence >= threshold
+        if expected is None:
+            if bypass:
+                false_bypass.append((text, p.args))
+        elif not bypass:
+            missed.append((text, p.confidence, p.notes))
+        elif _matches(p.args, expected):
+            bypass_ok += 1
+        else:
+            bypass_bad.append((text, p.args))
+
+    simple = sum(e is not None for _, e in CORPUS)
+    ambiguous = len(CORPUS) - simple
+    bypassed = bypass_ok + len(bypass_bad) + len(false_bypass)
+    print(f"threshold {threshold}: {len(CORPUS)} queries ({simple} simple, {ambiguous} ambiguous)")
+    print(f"  LLM bypass      : {bypassed}/{len(CORPUS)} ({bypassed / len(CORPUS):.0%})")
+    print(f"  simple covered  : {bypass_ok + len(bypass_bad)}/{simple}")
+    print(f"  correct args    : {bypass_ok}/{bypassed} of bypassed")
+    print(f"  false bypass    : {len(false_bypass)}/{ambiguous} ambiguous")
+    for text, args in bypass_bad + false_bypass:
+        print(f"    wrong: {text!r} -> {args}")
+    for text, conf, notes in missed:
+        print(f"    to LLM: {text!r} conf={conf} {notes}")
+
+    texts = [t for t, _ in CORPUS] * 200
+    t0 = time.perf_counter()
+    for t in texts:
+        parse_query(t)
+    print(f"  parse           : {(time.perf_counter() - t0) / len(texts) * 1e6:.1f} µs/query")
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 0.8)
@@ -0,0 +1,97 @@
+"""
+랭커 속도 비교: 항목별 스코어링(TopKRanker) vs NumPy 배치 랭커(rank_batch).
+
+합성 후보(제목/가격/상태/설명/판매자)를 만들어 후보 수별로 측정한다.
+- scalar  : score_listing을 후보마다 호출(RankedListing + 근거 생성) + 힙 top-k
+- batch   : 열 변환(CandidateColumns.from_listings) + 벡터화 점수 + argpartition, 승자만 객체 생성
+- columns : 이미 열로 준비된 후보에 대해 점수 + top-k만 (열 변환 비용 제외)
+
+    PYTHONPATH=src python scripts/bench_ranker.py --sizes 100 10000 1000000 --top-k 3
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+
+from mercari_ai_shopper.agent.batch_ranker import CandidateColumns, batch_scores, rank_batch, top_k_indices
+from mercari_ai_shopper.agent.reasoning import TopKRanker
+from mercari_ai_shopper.models.listing import Listing, SellerInfo
+from mercari_ai_shopper.models.query import MERCARI_CONDITION_WHITELIST, SearchQuery
+from mercari_ai_shopper.utils.matcher import matcher_for
+
+WORDS = ["Nintendo", "Switch", "OLED", "ホワイト", "有機EL", "本体", "Sony", "PS5", "black", "限定", "ケース", "中古"]
+CONDITIONS = sorted(MERCARI_CONDITION_WHITELIST) + [None]
+
+QUERY = SearchQuery(
+    raw_text="닌텐도 스위치 OLED 화이트 3만엔 이하",
+    keywords=["Switch", "OLED"],
+    budget_max=30000,
+    condition=["未使用に近い"],
+    brand=["nintendo"],
+    color=["ホワイト"],
+)
+
+
+def candidates(n: int, seed: int = 0) -> list[Listing]:
+    """검증 비용을 빼기 위해 model_construct로 생성(측정 대상은 랭킹만)."""
+    rnd = random.Random(seed)
+    sellers = [None, SellerInfo(rating=4.9, sales_count=120), SellerInfo(rating=3.5, sales_count=0)]
+    return [
+        Listing.model_construct(
+            title=" ".join(rnd.sample(WORDS, 4)),
+            price_jpy=rnd.randrange(1000, 80000, 100),
+            condition=rnd.choice(CONDITIONS),
+            shipping=None,
+            url=f"https://jp.mercari.com/item/m{i:010d}",
+            image_url=None,
+            seller=rnd.choice(sellers),
+            sold=None,
+            likes=None,
+            description_snippet=rnd.choice([None, "ホワイト 本体のみ", "箱あり"]),
+        )
+        for i in range(n)
+    ]
+
+
+def _time(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        matcher_for(QUERY).scan.cache_clear()  # 스캔 캐시 재사용 없이 측정
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[100, 10_000, 1_000_000])
+    ap.add_argument("--top-k", type=int, default=3)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--scalar-max", type=int, default=1_000_000, help="이보다 크면 scalar 측정 생략")
+    args = ap.parse_args()
+
+    print(f"{'n':>9} {'scalar ms':>11} {'batch ms':>10} {'columns ms':>11} {'speedup':>8}  same top-k")
+    for n in args.sizes:
+        items = candidates(n)
+        cols = CandidateColumns.from_listings(items, QUERY)
+        repeat = 1 if n >= 1_000_000 else args.repeat
+
+        t_batch = _time(lambda: rank_batch(items, QUERY, args.top_k), repeat)
+        t_cols = _time(lambda: top_k_indices(batch_scores(cols, QUERY), args.top_k), repeat)
+        got = [str(r.listing.url) for r in rank_batch(items, QUERY, args.top_k)]
+
+        if n <= args.scalar_max:
+            t_scalar = _time(lambda: TopKRanker(QUERY, args.top_k).extend(items).result(), repeat)
+            want = [str(r.listing.url) for r in TopKRanker(QUERY, args.top_k).extend(items).result()]
+            scalar, speedup, same = f"{t_scalar * 1000:11.1f}", f"{t_scalar / t_batch:7.1f}x", str(got == want)
+        else:
+            scalar, speedup, same = f"{'-':>11}", f"{'-':>8}", "-"
+        print(f"{n:>9} {scalar} {t_batch * 1000:10.1f} {t_cols * 1000:11.1f} {speedup}  {same}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
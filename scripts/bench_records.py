@@ -0,0 +1,125 @@
+"""
+검색 → 필터 → 랭킹 경로의 항목당 비용 비교: 기존 흐름(모든 카드를 Listing으로 검증 생성) vs
+경량 레코드 흐름(ListingRecord로 필터/랭킹, 승자만 model_construct로 Listing 생성).
+
+- legacy : 레코드마다 Listing(**fields)(HttpUrl 2회 + validator) → Listing 필터 → 후보마다 RankedListing
+- records: ListingRecord 그대로 pipeline.keep → TopKRanker(점수만) → 상위 K개만 Listing/RankedListing
+
+측정: 항목당 시간(us), tracemalloc 최대 사용량(KiB), 결과를 들고 있는 동안 남는 메모리 블록 수.
+파싱(레코드 추출)은 두 흐름이 같으므로 미리 해 두고 제외한다.
+
+    PYTHONPATH=src python scripts/bench_records.py --items 120 1200 12000 --top-k 3
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+import tracemalloc
+
+from mercari_ai_shopper.agent.reasoning import TopKRanker, _score
+from mercari_ai_shopper.models.listing import Listing, ListingRecord
+from mercari_ai_shopper.models.query import SearchQuery
+from mercari_ai_shopper.models.recommendation import RankedListing
+from mercari_ai_shopper.scraping.parsers import _state_records
+from mercari_ai_shopper.scraping.pipeline import compile_pipeline
+from mercari_ai_shopper.utils.matcher import matcher_for
+
+QUERY = SearchQuery(
+    raw_text="switch oled white",
+    keywords=["switch", "oled"],
+    budget_max=30000,
+    condition=["未使用に近い", "目立った傷や汚れなし"],
+    color=["ホワイト"],
+)
+TITLES = ["Nintendo Switch 有機EL ホワイト", "Switch OLED ネオン", "PS5 本体", "Switch Lite ホワイト", "ケース"]
+
+
+def state_blob(n: int, seed: int = 0) -> dict:
+    rnd = random.Random(seed)
+    return {"items": [
+        {
+            "id": f"m{i:010d}",
+            "name": rnd.choice(TITLES),
+            "price": rnd.randrange(1000, 60000, 100),
+            "itemConditionId": rnd.randint(1, 6),
+            "status": "on_sale",
+            "thumbnails": [f"https://static.mercdn.net/thumb/item/m{i:010d}_1.jpg"],
+            "seller": {"name": "s", "star_rating_score": rnd.choice([3.5, 4.6, 4.9]), "num_sell_items": rnd.randint(0, 200)},
+            "numLikes": rnd.randint(0, 50),
+        }
+        for i in range(n)
+    ]}
+
+
+def _fields(rec: ListingRecord) -> dict:
+    d = {k: getattr(rec, k) for k in ListingRecord.__slots__}
+    s = rec.seller
+    d["seller"] = None if s is None else {"name": s.name, "rating": s.rating, "sales_count": s.sales_count}
+    return d
+
+
+def legacy_flow(field_dicts: list[dict], top_k: int) -> list[RankedListing]:
+    keep = compile_pipeline(QUERY).keep
+    items = [Listing(**d) for d in field_dicts]
+    items = [it for it in items if keep(it)]  # 술어는 속성만 보므로 Listing에도 그대로 적용
+    ranked = []
+    for it in items:
+        score, reasons = _score(it, QUERY)
+        ranked.append(RankedListing(listing=it, score=score, reasons=reasons))
+    ranked.sort(key=lambda r: r.score, reverse=True)  # 안정 정렬: 동점은 먼저 온 항목
+    return ranked[:top_k]
+
+
+def record_flow(records: list[ListingRecord], top_k: int) -> list[RankedListing]:
+    keep = compile_pipeline(QUERY).keep
+    return TopKRanker(QUERY, top_k).extend(r for r in records if keep(r)).result()
+
+
+def _time(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        matcher_for(QUERY).scan.cache_clear()
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples)
+
+
+def _memory(fn) -> tuple[float, int]:
+    matcher_for(QUERY).scan.cache_clear()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = fn()
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sum(s.count_diff for s in after.compare_to(before, "filename"))
+    del result
+    return peak / 1024, blocks
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--items", type=int, nargs="+", default=[120, 1200, 12000])
+    ap.add_argument("--top-k", type=int, default=3)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    print(f"{'items':>7} {'flow':>8} {'us/item':>9} {'peak KiB':>10} {'blocks':>8}  same top-k")
+    for n in args.items:
+        records = _state_records(state_blob(n))
+        dicts = [_fields(r) for r in records]
+        want = [str(r.listing.url) for r in legacy_flow(dicts, args.top_k)]
+        got = [str(r.listing.url) for r in record_flow(records, args.top_k)]
+        for name, fn in (("legacy", lambda: legacy_flow(dicts, args.top_k)),
+                         ("records", lambda: record_flow(records, args.top_k))):
+            t = _time(fn, args.repeat)
+            peak, blocks = _memory(fn)
+            print(f"{n:>7} {name:>8} {t / n * 1e6:9.2f} {peak:10.1f} {blocks:8d}  {got == want}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
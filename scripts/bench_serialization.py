@@ -0,0 +1,130 @@
+"""
+/search 응답 직렬화 비교: FastAPI 기본(response_model 검증 + 인코딩) vs FastJSONResponse(dumps).
+
+1) serialize : 응답 모델 → 바이트까지만 (요청 처리 제외). p50/p99(us)
+   - fastapi : fastapi.routing.serialize_response(response_model 재검증 + pydantic-core JSON)
+   - fast    : FastJSONResponse(model).body (pydantic-core → 바이트, 재검증 없음)
+2) request   : 같은 응답을 돌려주는 두 라우트를 TestClient로 호출. 요청당 wall p50/p99, CPU(us)
+3) tool      : 도구 결과(Listing N개) → LLM 메시지 문자열. str(model_dump 목록) vs tool_result_json
+
+    PYTHONPATH=src python scripts/bench_serialization.py --items 3 10 30 --n 2000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from fastapi import FastAPI
+from fastapi.responses import Response
+from fastapi.routing import serialize_response
+from fastapi.testclient import TestClient
+from fastapi.utils import create_model_field
+
+from mercari_ai_shopper.models.listing import Listing, SellerInfo
+from mercari_ai_shopper.models.query import SearchQuery
+from mercari_ai_shopper.models.recommendation import RankedListing, RecommendationResponse
+from mercari_ai_shopper.utils.serialization import FastJSONResponse, tool_result_json
+
+QUERY = SearchQuery(raw_text="닌텐도 스위치 OLED 화이트", keywords=["switch", "oled"], budget_max=30000, brand=["nintendo"])
+
+
+def _listing(i: int) -> Listing:
+    return Listing(
+        title=f"Nintendo Switch 有機ELモデル ホワイト {i}",
+        price_jpy=29800 - i,
+        condition="未使用に近い",
+        shipping="送料込み",
+        url=f"https://jp.mercari.com/item/m{i:011d}",
+        image_url=f"https://static.mercdn.net/thumb/item/m{i:011d}_1.jpg",
+        seller=SellerInfo(name="shop", rating=4.9, sales_count=120),
+        likes=12,
+        description_snippet="購入後数回使用のみ。付属品完備、箱あり。" * 5,
+    )
+
+
+def response(n: int) -> RecommendationResponse:
+    items = [RankedListing(listing=_listing(i), score=0.9, reasons=["예산 이내", "키워드 일치", "브랜드 일치"]) for i in range(n)]
+    return RecommendationResponse(query=QUERY, top_k=n, items=items)
+
+
+def _pct(samples: list[float], p: float) -> float:
+    s = sorted(samples)
+    return s[min(len(s) - 1, int(p * len(s)))]
+
+
+def _measure(fn, n: int) -> tuple[list[float], float]:
+    samples = []
+    c0 = time.process_time()
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1e6)
+    return samples, (time.process_time() - c0) / n * 1e6
+
+
+def _row(label: str, samples: list[float], cpu: float) -> None:
+    print(f"  {label:<22} p50 {statistics.median(samples):8.1f}  p99 {_pct(samples, 0.99):8.1f}  cpu {cpu:8.1f} us")
+
+
+def bench(n_items: int, n: int) -> None:
+    resp = response(n_items)
+    field = create_model_field(name="Response", type_=RecommendationResponse, mode="serialization")
+
+    loop = asyncio.new_event_loop()
+
+    def legacy() -> bytes:
+        # FastAPI 0.13x+: 기본 응답 클래스면 dump_json=True(검증 후 pydantic-core로 바이트)
+        content = loop.run_until_complete(serialize_response(field=field, response_content=resp, dump_json=True))
+        return Response(content, media_type="application/json").body
+
+    def fast() -> bytes:
+        return FastJSONResponse(resp).body
+
+    print(f"items={n_items} ({len(fast())} bytes)")
+    print(" serialize")
+    _row("fastapi default", *_measure(legacy, n))
+    _row("FastJSONResponse", *_measure(fast, n))
+    loop.close()
+
+    app = FastAPI()
+
+    @app.post("/legacy", response_model=RecommendationResponse)
+    async def legacy_route() -> RecommendationResponse:
+        return resp
+
+    @app.post("/fast", response_model=None, response_class=FastJSONResponse)
+    async def fast_route() -> FastJSONResponse:
+        return FastJSONResponse(resp)
+
+    with TestClient(app) as client:
+        assert client.post("/legacy").json() == client.post("/fast").json()
+        # 워밍업 후 두 라우트를 번갈아 호출(순서/캐시 편향 제거)
+        for _ in range(100):
+            client.post("/legacy"), client.post("/fast")
+        rounds = [(_measure(lambda: client.post("/legacy"), 1), _measure(lambda: client.post("/fast"), 1))
+                  for _ in range(max(200, n // 4))]
+        print(" request (TestClient)")
+        for label, i in (("fastapi default", 0), ("FastJSONResponse", 1)):
+            samples = [r[i][0][0] for r in rounds]
+            _row(label, samples, statistics.fmean(r[i][1] for r in rounds))
+
+    listings = [r.listing for r in resp.items]
+    print(" tool result")
+    _row("str(model_dump list)", *_measure(lambda: str({"ok": True, "result": [x.model_dump() for x in listings]}), n))
+    _row("tool_result_json", *_measure(lambda: tool_result_json({"ok": True, "result": listings}), n))
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--items", type=int, nargs="+", default=[3, 10, 30])
+    ap.add_argument("--n", type=int, default=2000)
+    args = ap.parse_args()
+    for k in args.items:
+        bench(k, args.n)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
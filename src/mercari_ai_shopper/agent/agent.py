@@ -1,30 +1,85 @@
 from __future__ import annotations
 
 import os
-from typing import Dict, Any, List, Callable
+import threading
+from typing import Dict, Any, AsyncIterator, Iterator, List, Callable, Optional, Tuple
 
+from mercari_ai_shopper.agent.compaction import ItemRefs, compact_search_result, expand_refs
 from mercari_ai_shopper.agent.composer import system_prompt, user_prompt, tool_defs_for_llm
+from mercari_ai_shopper.agent.query_cache import CachedQuery, get_query_cache
+from mercari_ai_shopper.agent.query_parser import ParsedQuery, parse_query
 from mercari_ai_shopper.agent.tool_schema import get_tool_schemas
+from mercari_ai_shopper.config import get_settings
+from mercari_ai_shopper.models.listing import Listing
 from mercari_ai_shopper.models.query import SearchQuery
 from mercari_ai_shopper.scraping import mercari_client
+from mercari_ai_shopper.scraping.pipeline import sort_limit
 
 # (옵션) Playwright 폴백도 원하면 등록 가능
 # from mercari_ai_shopper.scraping.mercari_playwright import search_playwright
 
 # LLM 클라이언트 선택
-from mercari_ai_shopper.llm.openai_client import OpenAIClient
-from mercari_ai_shopper.llm.anthropic_client import AnthropicClient
+from mercari_ai_shopper.llm.openai_client import AsyncOpenAIClient, OpenAIClient
+from mercari_ai_shopper.llm.anthropic_client import AnthropicClient, AsyncAnthropicClient
+from mercari_ai_shopper.llm.tool_executor import (
+    AsyncToolExecutor,
+    ToolCall,
+    ToolExecutor,
+    ToolOutcome,
+    tool_end_event,
+    tool_start_event,
+)
 
+# LLM 대신 만들어 넣는 검색 호출의 ID(질의 캐시 적중 / 규칙 파서)
+CACHED_CALL_ID = "cached_search"
+RULE_CALL_ID = "rule_search"
 
-def _tool_search_mercari(args: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """
-    LLM이 호출하는 실제 툴 구현.
-    - args를 SearchQuery로 관대하게 매핑
-    - mercari_client.search() 호출
-    - JSON-serializable로 반환
-    """
-    # 관대한 파싱
-    q = SearchQuery(
+_route_lock = threading.Lock()
+# 요청 경로별 건수: rules(LLM 없음) / cache(첫 LLM 호출 생략) / llm
+_route_counts: Dict[str, int] = {"rules": 0, "cache": 0, "llm": 0}
+
+
+def _count_route(kind: str) -> None:
+    with _route_lock:
+        _route_counts[kind] += 1
+
+
+def agent_route_stats() -> Dict[str, Any]:
+    with _route_lock:
+        out: Dict[str, Any] = dict(_route_counts)
+    total = sum(out.values())
+    out["rules_ratio"] = round(out["rules"] / total, 4) if total else 0.0
+    return out
+
+
+def _rule_parse(raw_text: str) -> Optional[ParsedQuery]:
+    """규칙 파서 결과가 확신도 임계값(AGENT_RULE_PARSER_MIN_CONFIDENCE) 이상일 때만."""
+    s = get_settings()
+    if not s.agent_rule_parser_enabled:
+        return None
+    parsed = parse_query(raw_text)
+    return parsed if parsed.confidence >= s.agent_rule_parser_min_confidence else None
+
+
+def _render_answer(result: Dict[str, Any], refs: ItemRefs, top_k: int = 3) -> str:
+    """압축 검색 결과(agent.compaction) → 상위 K개 요약(CLI 출력과 같은 형식)."""
+    cols, common = result.get("cols", []), result.get("common", {})
+    lines: List[str] = []
+    for n, row in enumerate(result.get("rows", [])[:top_k], 1):
+        r = {**common, **dict(zip(cols, row))}
+        price = r.get("price")
+        lines.append(f"{n}. {r.get('title')}  ¥{price:,}" if isinstance(price, int) else f"{n}. {r.get('title')}")
+        if r.get("condition"):
+            lines.append(f"   - 상태: {r['condition']}")
+        if r.get("why"):
+            lines.append(f"   - 근거: {r['why'].replace('/', ', ')}")
+        lines.append(f"   - URL: {refs.resolve(str(r.get('id')))}")
+    return "\n".join(lines) if lines else "조건에 맞는 상품을 찾지 못했습니다."
+
+
+def _query_from_args(args: Dict[str, Any]) -> SearchQuery:
+    """LLM 도구 인자 → SearchQuery(관대한 파싱)."""
+    return SearchQuery(
         raw_text="LLM structured",
         keywords=args.get("keywords", []),
         budget_min=args.get("budget_min"),
@@ -36,44 +91,273 @@ def _tool_search_mercari(args: Dict[str, Any]) -> List[Dict[str, Any]]:
         sort=args.get("sort", "relevance"),
         limit=min(100, max(1, int(args.get("limit", 30)))),
     )
-    items = mercari_client.search(None, q)
-    return [it.model_dump() for it in items]
 
 
-def _tool_fetch_listing_detail(args: Dict[str, Any]) -> Dict[str, Any]:
+def _tool_search_mercari(args: Dict[str, Any]) -> List[Listing]:
+    """
+    LLM이 호출하는 실제 툴 구현(압축 없는 원본 목록).
+    - args를 SearchQuery로 관대하게 매핑
+    - mercari_client.search() 호출
+    - Listing 그대로 반환(LLM 클라이언트가 utils.serialization.tool_result_json으로 JSON 직렬화)
+    에이전트는 Agent._search_compact(상위 N개 표 형식)를 등록한다.
+    """
+    return mercari_client.search(None, _query_from_args(args))
+
+
+def _tool_fetch_listing_detail(args: Dict[str, Any]) -> Any:
+    """
+    단건(url) 또는 다건(urls) 상세 조회.
+    다건은 병렬 조회하며 입력 순서대로 {url, ok, listing | error}를 돌려준다.
+    """
+    urls = [str(u) for u in (args.get("urls") or []) if u]
+    if urls:
+        results = mercari_client.fetch_details(urls)
+        return [
+            {"url": r.url, "ok": r.ok, "listing": r.listing, "error": r.error}
+            for r in results
+        ]
     url = str(args.get("url", ""))
     if not url:
-        raise ValueError("url is required")
-    it = mercari_client.fetch_detail(None, url)
-    return it.model_dump()
+        raise ValueError("url or urls is required")
+    return mercari_client.fetch_detail(None, url)
 
 
-def _resolve_llm() -> Any:
+def _llm_class(asynchronous: bool = False) -> type:
     provider = os.getenv("LLM_PROVIDER", "openai").lower()
     if provider == "anthropic":
-        return AnthropicClient()
-    return OpenAIClient()
+        return AsyncAnthropicClient if asynchronous else AnthropicClient
+    return AsyncOpenAIClient if asynchronous else OpenAIClient
+
+
+def _resolve_llm(asynchronous: bool = False) -> Any:
+    return _llm_class(asynchronous)()
 
 
 class Agent:
     """
     단일턴/멀티턴 상관없이 LLM ↔ 도구 호출을 중재하는 에이전트.
     - raw_text 입력 → LLM이 tool-call → 툴 실행 → 결과 전달 → 최종 응답
+    - asynchronous=True: 비동기 LLM 클라이언트 + async 도구로 arun/astream(서버용).
+      LLM SDK 클라이언트는 프로세스(비동기는 이벤트 루프) 공용이라 Agent 생성 비용이 작다.
+    - 규칙 파서(agent.query_parser): 확신도가 높은 단순 요청은 LLM 없이 바로 검색+랭킹하고
+      상위 3개 요약으로 답한다. 모호한 요청만 아래 경로(질의 캐시 → LLM)로 간다.
+    - 질의 캐시(agent.query_cache): 본 적 있는(또는 거의 같은) 요청문이면 첫 LLM 호출
+      (문장 → search_mercari 인자) 없이 캐시된 인자로 바로 검색하고, 결과부터 LLM에 넘긴다.
+      캐시에 없으면 이번 실행에서 LLM이 처음 부른 검색 인자를 저장한다.
     """
 
-    def __init__(self):
-        self.client = _resolve_llm()
+    def __init__(self, asynchronous: bool = False):
+        self.asynchronous = asynchronous
+        # 제공자 클래스만 정해 두고 클라이언트는 처음 쓸 때 생성(규칙 파서 경로는 API 키 없이도 동작)
+        self._llm_cls = _llm_class(asynchronous)
+        self._client: Any = None
+        # 검색 결과의 짧은 ID(i1, i2, ...) ↔ URL. 같은 Agent의 대화 동안 유지
+        self.refs = ItemRefs()
         self.tool_registry: Dict[str, Callable[[Dict[str, Any]], Any]] = {
-            "search_mercari": _tool_search_mercari,
-            "fetch_listing_detail": _tool_fetch_listing_detail,
+            "search_mercari": self._search_compact,
+            "fetch_listing_detail": self._fetch_detail,
+        }
+        # 비동기 경로: 검색/상세 조회를 httpx 비동기로(이벤트 루프를 막지 않음)
+        self.async_tool_registry: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            "search_mercari": self._asearch_compact,
+            "fetch_listing_detail": self._afetch_detail,
         }
         self.tools = get_tool_schemas()
+        # 캐시 미스였던 실행의 요청문(첫 검색 인자를 저장할 키). 저장 후/적중 시 None
+        self._learn_text: Optional[str] = None
 
-    def run(self, raw_text: str, max_steps: int = 3) -> List[Dict[str, Any]]:
-        messages: List[Dict[str, Any]] = [
+    @property
+    def client(self) -> Any:
+        """LLM 클라이언트. API 키/SDK가 없으면 처음 쓸 때 RuntimeError."""
+        return self._ensure_client()
+
+    def _ensure_client(self) -> Any:
+        if self._client is None:
+            self._client = _resolve_llm(self.asynchronous)
+        return self._client
+
+    def check_llm(self, raw_text: str) -> None:
+        """
+        규칙 파서로 끝나지 않는 요청(질의 캐시 적중도 최종 답변은 LLM)이면 클라이언트를 미리 만든다.
+        API 키/SDK 미설정이면 여기서 RuntimeError(스트림 시작 전에 알리려고).
+        """
+        if _rule_parse(raw_text) is None:
+            self._ensure_client()
+
+    def _compact(self, records: List[Any], q: SearchQuery) -> Dict[str, Any]:
+        s = get_settings()
+        return compact_search_result(
+            records, q, self.refs,
+            top_n=s.agent_result_top_n,
+            token_budget=s.agent_result_token_budget,
+        )
+
+    def _search_compact(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        검색 → 점수 상위 N개를 토큰 예산 안의 표 형식으로(agent.compaction).
+        레코드 상태로 랭킹하므로 Listing은 상위 N개만 만든다.
+        """
+        q = _query_from_args(args)
+        result = self._compact(sort_limit(list(mercari_client.iter_search(None, q)), q), q)
+        self._remember(args)
+        return result
+
+    async def _asearch_compact(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        q = _query_from_args(args)
+        records = [r async for r in mercari_client.aiter_search(q)]
+        result = self._compact(sort_limit(records, q), q)
+        self._remember(args)
+        return result
+
+    def _detail_targets(self, args: Dict[str, Any]) -> Tuple[List[str], str]:
+        """검색 결과의 짧은 ID(ids/urls/url 어디든) → (다건 URL 목록, 단건 URL)."""
+        urls = expand_refs([*(args.get("ids") or []), *(args.get("urls") or [])], self.refs)
+        url = args.get("url") or args.get("id")
+        return urls, self.refs.resolve(str(url)) if url else ""
+
+    def _fetch_detail(self, args: Dict[str, Any]) -> Any:
+        urls, url = self._detail_targets(args)
+        if urls:
+            return _tool_fetch_listing_detail({"urls": urls})
+        return _tool_fetch_listing_detail({"url": url})
+
+    async def _afetch_detail(self, args: Dict[str, Any]) -> Any:
+        urls, url = self._detail_targets(args)
+        if urls:
+            results = await mercari_client.async_fetch_details(urls)
+            return [{"url": r.url, "ok": r.ok, "listing": r.listing, "error": r.error} for r in results]
+        if not url:
+            raise ValueError("url or urls is required")
+        return await mercari_client.async_fetch_detail(url)
+
+    # ── 라우팅: 규칙 파서 → 질의 캐시 → LLM ────────────────────────────────────────
+    def _route(self, raw_text: str) -> Tuple[str, Any]:
+        """
+        ("rules", ParsedQuery): 규칙 파서 확신도 ≥ 임계값 → LLM 없이 검색+랭킹으로 끝
+        ("cache", CachedQuery): 질의 캐시 적중 → 첫 LLM 호출만 생략
+        ("llm", None): 처음부터 LLM
+        """
+        self._learn_text = None
+        parsed = _rule_parse(raw_text)
+        if parsed is not None:
+            route: Tuple[str, Any] = ("rules", parsed)
+        else:
+            hit = self._cached_query(raw_text)
+            route = ("cache", hit) if hit is not None else ("llm", None)
+        _count_route(route[0])
+        return route
+
+    def _cached_query(self, raw_text: str) -> Optional[CachedQuery]:
+        cache = get_query_cache()
+        hit = cache.lookup(raw_text) if cache is not None else None
+        self._learn_text = raw_text if cache is not None and hit is None else None
+        return hit
+
+    def _remember(self, args: Dict[str, Any]) -> None:
+        """캐시 미스였던 실행에서 성공한 첫 검색의 인자만 저장."""
+        text, self._learn_text = self._learn_text, None
+        if text is not None:
+            cache = get_query_cache()
+            if cache is not None:
+                cache.store(text, args)
+
+    @staticmethod
+    def _seed_call(kind: str, found: Any) -> ToolCall:
+        """LLM 대신 만들어 넣는 첫 검색 호출(규칙 파서/질의 캐시의 인자)."""
+        return ToolCall(RULE_CALL_ID if kind == "rules" else CACHED_CALL_ID, "search_mercari", dict(found.args))
+
+    @staticmethod
+    def _route_event(kind: str, found: Any) -> Dict[str, Any]:
+        if kind == "rules":
+            return {"type": "parsed", "args": found.args, "confidence": found.confidence}
+        return {"type": "cache_hit", "text": found.text, "similarity": found.similarity}
+
+    def _rule_answer(self, messages: List[Dict[str, Any]], outcome: ToolOutcome) -> List[Dict[str, Any]]:
+        """규칙 경로의 최종 답변(검색 결과 상위 3개 요약)을 대화에 붙이고 token/done 이벤트로."""
+        if outcome.ok:
+            text = _render_answer(outcome.result, self.refs)
+        else:
+            text = f"검색에 실패했습니다: {outcome.error}"
+        messages.append({"role": "assistant", "content": text})
+        return [{"type": "token", "text": text}, {"type": "done", "text": text, "steps": 0}]
+
+    # ── 실행 ──────────────────────────────────────────────────────────────────
+    @staticmethod
+    def _messages(raw_text: str) -> List[Dict[str, Any]]:
+        return [
             {"role": "system", "content": system_prompt()},
             {"role": "user", "content": user_prompt(raw_text)},
         ]
+
+    def run(self, raw_text: str, max_steps: int = 3) -> List[Dict[str, Any]]:
         tools = tool_defs_for_llm(self.tools)
+        messages = self._messages(raw_text)
+        kind, found = self._route(raw_text)
+        if kind != "llm":
+            call = self._seed_call(kind, found)
+            outcomes = ToolExecutor(self.tool_registry).run([call])
+            messages.extend(self._llm_cls.tool_turn_messages([call], outcomes))
+            if kind == "rules":
+                self._rule_answer(messages, outcomes[0])
+                return messages
         # OpenAI/Anthropic 공통 인터페이스(run_loop) 호출
         return self.client.run_loop(messages, tools, self.tool_registry, max_steps=max_steps)
+
+    def stream(self, raw_text: str, max_steps: int = 3) -> Iterator[Dict[str, Any]]:
+        """
+        run()의 스트리밍판: step/token/tool_start/tool_end/done 이벤트를 도착하는 대로 내보낸다
+        (OpenAI/Anthropic 공통 인터페이스 stream_loop).
+        규칙 파서 경로는 parsed → 검색 진행 → token/done(steps=0), 질의 캐시 적중은 cache_hit → 검색 진행 → LLM.
+        """
+        tools = tool_defs_for_llm(self.tools)
+        messages = self._messages(raw_text)
+        kind, found = self._route(raw_text)
+        if kind == "llm":
+            return self.client.stream_loop(messages, tools, self.tool_registry, max_steps=max_steps)
+        return self._stream_seeded(kind, found, messages, tools, max_steps)
+
+    def _stream_seeded(self, kind: str, found: Any, messages: List[Dict[str, Any]], tools: List[Dict[str, Any]],
+                       max_steps: int) -> Iterator[Dict[str, Any]]:
+        yield self._route_event(kind, found)
+        call = self._seed_call(kind, found)
+        outcomes = yield from ToolExecutor(self.tool_registry).stream([call])
+        messages.extend(self._llm_cls.tool_turn_messages([call], outcomes))
+        if kind == "rules":
+            yield from self._rule_answer(messages, outcomes[0])
+            return
+        yield from self.client.stream_loop(messages, tools, self.tool_registry, max_steps=max_steps)
+
+    async def arun(self, raw_text: str, max_steps: int = 3) -> List[Dict[str, Any]]:
+        """run()의 asyncio 버전(Agent(asynchronous=True)). LLM 호출 수는 제공자별 상한(llm.shared)."""
+        tools = tool_defs_for_llm(self.tools)
+        messages = self._messages(raw_text)
+        kind, found = self._route(raw_text)
+        if kind != "llm":
+            call = self._seed_call(kind, found)
+            outcomes = await AsyncToolExecutor(self.async_tool_registry).arun([call])
+            messages.extend(self._llm_cls.tool_turn_messages([call], outcomes))
+            if kind == "rules":
+                self._rule_answer(messages, outcomes[0])
+                return messages
+        return await self.client.arun_loop(messages, tools, self.async_tool_registry, max_steps=max_steps)
+
+    async def astream(self, raw_text: str, max_steps: int = 3) -> AsyncIterator[Dict[str, Any]]:
+        """stream()의 asyncio 버전(Agent(asynchronous=True)). 이벤트 형식 동일."""
+        tools = tool_defs_for_llm(self.tools)
+        messages = self._messages(raw_text)
+        kind, found = self._route(raw_text)
+        if kind != "llm":
+            yield self._route_event(kind, found)
+            call = self._seed_call(kind, found)
+            yield tool_start_event(call)
+            outcomes = await AsyncToolExecutor(self.async_tool_registry).arun([call])
+            yield tool_end_event(outcomes[0])
+            messages.extend(self._llm_cls.tool_turn_messages([call], outcomes))
+            if kind == "rules":
+                for event in self._rule_answer(messages, outcomes[0]):
+                    yield event
+                return
+        async for event in self.client.astream_loop(
+            messages, tools, self.async_tool_registry, max_steps=max_steps
+        ):
+            yield event
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Sequence
+
+import numpy as np
+
+from mercari_ai_shopper.agent.reasoning import _condition_score, score_listing
+from mercari_ai_shopper.models.listing import Listing
+from mercari_ai_shopper.models.query import SearchQuery
+from mercari_ai_shopper.models.recommendation import RankedListing
+from mercari_ai_shopper.utils.matcher import matcher_for
+
+
+@dataclass
+class CandidateColumns:
+    """
+    후보 집합의 열 표현. 텍스트 매칭은 질의 매처(utils.matcher)로 미리 끝내 둔다.
+    - price: float64
+    - condition: 상태 라벨(None → "")
+    - keyword_hits: 제목에 나온 키워드 수
+    - brand_ok / color_ok: 모든 브랜드/색상이 제목+설명에 있음
+    - seller_rating / seller_sales: 없으면 NaN
+    """
+
+    price: np.ndarray
+    condition: np.ndarray
+    keyword_hits: np.ndarray
+    brand_ok: np.ndarray
+    color_ok: np.ndarray
+    seller_rating: np.ndarray
+    seller_sales: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.price.shape[0])
+
+    @classmethod
+    def from_listings(cls, items: Sequence[Listing], q: SearchQuery) -> "CandidateColumns":
+        # 속성 접근/텍스트 스캔은 한 번의 파이썬 루프로 모은 뒤 배열로 변환
+        n = len(items)
+        nan = float("nan")
+        scan = matcher_for(q).scan
+        price = np.empty(n, dtype=np.float64)
+        hits = np.zeros(n, dtype=np.int64)
+        brand_ok = np.zeros(n, dtype=bool)
+        color_ok = np.zeros(n, dtype=bool)
+        rating = np.full(n, nan)
+        sales = np.full(n, nan)
+        cond: List[str] = [""] * n
+        for i, it in enumerate(items):
+            price[i] = it.price_jpy
+            cond[i] = it.condition or ""
+            m = scan(it.title, it.description_snippet)
+            hits[i] = m.keyword_hits
+            brand_ok[i] = m.brand_ok
+            color_ok[i] = m.color_ok
+            s = it.seller
+            if s is not None:
+                if s.rating is not None:
+                    rating[i] = s.rating
+                if s.sales_count is not None:
+                    sales[i] = s.sales_count
+        return cls(
+            price=price,
+            condition=np.array(cond, dtype=str),
+            keyword_hits=hits,
+            brand_ok=brand_ok,
+            color_ok=color_ok,
+            seller_rating=rating,
+            seller_sales=sales,
+        )
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 벡터화 점수 (reasoning의 _*_score와 같은 식)
+# ──────────────────────────────────────────────────────────────────────────────
+def _budget_scores(price: np.ndarray, q: SearchQuery) -> np.ndarray:
+    if q.budget_max is None and q.budget_min is None:
+        return np.full(price.shape, 0.5)
+    if q.budget_max is not None:
+        bmax = float(q.budget_max)
+        within = np.clip(0.6 + 0.4 * ((bmax - price) / max(1.0, bmax)), 0.0, 1.0)
+        over = np.maximum(0.0, 0.6 - (price - bmax) / (bmax + 1))
+        return np.where(price <= bmax, within, over)
+    bmin = float(q.budget_min)  # type: ignore[arg-type]
+    above = np.clip(0.6 + 0.4 * ((price - bmin) / np.maximum(1.0, price)), 0.0, 1.0)
+    return np.where(price >= bmin, above, 0.2)
+
+
+def _condition_scores(condition: np.ndarray, q: SearchQuery) -> np.ndarray:
+    if not q.condition:
+        return np.full(condition.shape, 0.5)
+    # 상태 라벨 종류는 몇 개뿐이므로 고유값별로 한 번씩만 계산
+    uniq, inverse = np.unique(condition, return_inverse=True)
+    table = np.array([_condition_score(u, q)[0] for u in uniq])
+    return table[inverse]
+
+
+def _keyword_scores(hits: np.ndarray, q: SearchQuery) -> np.ndarray:
+    ratio = hits / max(1, len(q.keywords))
+    return np.where(hits == 0, 0.4, 0.6 + 0.4 * ratio)
+
+
+def _brand_color_scores(cols: CandidateColumns, q: SearchQuery) -> np.ndarray:
+    s = np.full(cols.price.shape, 0.5)
+    if q.brand:
+        s += np.where(cols.brand_ok, 0.2, -0.15)
+    if q.color:
+        s += np.where(cols.color_ok, 0.1, -0.1)
+    return np.clip(s, 0.0, 1.0)
+
+
+def _seller_adjustments(rating: np.ndarray, sales: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid="ignore"):
+        adj = np.where(np.isnan(rating), 0.0, np.clip((rating - 4.5) * 0.1, -0.05, 0.05))
+        adj += np.where(sales >= 50, 0.01, 0.0) - np.where(sales == 0, 0.01, 0.0)
+    return np.clip(adj, -0.05, 0.05)
+
+
+def batch_scores(cols: CandidateColumns, q: SearchQuery) -> np.ndarray:
+    """모든 후보의 점수(rank_and_explain과 같은 가중치, 소수 4자리 반올림)."""
+    score = (
+        0.35 * _budget_scores(cols.price, q)
+        + 0.3 * _condition_scores(cols.condition, q)
+        + 0.25 * _keyword_scores(cols.keyword_hits, q)
+        + 0.10 * _brand_color_scores(cols, q)
+        + _seller_adjustments(cols.seller_rating, cols.seller_sales)
+    )
+    return np.round(np.clip(score, 0.0, 1.0), 4)
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    argpartition으로 상위 k개 인덱스 선택(전체 정렬 없음).
+    동점은 입력 순서가 앞선 항목 우선(rank_and_explain과 동일).
+    """
+    n = scores.shape[0]
+    k = max(1, min(k, n))
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+    if n > k:
+        part = np.argpartition(-scores, k - 1)[:k]
+        # 경계 점수와 동점인 후보까지 포함해 순서를 안정적으로 결정
+        cand = np.flatnonzero(scores >= scores[part].min())
+    else:
+        cand = np.arange(n)
+    order = np.lexsort((cand, -scores[cand]))
+    return cand[order][:k]
+
+
+def rank_batch(items: Sequence[Listing], q: SearchQuery, top_k: int = 3) -> List[RankedListing]:
+    """
+    rank_and_explain의 배치 버전.
+    점수 계산은 열 단위로 한 번에 하고, 근거 문자열/RankedListing은 상위 k개에만 만든다.
+    """
+    if not items:
+        return []
+    idx = top_k_indices(batch_scores(CandidateColumns.from_listings(items, q), q), top_k)
+    return [score_listing(items[i], q) for i in idx]
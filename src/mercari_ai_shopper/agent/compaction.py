@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+"""
+LLM에 돌려줄 검색 도구 결과 압축.
+- rank_and_explain과 같은 점수로 미리 순위를 매겨 상위 N개만 남김
+- null 열/모든 행에서 같은 값(예: 전부 送料込み)은 행에서 빼고 common으로 한 번만
+- 열 이름 1회 + 행 배열(columnar table), URL 대신 짧은 ID(i1, i2, ...)
+- 로컬 토큰 추정치로 예산을 넘기 전까지만 행을 담는다
+"""
+
+import math
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from mercari_ai_shopper.agent.reasoning import Candidate, TopKRanker
+from mercari_ai_shopper.models.query import SearchQuery
+from mercari_ai_shopper.utils.serialization import dumps_str
+
+# tiktoken은 선택 의존성: 없으면 문자 종류 기반 추정
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - 설치 환경에 따라
+    tiktoken = None  # type: ignore[assignment]
+
+# 제목은 앞부분만(검색 키워드/모델명은 보통 앞쪽에 있음)
+TITLE_MAX_CHARS = 60
+# 행 열 순서(값이 전부 null인 열은 뺀다)
+COLUMNS = ("id", "title", "price", "condition", "shipping", "score", "rating", "sales", "likes", "sold", "why")
+
+# 짧은 ID("i12")와 구분자의 추정 토큰 수
+ID_TOKENS = 3
+
+_encoding: Any = None
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 토큰 추정
+# ──────────────────────────────────────────────────────────────────────────────
+def estimate_tokens(text: str) -> int:
+    """
+    프롬프트 토큰 수 추정. tiktoken이 있으면 cl100k_base로 세고,
+    없으면 ASCII 4자당 1토큰 + 비ASCII(일본어/한국어) 1자당 1토큰으로 어림한다(보수적).
+    """
+    global _encoding
+    if tiktoken is not None:
+        if _encoding is None:
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        return len(_encoding.encode(text))
+    ascii_chars = sum(1 for ch in text if ch < "\x80")
+    return math.ceil(ascii_chars / 4) + (len(text) - ascii_chars)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 짧은 ID ↔ URL
+# ──────────────────────────────────────────────────────────────────────────────
+class ItemRefs:
+    """
+    에이전트 대화 1개 범위의 상품 참조표. 같은 URL은 같은 ID를 받고,
+    모델이 fetch_listing_detail에 ID를 넘기면 resolve()로 URL을 되찾는다.
+    """
+
+    def __init__(self, prefix: str = "i"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._by_url: Dict[str, str] = {}
+        self._by_id: Dict[str, str] = {}
+
+    def ref(self, url: str) -> str:
+        with self._lock:
+            rid = self._by_url.get(url)
+            if rid is None:
+                rid = f"{self.prefix}{len(self._by_url) + 1}"
+                self._by_url[url] = rid
+                self._by_id[rid] = url
+            return rid
+
+    def resolve(self, ref_or_url: str) -> str:
+        """ID면 URL로, 모르는 값(이미 URL 등)은 그대로."""
+        key = ref_or_url.strip()
+        return self._by_id.get(key, key)
+
+    def __len__(self) -> int:
+        return len(self._by_url)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 압축
+# ──────────────────────────────────────────────────────────────────────────────
+def _row(it: Candidate, score: float, reasons: List[str]) -> Dict[str, Any]:
+    seller = it.seller
+    title = it.title if len(it.title) <= TITLE_MAX_CHARS else it.title[: TITLE_MAX_CHARS - 1] + "…"
+    return {
+        "id": str(it.url),
+        "title": title,
+        "price": it.price_jpy,
+        "condition": it.condition,
+        "shipping": it.shipping,
+        "score": score,
+        "rating": seller.rating if seller is not None else None,
+        "sales": seller.sales_count if seller is not None else None,
+        "likes": it.likes,
+        "sold": it.sold,
+        "why": "/".join(reasons) or None,
+    }
+
+
+def _columns(rows: Sequence[Dict[str, Any]]) -> Tuple[List[str], Dict[str, Any]]:
+    """(행에 남길 열, 모든 행이 같은 값이라 common으로 뺄 열). 전부 null인 열은 둘 다에서 제외."""
+    cols: List[str] = []
+    common: Dict[str, Any] = {}
+    for c in COLUMNS:
+        values = {dumps_str(r[c]) for r in rows}
+        if values == {"null"}:
+            continue
+        if len(rows) > 1 and len(values) == 1 and c not in ("id", "title", "score"):
+            common[c] = rows[0][c]
+            continue
+        cols.append(c)
+    return cols, common
+
+
+def compact_search_result(
+    items: Iterable[Candidate],
+    q: SearchQuery,
+    refs: ItemRefs,
+    *,
+    top_n: int = 20,
+    token_budget: int = 1500,
+) -> Dict[str, Any]:
+    """
+    검색 결과 → 토큰 예산 안의 표 형식 dict.
+      {"total": 전체 후보 수, "shown": 행 수, "cols": [...], "rows": [[...], ...],
+       "common": {모든 행 공통 값}, "hint": ...}
+    rows는 점수 내림차순이며, 예산을 넘는 꼬리 행부터 잘린다(최소 1행은 유지).
+    """
+    ranker = TopKRanker(q, top_k=top_n).extend(items)
+    rows = [_row(it, score, reasons) for score, reasons, it in ranker.scored()]
+    cols, common = _columns(rows)
+
+    out: Dict[str, Any] = {
+        "total": ranker.seen,
+        "shown": 0,
+        "cols": cols,
+        "rows": [],
+        "hint": "ids can be passed to fetch_listing_detail(ids=[...])",
+    }
+    if common:
+        out["common"] = common
+    used = estimate_tokens(dumps_str(out))
+    for r in rows:
+        row = [r[c] for c in cols]
+        cost = estimate_tokens(dumps_str(row[1:])) + ID_TOKENS + 1  # 행 구분자
+        if out["rows"] and used + cost > token_budget:
+            break
+        # ID는 실제로 담기는 행에만 발급(잘린 행이 번호를 소모하지 않게)
+        row[0] = refs.ref(row[0])
+        out["rows"].append(row)
+        used += cost
+    out["shown"] = len(out["rows"])
+    return out
+
+
+def compact_tokens(result: Dict[str, Any]) -> int:
+    """압축 결과의 추정 토큰 수(벤치/로그용)."""
+    return estimate_tokens(dumps_str(result))
+
+
+def expand_refs(values: Optional[Iterable[str]], refs: ItemRefs) -> List[str]:
+    """fetch_listing_detail 인자(ID 또는 URL 목록) → URL 목록."""
+    return [refs.resolve(str(v)) for v in (values or []) if v]
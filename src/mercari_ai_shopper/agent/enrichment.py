@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from typing import AsyncIterable, Awaitable, Callable, Iterable, List, Optional, Sequence, Union
+
+from mercari_ai_shopper.agent.reasoning import TopKRanker, rank_and_explain
+from mercari_ai_shopper.models.listing import Listing
+from mercari_ai_shopper.models.query import SearchQuery
+from mercari_ai_shopper.models.recommendation import RankedListing
+from mercari_ai_shopper.scraping.mercari_client import (
+    DetailResult,
+    async_fetch_details,
+    fetch_details,
+)
+
+# 상세 정보로 덮어쓸 필드(검색 카드에 없거나 부정확한 값 위주)
+_FILL_FIELDS = ("seller", "description_snippet", "sold", "likes", "image_url", "shipping")
+
+
+def merge_detail(base: Listing, detail: Optional[Listing]) -> Listing:
+    """
+    검색 카드 Listing에 상세 페이지 정보를 병합.
+    - 상세에 값이 있는 필드만 채움
+    - 가격/제목/상태는 카드 값을 우선(상세 DOM 폴백의 상태 텍스트는 부정확할 수 있음)
+    """
+    if detail is None:
+        return base
+    update = {}
+    for f in _FILL_FIELDS:
+        v = getattr(detail, f)
+        if v is not None:
+            update[f] = v
+    if base.condition is None and detail.condition:
+        update["condition"] = detail.condition
+    return base.model_copy(update=update) if update else base
+
+
+def _enriched(first: List[RankedListing], results: Sequence[DetailResult]) -> List[Listing]:
+    return [merge_detail(r.listing, res.listing) for r, res in zip(first, results)]
+
+
+def enrich_and_rank(
+    items: Iterable[Listing],
+    q: SearchQuery,
+    top_k: int = 3,
+    top_n: int = 10,
+    fetch: Callable[[List[str]], List[DetailResult]] = fetch_details,
+) -> List[RankedListing]:
+    """
+    2단계 랭킹.
+    1) 카드 정보만으로 rank_and_explain → 상위 top_n 후보
+    2) 후보의 상세 페이지를 병렬 조회해 판매자 평가/판매 수/설명 보강
+    3) 보강된 후보만 다시 랭킹해 top_k 반환
+    상세 조회에 실패한 후보는 카드 정보 그대로 2차 랭킹에 참여한다.
+    """
+    if top_n <= 0:
+        return rank_and_explain(items, q, top_k=top_k)
+    first = rank_and_explain(items, q, top_k=max(top_n, top_k))
+    if not first:
+        return first
+    results = fetch([str(r.listing.url) for r in first])
+    return rank_and_explain(_enriched(first, results), q, top_k=top_k)
+
+
+async def aenrich_and_rank(
+    items: Union[Iterable[Listing], AsyncIterable[Listing]],
+    q: SearchQuery,
+    top_k: int = 3,
+    top_n: int = 10,
+    fetch: Callable[[List[str]], Awaitable[List[DetailResult]]] = async_fetch_details,
+) -> List[RankedListing]:
+    """
+    enrich_and_rank의 asyncio 버전(서버용).
+    items가 async 이터러블(aiter_search)이면 페이지가 도착하는 대로 1차 랭킹을 진행한다.
+    """
+    k = max(top_n, top_k) if top_n > 0 else top_k
+    ranker = TopKRanker(q, k)
+    if isinstance(items, AsyncIterable):
+        async for it in items:
+            ranker.add(it)
+    else:
+        ranker.extend(items)
+    first = ranker.result()
+    if top_n <= 0 or not first:
+        return first
+    results = await fetch([str(r.listing.url) for r in first])
+    return rank_and_explain(_enriched(first, results), q, top_k=top_k)
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+"""
+자연어 요청(raw_text) → search_mercari 인자 캐시.
+같은/거의 같은 요청이면 LLM의 첫 왕복(문장 → 구조화 인자)을 건너뛴다.
+- 정확 일치: normalize_text(NFKC·소문자·공백 정리) 키
+- 근사 일치: 문자 n-gram Jaccard 유사도(로컬 역색인) ≥ 임계값, 단 숫자(예산 등)와
+  규칙 파서가 인식한 속성(색상/상태/브랜드/정렬)은 완전히 같아야 함
+- 저장: Settings.cache_dir의 SQLite(WAL, 워커 간 공유), TTL + 항목 수 상한(LRU)
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+from mercari_ai_shopper.agent.query_parser import query_attributes
+from mercari_ai_shopper.config import get_settings
+from mercari_ai_shopper.utils.text import normalize_text
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS queries (
+    key         TEXT PRIMARY KEY,
+    text        TEXT NOT NULL,
+    args        TEXT NOT NULL,
+    stored_at   REAL NOT NULL,
+    expires_at  REAL NOT NULL,
+    last_access REAL NOT NULL,
+    hits        INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_queries_last_access ON queries(last_access);
+"""
+
+NGRAM = 3
+SWEEP_INTERVAL_SECONDS = 60.0
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)*")
+
+
+def _ngrams(text: str, n: int = NGRAM) -> FrozenSet[str]:
+    """공백을 뺀 문자 n-gram(양 끝 패딩). 한/일 문장도 띄어쓰기 차이에 둔감하게."""
+    s = f"^{text.replace(' ', '')}$"
+    if len(s) <= n:
+        return frozenset((s,))
+    return frozenset(s[i:i + n] for i in range(len(s) - n + 1))
+
+
+def _numbers(text: str) -> Tuple[str, ...]:
+    """예산/용량 등 숫자 토큰. 근사 일치여도 숫자가 다르면 다른 요청으로 본다(30000엔 ≠ 20000엔)."""
+    return tuple(sorted(m.replace(",", "") for m in _NUMBER.findall(text)))
+
+
+_Partition = Tuple[Tuple[str, ...], Tuple[str, ...]]
+
+
+def _partition(text: str) -> _Partition:
+    """근사 일치 후보를 나누는 키: (숫자 토큰, 인식한 속성). 화이트 ≠ 블랙, 미사용에 가까운 ≠ 정크."""
+    return _numbers(text), query_attributes(text)
+
+
+@dataclass(frozen=True)
+class CachedQuery:
+    """캐시 적중 결과. similarity: 근사 일치의 n-gram Jaccard(정확 일치는 1.0)."""
+
+    text: str
+    args: Dict[str, Any]
+    similarity: float
+
+
+class QueryCache:
+    """
+    SQLite 영속 + 프로세스 내 n-gram 역색인.
+    역색인은 시작 시 유효 항목으로 채우고 이후 이 프로세스의 저장분만 더한다
+    (다른 워커가 넣은 항목도 정확 일치는 SQLite로 바로 보이고, 근사 일치는 재시작 후 반영).
+    """
+
+    def __init__(self, path: str, ttl: int = 7 * 24 * 3600, max_entries: int = 10000, threshold: float = 0.85):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=10.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        # key → (n-gram 집합, 분할 키), (분할 키, gram) → {key}
+        self._grams: Dict[str, Tuple[FrozenSet[str], _Partition]] = {}
+        self._postings: Dict[Tuple[_Partition, str], set] = {}
+        # 만료 정리/전체 개수 확인은 저장마다가 아니라 주기적으로(다른 워커의 저장분 포함)
+        self._next_sweep = 0.0
+        self._stats = {"exact_hits": 0, "near_hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        self._load_index()
+
+    @staticmethod
+    def key_for(text: str) -> str:
+        return hashlib.sha1(normalize_text(text).encode("utf-8")).hexdigest()
+
+    # ── 역색인 ────────────────────────────────────────────────────────────────
+    def _index_add(self, key: str, norm: str) -> None:
+        grams, part = _ngrams(norm), _partition(norm)
+        self._grams[key] = (grams, part)
+        for g in grams:
+            self._postings.setdefault((part, g), set()).add(key)
+
+    def _index_remove(self, key: str) -> None:
+        entry = self._grams.pop(key, None)
+        if entry is None:
+            return
+        grams, part = entry
+        for g in grams:
+            keys = self._postings.get((part, g))
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._postings[(part, g)]
+
+    def _load_index(self) -> None:
+        try:
+            rows = self._conn.execute("SELECT key, text FROM queries WHERE expires_at > ?", (time.time(),)).fetchall()
+        except sqlite3.Error as exc:
+            logger.warning("query cache index load failed: %s", exc)
+            return
+        for key, norm in rows:
+            self._index_add(key, norm)
+
+    def _nearest(self, norm: str) -> Optional[Tuple[str, float]]:
+        """
+        Jaccard 최댓값 후보(임계값 이상만). 역색인은 (숫자 토큰, 속성)별로 나뉘어 있어
+        예산이나 색상/상태/브랜드/정렬이 다른 요청은 애초에 후보가 아니다.
+        prefix 필터: J ≥ t 이면 |A∩B| ≥ t·|A| 이므로 B는 A의 n-gram 중 아무 (|A| - ⌈t·|A|⌉ + 1)개 안에
+        적어도 하나를 가진다 → 포스팅이 짧은(드문) n-gram부터 그만큼만 훑어 후보를 모은다.
+        """
+        grams = _ngrams(norm)
+        part = _partition(norm)
+        postings = sorted((self._postings.get((part, g), ()) for g in grams), key=len)
+        prefix = len(grams) - math.ceil(self.threshold * len(grams)) + 1
+        candidates = set().union(*postings[:prefix])
+        lo, hi = self.threshold * len(grams), len(grams) / self.threshold if self.threshold > 0 else math.inf
+        best: Optional[Tuple[str, float]] = None
+        for key in candidates:
+            other = self._grams[key][0]
+            if not lo <= len(other) <= hi:
+                continue
+            inter = len(grams & other)
+            sim = inter / (len(grams) + len(other) - inter)
+            if sim >= self.threshold and (best is None or sim > best[1]):
+                best = (key, sim)
+        return best
+
+    # ── 조회/저장 ─────────────────────────────────────────────────────────────
+    def lookup(self, text: str) -> Optional[CachedQuery]:
+        norm = normalize_text(text)
+        if not norm:
+            return None
+        key = self.key_for(norm)
+        now = time.time()
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT text, args, expires_at FROM queries WHERE key = ?", (key,)
+                ).fetchone()
+                similarity, exact = 1.0, True
+                if row is None or row[2] <= now:
+                    near = self._nearest(norm)
+                    if near is not None:
+                        (key, similarity), exact = near, False
+                        row = self._conn.execute(
+                            "SELECT text, args, expires_at FROM queries WHERE key = ?", (key,)
+                        ).fetchone()
+                if row is None or row[2] <= now:
+                    if row is not None:
+                        self._conn.execute("DELETE FROM queries WHERE key = ?", (key,))
+                        self._index_remove(key)
+                    self._stats["misses"] += 1
+                    return None
+                self._conn.execute(
+                    "UPDATE queries SET last_access = ?, hits = hits + 1 WHERE key = ?", (now, key)
+                )
+            except sqlite3.Error as exc:
+                logger.warning("query cache lookup failed: %s", exc)
+                return None
+            self._stats["exact_hits" if exact else "near_hits"] += 1
+        return CachedQuery(text=row[0], args=json.loads(row[1]), similarity=round(similarity, 4))
+
+    def store(self, text: str, args: Dict[str, Any]) -> None:
+        norm = normalize_text(text)
+        if not norm:
+            return
+        key = self.key_for(norm)
+        now = time.time()
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO queries (key, text, args, stored_at, expires_at, last_access, hits) "
+                    "VALUES (?, ?, ?, ?, ?, ?, 0)",
+                    (key, norm, json.dumps(args, ensure_ascii=False), now, now + self.ttl, now),
+                )
+                self._index_remove(key)
+                self._index_add(key, norm)
+                self._stats["stores"] += 1
+                if len(self._grams) > self.max_entries or now >= self._next_sweep:
+                    self._evict_locked(now)
+            except sqlite3.Error as exc:
+                logger.warning("query cache store failed: %s", exc)
+
+    def _evict_locked(self, now: float) -> None:
+        # 만료 항목 + 상한 초과분(오래 안 쓴 순)
+        self._next_sweep = now + SWEEP_INTERVAL_SECONDS
+        doomed = [r[0] for r in self._conn.execute("SELECT key FROM queries WHERE expires_at <= ?", (now,))]
+        over = self._conn.execute("SELECT COUNT(*) FROM queries").fetchone()[0] - len(doomed) - self.max_entries
+        if over > 0:
+            doomed += [
+                r[0] for r in self._conn.execute(
+                    "SELECT key FROM queries WHERE expires_at > ? ORDER BY last_access ASC LIMIT ?", (now, over)
+                )
+            ]
+        if not doomed:
+            return
+        self._conn.executemany("DELETE FROM queries WHERE key = ?", [(k,) for k in doomed])
+        for k in doomed:
+            self._index_remove(k)
+        self._stats["evictions"] += len(doomed)
+
+    # ── 관측 ──────────────────────────────────────────────────────────────────
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM queries").fetchone()[0]
+            out: Dict[str, Any] = dict(self._stats)
+        lookups = out["exact_hits"] + out["near_hits"] + out["misses"]
+        hits = out["exact_hits"] + out["near_hits"]
+        out.update(entries=entries, indexed=len(self._grams), hit_ratio=round(hits / lookups, 4) if lookups else 0.0)
+        return out
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM queries")
+            self._grams.clear()
+            self._postings.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_cache: Optional[QueryCache] = None
+_cache_lock = threading.Lock()
+_cache_disabled = False
+
+
+def get_query_cache() -> Optional[QueryCache]:
+    """Settings 기반 프로세스 공용 캐시. 비활성화되었거나 cache_dir을 쓸 수 없으면 None."""
+    global _cache, _cache_disabled
+    if _cache is not None or _cache_disabled:
+        return _cache
+    with _cache_lock:
+        if _cache is not None or _cache_disabled:
+            return _cache
+        s = get_settings()
+        if not s.query_cache_enabled:
+            _cache_disabled = True
+            return None
+        try:
+            os.makedirs(s.cache_dir, exist_ok=True)
+            _cache = QueryCache(
+                os.path.join(s.cache_dir, "agent_queries.sqlite"),
+                ttl=s.query_cache_ttl_seconds,
+                max_entries=s.query_cache_max_entries,
+                threshold=s.query_cache_similarity,
+            )
+        except (OSError, sqlite3.Error) as exc:
+            logger.warning("query cache disabled (cache_dir=%s): %s", s.cache_dir, exc)
+            _cache_disabled = True
+        return _cache
@@ -0,0 +1,624 @@
+from __future__ import annotations
+
+"""
+규칙 기반 자연어 요청 → search_mercari 인자 파서(LLM 없이, 요청당 수십 µs).
+- 예산: "30000엔 이하", "3万円以下", "under ¥20,000", "2~3만엔", "3万円台", "예산 5만엔"
+- 상태: ko/en/ja 표현 → MERCARI_CONDITION_WHITELIST 라벨
+- 색상/브랜드/상품어: ko/en → ja 사전(일본어 입력은 그대로)
+- 남은 토큰 → 핵심 키워드
+confidence는 키워드가 사전/일본어/모델명으로 해석된 비율에, 모호한 신호(원화 금액, 부정/비교 표현,
+조건어 없는 금액 등)마다 감점한 값이다. 임계값 이상이면 Agent가 LLM 없이 바로 검색+랭킹한다.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from mercari_ai_shopper.models.query import MERCARI_CONDITION_WHITELIST, SearchQuery
+from mercari_ai_shopper.utils.text import normalize_text
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 사전 (별칭은 normalize_text 기준: 소문자/NFKC. 공백은 있어도 없어도 매칭)
+# ──────────────────────────────────────────────────────────────────────────────
+_NEW = "新品、未使用"
+_LIKE_NEW = "未使用に近い"
+_GOOD = "目立った傷や汚れなし"
+_SOME_WEAR = "やや傷や汚れあり"
+_WORN = "傷や汚れあり"
+_POOR = "全体的に状態が悪い"
+
+# 라벨 묶음 → 별칭. 빈 묶음("중고" 등)은 인식만 하고 필터는 걸지 않는다
+CONDITIONS: Dict[Tuple[str, ...], Tuple[str, ...]] = {
+    (_NEW,): ("새상품", "새 제품", "새것", "새거", "미개봉", "미사용", "신품", "brand new", "new", "unused",
+              "unopened", "sealed", "新品", "未使用", "未開封"),
+    (_LIKE_NEW,): ("거의 새것", "거의 새거", "거의 새 것", "거의 새상품", "새것 같은", "새거 같은", "미사용에 가까운",
+                   "like new", "nearly new", "almost new", "mint", "未使用に近い", "美品", "極美品"),
+    (_NEW, _LIKE_NEW, _GOOD): ("상태 좋은", "상태가 좋은", "상태 좋은 것", "깨끗한", "흠집 없는", "스크래치 없는",
+                               "하자 없는", "good condition", "great condition", "excellent condition",
+                               "no scratches", "状態良好", "傷なし", "目立った傷や汚れなし", "きれい", "綺麗"),
+    (_SOME_WEAR,): ("약간 흠집", "사용감 있는", "생활기스", "minor scratches", "some scratches", "やや傷や汚れあり"),
+    (_WORN,): ("흠집 있는", "傷や汚れあり"),
+    (_POOR,): ("상태 나쁜", "정크", "junk", "ジャンク", "全体的に状態が悪い"),
+    (): ("중고", "used", "second hand", "secondhand", "pre-owned", "中古"),
+}
+
+SORTS: Dict[str, Tuple[str, ...]] = {
+    "price_asc": ("싼 순", "저렴한 순", "가격 낮은 순", "낮은 가격순", "최저가", "가격순", "cheapest", "lowest price",
+                  "price low to high", "安い順", "価格の安い順", "最安"),
+    "price_desc": ("비싼 순", "가격 높은 순", "높은 가격순", "고가순", "most expensive", "highest price", "高い順", "価格の高い順"),
+    "new": ("최신순", "새로 올라온", "최근 올라온", "newest", "latest", "most recent", "新着", "新しい順"),
+}
+
+# 표준 색상(제목에 흔한 가타카나) → 별칭. 한 글자 한자(白/赤…)는 다른 단어 속에서 오탐이 많아 뺀다
+COLORS: Dict[str, Tuple[str, ...]] = {
+    "ホワイト": ("화이트", "흰색", "하얀색", "white", "白色", "ホワイト"),
+    "ブラック": ("블랙", "검정", "검은색", "검정색", "black", "黒色", "ブラック"),
+    "レッド": ("레드", "빨강", "빨간색", "red", "赤色", "レッド"),
+    "ブルー": ("블루", "파랑", "파란색", "blue", "青色", "ブルー"),
+    "ネイビー": ("네이비", "남색", "navy", "紺色", "ネイビー"),
+    "グリーン": ("그린", "초록", "초록색", "녹색", "green", "緑色", "グリーン"),
+    "イエロー": ("옐로", "옐로우", "노랑", "노란색", "yellow", "黄色", "イエロー"),
+    "ピンク": ("핑크", "분홍", "분홍색", "pink", "ピンク"),
+    "グレー": ("그레이", "회색", "gray", "grey", "グレー"),
+    "シルバー": ("실버", "은색", "silver", "シルバー"),
+    "ゴールド": ("골드", "금색", "gold", "ゴールド"),
+    "ベージュ": ("베이지", "beige", "ベージュ"),
+    "ブラウン": ("브라운", "갈색", "brown", "茶色", "ブラウン"),
+    "パープル": ("퍼플", "보라", "보라색", "purple", "紫色", "パープル"),
+    "オレンジ": ("오렌지", "주황", "주황색", "orange", "オレンジ"),
+}
+
+# 브랜드(머카리 제목에 흔한 표기) → 별칭
+BRANDS: Dict[str, Tuple[str, ...]] = {
+    "Nintendo": ("닌텐도", "nintendo", "任天堂", "ニンテンドー"),
+    "SONY": ("소니", "sony", "ソニー"),
+    "Apple": ("애플", "apple", "アップル"),
+    "Canon": ("캐논", "canon", "キヤノン", "キャノン"),
+    "Nikon": ("니콘", "nikon", "ニコン"),
+    "Panasonic": ("파나소닉", "panasonic", "パナソニック"),
+    "dyson": ("다이슨", "dyson", "ダイソン"),
+    "BANDAI": ("반다이", "bandai", "バンダイ"),
+    "LEGO": ("레고", "lego", "レゴ"),
+    "NIKE": ("나이키", "nike", "ナイキ"),
+    "adidas": ("아디다스", "adidas", "アディダス"),
+    "New Balance": ("뉴발란스", "new balance", "ニューバランス"),
+    "THE NORTH FACE": ("노스페이스", "north face", "the north face", "ノースフェイス"),
+    "Supreme": ("슈프림", "supreme", "シュプリーム"),
+    "UNIQLO": ("유니클로", "uniqlo", "ユニクロ"),
+    "CHANEL": ("샤넬", "chanel", "シャネル"),
+    "LOUIS VUITTON": ("루이비통", "루이 비통", "louis vuitton", "ルイヴィトン", "ヴィトン"),
+    "GUCCI": ("구찌", "gucci", "グッチ"),
+    "PRADA": ("프라다", "prada", "プラダ"),
+    "HERMES": ("에르메스", "hermes", "エルメス"),
+    "Dior": ("디올", "dior", "ディオール"),
+    "CELINE": ("셀린느", "celine", "セリーヌ"),
+    "BALENCIAGA": ("발렌시아가", "balenciaga", "バレンシアガ"),
+    "ROLEX": ("롤렉스", "rolex", "ロレックス"),
+}
+
+# 상품어 ko/en → ja(머카리 검색어로 쓸 표기)
+TERMS: Dict[str, Tuple[str, ...]] = {
+    "スイッチ": ("스위치", "switch"),
+    "ライト": ("라이트", "lite"),
+    "有機EL": ("올레드", "유기el", "oled", "有機el"),
+    "PS5": ("플스5", "플레이스테이션5", "ps5", "playstation 5"),
+    "PS4": ("플스4", "플레이스테이션4", "ps4", "playstation 4"),
+    "プレイステーション": ("플레이스테이션", "플스", "playstation"),
+    "ゲームボーイ": ("게임보이", "gameboy", "game boy"),
+    "アドバンス": ("어드밴스", "advance"),
+    "iPhone": ("아이폰", "iphone"),
+    "iPad": ("아이패드", "ipad"),
+    "MacBook": ("맥북", "macbook"),
+    "AirPods": ("에어팟", "airpods"),
+    "Buds": ("버즈", "buds"),
+    "Apple Watch": ("애플워치", "apple watch"),
+    "Galaxy": ("갤럭시", "galaxy"),
+    "Pixel": ("픽셀", "pixel"),
+    "Xperia": ("엑스페리아", "xperia"),
+    "Pro": ("프로", "pro"),
+    "mini": ("미니", "mini"),
+    "Air": ("에어", "air"),
+    "Plus": ("플러스", "plus"),
+    "カメラ": ("카메라", "camera"),
+    "ミラーレス": ("미러리스", "mirrorless"),
+    "レンズ": ("렌즈", "lens"),
+    "ノートパソコン": ("노트북", "laptop"),
+    "タブレット": ("태블릿", "tablet"),
+    "ヘッドホン": ("헤드폰", "headphones", "headphone"),
+    "イヤホン": ("이어폰", "earphones", "earbuds"),
+    "スピーカー": ("스피커", "speaker"),
+    "キーボード": ("키보드", "keyboard"),
+    "マウス": ("마우스", "mouse"),
+    "モニター": ("모니터", "monitor"),
+    "グラフィックボード": ("그래픽카드", "graphics card", "gpu"),
+    "ゲーム": ("게임", "game"),
+    "ソフト": ("소프트", "게임팩", "software"),
+    "コントローラー": ("컨트롤러", "controller"),
+    "本体": ("본체", "console"),
+    "ケース": ("케이스", "case"),
+    "充電器": ("충전기", "charger"),
+    "バッグ": ("가방", "bag"),
+    "ショルダーバッグ": ("숄더백", "shoulder bag"),
+    "リュック": ("백팩", "backpack"),
+    "財布": ("지갑", "wallet"),
+    "腕時計": ("손목시계", "시계", "watch"),
+    "スニーカー": ("운동화", "스니커즈", "sneakers", "sneaker"),
+    "靴": ("신발", "shoes"),
+    "ブーツ": ("부츠", "boots"),
+    "ジャケット": ("자켓", "재킷", "jacket"),
+    "ダウンジャケット": ("패딩", "down jacket"),
+    "コート": ("코트", "coat"),
+    "パーカー": ("후드티", "hoodie"),
+    "Tシャツ": ("티셔츠", "t-shirt", "tshirt"),
+    "デニム": ("청바지", "jeans"),
+    "ワンピース": ("원피스", "dress"),
+    "キャップ": ("캡모자", "cap"),
+    "サングラス": ("선글라스", "sunglasses"),
+    "ネックレス": ("목걸이", "necklace"),
+    "ピアス": ("귀걸이", "earrings"),
+    "香水": ("향수", "perfume"),
+    "コスメ": ("화장품", "cosmetics"),
+    "ポケモンカード": ("포켓몬카드", "pokemon card", "pokemon cards"),
+    "ポケモン": ("포켓몬스터", "포켓몬", "pokemon"),
+    "カード": ("카드", "card", "cards"),
+    "フィギュア": ("피규어", "figure"),
+    "ぬいぐるみ": ("인형", "plush"),
+    "テクニック": ("테크닉", "technic"),
+    "プラモデル": ("프라모델", "plastic model"),
+    "ガンプラ": ("건프라", "gunpla"),
+    "漫画": ("만화책", "만화", "manga"),
+    "自転車": ("자전거", "bicycle", "bike"),
+    "掃除機": ("청소기", "vacuum"),
+    "ドライヤー": ("드라이기", "드라이어", "hair dryer"),
+    "セット": ("세트", "set"),
+    "限定": ("한정판", "limited edition"),
+}
+
+# 키워드에서 버리는 말(요청/존칭/조사 등)
+STOPWORDS = frozenset("""
+찾아줘 찾아 찾아주세요 찾고 찾는 있어요 있나요 있을까요 싶어 싶어요 싶은데 사고 살 구매 구입 원해 원해요
+추천 추천해줘 추천해 추천해주세요 해줘 주세요 부탁해 부탁해요 좀 것 거 걸 제품 상품 물건 매물 메루카리 메르카리
+에서 으로 하고 이랑 그리고 정품 좋은 싼 저렴한 괜찮은 예산 가격
+i im i'm want wanna looking look for find me a an the to buy please some with in on of and or my is it that
+cheap good nice search show mercari item items condition price budget
+探して 探しています 探してます 探してる 欲しい ほしい 欲しいです ください 下さい お願いします です あれば
+の を が で と は に メルカリ 商品 出品 おすすめ 購入 買いたい したい
+""".split())
+
+# 남으면 LLM에 맡길 표현(부정/제외, 비교·상담형 질문)
+HARD_WORDS = ("말고", "빼고", "제외", "없이", "아닌", "except", "without", "not", "exclude", "以外", "除く", "じゃない",
+              "비교", "차이", "어떤", "뭐가", "어느", "vs", "compare", "which", "違い", "どれ")
+
+# 한국어 조사(토큰 끝). 떼어 낸 나머지가 사전/불용어에 있으면 그걸로 본다
+_PARTICLES = ("에서", "으로", "이랑", "하고", "을", "를", "이", "가", "은", "는", "로", "의", "도", "에", "랑", "와", "과")
+
+# 일본어 조사: 띄어쓰기 없는 문장("3万円以下でスイッチが欲しい")을 토큰 처음/끝이나 가타카나·한자·영숫자 뒤에서 자른다
+_JA_PARTICLE = re.compile(r"(?:^|(?<=[゠-ヿ一-鿿0-9a-z]))(?:から|まで|より|で|を|が|は|の|に|と|も|へ|や)(?![぀-ゟ])")
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 금액
+# ──────────────────────────────────────────────────────────────────────────────
+_MULT = {"만": 10000, "万": 10000, "천": 1000, "千": 1000, "k": 1000}
+# 앞이 영숫자면(ps5, s23) 금액이 아니다
+_MONEY = re.compile(
+    r"(?<![a-z0-9.,])(?P<yen>¥\s*)?(?P<n>\d+(?:,\d{3})*(?:\.\d+)?)\s*(?P<u>만|万|천|千|k)?\s*(?P<c>엔|円|yen|jpy|원)?"
+)
+_UPPER_AFTER = re.compile(r"\s*(이하|까지|이내|미만|안으로|안쪽|以下|まで|以内|未満|迄)")
+_LOWER_AFTER = re.compile(r"\s*(이상|넘는|초과|以上|超)")
+_APPROX_AFTER = re.compile(r"\s*(정도|쯤|내외|전후|くらい|ぐらい|程度|前後)")
+_BAND_AFTER = re.compile(r"\s*(대|台)")
+_UPPER_BEFORE = re.compile(r"(under|below|less than|up to|max|maximum|within|no more than|<=?|최대|예산|予算|budget)\s*$")
+_LOWER_BEFORE = re.compile(r"(over|above|more than|at least|min|minimum|>=?|최소)\s*$")
+_APPROX_BEFORE = re.compile(r"(around|about|approx|approximately|약|대략|約)\s*$")
+_BETWEEN_BEFORE = re.compile(r"between\s*$")
+_BETWEEN_AFTER = re.compile(r"\s*사이")
+_RANGE_JOIN = re.compile(r"^\s*(~|〜|-|–|부터|에서|から|to|and)\s*$")
+
+_HANGUL = re.compile(r"[가-힣]")
+_JA = re.compile(r"[぀-ヿ一-鿿]")
+_HIRAGANA = re.compile(r"[぀-ゟ]")
+_LATIN = re.compile(r"[a-z]")
+_TOKEN_SPLIT = re.compile(r"[^\w\-]+")
+
+
+@dataclass
+class _Money:
+    start: int
+    end: int
+    value: int
+    explicit: bool  # ¥/통화/만·万 단위가 붙음
+    krw: bool
+    unit: Optional[str]
+
+
+@dataclass(frozen=True)
+class ParsedQuery:
+    """
+    파싱 결과. args는 search_mercari 도구 인자 형식(LLM이 만드는 것과 같음).
+    confidence ∈ [0, 1], notes는 감점/판단 근거(벤치·로그용).
+    """
+
+    raw_text: str
+    args: Dict[str, Any]
+    confidence: float
+    notes: Tuple[str, ...] = field(default_factory=tuple)
+
+    def to_query(self) -> SearchQuery:
+        return SearchQuery(raw_text=self.raw_text, **self.args)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 구문 매칭(사전 전체를 문자 트라이 1개로, 위치마다 가장 긴 별칭)
+# ──────────────────────────────────────────────────────────────────────────────
+_END = ""  # 트라이 노드에서 (kind, value)를 담는 키
+
+
+def _variants(alias: str) -> List[str]:
+    """한/일 별칭은 띄어쓰기 유무 둘 다("상태 좋은" / "상태좋은"). 영문은 그대로."""
+    a = normalize_text(alias)
+    return [a] if a.isascii() or " " not in a else [a, a.replace(" ", "")]
+
+
+def _build_trie() -> Dict[str, Any]:
+    table: Dict[str, Tuple[str, Any]] = {}
+    for labels, aliases in CONDITIONS.items():
+        for a in aliases:
+            for v in _variants(a):
+                table[v] = ("condition", labels)
+    for kind, mapping in (("sort", SORTS), ("color", COLORS), ("brand", BRANDS), ("term", TERMS)):
+        for value, aliases in mapping.items():
+            # 브랜드/상품어는 표준 표기(일본어 입력의 "ゲーム", "カメラ" 등)도 별칭으로
+            for a in (*aliases, value) if kind in ("brand", "term") else aliases:
+                for v in _variants(a):
+                    table.setdefault(v, (kind, value))
+    root: Dict[str, Any] = {}
+    for alias, entry in table.items():
+        # 한 글자 한글 별칭은 다른 단어 속 오탐이 많아 구문 매칭에서 뺀다(토큰 단위로만)
+        if len(alias) == 1 and _HANGUL.match(alias):
+            continue
+        node = root
+        for ch in alias:
+            node = node.setdefault(ch, {})
+        node[_END] = entry
+    return root
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isascii() and ch.isalnum()
+
+
+def _match_phrases(text: str) -> List[Tuple[int, int, str, Any]]:
+    """
+    왼쪽부터 가장 긴 별칭을 겹치지 않게 찾는다 → [(start, end, kind, value)].
+    영숫자로 시작/끝나는 별칭은 단어 경계에서만(switch ⊄ switches, pro ⊄ product).
+    """
+    out: List[Tuple[int, int, str, Any]] = []
+    n = len(text)
+    i = 0
+    while i < n:
+        if i > 0 and _is_word_char(text[i]) and _is_word_char(text[i - 1]):
+            i += 1
+            continue
+        node = _TRIE.get(text[i])
+        best: Optional[Tuple[int, Tuple[str, Any]]] = None
+        j = i
+        while node is not None:
+            j += 1
+            entry = node.get(_END)
+            if entry is not None and not (j < n and _is_word_char(text[j]) and _is_word_char(text[j - 1])):
+                best = (j, entry)
+            node = node.get(text[j]) if j < n else None
+        if best is None:
+            i += 1
+            continue
+        out.append((i, best[0], *best[1]))
+        i = best[0]
+    return out
+
+
+_TRIE = _build_trie()
+# 토큰 단위 조회(조사 뗀 토큰 포함): 별칭 → 상품어/브랜드
+_TOKEN_TERMS: Dict[str, Tuple[str, str]] = {
+    normalize_text(a): (kind, value)
+    for kind, mapping in (("brand", BRANDS), ("term", TERMS))
+    for value, aliases in mapping.items()
+    for a in (*aliases, value)
+}
+
+assert all(set(labels) <= MERCARI_CONDITION_WHITELIST for labels in CONDITIONS)
+
+# 제목에 흔한 한 글자 색상 한자(요청문 매칭에서는 오탐 때문에 뺐지만, 리스팅 필터에서는 인정)
+_COLOR_TITLE_FORMS: Dict[str, Tuple[str, ...]] = {
+    "ホワイト": ("白",), "ブラック": ("黒",), "レッド": ("赤",), "ブルー": ("青",),
+    "ネイビー": ("紺",), "グリーン": ("緑",), "シルバー": ("銀",), "パープル": ("紫",),
+}
+
+
+def _alias_groups() -> Dict[str, Tuple[str, ...]]:
+    out: Dict[str, Tuple[str, ...]] = {}
+    for mapping, extra in ((BRANDS, {}), (COLORS, _COLOR_TITLE_FORMS)):
+        for value, aliases in mapping.items():
+            group = tuple(dict.fromkeys(normalize_text(a) for a in (value, *aliases, *extra.get(value, ()))))
+            for a in group:
+                out.setdefault(a, group)
+    return out
+
+
+_ALIAS_GROUPS = _alias_groups()
+
+
+def alias_group(value: str) -> Tuple[str, ...]:
+    """
+    브랜드/색상 값 → 같은 뜻의 표기들(normalize_text 기준). 사전에 없으면 (값,).
+    리스팅 필터가 "Nintendo"를 요구해도 "任天堂スイッチ"를, "ホワイト"를 요구해도 "iPhone 白"을 통과시키도록.
+    """
+    v = normalize_text(value)
+    return _ALIAS_GROUPS.get(v, (v,))
+
+
+def query_attributes(text: str) -> Tuple[str, ...]:
+    """
+    정규화된 요청문(normalize_text)에서 인식한 상태/정렬/색상/브랜드 값(정렬된 튜플).
+    문장이 거의 같아도 이 값이 다르면 다른 요청이다(질의 캐시 근사 일치의 분할 키).
+    """
+    found = set()
+    for _, _, kind, value in _match_phrases(text):
+        if kind == "condition":
+            found.add("condition:" + "|".join(value))
+        elif kind != "term":
+            found.add(f"{kind}:{value}")
+    return tuple(sorted(found))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 파서
+# ──────────────────────────────────────────────────────────────────────────────
+def _scan_money(text: str) -> List[_Money]:
+    out: List[_Money] = []
+    for m in _MONEY.finditer(text):
+        # 끝은 마지막으로 잡힌 그룹까지(뒤따르는 공백 제외)
+        end = m.end("c") if m.group("c") else m.end("u") if m.group("u") else m.end("n")
+        # 128gb, 5kg 같은 단위가 바로 붙으면 금액 아님
+        if not m.group("c") and end < len(text) and _LATIN.match(text[end]):
+            continue
+        n = float(m.group("n").replace(",", ""))
+        unit = m.group("u")
+        out.append(_Money(
+            start=m.start(),
+            end=end,
+            value=int(round(n * _MULT.get(unit or "", 1))),
+            explicit=bool(m.group("yen") or (m.group("c") and m.group("c") != "원") or unit in ("만", "万")),
+            krw=m.group("c") == "원",
+            unit=unit,
+        ))
+    return out
+
+
+def _parse_budget(text: str, notes: List[str]) -> Tuple[Optional[int], Optional[int], List[Tuple[int, int]]]:
+    """(budget_min, budget_max, 지울 구간)."""
+    lo: Optional[int] = None
+    hi: Optional[int] = None
+    spans: List[Tuple[int, int]] = []
+    moneys = _scan_money(text)
+    i = 0
+    while i < len(moneys):
+        m = moneys[i]
+        nxt = moneys[i + 1] if i + 1 < len(moneys) else None
+        # 범위: "2~3만엔", "20000-30000円", "2万から3万円", "between 10000 and 20000 yen"
+        if nxt is not None and (nxt.explicit or m.explicit) and _RANGE_JOIN.match(text[m.end:nxt.start]):
+            if text[m.end:nxt.start].strip() != "and" or text[:m.start].rstrip().endswith("between"):
+                first = m.value
+                if m.unit is None and nxt.unit is not None and m.value * _MULT[nxt.unit] <= nxt.value:
+                    first = m.value * _MULT[nxt.unit]  # 단위는 뒤 금액을 따른다
+                if m.krw or nxt.krw:
+                    notes.append("krw")
+                else:
+                    lo, hi = min(first, nxt.value), max(first, nxt.value)
+                tail = _UPPER_AFTER.match(text, nxt.end) or _BETWEEN_AFTER.match(text, nxt.end)
+                head = _BETWEEN_BEFORE.search(text[:m.start])
+                spans.append((head.start() if head else m.start, tail.end() if tail else nxt.end))
+                i += 2
+                continue
+        start, end = m.start, m.end
+        before = text[max(0, start - 24):start]
+        upper_b, lower_b, approx_b = _UPPER_BEFORE.search(before), _LOWER_BEFORE.search(before), _APPROX_BEFORE.search(before)
+        upper_a, lower_a = _UPPER_AFTER.match(text, end), _LOWER_AFTER.match(text, end)
+        approx_a, band_a = _APPROX_AFTER.match(text, end), _BAND_AFTER.match(text, end)
+        qualified = any((upper_b, lower_b, approx_b, upper_a, lower_a, approx_a))
+        # 통화/단위 없는 숫자는 조건어가 붙고 값이 금액답게 클 때만(2개 이상, 128 이하 등 제외)
+        if not m.explicit and not m.krw and not (qualified and m.value >= 300):
+            i += 1
+            continue
+        if m.krw:
+            notes.append("krw")
+        elif lower_a or lower_b:
+            lo = m.value
+        elif band_a and m.explicit:
+            step = _MULT.get(m.unit or "", 10 ** (len(str(m.value)) - 1))
+            lo, hi = m.value, m.value + step - 1
+        elif approx_a or approx_b:
+            hi = int(m.value * 1.1)
+            notes.append("approx")
+        else:
+            hi = m.value
+            if not (upper_a or upper_b):
+                notes.append("bare_price")
+        for q in (upper_b, lower_b, approx_b):
+            if q is not None:
+                start = min(start, before.rfind(q.group(1)) + max(0, m.start - 24))
+        for q in (upper_a, lower_a, approx_a, band_a):
+            if q is not None:
+                end = max(end, q.end())
+        spans.append((start, end))
+        i += 1
+    if lo is not None and hi is not None and lo > hi:
+        lo, hi = hi, lo
+    return lo, hi, spans
+
+
+def _blank(text: str, spans: List[Tuple[int, int]]) -> str:
+    chars = list(text)
+    for s, e in spans:
+        chars[s:e] = " " * (e - s)
+    return "".join(chars)
+
+
+def _pieces(tok: str) -> List[Tuple[int, str]]:
+    """일본어 토큰은 조사에서 잘라 [(토큰 내 위치, 조각)]. 그 밖의 토큰은 그대로."""
+    if not _JA.search(tok):
+        return [(0, tok)]
+    out: List[Tuple[int, str]] = []
+    pos = 0
+    for m in _JA_PARTICLE.finditer(tok):
+        if m.start() > pos:
+            out.append((pos, tok[pos:m.start()]))
+        pos = m.end()
+    if pos < len(tok):
+        out.append((pos, tok[pos:]))
+    return out
+
+
+def _resolve_token(tok: str) -> Tuple[Optional[Tuple[str, str]], bool]:
+    """(사전 항목, 불용어 여부). 한글 토큰은 조사를 떼어 다시 본다."""
+    if tok in STOPWORDS:
+        return None, True
+    hit = _TOKEN_TERMS.get(tok)
+    if hit is not None:
+        return hit, False
+    if _HANGUL.search(tok):
+        for p in _PARTICLES:
+            if tok.endswith(p) and len(tok) > len(p):
+                stem = tok[: -len(p)]
+                if stem in STOPWORDS:
+                    return None, True
+                if stem in _TOKEN_TERMS:
+                    return _TOKEN_TERMS[stem], False
+    return None, False
+
+
+def parse_query(raw_text: str) -> ParsedQuery:
+    """자연어 요청 → ParsedQuery(search_mercari 인자 + confidence)."""
+    text = normalize_text(raw_text)
+    notes: List[str] = []
+    budget_min, budget_max, spans = _parse_budget(text, notes)
+    rest = _blank(text, spans)
+
+    conditions: List[str] = []
+    condition_seen = False
+    colors: List[str] = []
+    brands: List[str] = []
+    sort = "relevance"
+    # (위치, 키워드, 가중치): 사전/가타카나·한자/모델명 1.0, 모르는 영단어 0.6,
+    # 통화 없는 4자리 이상 숫자(금액인지 품번인지 모름) 0.5, 모르는 한글·히라가나가 남은 일본어 0
+    found: List[Tuple[int, str, float]] = []
+    phrase_spans: List[Tuple[int, int]] = []
+    # 영어 색상/상태어(red, gold, new…)는 상품명 일부일 수 있어("red dead redemption", "new 3ds")
+    # 모르는 토큰이 하나라도 남으면 필터로 쓰지 않고 미해석 키워드로 둔다
+    loose: List[Tuple[int, str, str, Any]] = []
+
+    def attribute(kind: str, value: Any) -> None:
+        nonlocal condition_seen
+        if kind == "condition":
+            condition_seen = True
+            conditions.extend(c for c in value if c not in conditions)
+        elif value not in colors:
+            colors.append(value)
+
+    for start, end, kind, value in _match_phrases(rest):
+        phrase_spans.append((start, end))
+        if kind in ("condition", "color"):
+            alias = rest[start:end]
+            if alias.isascii():
+                loose.append((start, alias, kind, value))
+            else:
+                attribute(kind, value)
+        elif kind == "sort":
+            sort = value
+        elif kind == "brand":
+            if value not in brands:
+                brands.append(value)
+            found.append((start, value, 1.0))
+        else:
+            found.append((start, value, 1.0))
+    rest = _blank(rest, phrase_spans)
+
+    hard = False
+    pos = 0
+    for raw in _TOKEN_SPLIT.split(rest):
+        at = rest.find(raw, pos) if raw else pos
+        pos = at + len(raw)
+        for off, tok in _pieces(raw.strip("-_")):
+            if len(tok) < 2 and not tok.isdigit():
+                continue
+            if any(h in tok for h in HARD_WORDS if not h.isascii()) or tok in HARD_WORDS:
+                hard = True
+                continue
+            hit, stop = _resolve_token(tok)
+            if stop:
+                continue
+            if hit is not None:
+                kind, value = hit
+                if kind == "brand" and value not in brands:
+                    brands.append(value)
+                found.append((at + off, value, 1.0))
+            elif _HANGUL.search(tok) or _HIRAGANA.search(tok):
+                # 사전에 없는 한국어, 조사를 떼고도 히라가나가 남은 일본어(활용어/문장 조각)
+                found.append((at + off, tok, 0.0))
+            elif tok.isdigit() and len(tok) >= 4:
+                found.append((at + off, tok, 0.5))
+            elif _JA.search(tok) or any(ch.isdigit() for ch in tok):
+                found.append((at + off, tok, 1.0))
+            else:
+                found.append((at + off, tok, 0.6))
+
+    if any(w < 1.0 for _, _, w in found):
+        found.extend((start, alias, 0.6) for start, alias, _, _ in loose)
+    else:
+        for _, _, kind, value in loose:
+            attribute(kind, value)
+
+    found.sort(key=lambda f: f[0])
+    keywords: List[str] = []
+    weights: List[float] = []
+    for _, kw, w in found:
+        if kw not in keywords:
+            keywords.append(kw)
+            weights.append(w)
+
+    if not keywords or all(kw.isdigit() for kw in keywords):
+        confidence = 0.0
+        notes.append("no_keywords")
+    else:
+        confidence = sum(weights) / len(weights)
+        unresolved = [kw for kw, w in zip(keywords, weights) if w < 1.0]
+        if unresolved:
+            notes.append("unresolved:" + ",".join(unresolved))
+        if hard:
+            confidence *= 0.5
+            notes.append("negation_or_question")
+        if "krw" in notes:
+            confidence *= 0.5
+        if "bare_price" in notes:
+            confidence *= 0.85
+        if "approx" in notes:
+            confidence *= 0.9
+        if len(keywords) > 5:
+            confidence *= 0.7
+            notes.append("long")
+    if condition_seen and not conditions:
+        notes.append("used_ok")
+
+    args: Dict[str, Any] = {"keywords": keywords or [text]}
+    if budget_min is not None:
+        args["budget_min"] = budget_min
+    if budget_max is not None:
+        args["budget_max"] = budget_max
+    if conditions:
+        args["condition"] = conditions
+    if brands:
+        args["brand"] = brands
+    if colors:
+        args["color"] = colors
+    if sort != "relevance":
+        args["sort"] = sort
+    return ParsedQuery(raw_text=raw_text, args=args, confidence=round(confidence, 3), notes=tuple(notes))
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
-from typing import List, Tuple
+import heapq
+from itertools import count
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
 from mercari_ai_shopper.models.query import SearchQuery
-from mercari_ai_shopper.models.listing import Listing
+from mercari_ai_shopper.models.listing import Listing, ListingRecord, SellerInfo, SellerRecord, as_listing
 from mercari_ai_shopper.models.recommendation import RankedListing
+from mercari_ai_shopper.utils.matcher import TextMatch, matcher_for
+
+# 랭킹 입력: 검색 경로의 경량 레코드 또는 이미 만들어진 Listing
+Candidate = Union[Listing, ListingRecord]
 
 
 def _budget_score(price: int, q: SearchQuery) -> Tuple[float, str | None]:
@@ -51,26 +57,20 @@ def _condition_score(condition_text: str | None, q: SearchQuery) -> Tuple[float,
     return 0.4, "상태 정보 불명/일치 낮음"
 
 
-def _keyword_score(title: str, q: SearchQuery) -> Tuple[float, str | None]:
-    t = title.lower()
-    hits = 0
-    for kw in q.keywords:
-        if kw.lower() in t:
-            hits += 1
+def _keyword_score(m: TextMatch, q: SearchQuery) -> Tuple[float, str | None]:
+    hits = m.keyword_hits
     if hits == 0:
         return 0.4, "키워드 일치 낮음"
     ratio = hits / max(1, len(q.keywords))
     return 0.6 + 0.4 * ratio, "키워드 일치"
 
 
-def _brand_color_score(title: str, desc_snippet: str | None, q: SearchQuery) -> Tuple[float, list[str]]:
+def _brand_color_score(m: TextMatch, q: SearchQuery) -> Tuple[float, list[str]]:
     reasons: list[str] = []
-    hay = f"{title} {(desc_snippet or '')}".lower()
     s = 0.5
 
     if q.brand:
-        ok = all(b.lower() in hay for b in q.brand)
-        if ok:
+        if m.brand_ok:
             s += 0.2
             reasons.append("브랜드 일치")
         else:
@@ -78,8 +78,7 @@ def _brand_color_score(title: str, desc_snippet: str | None, q: SearchQuery) ->
             reasons.append("브랜드 일부 불일치")
 
     if q.color:
-        ok = all(c.lower() in hay for c in q.color)
-        if ok:
+        if m.color_ok:
             s += 0.1
             reasons.append("색상 일치")
         else:
@@ -89,32 +88,125 @@ def _brand_color_score(title: str, desc_snippet: str | None, q: SearchQuery) ->
     return max(0.0, min(1.0, s)), reasons
 
 
-def rank_and_explain(items: List[Listing], q: SearchQuery, top_k: int = 3) -> List[RankedListing]:
+def _seller_adjustment(seller: Optional[Union[SellerInfo, SellerRecord]]) -> Tuple[float, str | None]:
     """
-    간단한 규칙 기반 스코어링으로 Top-K 추천.
+    판매자 정보 가감점(±0.05). 상세 보강(enrichment) 전에는 정보가 없으므로 0(중립).
     """
-    ranked: list[RankedListing] = []
-    for it in items:
-        reasons: list[str] = []
+    if seller is None or (seller.rating is None and seller.sales_count is None):
+        return 0.0, None
+    adj = 0.0
+    reason = None
+    if seller.rating is not None:
+        # 4.5점 기준, 5.0 → +0.05 / 4.0 이하 → -0.05
+        adj += max(-0.05, min(0.05, (seller.rating - 4.5) * 0.1))
+        if seller.rating >= 4.8:
+            reason = f"판매자 평가 우수({seller.rating:.1f})"
+        elif seller.rating < 4.0:
+            reason = f"판매자 평가 낮음({seller.rating:.1f})"
+    if seller.sales_count is not None:
+        if seller.sales_count >= 50:
+            adj += 0.01
+            reason = reason or f"판매 실적 많음({seller.sales_count}건)"
+        elif seller.sales_count == 0:
+            adj -= 0.01
+    return max(-0.05, min(0.05, adj)), reason
+
+
+def _score(it: Candidate, q: SearchQuery) -> Tuple[float, List[str]]:
+    """점수/근거만 계산(Listing/ListingRecord 공용, 모델 생성 없음)."""
+    reasons: list[str] = []
+
+    sb, rb = _budget_score(it.price_jpy, q)
+    if rb:
+        reasons.append(rb)
+
+    sc, rc = _condition_score(it.condition, q)
+    if rc:
+        reasons.append(rc)
+
+    # 키워드/브랜드/색상은 정규화 텍스트 한 번 스캔(필터에서 본 리스팅이면 캐시)
+    m = matcher_for(q).scan(it.title, it.description_snippet)
+    sk, rk = _keyword_score(m, q)
+    if rk:
+        reasons.append(rk)
+
+    sbc, rbc = _brand_color_score(m, q)
+    reasons.extend(rbc)
 
-        sb, rb = _budget_score(it.price_jpy, q)
-        if rb:
-            reasons.append(rb)
+    ss, rs = _seller_adjustment(it.seller)
+    if rs:
+        reasons.append(rs)
 
-        sc, rc = _condition_score(it.condition, q)
-        if rc:
-            reasons.append(rc)
+    # 가중 합 (예: 예산/상태 비중↑) + 판매자 가감점
+    score = 0.35 * sb + 0.3 * sc + 0.25 * sk + 0.10 * sbc + ss
+    score = max(0.0, min(1.0, score))
+    return round(score, 4), reasons
 
-        sk, rk = _keyword_score(it.title, q)
-        if rk:
-            reasons.append(rk)
 
-        sbc, rbc = _brand_color_score(it.title, it.description_snippet, q)
-        reasons.extend(rbc)
+def score_listing(it: Candidate, q: SearchQuery) -> RankedListing:
+    """단일 후보 점수/근거 계산. 레코드면 여기서 Listing으로 만든다(랭킹 경계)."""
+    score, reasons = _score(it, q)
+    return RankedListing.model_construct(listing=as_listing(it), score=score, reasons=reasons)
 
-        # 가중 합 (예: 예산/상태 비중↑)
-        score = 0.35 * sb + 0.3 * sc + 0.25 * sk + 0.10 * sbc
-        ranked.append(RankedListing(listing=it, score=round(score, 4), reasons=reasons))
 
-    ranked.sort(key=lambda x: x.score, reverse=True)
-    return ranked[:max(1, top_k)]
+class TopKRanker:
+    """
+    항목이 도착하는 대로 점수를 매기고 상위 K개만 유지(min-heap, 메모리 O(K)).
+    크롤이 끝나기 전에 랭킹을 시작할 때 사용. 동점은 먼저 들어온 항목 우선.
+    후보마다 RankedListing을 만들지 않고, result()에서 상위 K개만 만든다.
+    """
+
+    def __init__(self, q: SearchQuery, top_k: int = 3):
+        self.q = q
+        self.top_k = max(1, top_k)
+        self._heap: list[tuple[float, int, List[str], Candidate]] = []
+        self._seq = count()
+        self.seen = 0
+
+    def add(self, it: Candidate) -> None:
+        score, reasons = _score(it, self.q)
+        self.seen += 1
+        # 동점이면 먼저 온 항목이 남도록 순번을 음수로
+        entry = (score, -next(self._seq), reasons, it)
+        if len(self._heap) < self.top_k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def extend(self, items: Iterable[Candidate]) -> "TopKRanker":
+        for it in items:
+            self.add(it)
+        return self
+
+    def scored(self) -> List[Tuple[float, List[str], Candidate]]:
+        """상위 K개 (점수, 근거, 후보)를 점수 내림차순으로. 모델을 만들지 않는다."""
+        return [
+            (score, reasons, it)
+            for score, _, reasons, it in sorted(self._heap, key=lambda e: e[:2], reverse=True)
+        ]
+
+    def result(self) -> List[RankedListing]:
+        return [
+            RankedListing.model_construct(listing=as_listing(it), score=score, reasons=reasons)
+            for score, reasons, it in self.scored()
+        ]
+
+
+# 이 개수 이상인 리스트는 NumPy 배치 랭커(agent.batch_ranker)로 계산
+BATCH_MIN_ITEMS = 256
+
+
+def rank_and_explain(items: Iterable[Candidate], q: SearchQuery, top_k: int = 3) -> List[RankedListing]:
+    """
+    간단한 규칙 기반 스코어링으로 Top-K 추천.
+    items는 제너레이터여도 되며(iter_search 등) 상위 K개만 메모리에 유지한다.
+    큰 리스트는 열 단위 벡터화 + argpartition(batch_ranker)으로 같은 결과를 더 빨리 낸다.
+    """
+    if isinstance(items, Sequence) and len(items) >= BATCH_MIN_ITEMS:
+        try:
+            from mercari_ai_shopper.agent.batch_ranker import rank_batch
+        except ImportError:  # numpy 미설치 환경
+            pass
+        else:
+            return rank_batch(items, q, top_k=top_k)
+    return TopKRanker(q, top_k).extend(items).result()
@@ -7,7 +7,11 @@ OpenAI(Function calling)/Anthropic(Tool use) 모두 호환되는 dict 형태로
 
 search_mercari = {
     "name": "search_mercari",
-    "description": "Search items on Mercari Japan with optional filters and return a list of listings.",
+    "description": (
+        "Search items on Mercari Japan with optional filters. Returns the best-scoring listings as a table: "
+        "`cols` names the columns of each row in `rows`, `common` holds values shared by every row, "
+        "and `id` is a short item id accepted by fetch_listing_detail."
+    ),
     "parameters": {
         "type": "object",
         "properties": {
@@ -54,16 +58,28 @@ search_mercari = {
 
 fetch_listing_detail = {
     "name": "fetch_listing_detail",
-    "description": "Fetch detail information for a single Mercari listing URL.",
+    "description": (
+        "Fetch detail information (seller rating, sales count, description) for one Mercari listing, "
+        "or for several at once via `ids`/`urls` (fetched in parallel, results in input order)."
+    ),
     "parameters": {
         "type": "object",
         "properties": {
             "url": {
                 "type": "string",
                 "description": "Absolute URL of a Mercari item (https://jp.mercari.com/item/...).",
-            }
+            },
+            "ids": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Short item ids from search_mercari results (e.g. ['i1', 'i3']).",
+            },
+            "urls": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Multiple item URLs to fetch in one call. Prefer this for the top candidates.",
+            },
         },
-        "required": ["url"],
     },
 }
 
@@ -44,6 +44,20 @@ class Settings:
     anthropic_api_key: str = ""
     openai_model: str = "gpt-4o-mini"
     anthropic_model: str = "claude-3-5-sonnet-20240620"
+    # 워커당 제공자별 동시 LLM 호출 상한(비동기 Agent 경로)
+    openai_max_concurrency: int = 32
+    anthropic_max_concurrency: int = 32
+    # Anthropic 프롬프트 캐시(도구 목록/system/대화 접두부에 cache_control)
+    anthropic_prompt_cache: bool = True
+    # 검색 도구 결과 압축(상위 N개, 추정 토큰 예산)
+    agent_result_top_n: int = 20
+    agent_result_token_budget: int = 1500
+    # 한 턴의 도구 호출 병렬 실행(공용 스레드 수, 호출당 제한 시간)
+    agent_tool_max_workers: int = 4
+    agent_tool_timeout_seconds: float = 30.0
+    # 규칙 기반 요청 파서: 확신도가 임계값 이상이면 LLM 없이 바로 검색+랭킹
+    agent_rule_parser_enabled: bool = True
+    agent_rule_parser_min_confidence: float = 0.8
 
     # Scraping
     mercari_base_url: str = "https://jp.mercari.com/search"
@@ -56,14 +70,64 @@ class Settings:
     http_timeout: float = 15.0
     http_max_retries: int = 3
     http_backoff_seconds: float = 0.5
+    http_pool_size: int = 20
+    http_async_max_connections: int = 200
+    http_keepalive_seconds: float = 30.0
+    http2: bool = False
+    detail_max_concurrency: int = 8
+    http_per_host_concurrency: int = 8
+    search_max_pages: int = 5
+    search_time_budget_seconds: float = 20.0
+    search_seen_window: int = 10000
+    # 서버 측 필터 푸시다운(옵트인: price,sort,condition 중 켤 항목, 기본 끔) + 결과 검증/자동 해제
+    search_pushdown: str = ""
+    search_pushdown_verify: bool = True
+    search_pushdown_min_checked: int = 5
+    search_pushdown_tolerance: float = 0.9
+    search_pushdown_strikes: int = 2
+    search_pushdown_cooldown_seconds: float = 3600.0
+    # 아웃바운드 레이트 리미트(토큰 버킷은 cache_dir의 SQLite로 워커 간 공유)
+    rate_limit_enabled: bool = True
+    rate_limit_rps: float = 3.0
+    rate_limit_burst: float = 10.0
+    rate_limit_min_rps: float = 0.2
+    rate_limit_max_rps: float = 20.0
+    rate_limit_concurrency: int = 8
+    rate_limit_max_concurrency: int = 64
+    rate_limit_latency_target_seconds: float = 2.0
+    # engine="auto": HTTP 우선 + Playwright 헤지
+    auto_min_results: int = 3
+    auto_hedge_initial_seconds: float = 3.0
+    auto_hedge_min_seconds: float = 0.5
+    auto_hedge_max_seconds: float = 8.0
 
     # Cache
     cache_dir: str = "/app/data/cache"
     requests_cache_expire_seconds: int = 3600
+    http_cache_enabled: bool = True
+    cache_ttl_search_seconds: int = 600
+    cache_ttl_item_seconds: int = 3600
+    cache_max_bytes: int = 256 * 1024 * 1024
+    search_cache_ttl_seconds: int = 300
+    search_cache_max_entries: int = 1024
+    search_cache_max_bytes: int = 64 * 1024 * 1024
+    # 에이전트 자연어 요청 → search_mercari 인자 캐시(정확/근사 일치 시 첫 LLM 호출 생략)
+    query_cache_enabled: bool = True
+    query_cache_ttl_seconds: int = 7 * 24 * 3600
+    query_cache_max_entries: int = 10000
+    query_cache_similarity: float = 0.85
 
     # Playwright
     playwright_browsers_path: str = "/ms-playwright"
     playwright_headless: bool = True
+    playwright_pool_size: int = 2
+    playwright_recycle_after: int = 50
+    playwright_max_heap_mb: int = 512
+    playwright_pool_queue_size: int = 64
+    playwright_pool_prestart: bool = True
+    playwright_lean_mode: bool = True
+    playwright_ready_min_items: int = 20
+    playwright_ready_timeout_seconds: float = 7.0
 
     # Proxy (optional)
     http_proxy: str = ""
@@ -88,16 +152,73 @@ def get_settings() -> Settings:
         anthropic_api_key=_getenv_str("ANTHROPIC_API_KEY", ""),
         openai_model=_getenv_str("OPENAI_MODEL", "gpt-4o-mini"),
         anthropic_model=_getenv_str("ANTHROPIC_MODEL", "claude-3-5-sonnet-20240620"),
+        openai_max_concurrency=_getenv_int("OPENAI_MAX_CONCURRENCY", 32),
+        anthropic_max_concurrency=_getenv_int("ANTHROPIC_MAX_CONCURRENCY", 32),
+        anthropic_prompt_cache=_getenv_bool("ANTHROPIC_PROMPT_CACHE", True),
+        agent_result_top_n=_getenv_int("AGENT_RESULT_TOP_N", 20),
+        agent_result_token_budget=_getenv_int("AGENT_RESULT_TOKEN_BUDGET", 1500),
+        agent_tool_max_workers=_getenv_int("AGENT_TOOL_MAX_WORKERS", 4),
+        agent_tool_timeout_seconds=_getenv_float("AGENT_TOOL_TIMEOUT_SECONDS", 30.0),
+        agent_rule_parser_enabled=_getenv_bool("AGENT_RULE_PARSER_ENABLED", True),
+        agent_rule_parser_min_confidence=_getenv_float("AGENT_RULE_PARSER_MIN_CONFIDENCE", 0.8),
         mercari_base_url=_getenv_str("MERCARI_BASE_URL", "https://jp.mercari.com/search"),
         user_agent=_getenv_str("USER_AGENT", Settings.user_agent),
         accept_language=_getenv_str("ACCEPT_LANGUAGE", Settings.accept_language),
         http_timeout=_getenv_float("HTTP_TIMEOUT", 15.0),
         http_max_retries=_getenv_int("HTTP_MAX_RETRIES", 3),
         http_backoff_seconds=_getenv_float("HTTP_BACKOFF_SECONDS", 0.5),
+        http_pool_size=_getenv_int("HTTP_POOL_SIZE", 20),
+        http_async_max_connections=_getenv_int("HTTP_ASYNC_MAX_CONNECTIONS", 200),
+        http_keepalive_seconds=_getenv_float("HTTP_KEEPALIVE_SECONDS", 30.0),
+        http2=_getenv_bool("HTTP2", False),
+        detail_max_concurrency=_getenv_int("DETAIL_MAX_CONCURRENCY", 8),
+        http_per_host_concurrency=_getenv_int("HTTP_PER_HOST_CONCURRENCY", 8),
+        search_max_pages=_getenv_int("SEARCH_MAX_PAGES", 5),
+        search_time_budget_seconds=_getenv_float("SEARCH_TIME_BUDGET_SECONDS", 20.0),
+        search_seen_window=_getenv_int("SEARCH_SEEN_WINDOW", 10000),
+        search_pushdown=_getenv_str("SEARCH_PUSHDOWN", ""),
+        search_pushdown_verify=_getenv_bool("SEARCH_PUSHDOWN_VERIFY", True),
+        search_pushdown_min_checked=_getenv_int("SEARCH_PUSHDOWN_MIN_CHECKED", 5),
+        search_pushdown_tolerance=_getenv_float("SEARCH_PUSHDOWN_TOLERANCE", 0.9),
+        search_pushdown_strikes=_getenv_int("SEARCH_PUSHDOWN_STRIKES", 2),
+        search_pushdown_cooldown_seconds=_getenv_float("SEARCH_PUSHDOWN_COOLDOWN_SECONDS", 3600.0),
+        rate_limit_enabled=_getenv_bool("RATE_LIMIT_ENABLED", True),
+        rate_limit_rps=_getenv_float("RATE_LIMIT_RPS", 3.0),
+        rate_limit_burst=_getenv_float("RATE_LIMIT_BURST", 10.0),
+        rate_limit_min_rps=_getenv_float("RATE_LIMIT_MIN_RPS", 0.2),
+        rate_limit_max_rps=_getenv_float("RATE_LIMIT_MAX_RPS", 20.0),
+        rate_limit_concurrency=_getenv_int("RATE_LIMIT_CONCURRENCY", 8),
+        rate_limit_max_concurrency=_getenv_int("RATE_LIMIT_MAX_CONCURRENCY", 64),
+        rate_limit_latency_target_seconds=_getenv_float("RATE_LIMIT_LATENCY_TARGET_SECONDS", 2.0),
+        auto_min_results=_getenv_int("AUTO_MIN_RESULTS", 3),
+        auto_hedge_initial_seconds=_getenv_float("AUTO_HEDGE_INITIAL_SECONDS", 3.0),
+        auto_hedge_min_seconds=_getenv_float("AUTO_HEDGE_MIN_SECONDS", 0.5),
+        auto_hedge_max_seconds=_getenv_float("AUTO_HEDGE_MAX_SECONDS", 8.0),
         cache_dir=_getenv_str("CACHE_DIR", "/app/data/cache"),
         requests_cache_expire_seconds=_getenv_int("REQUESTS_CACHE_EXPIRE_SECONDS", 3600),
+        http_cache_enabled=_getenv_bool("HTTP_CACHE_ENABLED", True),
+        cache_ttl_search_seconds=_getenv_int("CACHE_TTL_SEARCH_SECONDS", 600),
+        cache_ttl_item_seconds=_getenv_int(
+            "CACHE_TTL_ITEM_SECONDS", _getenv_int("REQUESTS_CACHE_EXPIRE_SECONDS", 3600)
+        ),
+        cache_max_bytes=_getenv_int("CACHE_MAX_BYTES", 256 * 1024 * 1024),
+        search_cache_ttl_seconds=_getenv_int("SEARCH_CACHE_TTL_SECONDS", 300),
+        search_cache_max_entries=_getenv_int("SEARCH_CACHE_MAX_ENTRIES", 1024),
+        search_cache_max_bytes=_getenv_int("SEARCH_CACHE_MAX_BYTES", 64 * 1024 * 1024),
+        query_cache_enabled=_getenv_bool("QUERY_CACHE_ENABLED", True),
+        query_cache_ttl_seconds=_getenv_int("QUERY_CACHE_TTL_SECONDS", 7 * 24 * 3600),
+        query_cache_max_entries=_getenv_int("QUERY_CACHE_MAX_ENTRIES", 10000),
+        query_cache_similarity=_getenv_float("QUERY_CACHE_SIMILARITY", 0.85),
         playwright_browsers_path=_getenv_str("PLAYWRIGHT_BROWSERS_PATH", "/ms-playwright"),
         playwright_headless=_getenv_bool("PLAYWRIGHT_HEADLESS", True),
+        playwright_pool_size=_getenv_int("PLAYWRIGHT_POOL_SIZE", 2),
+        playwright_recycle_after=_getenv_int("PLAYWRIGHT_RECYCLE_AFTER", 50),
+        playwright_max_heap_mb=_getenv_int("PLAYWRIGHT_MAX_HEAP_MB", 512),
+        playwright_pool_queue_size=_getenv_int("PLAYWRIGHT_POOL_QUEUE_SIZE", 64),
+        playwright_pool_prestart=_getenv_bool("PLAYWRIGHT_POOL_PRESTART", True),
+        playwright_lean_mode=_getenv_bool("PLAYWRIGHT_LEAN_MODE", True),
+        playwright_ready_min_items=_getenv_int("PLAYWRIGHT_READY_MIN_ITEMS", 20),
+        playwright_ready_timeout_seconds=_getenv_float("PLAYWRIGHT_READY_TIMEOUT_SECONDS", 7.0),
         http_proxy=_getenv_str("HTTP_PROXY", ""),
         https_proxy=_getenv_str("HTTPS_PROXY", ""),
         no_proxy=_getenv_str("NO_PROXY", "localhost,127.0.0.1"),
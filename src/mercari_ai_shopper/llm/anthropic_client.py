@@ -1,14 +1,160 @@
-import anthropic
+import json
+import logging
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Iterator, Sequence, Tuple
+
+from mercari_ai_shopper.config import get_settings
+from mercari_ai_shopper.llm.shared import USAGE_FIELDS, get_async_sdk_client, get_sdk_client, llm_slot, record_usage
+from mercari_ai_shopper.llm.tool_executor import (
+    AsyncToolExecutor,
+    ToolCall,
+    ToolExecutor,
+    ToolOutcome,
+    tool_end_event,
+    tool_start_event,
+)
+from mercari_ai_shopper.utils.serialization import tool_result_json
+
+logger = logging.getLogger(__name__)
+
+# 프롬프트 캐시 breakpoint. 접두부(tools → system → messages)가 바이트 단위로 같아야 적중한다
+CACHE_CONTROL = {"type": "ephemeral"}
+# 도구 스키마(JSON 지문) → Anthropic 형식 변환 결과. 세션 간에도 같은 객체를 재사용
+_tools_memo: Dict[str, List[Dict[str, Any]]] = {}
+_TOOLS_MEMO_MAX = 32
+
+
+def _block_get(block: Any, key: str) -> Any:
+    """SDK 응답 블록(객체)과 dict 블록 모두에서 필드 읽기."""
+    if isinstance(block, dict):
+        return block.get(key)
+    return getattr(block, key, None)
+
+
+def _split_system(messages: List[Dict[str, Any]]) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    Anthropic은 system을 messages가 아니라 별도 파라미터로 받는다.
+    Agent가 만든 OpenAI 형식 대화({"role": "system"})를 (system 문자열, 나머지)로 나눈다.
+    """
+    system = "\n\n".join(m["content"] for m in messages if m.get("role") == "system")
+    return system, [m for m in messages if m.get("role") != "system"]
+
+
+def _usage_dict(usage: Any) -> Dict[str, int]:
+    """SDK usage(객체/dict) → USAGE_FIELDS. 캐시 필드가 없는(None) 응답은 0."""
+    return {k: int(_block_get(usage, k) or 0) for k in USAGE_FIELDS} if usage is not None else dict.fromkeys(USAGE_FIELDS, 0)
+
+
+def _with_breakpoint(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    마지막 메시지의 마지막 블록에 cache_control을 단 사본(원본 대화는 그대로).
+    단계마다 breakpoint가 한 칸씩 뒤로 가므로, 다음 단계는 직전 단계까지의 대화를 캐시에서 읽는다.
+    """
+    if not messages:
+        return messages
+    last = messages[-1]
+    content = last.get("content")
+    if isinstance(content, str) and content:
+        blocks = [{"type": "text", "text": content, "cache_control": CACHE_CONTROL}]
+    elif isinstance(content, list) and content and isinstance(content[-1], dict):
+        blocks = [*content[:-1], {**content[-1], "cache_control": CACHE_CONTROL}]
+    else:
+        return messages
+    return [*messages[:-1], {**last, "content": blocks}]
+
+
+def _tool_result_message(outcomes: Sequence[ToolOutcome]) -> Dict[str, Any]:
+    """
+    도구 결과 → user 메시지의 tool_result 블록들.
+    주의: role="tool" 아님! role="user" + content=[{"type":"tool_result", ...}]
+    여기에 추가 텍스트를 넣고 싶다면 반드시 tool_result 뒤에 위치시켜야 함.
+    예: [{"type":"tool_result", ...}, {"type":"text","text":"...next"}]
+    모든 결과를 "단일 user 메시지"로 한 번에 붙인다(병렬 도구 사용에 권장).
+    """
+    return {
+        "role": "user",
+        "content": [
+            {
+                "type": "tool_result",
+                "tool_use_id": out.id,
+                "content": tool_result_json(out.payload()),
+                **({} if out.ok else {"is_error": True}),
+            }
+            for out in outcomes
+        ],
+    }
+
+
+class _StreamedTurn:
+    """
+    스트리밍 응답 1턴 조립(content_block_start/delta/stop).
+    텍스트 조각은 feed()가 바로 돌려주고, tool_use 입력(input_json_delta)은 블록이 끝날 때까지 모은다.
+    """
+
+    def __init__(self) -> None:
+        self.blocks: Dict[int, Dict[str, Any]] = {}
+        self.partial: Dict[int, List[str]] = {}
+        self.usage: Dict[str, int] = dict.fromkeys(USAGE_FIELDS, 0)
+
+    def feed(self, event: Any) -> str | None:
+        etype = _block_get(event, "type")
+        idx = _block_get(event, "index")
+        if etype == "message_start":
+            # 입력/캐시 토큰은 message_start에, 출력 토큰(누적)은 message_delta에 온다
+            self.usage = _usage_dict(_block_get(_block_get(event, "message"), "usage"))
+        elif etype == "message_delta":
+            out = _block_get(_block_get(event, "usage"), "output_tokens")
+            if out is not None:
+                self.usage["output_tokens"] = int(out)
+        elif etype == "content_block_start":
+            cb = _block_get(event, "content_block")
+            if _block_get(cb, "type") == "tool_use":
+                self.blocks[idx] = {"type": "tool_use", "id": _block_get(cb, "id"), "name": _block_get(cb, "name"), "input": {}}
+                self.partial[idx] = []
+            else:
+                self.blocks[idx] = {"type": "text", "text": ""}
+        elif etype == "content_block_delta":
+            delta = _block_get(event, "delta")
+            dtype = _block_get(delta, "type")
+            if dtype == "text_delta":
+                piece = _block_get(delta, "text") or ""
+                self.blocks.setdefault(idx, {"type": "text", "text": ""})["text"] += piece
+                return piece
+            if dtype == "input_json_delta":
+                self.partial.setdefault(idx, []).append(_block_get(delta, "partial_json") or "")
+        elif etype == "content_block_stop" and idx in self.partial:
+            raw = "".join(self.partial.pop(idx))
+            try:
+                self.blocks[idx]["input"] = json.loads(raw) if raw else {}
+            except ValueError:
+                self.blocks[idx]["input"] = {}
+        return None
+
+    @property
+    def content(self) -> List[Dict[str, Any]]:
+        return [b for _, b in sorted(self.blocks.items()) if b["type"] == "tool_use" or b["text"]]
+
+    @property
+    def text(self) -> str:
+        return "".join(b["text"] for b in self.content if b["type"] == "text")
+
+    def calls(self) -> List[ToolCall]:
+        return [ToolCall(b["id"], b["name"], b["input"]) for b in self.content if b["type"] == "tool_use"]
 
 
 class AnthropicClient:
+    """
+    Anthropic tool-use 루프. SDK 클라이언트(커넥션 풀)는 프로세스 공용(llm.shared.get_sdk_client).
+    프롬프트 캐시(ANTHROPIC_PROMPT_CACHE): 도구 목록·system·직전까지의 대화에 cache_control을 달아
+    같은 접두부를 단계/세션 간에 캐시에서 읽는다. 단계별 사용량은 usage 이벤트와 /stats(llm)로 보고.
+    """
+
     def __init__(self, model: str | None = None, max_tokens: int = 1024):
-        self.client = anthropic.Anthropic()
+        self.client = get_sdk_client("anthropic")
         self.model = model or os.getenv("ANTHROPIC_MODEL", "claude-3-7-sonnet-20250219")
         self.max_tokens = max_tokens
-        
+        self.prompt_cache = get_settings().anthropic_prompt_cache
+
     def _to_anthropic_tools(self, tools):
         """
         Normalize tool schema to Anthropic format: [{"name","description","input_schema"}...]
@@ -44,6 +190,61 @@ class AnthropicClient:
                 })
         return anth_tools
     
+    def _tools_for(self, tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """변환된 도구 스키마(메모이즈). 프롬프트 캐시가 켜져 있으면 마지막 도구에 breakpoint."""
+        key = json.dumps(tools, sort_keys=True, ensure_ascii=False) + ("|cached" if self.prompt_cache else "")
+        converted = _tools_memo.get(key)
+        if converted is None:
+            converted = self._to_anthropic_tools(tools)
+            if self.prompt_cache and converted:
+                converted[-1] = {**converted[-1], "cache_control": CACHE_CONTROL}
+            if len(_tools_memo) >= _TOOLS_MEMO_MAX:
+                _tools_memo.clear()
+            _tools_memo[key] = converted
+        return converted
+
+    def _prepare(self, messages: List[Dict[str, Any]], tools: List[Dict[str, Any]]) -> Tuple[Any, List[Dict[str, Any]]]:
+        """
+        루프 시작 시 한 번: system 메시지를 떼어 system 파라미터로(messages는 제자리에서 user/assistant만 남김),
+        도구 스키마 변환. 프롬프트 캐시가 켜져 있으면 system은 breakpoint를 단 텍스트 블록.
+        """
+        system, convo = _split_system(messages)
+        messages[:] = convo
+        if system and self.prompt_cache:
+            return [{"type": "text", "text": system, "cache_control": CACHE_CONTROL}], self._tools_for(tools)
+        return system, self._tools_for(tools)
+
+    def _request(self, messages: List[Dict[str, Any]], tools: List[Dict[str, Any]], system: Any,
+                 **extra: Any) -> Dict[str, Any]:
+        """tools는 _prepare가 변환한 Anthropic 형식."""
+        kwargs: Dict[str, Any] = {
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            # role: user/assistant only
+            "messages": _with_breakpoint(messages) if self.prompt_cache else messages,
+            "tools": tools,
+            **extra,
+        }
+        if system:
+            kwargs["system"] = system
+        return kwargs
+
+    @staticmethod
+    def _report(step: int, usage: Dict[str, int]) -> Dict[str, Any]:
+        """단계별 사용량 누적(/stats) + usage 이벤트."""
+        record_usage("anthropic", usage)
+        logger.debug("anthropic step %d usage %s", step, usage)
+        return {"type": "usage", "step": step, **usage}
+
+    @staticmethod
+    def tool_turn_messages(calls: Sequence[ToolCall], outcomes: Sequence[ToolOutcome]) -> List[Dict[str, Any]]:
+        """LLM 없이 실행한 도구 호출(질의 캐시 적중)을 대화 기록으로: assistant tool_use + user tool_result."""
+        assistant = {
+            "role": "assistant",
+            "content": [{"type": "tool_use", "id": c.id, "name": c.name, "input": c.args} for c in calls],
+        }
+        return [assistant, _tool_result_message(outcomes)]
+
     def run_loop(self, messages: List[Dict[str, Any]], tools: List[Dict[str, Any]],
                  tool_registry, max_steps: int = 2):
         """
@@ -51,14 +252,12 @@ class AnthropicClient:
         tools: Anthropic 'tools' 스키마 (name/description/input_schema)
         """
 
+        system, anth_tools = self._prepare(messages, tools)
+
         # 초기 호출 (user 메시지 + tools)
-        for step in range(max_steps):
-            resp = self.client.messages.create(
-                model=self.model,
-                max_tokens=self.max_tokens,
-                messages=messages,             # role: user/assistant only
-                tools=self._to_anthropic_tools(tools)  # <-- 여기
-            )
+        for step in range(1, max_steps + 1):
+            resp = self.client.messages.create(**self._request(messages, anth_tools, system))
+            self._report(step, _usage_dict(getattr(resp, "usage", None)))
             # Anthropic SDK 응답은 resp.content = [blocks...], resp.stop_reason 등 포함
             assistant_msg = {
                 "role": "assistant",
@@ -66,36 +265,111 @@ class AnthropicClient:
             }
             messages.append(assistant_msg)
 
-            # tool_use 요청이 없으면 종료
-            tool_uses = [b for b in resp.content if b.get("type") == "tool_use"]
+            # tool_use 요청이 없으면 종료 (SDK 응답 블록은 dict가 아니라 객체)
+            tool_uses = [b for b in resp.content if _block_get(b, "type") == "tool_use"]
             if not tool_uses:
                 break
 
-            # (1) 각 tool_use 실행
-            tool_results_blocks = []
-            for tu in tool_uses:
-                tool_name = tu["name"]
-                tool_input = tu.get("input", {})
-                tool_use_id = tu["id"]
-
-                # 실제 도구 실행
-                result = tool_registry.call(tool_name, tool_input)
-
-                # (2) 결과를 user 메시지의 tool_result 블록으로 전달
-                # 주의: role="tool" 아님! role="user" + content=[{"type":"tool_result", ...}]
-                # 여기에 추가 텍스트를 넣고 싶다면 반드시 tool_result 뒤에 위치시켜야 함.
-                # 예: [{"type":"tool_result", ...}, {"type":"text","text":"...next"}]
-                block = {
-                    "type": "tool_result",
-                    "tool_use_id": tool_use_id,
-                    "content": str(result) if not isinstance(result, list) else result
-                }
-                tool_results_blocks.append(block)
-
-            # 모든 결과를 "단일 user 메시지"로 한 번에 붙이기(병렬 도구 사용에 권장)
-            messages.append({
-                "role": "user",
-                "content": tool_results_blocks
-            })
+            # (1) 같은 턴의 tool_use들을 병렬 실행(결과는 요청 순서/ID 그대로)
+            calls = [
+                ToolCall(_block_get(tu, "id"), _block_get(tu, "name"), _block_get(tu, "input") or {})
+                for tu in tool_uses
+            ]
+            # (2) 결과를 user 메시지의 tool_result 블록으로 전달
+            messages.append(_tool_result_message(ToolExecutor(tool_registry).run(calls)))
 
         return messages
+
+    def stream_loop(self, messages: List[Dict[str, Any]], tools: List[Dict[str, Any]],
+                    tool_registry, max_steps: int = 2) -> Iterator[Dict[str, Any]]:
+        """
+        run_loop의 스트리밍판(이벤트 형식은 OpenAIClient.stream_loop과 같음).
+        텍스트는 도착하는 대로 token으로 내보내고, tool_use 입력은 블록이 끝나면 실행한다.
+        system 메시지가 섞여 있으면 system 파라미터로 옮기고, messages는 제자리에서 갱신된다.
+        """
+        system, anth_tools = self._prepare(messages, tools)
+        turn = _StreamedTurn()
+        step = 0
+        for step in range(1, max_steps + 1):
+            yield {"type": "step", "step": step}
+            turn = _StreamedTurn()
+            for event in self.client.messages.create(**self._request(messages, anth_tools, system, stream=True)):
+                piece = turn.feed(event)
+                if piece:
+                    yield {"type": "token", "text": piece}
+            yield self._report(step, turn.usage)
+            messages.append({"role": "assistant", "content": turn.content})
+            calls = turn.calls()
+            if not calls:
+                break
+            outcomes = yield from ToolExecutor(tool_registry).stream(calls)
+            messages.append(_tool_result_message(outcomes))
+        yield {"type": "done", "text": turn.text, "steps": step}
+
+
+class AsyncAnthropicClient(AnthropicClient):
+    """
+    AnthropicClient의 asyncio 버전(AsyncAnthropic).
+    - SDK 클라이언트는 이벤트 루프별 공용, LLM 호출은 llm_slot("anthropic")로 동시 수 제한
+    - 도구: async def는 루프에서, 동기 함수는 스레드에서(AsyncToolExecutor)
+    """
+
+    def __init__(self, model: str | None = None, max_tokens: int = 1024):
+        self.model = model or os.getenv("ANTHROPIC_MODEL", "claude-3-7-sonnet-20250219")
+        self.max_tokens = max_tokens
+        self.prompt_cache = get_settings().anthropic_prompt_cache
+
+    @property
+    def client(self) -> Any:  # type: ignore[override]
+        return get_async_sdk_client("anthropic")
+
+    async def arun_loop(self, messages: List[Dict[str, Any]], tools: List[Dict[str, Any]],
+                        tool_registry, max_steps: int = 2) -> List[Dict[str, Any]]:
+        """run_loop의 asyncio 버전."""
+        system, anth_tools = self._prepare(messages, tools)
+        for step in range(1, max_steps + 1):
+            async with llm_slot("anthropic"):
+                resp = await self.client.messages.create(**self._request(messages, anth_tools, system))
+            self._report(step, _usage_dict(getattr(resp, "usage", None)))
+            messages.append({"role": "assistant", "content": resp.content})
+            tool_uses = [b for b in resp.content if _block_get(b, "type") == "tool_use"]
+            if not tool_uses:
+                break
+            calls = [
+                ToolCall(_block_get(tu, "id"), _block_get(tu, "name"), _block_get(tu, "input") or {})
+                for tu in tool_uses
+            ]
+            messages.append(_tool_result_message(await AsyncToolExecutor(tool_registry).arun(calls)))
+        return messages
+
+    async def astream_loop(self, messages: List[Dict[str, Any]], tools: List[Dict[str, Any]],
+                           tool_registry, max_steps: int = 2) -> AsyncIterator[Dict[str, Any]]:
+        """stream_loop의 asyncio 버전(이벤트 형식 동일)."""
+        system, anth_tools = self._prepare(messages, tools)
+        turn = _StreamedTurn()
+        step = 0
+        for step in range(1, max_steps + 1):
+            yield {"type": "step", "step": step}
+            turn = _StreamedTurn()
+            # 슬롯은 스트림을 다 읽을 때까지 점유(진행 중 호출 수 기준)
+            async with llm_slot("anthropic"):
+                stream = await self.client.messages.create(
+                    **self._request(messages, anth_tools, system, stream=True)
+                )
+                async for event in stream:
+                    piece = turn.feed(event)
+                    if piece:
+                        yield {"type": "token", "text": piece}
+            yield self._report(step, turn.usage)
+            messages.append({"role": "assistant", "content": turn.content})
+            calls = turn.calls()
+            if not calls:
+                break
+            for c in calls:
+                yield tool_start_event(c)
+            outcomes: List[ToolOutcome] = [None] * len(calls)  # type: ignore[list-item]
+            async for i, out in AsyncToolExecutor(tool_registry).aiter_completed(calls):
+                outcomes[i] = out
+                yield tool_end_event(out)
+            messages.append(_tool_result_message(outcomes))
+        yield {"type": "done", "text": turn.text, "steps": step}
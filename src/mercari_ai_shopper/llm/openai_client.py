@@ -1,13 +1,129 @@
 from __future__ import annotations
 
+import json
+import logging
 import os
-from typing import Dict, Any, List, Callable
+from typing import Dict, Any, AsyncIterator, Iterator, List, Callable, Sequence
 
-# OpenAI SDK는 requirements에 포함되어 있음
-try:
-    from openai import OpenAI
-except Exception:  # noqa: BLE001
-    OpenAI = None  # type: ignore[assignment]
+from mercari_ai_shopper.llm.shared import (
+    USAGE_FIELDS,
+    ensure_credentials,
+    get_async_sdk_client,
+    get_sdk_client,
+    llm_slot,
+    record_usage,
+)
+from mercari_ai_shopper.llm.tool_executor import (
+    AsyncToolExecutor,
+    ToolCall,
+    ToolExecutor,
+    ToolOutcome,
+    tool_end_event,
+    tool_start_event,
+)
+from mercari_ai_shopper.utils.serialization import tool_result_json
+
+logger = logging.getLogger(__name__)
+
+
+# 스트리밍 요청: 마지막 청크에 토큰 사용량 포함
+_STREAM: Dict[str, Any] = {"stream": True, "stream_options": {"include_usage": True}}
+
+
+def _parse_args(raw: str | None) -> Dict[str, Any]:
+    """function.arguments(JSON 문자열) → dict. 깨진 JSON이면 빈 dict."""
+    try:
+        parsed = json.loads(raw or "{}")
+    except Exception:
+        return {}
+    return parsed if isinstance(parsed, dict) else {}
+
+
+def _usage_dict(usage: Any) -> Dict[str, int]:
+    """
+    OpenAI usage → 공통 필드(llm.shared.USAGE_FIELDS). OpenAI는 접두부 캐시가 자동이고
+    prompt_tokens에 캐시 적중분(prompt_tokens_details.cached_tokens)이 포함되므로 빼서 input_tokens로.
+    """
+    if usage is None:
+        return dict.fromkeys(USAGE_FIELDS, 0)
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = int(getattr(details, "cached_tokens", 0) or 0)
+    return {
+        "input_tokens": int(usage.prompt_tokens or 0) - cached,
+        "output_tokens": int(usage.completion_tokens or 0),
+        "cache_read_input_tokens": cached,
+        "cache_creation_input_tokens": 0,
+    }
+
+
+def _report(step: int, usage: Dict[str, int]) -> Dict[str, Any]:
+    """단계별 사용량 누적(/stats) + usage 이벤트."""
+    record_usage("openai", usage)
+    logger.debug("openai step %d usage %s", step, usage)
+    return {"type": "usage", "step": step, **usage}
+
+
+def _tool_messages(outcomes: Sequence[ToolOutcome]) -> List[Dict[str, Any]]:
+    """도구 결과 → role=tool 메시지(요청 순서/tool_call_id 유지)."""
+    return [
+        {
+            "role": "tool",
+            "tool_call_id": out.id,
+            "name": out.name,
+            "content": tool_result_json(out.payload()),
+        }
+        for out in outcomes
+    ]
+
+
+class _StreamedTurn:
+    """
+    스트리밍 응답 1턴 조립: 텍스트 조각과, index별로 나뉘어 오는 tool_calls(id/name/arguments 조각).
+    feed(chunk)는 새 텍스트 조각(없으면 None)을 돌려준다.
+    """
+
+    def __init__(self) -> None:
+        self.parts: List[str] = []
+        self.pending: Dict[int, Dict[str, str]] = {}
+        self.usage: Dict[str, int] = dict.fromkeys(USAGE_FIELDS, 0)
+
+    def feed(self, chunk: Any) -> str | None:
+        # stream_options.include_usage: 마지막 청크(choices 비어 있음)에 usage
+        if getattr(chunk, "usage", None) is not None:
+            self.usage = _usage_dict(chunk.usage)
+        if not chunk.choices:
+            return None
+        delta = chunk.choices[0].delta
+        for tc in delta.tool_calls or []:
+            acc = self.pending.setdefault(tc.index, {"id": "", "name": "", "arguments": ""})
+            if tc.id:
+                acc["id"] = tc.id
+            if tc.function is not None:
+                acc["name"] += tc.function.name or ""
+                acc["arguments"] += tc.function.arguments or ""
+        if delta.content:
+            self.parts.append(delta.content)
+            return delta.content
+        return None
+
+    @property
+    def text(self) -> str:
+        return "".join(self.parts)
+
+    def calls(self) -> List[ToolCall]:
+        return [
+            ToolCall(c["id"], c["name"], _parse_args(c["arguments"]))
+            for _, c in sorted(self.pending.items())
+        ]
+
+    def assistant_message(self) -> Dict[str, Any]:
+        msg: Dict[str, Any] = {"role": "assistant", "content": self.text}
+        if self.pending:
+            msg["tool_calls"] = [
+                {"id": c["id"], "type": "function", "function": {"name": c["name"], "arguments": c["arguments"]}}
+                for _, c in sorted(self.pending.items())
+            ]
+        return msg
 
 
 class OpenAIClient:
@@ -16,18 +132,38 @@ class OpenAIClient:
     - messages: [{"role": "system"|"user"|"assistant"|"tool", "content": "..."}]
     - tools: function schema list
     - tool_registry: {"tool_name": callable}
+    SDK 클라이언트(커넥션 풀)는 프로세스 공용(llm.shared.get_sdk_client).
     """
 
     def __init__(self, model: str = None):
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise RuntimeError("OPENAI_API_KEY is not set in environment.")
-        if OpenAI is None:
-            raise RuntimeError("openai SDK is not available. Please install 'openai' package.")
-        self.client = OpenAI(api_key=api_key)
+        self.client = get_sdk_client("openai")
         # gpt-4o / gpt-4.1 / o3-mini 등 최신 모델 환경에 맞게 교체 가능
         self.model = model or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 
+    def _request(self, messages: List[Dict[str, Any]], tools: List[Dict[str, Any]], **extra: Any) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "messages": messages,
+            "tools": [{"type": "function", "function": t} for t in tools],
+            "tool_choice": "auto",
+            "temperature": 0.3,
+            **extra,
+        }
+
+    @staticmethod
+    def tool_turn_messages(calls: Sequence[ToolCall], outcomes: Sequence[ToolOutcome]) -> List[Dict[str, Any]]:
+        """LLM 없이 실행한 도구 호출(질의 캐시 적중)을 대화 기록으로: assistant tool_calls + tool 결과."""
+        assistant = {
+            "role": "assistant",
+            "content": "",
+            "tool_calls": [
+                {"id": c.id, "type": "function",
+                 "function": {"name": c.name, "arguments": json.dumps(c.args, ensure_ascii=False)}}
+                for c in calls
+            ],
+        }
+        return [assistant, *_tool_messages(outcomes)]
+
     def run_loop(
         self,
         messages: List[Dict[str, Any]],
@@ -39,14 +175,9 @@ class OpenAIClient:
         function-calling을 수행하고, 필요 시 tool 호출 → 결과를 대화에 append.
         최종 assistant 메시지가 나오면 종료.
         """
-        for _ in range(max_steps):
-            resp = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                tools=[{"type": "function", "function": t} for t in tools],
-                tool_choice="auto",
-                temperature=0.3,
-            )
+        for step in range(1, max_steps + 1):
+            resp = self.client.chat.completions.create(**self._request(messages, tools))
+            _report(step, _usage_dict(getattr(resp, "usage", None)))
             choice = resp.choices[0]
             msg = choice.message
             messages.append({"role": "assistant", "content": msg.content or "", "tool_calls": msg.tool_calls})
@@ -55,32 +186,113 @@ class OpenAIClient:
             if not msg.tool_calls:
                 break
 
-            # 여러 개의 도구 호출을 순차 처리
-            for tc in msg.tool_calls:
-                fn_name = tc.function.name
-                fn_args = tc.function.arguments
-                if fn_name not in tool_registry:
-                    tool_output = {"error": f"Tool '{fn_name}' not implemented"}
-                else:
-                    # JSON 문자열 → dict 파싱은 SDK가 해주거나 직접 처리 필요
-                    import json
-                    try:
-                        parsed = json.loads(fn_args or "{}")
-                    except Exception:
-                        parsed = {}
-                    try:
-                        result = tool_registry[fn_name](parsed)
-                        tool_output = {"ok": True, "result": result}
-                    except Exception as e:  # noqa: BLE001
-                        tool_output = {"ok": False, "error": str(e)}
-                # tool 결과를 assistant에게 전달
-                messages.append(
-                    {
-                        "role": "tool",
-                        "tool_call_id": tc.id,
-                        "name": fn_name,
-                        "content": str(tool_output),
-                    }
-                )
+            # 같은 턴의 도구 호출은 서로 독립이므로 병렬 실행(결과는 요청 순서/ID 그대로)
+            calls = [ToolCall(tc.id, tc.function.name, _parse_args(tc.function.arguments)) for tc in msg.tool_calls]
+            # tool 결과를 assistant에게 전달
+            messages.extend(_tool_messages(ToolExecutor(tool_registry).run(calls)))
 
         return messages
+
+    def stream_loop(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: List[Dict[str, Any]],
+        tool_registry: Dict[str, Callable[[Dict[str, Any]], Any]],
+        max_steps: int = 3,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        run_loop의 스트리밍판. 이벤트 dict를 차례로 내보낸다.
+        - {"type": "step", "step": n}: LLM 호출 시작
+        - {"type": "token", "text": ...}: assistant 텍스트 조각(도착하는 대로)
+        - {"type": "usage", "step": n, input/output/cache_read/cache_creation 토큰}: 단계가 끝날 때
+        - {"type": "tool_start" | "tool_end", ...}: 도구 실행 진행(ToolExecutor.stream)
+        - {"type": "done", "text": 최종 답변 전체, "steps": n}
+        messages는 run_loop와 같이 제자리에서 갱신된다.
+        """
+        turn = _StreamedTurn()
+        step = 0
+        for step in range(1, max_steps + 1):
+            yield {"type": "step", "step": step}
+            turn = _StreamedTurn()
+            for chunk in self.client.chat.completions.create(**self._request(messages, tools, **_STREAM)):
+                piece = turn.feed(chunk)
+                if piece:
+                    yield {"type": "token", "text": piece}
+            yield _report(step, turn.usage)
+            messages.append(turn.assistant_message())
+            calls = turn.calls()
+            if not calls:
+                break
+            outcomes = yield from ToolExecutor(tool_registry).stream(calls)
+            messages.extend(_tool_messages(outcomes))
+        yield {"type": "done", "text": turn.text, "steps": step}
+
+
+class AsyncOpenAIClient(OpenAIClient):
+    """
+    OpenAIClient의 asyncio 버전(AsyncOpenAI).
+    - SDK 클라이언트는 이벤트 루프별 공용, LLM 호출은 llm_slot("openai")로 동시 수 제한
+    - 도구: async def는 루프에서, 동기 함수는 스레드에서(AsyncToolExecutor)
+    """
+
+    def __init__(self, model: str = None):
+        ensure_credentials("openai")
+        self.model = model or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+
+    @property
+    def client(self) -> Any:  # type: ignore[override]
+        return get_async_sdk_client("openai")
+
+    async def arun_loop(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: List[Dict[str, Any]],
+        tool_registry: Dict[str, Callable[[Dict[str, Any]], Any]],
+        max_steps: int = 3,
+    ) -> List[Dict[str, Any]]:
+        """run_loop의 asyncio 버전."""
+        for step in range(1, max_steps + 1):
+            async with llm_slot("openai"):
+                resp = await self.client.chat.completions.create(**self._request(messages, tools))
+            _report(step, _usage_dict(getattr(resp, "usage", None)))
+            msg = resp.choices[0].message
+            messages.append({"role": "assistant", "content": msg.content or "", "tool_calls": msg.tool_calls})
+            if not msg.tool_calls:
+                break
+            calls = [ToolCall(tc.id, tc.function.name, _parse_args(tc.function.arguments)) for tc in msg.tool_calls]
+            messages.extend(_tool_messages(await AsyncToolExecutor(tool_registry).arun(calls)))
+        return messages
+
+    async def astream_loop(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: List[Dict[str, Any]],
+        tool_registry: Dict[str, Callable[[Dict[str, Any]], Any]],
+        max_steps: int = 3,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """stream_loop의 asyncio 버전(이벤트 형식 동일)."""
+        turn = _StreamedTurn()
+        step = 0
+        for step in range(1, max_steps + 1):
+            yield {"type": "step", "step": step}
+            turn = _StreamedTurn()
+            # 슬롯은 스트림을 다 읽을 때까지 점유(진행 중 호출 수 기준)
+            async with llm_slot("openai"):
+                stream = await self.client.chat.completions.create(**self._request(messages, tools, **_STREAM))
+                async for chunk in stream:
+                    piece = turn.feed(chunk)
+                    if piece:
+                        yield {"type": "token", "text": piece}
+            yield _report(step, turn.usage)
+            messages.append(turn.assistant_message())
+            calls = turn.calls()
+            if not calls:
+                break
+            for c in calls:
+                yield tool_start_event(c)
+            outcomes: List[ToolOutcome] = [None] * len(calls)  # type: ignore[list-item]
+            async for i, out in AsyncToolExecutor(tool_registry).aiter_completed(calls):
+                outcomes[i] = out
+                yield tool_end_event(out)
+            messages.extend(_tool_messages(outcomes))
+        yield {"type": "done", "text": turn.text, "steps": step}
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+"""
+LLM SDK 클라이언트 공유 + 제공자별 동시 호출 상한.
+- 동기 SDK 클라이언트: 프로세스 공용(제공자/키/엔드포인트별 1개, 내부 커넥션 풀 재사용)
+- 비동기 SDK 클라이언트: 이벤트 루프별 공용(utils.http.get_async_http_client와 같은 방식)
+- llm_slot(provider): 진행 중 LLM 호출 수를 제공자별 세마포어로 제한(루프별)
+- record_usage(provider, usage): 단계별 토큰 사용량(프롬프트 캐시 읽기/쓰기 포함) 누적
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Tuple
+
+from mercari_ai_shopper.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+PROVIDERS = ("openai", "anthropic")
+# 제공자 공통 사용량 필드(Anthropic 기준: input_tokens는 캐시에서 읽지 않은 입력만)
+USAGE_FIELDS = ("input_tokens", "output_tokens", "cache_read_input_tokens", "cache_creation_input_tokens")
+
+_lock = threading.Lock()
+# (provider, api_key, base_url) → 동기 SDK 클라이언트
+_sync_clients: Dict[Tuple[str, str, str], Any] = {}
+# (id(loop), provider, api_key, base_url) → (loop, 비동기 SDK 클라이언트)
+_async_clients: Dict[Tuple[int, str, str, str], Tuple[asyncio.AbstractEventLoop, Any]] = {}
+# (id(loop), provider) → (loop, 세마포어)
+_slots: Dict[Tuple[int, str], Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = {}
+# provider → {"in_flight", "waiting", "calls"}
+_counts: Dict[str, Dict[str, int]] = {p: {"in_flight": 0, "waiting": 0, "calls": 0} for p in PROVIDERS}
+# provider → USAGE_FIELDS 누적 + "steps"
+_usage: Dict[str, Dict[str, int]] = {p: {**dict.fromkeys(USAGE_FIELDS, 0), "steps": 0} for p in PROVIDERS}
+
+
+def _credentials(provider: str) -> Tuple[str, str]:
+    """(API 키, 엔드포인트). 엔드포인트는 SDK가 읽는 *_BASE_URL(테스트/프록시용)."""
+    if provider == "anthropic":
+        return os.getenv("ANTHROPIC_API_KEY", ""), os.getenv("ANTHROPIC_BASE_URL", "")
+    return os.getenv("OPENAI_API_KEY", ""), os.getenv("OPENAI_BASE_URL", "")
+
+
+def _build(provider: str, async_: bool, api_key: str) -> Any:
+    if provider == "anthropic":
+        import anthropic
+
+        return anthropic.AsyncAnthropic() if async_ else anthropic.Anthropic()
+    try:
+        from openai import AsyncOpenAI, OpenAI
+    except Exception:  # noqa: BLE001
+        raise RuntimeError("openai SDK is not available. Please install 'openai' package.")
+    if not api_key:
+        raise RuntimeError("OPENAI_API_KEY is not set in environment.")
+    return AsyncOpenAI(api_key=api_key) if async_ else OpenAI(api_key=api_key)
+
+
+def get_sdk_client(provider: str) -> Any:
+    """프로세스 공용 동기 SDK 클라이언트(Agent마다 새 커넥션 풀을 만들지 않음)."""
+    api_key, base_url = _credentials(provider)
+    key = (provider, api_key, base_url)
+    with _lock:
+        client = _sync_clients.get(key)
+        if client is None:
+            client = _sync_clients[key] = _build(provider, False, api_key)
+        return client
+
+
+def get_async_sdk_client(provider: str) -> Any:
+    """현재 이벤트 루프용 공용 비동기 SDK 클라이언트(AsyncOpenAI/AsyncAnthropic)."""
+    loop = asyncio.get_running_loop()
+    api_key, base_url = _credentials(provider)
+    key = (id(loop), provider, api_key, base_url)
+    with _lock:
+        entry = _async_clients.get(key)
+        if entry is not None and entry[0] is loop:
+            return entry[1]
+        # 닫힌 루프의 클라이언트는 정리 대상에서 제외(그 루프에서만 닫을 수 있음)
+        for k in [k for k, (lp, _) in _async_clients.items() if lp.is_closed()]:
+            del _async_clients[k]
+        client = _build(provider, True, api_key)
+        _async_clients[key] = (loop, client)
+        return client
+
+
+def ensure_credentials(provider: str) -> None:
+    """클라이언트 생성 전 빠른 확인(Agent 생성 시 키 누락을 바로 알리기 위함)."""
+    if provider == "openai" and not _credentials(provider)[0]:
+        raise RuntimeError("OPENAI_API_KEY is not set in environment.")
+
+
+def _limit(provider: str) -> int:
+    s = get_settings()
+    return max(1, s.anthropic_max_concurrency if provider == "anthropic" else s.openai_max_concurrency)
+
+
+def _semaphore(provider: str) -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    with _lock:
+        entry = _slots.get((id(loop), provider))
+        if entry is not None and entry[0] is loop:
+            return entry[1]
+        for k in [k for k, (lp, _) in _slots.items() if lp.is_closed()]:
+            del _slots[k]
+        sem = asyncio.Semaphore(_limit(provider))
+        _slots[(id(loop), provider)] = (loop, sem)
+        return sem
+
+
+def _bump(provider: str, **deltas: int) -> None:
+    with _lock:
+        for k, d in deltas.items():
+            _counts[provider][k] += d
+
+
+@asynccontextmanager
+async def llm_slot(provider: str) -> AsyncIterator[None]:
+    """
+    제공자별 진행 중 LLM 호출 상한(OPENAI_MAX_CONCURRENCY / ANTHROPIC_MAX_CONCURRENCY, 워커당).
+    상한에 걸리면 자리가 날 때까지 기다린다(대화 수와 무관하게 제공자 레이트 리밋 보호).
+    """
+    sem = _semaphore(provider)
+    _bump(provider, waiting=1)
+    try:
+        await sem.acquire()
+    finally:
+        _bump(provider, waiting=-1)
+    _bump(provider, in_flight=1, calls=1)
+    try:
+        yield
+    finally:
+        _bump(provider, in_flight=-1)
+        sem.release()
+
+
+def record_usage(provider: str, usage: Dict[str, int]) -> None:
+    """LLM 호출 1단계의 사용량(USAGE_FIELDS) 누적."""
+    with _lock:
+        acc = _usage[provider]
+        for k in USAGE_FIELDS:
+            acc[k] += int(usage.get(k) or 0)
+        acc["steps"] += 1
+
+
+def _usage_summary(acc: Dict[str, int]) -> Dict[str, Any]:
+    prompt = acc["input_tokens"] + acc["cache_read_input_tokens"] + acc["cache_creation_input_tokens"]
+    return {**acc, "cache_read_ratio": round(acc["cache_read_input_tokens"] / prompt, 4) if prompt else 0.0}
+
+
+async def aclose_llm_clients() -> None:
+    """현재 루프의 비동기 SDK 클라이언트 종료(앱 shutdown 시)."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        keys = [k for k, (lp, _) in _async_clients.items() if lp is loop]
+        clients = [_async_clients.pop(k)[1] for k in keys]
+    for c in clients:
+        try:
+            await c.close()
+        except Exception:  # noqa: BLE001
+            logger.debug("llm client close failed", exc_info=True)
+
+
+def llm_client_stats() -> Dict[str, Any]:
+    with _lock:
+        out: Dict[str, Any] = {
+            p: {**_counts[p], "limit": _limit(p), "usage": _usage_summary(_usage[p])} for p in PROVIDERS
+        }
+        out["sync_clients"] = len(_sync_clients)
+        out["async_clients"] = len(_async_clients)
+    return out
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, Generator, Iterator, List, Optional, Sequence, Tuple
+
+from mercari_ai_shopper.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+ToolFn = Callable[[Dict[str, Any]], Any]
+
+# 지연시간 EWMA 가중치(최근 표본 비중)
+_ALPHA = 0.2
+
+
+@dataclass
+class ToolCall:
+    """assistant 한 턴이 요청한 도구 호출 1건(제공자 공통 형태)."""
+
+    id: str
+    name: str
+    args: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class ToolOutcome:
+    """도구 호출 결과. ok=False면 error에 사유(예외 메시지/타임아웃/미등록 도구)."""
+
+    id: str
+    name: str
+    ok: bool
+    result: Any = None
+    error: Optional[str] = None
+    latency: float = 0.0
+
+    def payload(self) -> Dict[str, Any]:
+        """LLM에 돌려줄 본문({"ok", "result"} 또는 {"ok", "error"})."""
+        if self.ok:
+            return {"ok": True, "result": self.result}
+        return {"ok": False, "error": self.error}
+
+
+@dataclass
+class _ToolState:
+    calls: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    latency: Optional[float] = None  # EWMA(초)
+    max_latency: float = 0.0
+
+
+class ToolStats:
+    """도구별 호출 수/실패/타임아웃/지연시간(EWMA, 최대). /stats의 agent_tools로 노출."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._tools: Dict[str, _ToolState] = {}
+
+    def record(self, outcome: ToolOutcome, timed_out: bool = False) -> None:
+        with self._lock:
+            st = self._tools.setdefault(outcome.name, _ToolState())
+            st.calls += 1
+            st.errors += int(not outcome.ok)
+            st.timeouts += int(timed_out)
+            st.max_latency = max(st.max_latency, outcome.latency)
+            if st.latency is None:
+                st.latency = outcome.latency
+            else:
+                st.latency += _ALPHA * (outcome.latency - st.latency)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                name: {
+                    "calls": st.calls,
+                    "errors": st.errors,
+                    "timeouts": st.timeouts,
+                    "latency_ms": round(st.latency * 1000, 1) if st.latency is not None else None,
+                    "max_latency_ms": round(st.max_latency * 1000, 1),
+                }
+                for name, st in self._tools.items()
+            }
+
+
+tool_stats = ToolStats()
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    """프로세스 공용 도구 실행 풀(AGENT_TOOL_MAX_WORKERS개 스레드)."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(
+                    max_workers=max(1, get_settings().agent_tool_max_workers),
+                    thread_name_prefix="agent-tool",
+                )
+    return _pool
+
+
+def _invoke(fn: ToolFn, args: Dict[str, Any]) -> tuple[bool, Any, float]:
+    """워커 스레드에서 실행: (성공 여부, 결과 또는 오류 메시지, 실행 시간)."""
+    t0 = time.perf_counter()
+    try:
+        return True, fn(args), time.perf_counter() - t0
+    except Exception as e:  # noqa: BLE001
+        return False, str(e), time.perf_counter() - t0
+
+
+class ToolExecutor:
+    """
+    assistant 한 턴의 도구 호출들을 병렬 실행(OpenAI/Anthropic 공용).
+    - 공용 스레드 풀로 동시 실행 수를 제한
+    - 호출마다 timeout(초): 턴 시작부터 잰 시간이며, 넘긴 호출만 실패 처리
+      (스레드는 강제 종료할 수 없으므로 결과만 버린다)
+    - 한 호출의 예외/타임아웃은 그 호출의 ToolOutcome(ok=False)로만 남고 나머지에 영향 없음
+    - 결과는 입력 순서 그대로(tool_call id 유지)
+    """
+
+    def __init__(
+        self,
+        registry: Dict[str, ToolFn],
+        timeout: Optional[float] = None,
+        pool: Optional[ThreadPoolExecutor] = None,
+        stats: Optional[ToolStats] = None,
+    ):
+        self.registry = registry
+        self.timeout = timeout if timeout is not None else get_settings().agent_tool_timeout_seconds
+        self._pool = pool
+        self.stats = stats or tool_stats
+
+    def _finish(self, c: ToolCall, ok: bool, value: Any, latency: float, timed_out: bool = False) -> ToolOutcome:
+        if ok:
+            outcome = ToolOutcome(c.id, c.name, ok=True, result=value, latency=latency)
+        else:
+            outcome = ToolOutcome(c.id, c.name, ok=False, error=value, latency=latency)
+        self.stats.record(outcome, timed_out=timed_out)
+        return outcome
+
+    def iter_completed(self, calls: Sequence[ToolCall]) -> Iterator[Tuple[int, ToolOutcome]]:
+        """
+        (입력 위치, 결과)를 끝난 순서대로 내보낸다(진행 이벤트 스트리밍용).
+        제한 시간이 지나면 남은 호출을 모두 타임아웃으로 내보내고 끝낸다.
+        """
+        pool = self._pool or _get_pool()
+        start = time.perf_counter()
+        pending: Dict[Future, int] = {}
+        for i, c in enumerate(calls):
+            fn = self.registry.get(c.name)
+            if fn is None:
+                yield i, self._finish(c, False, f"Tool '{c.name}' not implemented", 0.0)
+                continue
+            pending[pool.submit(_invoke, fn, c.args)] = i
+
+        while pending:
+            done, _ = wait(
+                pending, timeout=max(0.0, start + self.timeout - time.perf_counter()), return_when=FIRST_COMPLETED
+            )
+            if not done:
+                for fut, i in pending.items():
+                    fut.cancel()  # 아직 시작 전이면 취소, 실행 중이면 결과만 버림
+                    c = calls[i]
+                    logger.warning("tool %s (%s) timed out after %.1fs", c.name, c.id, self.timeout)
+                    yield i, self._finish(
+                        c, False, f"timeout after {self.timeout:.0f}s", time.perf_counter() - start, timed_out=True
+                    )
+                return
+            for fut in done:
+                i = pending.pop(fut)
+                ok, value, latency = fut.result()
+                yield i, self._finish(calls[i], ok, value, latency)
+
+    def run(self, calls: Sequence[ToolCall]) -> List[ToolOutcome]:
+        outcomes: List[Optional[ToolOutcome]] = [None] * len(calls)
+        for i, outcome in self.iter_completed(calls):
+            outcomes[i] = outcome
+        return outcomes  # type: ignore[return-value]
+
+    def stream(self, calls: Sequence[ToolCall]) -> Generator[Dict[str, Any], None, List[ToolOutcome]]:
+        """
+        run()과 같지만 진행 이벤트를 내보낸다(스트리밍 /agent용).
+        tool_start(요청 순서) → tool_end(끝난 순서). 반환값(yield from)은 입력 순서의 결과 목록.
+        """
+        for c in calls:
+            yield tool_start_event(c)
+        outcomes: List[Optional[ToolOutcome]] = [None] * len(calls)
+        for i, out in self.iter_completed(calls):
+            outcomes[i] = out
+            yield tool_end_event(out)
+        return outcomes  # type: ignore[return-value]
+
+
+def tool_start_event(c: ToolCall) -> Dict[str, Any]:
+    return {"type": "tool_start", "id": c.id, "name": c.name, "args": c.args}
+
+
+def tool_end_event(out: ToolOutcome) -> Dict[str, Any]:
+    event: Dict[str, Any] = {
+        "type": "tool_end", "id": out.id, "name": out.name,
+        "ok": out.ok, "latency_ms": round(out.latency * 1000, 1),
+    }
+    if not out.ok:
+        event["error"] = out.error
+    return event
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# asyncio 버전 (비동기 LLM 클라이언트용)
+# ──────────────────────────────────────────────────────────────────────────────
+async def _ainvoke(fn: Callable[[Dict[str, Any]], Any], args: Dict[str, Any]) -> tuple[bool, Any, float]:
+    """코루틴 도구는 루프에서 바로, 동기 도구는 스레드에서 실행(이벤트 루프를 막지 않음)."""
+    t0 = time.perf_counter()
+    try:
+        if inspect.iscoroutinefunction(fn):
+            value = await fn(args)
+        else:
+            value = await asyncio.to_thread(fn, args)
+        return True, value, time.perf_counter() - t0
+    except Exception as e:  # noqa: BLE001
+        return False, str(e), time.perf_counter() - t0
+
+
+class AsyncToolExecutor(ToolExecutor):
+    """
+    ToolExecutor의 asyncio 버전. 레지스트리에 async def 도구를 두면 스레드 없이 실행되고,
+    제한 시간을 넘긴 코루틴 도구는 실제로 취소된다(동기 도구는 결과만 버림).
+    결과 형식/통계/이벤트는 동기 버전과 같다.
+    """
+
+    async def aiter_completed(self, calls: Sequence[ToolCall]) -> AsyncIterator[Tuple[int, ToolOutcome]]:
+        start = time.perf_counter()
+        pending: Dict[asyncio.Task, int] = {}
+        for i, c in enumerate(calls):
+            fn = self.registry.get(c.name)
+            if fn is None:
+                yield i, self._finish(c, False, f"Tool '{c.name}' not implemented", 0.0)
+                continue
+            pending[asyncio.ensure_future(_ainvoke(fn, c.args))] = i
+
+        try:
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending, timeout=max(0.0, start + self.timeout - time.perf_counter()),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    for task, i in pending.items():
+                        task.cancel()
+                        c = calls[i]
+                        logger.warning("tool %s (%s) timed out after %.1fs", c.name, c.id, self.timeout)
+                        yield i, self._finish(
+                            c, False, f"timeout after {self.timeout:.0f}s", time.perf_counter() - start, timed_out=True
+                        )
+                    pending.clear()
+                    return
+                for task in done:
+                    i = pending.pop(task)
+                    ok, value, latency = task.result()
+                    yield i, self._finish(calls[i], ok, value, latency)
+        finally:
+            # 소비자가 중간에 끊으면(클라이언트 연결 종료 등) 남은 도구도 취소
+            for task in pending:
+                task.cancel()
+
+    async def arun(self, calls: Sequence[ToolCall]) -> List[ToolOutcome]:
+        outcomes: List[Optional[ToolOutcome]] = [None] * len(calls)
+        async for i, outcome in self.aiter_completed(calls):
+            outcomes[i] = outcome
+        return outcomes  # type: ignore[return-value]
+
+
+def tool_executor_stats() -> Dict[str, Any]:
+    return tool_stats.snapshot()
@@ -1,5 +1,5 @@
 from .query import SearchQuery, SortOption
-from .listing import Listing, SellerInfo
+from .listing import Listing, ListingRecord, SellerInfo, SellerRecord
 from .recommendation import RankedListing, RecommendationResponse
 
 __all__ = [
@@ -7,6 +7,8 @@ __all__ = [
     "SortOption",
     "Listing",
     "SellerInfo",
+    "ListingRecord",
+    "SellerRecord",
     "RankedListing",
     "RecommendationResponse",
 ]
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import Any, Optional, Union
+from urllib.parse import urlsplit
+
 from pydantic import BaseModel, Field, HttpUrl, field_validator
 
 
@@ -46,3 +48,124 @@ class Listing(BaseModel):
     @classmethod
     def _normalize_condition(cls, v: Optional[str]) -> Optional[str]:
         return v.strip() if isinstance(v, str) else v
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 내부 경량 레코드 (스크랩 → 필터 → 랭킹 경로)
+# ──────────────────────────────────────────────────────────────────────────────
+def _http_url(v: Any) -> Optional[str]:
+    """http(s) + 호스트가 있는 문자열만 통과(HttpUrl 검증의 값싼 사전 검사)."""
+    if not isinstance(v, str):
+        return None
+    head = v[:8].lower()
+    if not (head.startswith("https://") or head.startswith("http://")):
+        return None
+    return v if urlsplit(v).netloc else None
+
+
+def _non_negative(v: Optional[int]) -> Optional[int]:
+    return v if v is None or v >= 0 else None
+
+
+class SellerRecord:
+    """SellerInfo의 경량판(__slots__). 범위 밖 값은 None으로 정리해 둔다."""
+
+    __slots__ = ("name", "rating", "sales_count")
+
+    def __init__(self, name: Optional[str] = None, rating: Optional[float] = None, sales_count: Optional[int] = None):
+        self.name = name
+        self.rating = rating if rating is None or 0.0 <= rating <= 5.0 else None
+        self.sales_count = _non_negative(sales_count)
+
+    def to_model(self) -> SellerInfo:
+        return SellerInfo.model_construct(name=self.name, rating=self.rating, sales_count=self.sales_count)
+
+
+class ListingRecord:
+    """
+    파서가 만드는 내부 리스팅 레코드(__slots__, pydantic 검증 없음).
+    - create()에서 Listing 검증 규칙(가격 ≥ 0, http(s) URL, 제목/상태 strip)을 값싸게 미리 적용
+    - 필터(scraping.pipeline)와 랭킹(agent.reasoning)은 이 레코드를 그대로 읽는다
+    - API 경계(검색 결과 반환, 랭킹 승자)에서만 to_listing()으로 Listing을 만든다.
+      이미 검사한 값이므로 model_construct(검증 생략) + URL만 HttpUrl로 변환한다.
+    """
+
+    __slots__ = (
+        "title", "price_jpy", "condition", "shipping", "url", "image_url",
+        "seller", "sold", "likes", "description_snippet",
+    )
+
+    def __init__(
+        self,
+        title: str,
+        price_jpy: int,
+        condition: Optional[str],
+        shipping: Optional[str],
+        url: str,
+        image_url: Optional[str],
+        seller: Optional[SellerRecord],
+        sold: Optional[bool],
+        likes: Optional[int],
+        description_snippet: Optional[str],
+    ):
+        self.title = title
+        self.price_jpy = price_jpy
+        self.condition = condition
+        self.shipping = shipping
+        self.url = url
+        self.image_url = image_url
+        self.seller = seller
+        self.sold = sold
+        self.likes = likes
+        self.description_snippet = description_snippet
+
+    @classmethod
+    def create(
+        cls,
+        *,
+        title: str,
+        price_jpy: Optional[int],
+        url: Any,
+        condition: Optional[str] = None,
+        shipping: Optional[str] = None,
+        image_url: Any = None,
+        seller: Optional[SellerRecord] = None,
+        sold: Optional[bool] = None,
+        likes: Optional[int] = None,
+        description_snippet: Optional[str] = None,
+    ) -> Optional["ListingRecord"]:
+        """검증 규칙을 통과하면 레코드, 아니면 None(기존 Listing 생성 실패와 같은 항목을 버림)."""
+        item_url = _http_url(url)
+        if price_jpy is None or price_jpy < 0 or item_url is None:
+            return None
+        return cls(
+            title.strip(),
+            price_jpy,
+            condition.strip() if isinstance(condition, str) else condition,
+            shipping,
+            item_url,
+            _http_url(image_url),
+            seller,
+            sold,
+            _non_negative(likes),
+            description_snippet,
+        )
+
+    def to_listing(self) -> Listing:
+        return Listing.model_construct(
+            title=self.title,
+            price_jpy=self.price_jpy,
+            condition=self.condition,
+            shipping=self.shipping,
+            url=HttpUrl(self.url),
+            image_url=HttpUrl(self.image_url) if self.image_url else None,
+            seller=self.seller.to_model() if self.seller is not None else None,
+            sold=self.sold,
+            likes=self.likes,
+            description_snippet=self.description_snippet,
+        )
+
+
+def as_listing(it: Union[Listing, ListingRecord]) -> Listing:
+    """랭킹/응답 경계용: 레코드면 Listing으로, 이미 Listing이면 그대로."""
+    return it.to_listing() if isinstance(it, ListingRecord) else it
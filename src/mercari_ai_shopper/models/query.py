@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from typing import List, Optional, Literal
+from typing import List, Optional, Literal, Tuple
 from pydantic import BaseModel, Field, field_validator
 
+from mercari_ai_shopper.utils.text import normalize_text
+
 
 # 정렬 옵션(머카리 UI에 맞춘 합리적 가정)
 SortOption = Literal["relevance", "price_asc", "price_desc", "new"]
@@ -57,3 +59,24 @@ class SearchQuery(BaseModel):
         if vmax is not None and vmin is not None and vmax < vmin:
             raise ValueError("budget_max must be >= budget_min")
         return vmax
+
+    def cache_key(self) -> Tuple:
+        """
+        검색 파이프라인 결과를 공유해도 되는 질의끼리 같은 값을 갖는 정규화 키.
+        - raw_text는 결과에 영향이 없으므로 제외
+        - 키워드/브랜드/색상: NFKC·공백 정규화 후 정렬
+        """
+        def norm(vs: List[str]) -> Tuple[str, ...]:
+            return tuple(sorted(normalize_text(v) for v in vs if v and v.strip()))
+
+        return (
+            norm(self.keywords),
+            self.budget_min,
+            self.budget_max,
+            tuple(sorted(self.condition)),
+            norm(self.brand),
+            norm(self.color),
+            normalize_text(self.category) if self.category else None,
+            self.sort,
+            self.limit,
+        )
@@ -4,55 +4,74 @@ import argparse
 from typing import List
 
 from mercari_ai_shopper.models.query import SearchQuery
-from mercari_ai_shopper.scraping.mercari_client import search as http_search
+from mercari_ai_shopper.scraping.mercari_client import iter_search as http_search
 from mercari_ai_shopper.scraping.mercari_playwright import search_playwright
-from mercari_ai_shopper.agent.reasoning import rank_and_explain
+from mercari_ai_shopper.scraping.engine import search_auto
+from mercari_ai_shopper.agent.enrichment import enrich_and_rank
+from mercari_ai_shopper.agent.query_parser import parse_query
+from mercari_ai_shopper.config import get_settings
 
 
 def main(argv: List[str] | None = None) -> int:
     p = argparse.ArgumentParser(description="Mercari AI Shopper CLI")
     p.add_argument("--query", required=True, help="자연어 또는 키워드 (일본어 권장)")
-    p.add_argument("--keywords", nargs="*", default=None, help="키워드 배열. 미지정 시 --query 그대로 1개로 사용")
+    p.add_argument("--keywords", nargs="*", default=None, help="키워드 배열. 미지정 시 --query를 규칙 파서로 해석(확신도가 낮으면 --query 그대로 1개로 사용)")
     p.add_argument("--budget-max", type=int, default=None)
     p.add_argument("--budget-min", type=int, default=None)
     p.add_argument("--condition", nargs="*", default=None)
     p.add_argument("--brand", nargs="*", default=None)
     p.add_argument("--color", nargs="*", default=None)
     p.add_argument("--category", default=None)
-    p.add_argument("--sort", default="relevance", choices=["relevance", "price_asc", "price_desc", "new"])
+    p.add_argument("--sort", default=None, choices=["relevance", "price_asc", "price_desc", "new"])
     p.add_argument("--limit", type=int, default=30)
     p.add_argument("--top-k", type=int, default=3)
-    p.add_argument("--engine", default="http", choices=["http", "playwright"])
+    p.add_argument("--engine", default="http", choices=["http", "playwright", "auto"])
+    p.add_argument(
+        "--enrich-top", type=int, default=0,
+        help="1차 랭킹 상위 N개만 상세 페이지로 판매자/설명 보강 후 재랭킹 (0=끔)",
+    )
 
     args = p.parse_args(argv)
 
-    kws = args.keywords if args.keywords else [args.query]
+    # --keywords가 없으면 자연어 요청을 규칙 파서로 해석(Agent와 같은 확신도 임계값). 명시한 인자가 항상 우선
+    parsed = {}
+    if not args.keywords:
+        pq = parse_query(args.query)
+        if pq.confidence >= get_settings().agent_rule_parser_min_confidence:
+            parsed = pq.args
+    kws = args.keywords or parsed.get("keywords") or [args.query]
 
     q = SearchQuery(
         raw_text=args.query,
         keywords=kws,
-        budget_min=args.budget_min,
-        budget_max=args.budget_max,
-        condition=args.condition or [],
-        brand=args.brand or [],
-        color=args.color or [],
+        budget_min=args.budget_min if args.budget_min is not None else parsed.get("budget_min"),
+        budget_max=args.budget_max if args.budget_max is not None else parsed.get("budget_max"),
+        condition=args.condition or parsed.get("condition", []),
+        brand=args.brand or parsed.get("brand", []),
+        color=args.color or parsed.get("color", []),
         category=args.category,
-        sort=args.sort,
+        sort=args.sort or parsed.get("sort", "relevance"),
         limit=args.limit,
     )
 
     if args.engine == "playwright":
         items = search_playwright(q)
+    elif args.engine == "auto":
+        # HTTP 우선, 결과가 부족하거나 느리면 Playwright 병행
+        items = search_auto(q).items
     else:
+        # 제너레이터: 페이지가 도착하는 대로 랭킹(상위 K개만 유지)
         items = http_search(None, q)
 
-    ranked = rank_and_explain(items, q, top_k=args.top_k)
+    ranked = enrich_and_rank(items, q, top_k=args.top_k, top_n=args.enrich_top)
 
     # 보기 좋게 출력
     for i, r in enumerate(ranked, 1):
         print(f"{i}. {r.listing.title}  ¥{r.listing.price_jpy}")
         if r.listing.condition:
             print(f"   - 상태: {r.listing.condition}")
+        if r.listing.seller and r.listing.seller.rating is not None:
+            print(f"   - 판매자 평점: {r.listing.seller.rating}")
         print(f"   - URL: {r.listing.url}")
         print(f"   - 점수: {r.score}")
         if r.reasons:
@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from mercari_ai_shopper.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# (stop 핸들, browser). stop은 playwright 인스턴스 종료용(없으면 None)
+Launcher = Callable[[], Tuple[Optional[Callable[[], None]], Any]]
+
+_HEAP_JS = "() => (performance.memory && performance.memory.usedJSHeapSize) || 0"
+
+
+def _default_launcher(headless: bool) -> Launcher:
+    def launch() -> Tuple[Optional[Callable[[], None]], Any]:
+        from playwright.sync_api import sync_playwright
+
+        p = sync_playwright().start()
+        try:
+            browser = p.chromium.launch(headless=headless)
+        except Exception:
+            p.stop()
+            raise
+        return p.stop, browser
+
+    return launch
+
+
+class _Job:
+    __slots__ = ("fn", "future", "enqueued_at")
+
+    def __init__(self, fn: Callable[[Any], Any]):
+        self.fn = fn
+        self.future: Future = Future()
+        self.enqueued_at = time.monotonic()
+
+
+class _Worker(threading.Thread):
+    """
+    브라우저 1개 + 웜 컨텍스트/페이지 1개를 소유하는 스레드.
+    Playwright sync API 객체는 생성한 스레드에서만 쓸 수 있으므로 모든 조작을 이 스레드에서 한다.
+    """
+
+    def __init__(self, pool: "BrowserPool", index: int):
+        super().__init__(name=f"browser-pool-{index}", daemon=True)
+        self.pool = pool
+        self.index = index
+        self._stop_pw: Optional[Callable[[], None]] = None
+        self.browser: Any = None
+        self.context: Any = None
+        self.page: Any = None
+        self.uses = 0
+        self.busy = False
+
+    # ── 브라우저 수명 ─────────────────────────────────────────────────────────
+    def _ensure(self) -> None:
+        """헬스 체크: 끊긴 브라우저는 재시작, 컨텍스트/페이지가 없으면 새로 만든다."""
+        if self.browser is not None and not self.browser.is_connected():
+            logger.warning("browser %d disconnected; relaunching", self.index)
+            self._teardown()
+        if self.browser is None:
+            self._stop_pw, self.browser = self.pool._launcher()
+            self.uses = 0
+            self.pool._count("launches")
+        if self.context is None:
+            self.context = self.browser.new_context(locale="ja-JP")
+            self.page = self.context.new_page()
+
+    def _teardown(self) -> None:
+        for obj in (self.page, self.context, self.browser):
+            if obj is None:
+                continue
+            try:
+                obj.close()
+            except Exception:  # noqa: BLE001
+                pass
+        if self._stop_pw is not None:
+            try:
+                self._stop_pw()
+            except Exception:  # noqa: BLE001
+                pass
+        self._stop_pw = self.browser = self.context = self.page = None
+
+    def _heap_bytes(self) -> int:
+        try:
+            return int(self.page.evaluate(_HEAP_JS) or 0)
+        except Exception:  # noqa: BLE001
+            return 0
+
+    def _drop_context(self) -> None:
+        for obj in (self.page, self.context):
+            if obj is None:
+                continue
+            try:
+                obj.close()
+            except Exception:  # noqa: BLE001
+                pass
+        self.context = self.page = None
+
+    def _reset_after_use(self, failed: bool) -> None:
+        """
+        사용 후 정리.
+        - K회 사용 / JS 힙 상한 초과 → 브라우저째 재시작
+        - 작업 실패 → 컨텍스트만 버리고 다음 사용 때 새로 생성
+        - 그 외 → 쿠키 삭제 + about:blank (다음 사용자에게 상태가 새지 않게)
+        """
+        pool = self.pool
+        if self.uses >= pool.recycle_after or (
+            pool.max_heap_bytes and self.page is not None and self._heap_bytes() > pool.max_heap_bytes
+        ):
+            self._teardown()
+            pool._count("recycles")
+            return
+        if failed or self.context is None:
+            self._drop_context()
+            return
+        try:
+            self.context.clear_cookies()
+            self.page.goto("about:blank")
+        except Exception:  # noqa: BLE001
+            self._drop_context()
+
+    # ── 작업 루프 ─────────────────────────────────────────────────────────────
+    def run(self) -> None:
+        pool = self.pool
+        if pool.prelaunch:
+            try:
+                self._ensure()
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("browser %d prelaunch failed: %s", self.index, exc)
+        while True:
+            job = pool._jobs.get()
+            if job is None:
+                break
+            if not job.future.set_running_or_notify_cancel():
+                continue
+            started = time.monotonic()
+            pool._record_wait(started - job.enqueued_at)
+            self.busy = True
+            failed = False
+            try:
+                self._ensure()
+                self.uses += 1
+                job.future.set_result(job.fn(self.page))
+            except BaseException as exc:  # noqa: BLE001
+                failed = True
+                pool._count("failures")
+                job.future.set_exception(exc)
+            finally:
+                try:
+                    if self.browser is not None:
+                        self._reset_after_use(failed)
+                finally:
+                    self.busy = False
+                    pool._record_busy(time.monotonic() - started)
+        self._teardown()
+
+
+class BrowserPool:
+    """
+    장수명 Playwright 브라우저 풀.
+    - size개 워커 스레드가 각자 브라우저 + 웜 컨텍스트/페이지를 보유
+    - 작업은 크기 제한 큐(queue_size)로 들어가 비어 있는 워커가 처리(가득 차면 대기/타임아웃)
+    - 사용 후 쿠키 삭제 + about:blank로 리셋, recycle_after회 사용 또는 JS 힙 상한 초과 시 재시작
+    - 연결이 끊긴 브라우저는 다음 작업 전에 재시작(헬스 체크)
+    launcher를 주입하면 실제 Chromium 없이 테스트할 수 있다.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        recycle_after: int = 50,
+        max_heap_mb: int = 512,
+        queue_size: int = 64,
+        headless: bool = True,
+        launcher: Optional[Launcher] = None,
+        prelaunch: bool = True,
+    ):
+        self.size = max(1, size)
+        self.recycle_after = max(1, recycle_after)
+        self.max_heap_bytes = max(0, max_heap_mb) * 1024 * 1024
+        self.prelaunch = prelaunch
+        self._launcher = launcher or _default_launcher(headless)
+        self._jobs: "queue.Queue[Optional[_Job]]" = queue.Queue(maxsize=max(1, queue_size))
+        self._workers: List[_Worker] = []
+        self._lock = threading.Lock()
+        self._started_at: Optional[float] = None
+        self._closed = False
+        self._stats: Dict[str, float] = {
+            "jobs": 0, "failures": 0, "launches": 0, "recycles": 0,
+            "wait_total": 0.0, "wait_max": 0.0, "busy_total": 0.0,
+        }
+
+    # ── 수명 ──────────────────────────────────────────────────────────────────
+    def start(self) -> "BrowserPool":
+        with self._lock:
+            if self._workers or self._closed:
+                return self
+            self._started_at = time.monotonic()
+            self._workers = [_Worker(self, i) for i in range(self.size)]
+            for w in self._workers:
+                w.start()
+        return self
+
+    def close(self, timeout: float = 10.0) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers = list(self._workers)
+        # 아직 시작 안 한 작업은 취소(호출자는 CancelledError). 큐가 가득 찬 채로 종료 신호를 넣다 멈추지 않게
+        while True:
+            try:
+                job = self._jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job is not None:
+                job.future.cancel()
+        deadline = time.monotonic() + timeout
+        for _ in workers:
+            try:
+                self._jobs.put(None, timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Full:
+                break  # 데몬 스레드라 프로세스 종료를 막지는 않는다
+        for w in workers:
+            w.join(max(0.0, deadline - time.monotonic()))
+
+    # ── 사용 ──────────────────────────────────────────────────────────────────
+    def run(self, fn: Callable[[Any], T], timeout: Optional[float] = None) -> T:
+        """
+        웜 페이지 하나를 빌려 fn(page)를 실행하고 결과를 돌려준다.
+        timeout: 큐 대기 + 실행 전체 상한(초). 넘기면 작업을 취소(아직 시작 전이면 워커가 건너뜀).
+        """
+        if self._closed:
+            raise RuntimeError("browser pool is closed")
+        self.start()
+        job = _Job(fn)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            self._jobs.put(job, timeout=timeout)
+        except queue.Full:
+            raise TimeoutError("browser pool queue is full") from None
+        try:
+            return job.future.result(timeout=None if deadline is None else max(0.0, deadline - time.monotonic()))
+        except TimeoutError:
+            job.future.cancel()
+            raise
+
+    # ── 관측 ──────────────────────────────────────────────────────────────────
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def _record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self._stats["jobs"] += 1
+            self._stats["wait_total"] += seconds
+            self._stats["wait_max"] = max(self._stats["wait_max"], seconds)
+
+    def _record_busy(self, seconds: float) -> None:
+        with self._lock:
+            self._stats["busy_total"] += seconds
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            st = dict(self._stats)
+            workers = list(self._workers)
+            started = self._started_at
+        elapsed = time.monotonic() - started if started else 0.0
+        jobs = int(st["jobs"])
+        return {
+            "size": self.size,
+            "busy": sum(1 for w in workers if w.busy),
+            "queued": self._jobs.qsize(),
+            "jobs": jobs,
+            "failures": int(st["failures"]),
+            "launches": int(st["launches"]),
+            "recycles": int(st["recycles"]),
+            "avg_wait_ms": round(st["wait_total"] / jobs * 1000, 2) if jobs else 0.0,
+            "max_wait_ms": round(st["wait_max"] * 1000, 2),
+            "utilization": round(st["busy_total"] / (elapsed * self.size), 4) if elapsed else 0.0,
+        }
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Settings 기반 프로세스 공용 풀(최초 호출 시 시작)."""
+    global _pool
+    if _pool is not None:
+        return _pool
+    with _pool_lock:
+        if _pool is None:
+            s = get_settings()
+            _pool = BrowserPool(
+                size=s.playwright_pool_size,
+                recycle_after=s.playwright_recycle_after,
+                max_heap_mb=s.playwright_max_heap_mb,
+                queue_size=s.playwright_pool_queue_size,
+                headless=s.playwright_headless,
+            ).start()
+        return _pool
+
+
+def close_browser_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
+
+
+def browser_pool_stats() -> Optional[Dict[str, Any]]:
+    """풀이 아직 만들어지지 않았으면 None."""
+    return _pool.stats() if _pool is not None else None
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from mercari_ai_shopper.config import get_settings
+from mercari_ai_shopper.models.listing import Listing
+from mercari_ai_shopper.models.query import SearchQuery
+
+logger = logging.getLogger(__name__)
+
+ENGINE_HTTP = "http"
+ENGINE_PLAYWRIGHT = "playwright"
+
+AsyncEngine = Callable[[SearchQuery], Awaitable[List[Listing]]]
+
+# EWMA 가중치(최근 표본 비중)
+_ALPHA = 0.2
+# 이 표본 수 전까지는 성공률로 판단하지 않음
+_MIN_SAMPLES = 3
+
+
+@dataclass
+class _EngineState:
+    samples: int = 0
+    successes: int = 0
+    latency: Optional[float] = None  # EWMA(초)
+    deviation: float = 0.0  # |x - EWMA|의 EWMA
+    success_rate: float = 1.0  # EWMA
+
+
+class EngineStats:
+    """
+    엔진별 성공률/지연시간 EWMA. auto 모드의 헤지 지연을 정한다.
+    헤지 지연 = HTTP 지연 EWMA + 3×편차 (hedge_min ~ hedge_max로 제한).
+    """
+
+    def __init__(self, hedge_min: float = 0.5, hedge_max: float = 8.0, hedge_initial: float = 3.0):
+        self.hedge_min = hedge_min
+        self.hedge_max = hedge_max
+        self.hedge_initial = hedge_initial
+        self._lock = threading.Lock()
+        self._engines: Dict[str, _EngineState] = {}
+
+    def record(self, engine: str, latency: float, ok: bool) -> None:
+        with self._lock:
+            st = self._engines.setdefault(engine, _EngineState())
+            st.samples += 1
+            st.successes += int(ok)
+            st.success_rate += _ALPHA * (float(ok) - st.success_rate)
+            # 지연은 성공한 경우만 반영(실패는 대개 빠르게 끝나 평균을 왜곡)
+            if ok:
+                if st.latency is None:
+                    st.latency = latency
+                else:
+                    st.deviation += _ALPHA * (abs(latency - st.latency) - st.deviation)
+                    st.latency += _ALPHA * (latency - st.latency)
+
+    def success_rate(self, engine: str) -> float:
+        with self._lock:
+            st = self._engines.get(engine)
+            if st is None or st.samples < _MIN_SAMPLES:
+                return 1.0
+            return st.success_rate
+
+    def hedge_delay(self) -> float:
+        """HTTP 결과를 기다릴 시간(초). HTTP가 계속 실패 중이면 0(바로 브라우저 병행)."""
+        if self.success_rate(ENGINE_HTTP) < 0.3:
+            return 0.0
+        with self._lock:
+            st = self._engines.get(ENGINE_HTTP)
+            if st is None or st.latency is None:
+                return self.hedge_initial
+            delay = st.latency + 3 * st.deviation
+        return max(self.hedge_min, min(self.hedge_max, delay))
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = {
+                name: {
+                    "samples": st.samples,
+                    "successes": st.successes,
+                    "success_rate": round(st.success_rate, 4),
+                    "latency_ms": round(st.latency * 1000, 1) if st.latency is not None else None,
+                    "deviation_ms": round(st.deviation * 1000, 1),
+                }
+                for name, st in self._engines.items()
+            }
+        out["hedge_delay_ms"] = round(self.hedge_delay() * 1000, 1)
+        return out
+
+
+def _new_stats() -> EngineStats:
+    s = get_settings()
+    return EngineStats(s.auto_hedge_min_seconds, s.auto_hedge_max_seconds, s.auto_hedge_initial_seconds)
+
+
+engine_stats = _new_stats()
+
+
+@dataclass
+class AutoResult:
+    items: List[Listing] = field(default_factory=list)
+    engine: str = ENGINE_HTTP  # 결과를 낸 엔진
+    hedged: bool = False  # 브라우저 엔진을 띄웠는지
+
+
+def min_results(q: SearchQuery) -> int:
+    """이보다 적게 나오면 '수상하게 적음'으로 보고 다른 엔진을 시도."""
+    return max(1, min(q.limit, get_settings().auto_min_results))
+
+
+async def _default_http(q: SearchQuery) -> List[Listing]:
+    from .mercari_client import async_search
+
+    return await async_search(q)
+
+
+async def _default_browser(q: SearchQuery) -> List[Listing]:
+    from .mercari_playwright import search_playwright
+
+    return await asyncio.to_thread(search_playwright, q)
+
+
+async def asearch_auto(
+    q: SearchQuery,
+    http: Optional[AsyncEngine] = None,
+    browser: Optional[AsyncEngine] = None,
+    stats: Optional[EngineStats] = None,
+) -> AutoResult:
+    """
+    HTTP 우선 + 헤지 검색.
+    1) HTTP 검색 시작
+    2) 헤지 지연 안에 충분한 결과(min_results 이상)가 오면 그대로 반환
+    3) 실패/결과 부족/지연 초과 시 Playwright 검색을 병행하고 먼저 충분한 결과를 낸 쪽 채택
+    4) 둘 다 부족하면 더 많은 쪽(동수면 HTTP)
+    엔진별 결과는 stats에 기록되어 다음 헤지 지연 계산에 쓰인다.
+    """
+    http = http or _default_http
+    browser = browser or _default_browser
+    stats = stats or engine_stats
+    need = min_results(q)
+
+    async def timed(name: str, engine: AsyncEngine) -> tuple[str, List[Listing]]:
+        t0 = time.monotonic()
+        try:
+            items = await engine(q)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("%s engine failed: %s", name, exc)
+            stats.record(name, time.monotonic() - t0, False)
+            return name, []
+        stats.record(name, time.monotonic() - t0, len(items) >= need)
+        return name, items
+
+    t_http = asyncio.create_task(timed(ENGINE_HTTP, http))
+    done, _ = await asyncio.wait({t_http}, timeout=stats.hedge_delay())
+    best: Optional[tuple[str, List[Listing]]] = None
+    if t_http in done:
+        best = t_http.result()
+        if len(best[1]) >= need:
+            return AutoResult(items=best[1], engine=ENGINE_HTTP)
+        logger.info("http engine returned %d items (< %d); trying playwright", len(best[1]), need)
+    else:
+        logger.info("http engine slower than hedge delay; starting playwright")
+
+    pending = {asyncio.create_task(timed(ENGINE_PLAYWRIGHT, browser))}
+    if t_http not in done:
+        pending.add(t_http)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            # HTTP가 먼저 끝나는 동시 완료도 HTTP 우선
+            for t in sorted(done, key=lambda t: t is not t_http):
+                name, items = t.result()
+                if len(items) >= need:
+                    return AutoResult(items=items, engine=name, hedged=True)
+                if best is None or len(items) > len(best[1]):
+                    best = (name, items)
+    finally:
+        # 진 HTTP 요청은 취소. 브라우저 작업은 스레드라 끝까지 돌고 결과만 버려진다(통계에는 반영)
+        if not t_http.done():
+            t_http.cancel()
+    name, items = best or (ENGINE_HTTP, [])
+    return AutoResult(items=items, engine=name, hedged=True)
+
+
+def search_auto(q: SearchQuery) -> AutoResult:
+    """asearch_auto의 동기 버전(CLI용). HTTP 엔진은 동기 search()를 스레드로 실행."""
+    from .mercari_client import search
+
+    async def http(q: SearchQuery) -> List[Listing]:
+        return await asyncio.to_thread(search, None, q)
+
+    return asyncio.run(asearch_auto(q, http=http))
@@ -1,17 +1,42 @@
 from __future__ import annotations
 
+import asyncio
 import os
-import re
+import threading
 import time
 import logging
-from typing import List, Optional
-from urllib.parse import urlencode, urljoin
-
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Sequence
+from urllib.parse import parse_qs, urlencode, urljoin, urlsplit
+
+import httpx
 import requests
 from bs4 import BeautifulSoup
 
-from mercari_ai_shopper.models.listing import Listing, SellerInfo
+from mercari_ai_shopper.config import get_settings
+from mercari_ai_shopper.models.listing import Listing, ListingRecord
 from mercari_ai_shopper.models.query import SearchQuery
+from mercari_ai_shopper.utils.http import HttpClient, get_async_http_client, get_http_client
+from mercari_ai_shopper.utils.http_cache import get_response_cache
+from mercari_ai_shopper.utils.ratelimit import backoff_delay, get_rate_limiter, parse_retry_after
+from .parsers import (  # noqa: F401
+    # ITEM_URL_PREFIX/YEN_PRICE_RE: 기존 import 경로(mercari_client.*) 유지
+    ITEM_URL_PREFIX,
+    YEN_PRICE_RE,
+    _clean_text,
+    _extract_price_int,
+    _first_non_empty,
+    _parse_listing_detail,
+    parse_detail_page,
+    parse_listing_cards,
+    parse_search_page,
+    parse_search_records,
+)
+from .pipeline import compile_pipeline, sort_limit
+from .pushdown import pushdown_params, verify_pushdown
 
 logger = logging.getLogger(__name__)
 
@@ -35,87 +60,117 @@ DEFAULT_HEADERS = {
     "Cache-Control": "no-cache",
 }
 
-ITEM_URL_PREFIX = "https://jp.mercari.com/item/"
-
-# Yen price pattern (ex: ¥12,345)
-YEN_PRICE_RE = re.compile(r"[¥￥]\s?([\d,]+)")
-
-
 # ──────────────────────────────────────────────────────────────────────────────
 # HTTP 유틸
 # ──────────────────────────────────────────────────────────────────────────────
-def _request(session: requests.Session, url: str, params: Optional[dict] = None) -> requests.Response:
+def _request(session: HttpClient, url: str, params: Optional[dict] = None) -> requests.Response:
     """
     간단한 재시도/백오프 포함 GET 요청.
+    - 공유 레이트 리미터(utils.ratelimit): 토큰 버킷 + AIMD 동시성, Retry-After 존중
+    - 디스크 응답 캐시(utils.http_cache)가 켜져 있으면 신선한 항목은 네트워크 없이 반환
+    - 만료 항목은 ETag/Last-Modified로 조건부 요청 → 304면 캐시 본문 재사용
     """
+    cache = get_response_cache()
+    entry = cache.lookup(url, params) if cache is not None else None
+    if entry is not None and entry.fresh:
+        return entry.response()  # type: ignore[return-value]
+    headers = {**DEFAULT_HEADERS, **entry.validators()} if entry is not None else DEFAULT_HEADERS
+
+    limiter = get_rate_limiter()
     last_exc = None
     for attempt in range(1, HTTP_MAX_RETRIES + 1):
+        retry_after = None
         try:
-            resp = session.get(url, params=params, headers=DEFAULT_HEADERS, timeout=HTTP_TIMEOUT)
-            # 일부 사이트는 403/429 발생 가능 → 백오프
+            # 공유 토큰 버킷 + AIMD 동시성 슬롯을 얻은 뒤에만 요청
+            with limiter.slot(url) if limiter is not None else nullcontext():
+                t0 = time.monotonic()
+                resp = session.get(url, params=params, headers=headers, timeout=HTTP_TIMEOUT)
+                latency = time.monotonic() - t0
+            # 일부 사이트는 403/429 발생 가능 → Retry-After 존중 + 지터 백오프
             if resp.status_code in (429, 403, 503):
+                retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                if limiter is not None:
+                    limiter.on_throttle(url, retry_after)
                 raise requests.HTTPError(f"Status {resp.status_code}")
+            if limiter is not None and resp.status_code < 400:
+                limiter.on_success(url, latency)
+            if resp.status_code == 304 and entry is not None:
+                return cache.revalidated(entry, resp.headers)  # type: ignore[union-attr,return-value]
             resp.raise_for_status()
+            if cache is not None:
+                cache.store(url, params, resp)
             return resp
         except Exception as exc:  # noqa: BLE001
             last_exc = exc
             logger.warning("GET failed (attempt %s/%s): %s", attempt, HTTP_MAX_RETRIES, exc)
             if attempt < HTTP_MAX_RETRIES:
-                time.sleep(HTTP_BACKOFF_SECONDS * attempt)
+                time.sleep(backoff_delay(attempt, HTTP_BACKOFF_SECONDS, retry_after))
     # 최종 실패
     raise last_exc  # type: ignore[misc]
 
 
-# ──────────────────────────────────────────────────────────────────────────────
-# 검색 URL 빌더
-# ──────────────────────────────────────────────────────────────────────────────
-def build_search_url(q: SearchQuery) -> str:
+async def _arequest(client: httpx.AsyncClient, url: str, params: Optional[dict] = None):
     """
-    머카리의 공식 쿼리 파라미터는 비공식/변동 가능성이 있으므로
-    최소한의 'keyword' 기반 검색만 확실히 구성한다.
-    가격/정렬/상태 등은 이후 고도화 시 server-side 지원이 확인될 때 확장.
-
-    예: https://jp.mercari.com/search?keyword=nintendo%20switch%20oled
+    _request의 비동기 버전.
+    - 백오프는 asyncio.sleep(이벤트 루프 비차단)
+    - 디스크 캐시(SQLite) 접근은 스레드로 넘겨 루프를 막지 않음
     """
-    keywords = " ".join(k.strip() for k in q.keywords if k.strip())
-    params = {"keyword": keywords}
-
-    # (참고) 일부 파라미터는 사이트 변경에 민감하므로 기본적으로는 붙이지 않는다.
-    # if q.budget_min is not None:
-    #     params["price_min"] = str(q.budget_min)
-    # if q.budget_max is not None:
-    #     params["price_max"] = str(q.budget_max)
+    cache = get_response_cache()
+    entry = await asyncio.to_thread(cache.lookup, url, params) if cache is not None else None
+    if entry is not None and entry.fresh:
+        return entry.response()
+    headers = {**DEFAULT_HEADERS, **entry.validators()} if entry is not None else DEFAULT_HEADERS
 
-    return f"{MERCARI_BASE_URL}?{urlencode(params)}"
+    limiter = get_rate_limiter()
+    last_exc = None
+    for attempt in range(1, HTTP_MAX_RETRIES + 1):
+        retry_after = None
+        try:
+            async with limiter.aslot(url) if limiter is not None else nullcontext():
+                t0 = time.monotonic()
+                resp = await client.get(url, params=params, headers=headers, timeout=HTTP_TIMEOUT)
+                latency = time.monotonic() - t0
+            if resp.status_code in (429, 403, 503):
+                retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                if limiter is not None:
+                    await asyncio.to_thread(limiter.on_throttle, url, retry_after)
+                raise httpx.HTTPStatusError(f"Status {resp.status_code}", request=resp.request, response=resp)
+            if limiter is not None and resp.status_code < 400:
+                await asyncio.to_thread(limiter.on_success, url, latency)
+            if resp.status_code == 304 and entry is not None:
+                return await asyncio.to_thread(cache.revalidated, entry, resp.headers)  # type: ignore[union-attr]
+            resp.raise_for_status()
+            if cache is not None:
+                await asyncio.to_thread(cache.store, url, params, resp)
+            return resp
+        except Exception as exc:  # noqa: BLE001
+            last_exc = exc
+            logger.warning("async GET failed (attempt %s/%s): %s", attempt, HTTP_MAX_RETRIES, exc)
+            if attempt < HTTP_MAX_RETRIES:
+                await asyncio.sleep(backoff_delay(attempt, HTTP_BACKOFF_SECONDS, retry_after))
+    raise last_exc  # type: ignore[misc]
 
 
 # ──────────────────────────────────────────────────────────────────────────────
-# 파싱 헬퍼
+# 검색 URL 빌더
 # ──────────────────────────────────────────────────────────────────────────────
-def _extract_price_int(text: str) -> Optional[int]:
+def build_search_url(q: SearchQuery, page_token: Optional[str] = None) -> str:
     """
-    텍스트에서 '¥12,345' 형태를 찾아 int로 변환.
+    'keyword' 기반 검색 URL.
+    머카리의 쿼리 파라미터는 비공식/변동 가능성이 있으므로 가격/정렬/상태는
+    능력 표(scraping.pushdown)에서 켜져 있는 것만 싣는다. 실린 조건은 결과 페이지에서
+    검증(verify_pushdown)하고, 사이트가 무시하기 시작하면 자동으로 빠진다.
+    client-side 필터(pipeline)는 푸시다운 여부와 무관하게 그대로 적용된다.
+    page_token: 2페이지 이후 요청 시 이전 페이지에서 읽은 토큰(예: 'v1:1')
+
+    예: https://jp.mercari.com/search?keyword=nintendo%20switch%20oled&price_max=30000
     """
-    if not text:
-        return None
-    m = YEN_PRICE_RE.search(text)
-    if not m:
-        return None
-    try:
-        return int(m.group(1).replace(",", ""))
-    except Exception:  # noqa: BLE001
-        return None
-
-
-def _first_non_empty(*values: Optional[str]) -> Optional[str]:
-    for v in values:
-        if isinstance(v, str) and v.strip():
-            return v.strip()
-    return None
-
-
-def _clean_text(el) -> str:
-    return " ".join(el.get_text(" ", strip=True).split()) if el else ""
+    keywords = " ".join(k.strip() for k in q.keywords if k.strip())
+    params = {"keyword": keywords}
+    params.update(pushdown_params(q))
+    if page_token:
+        params["page_token"] = page_token
+    return f"{MERCARI_BASE_URL}?{urlencode(params)}"
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -125,6 +180,10 @@ def _parse_listing_cards(soup: BeautifulSoup) -> List[Listing]:
     """
     검색 결과 페이지에서 상품 카드들을 최대한 관대한 방식으로 파싱.
     여러 CSS 선택자 후보를 두고 일치하는 것들만 추출한다.
+
+    (레거시) 컨테이너 × 선택자 조합으로 같은 앵커를 여러 번 방문한다.
+    검색 경로는 parsers.parse_listing_cards(단일 패스)를 사용하며,
+    이 함수는 동작 비교/벤치마크(scripts/bench_parsers.py)용으로만 남겨 둔다.
     """
     cards: list = []
 
@@ -226,153 +285,292 @@ def _parse_listing_cards(soup: BeautifulSoup) -> List[Listing]:
 
 
 # ──────────────────────────────────────────────────────────────────────────────
-# 상세 페이지 파서 (선택적)
+# 다중 페이지 크롤
 # ──────────────────────────────────────────────────────────────────────────────
-def _parse_listing_detail(html: str, url: str) -> Listing:
+_PRICE_SORTS = {"price_asc": False, "price_desc": True}
+
+
+def _price_key(rec: ListingRecord) -> int:
+    return rec.price_jpy
+
+
+def _sort_pushed(url: str, violations: Sequence[str]) -> bool:
+    """URL에 정렬 파라미터가 실렸고 결과 페이지 검증에서도 어긋나지 않았는지."""
+    return "sort" in parse_qs(urlsplit(url).query) and "sort" not in violations
+
+
+class _Crawl:
     """
-    단일 상세 페이지에서 Listing을 완성(가능한 필드 보강).
+    iter_search/aiter_search 공용 상태.
+    - 필터 통과 개수(limit) / 페이지 수 / 시간 예산으로 조기 종료
+    - 가격 정렬인데 사이트가 정렬해 주지 않은 페이지(푸시다운 꺼짐/무시됨)가 나오면
+      limit으로 멈추지 않고 가격순 상위 limit개만 들고 있다가 크롤 끝에 내보낸다(finish)
+    - 중복 제거는 최근 search_seen_window개 URL만 기억(깊은 크롤에도 메모리 일정)
     """
-    soup = BeautifulSoup(html, "lxml")
-
-    # 타이틀
-    title_el = soup.select_one("h1, [data-testid='ItemTitle']")
-    title = _clean_text(title_el) if title_el else "No title"
-
-    # 가격
-    price_el = soup.select_one("[data-testid='Price'], [class*='price'], span:contains('¥')")
-    price = _extract_price_int(_clean_text(price_el) if price_el else "")
-
-    # 상태/배송
-    condition = None
-    shipping = None
-    detail_text = _clean_text(soup)
-    if "未使用" in detail_text or "傷" in detail_text or "汚れ" in detail_text:
-        # 너무 길면 일부만 보관
-        condition = detail_text[:120]
-    if "送料込" in detail_text or "送料込み" in detail_text or "着払い" in detail_text:
-        shipping = "送料込み" if "送料" in detail_text else None
-
-    # 이미지(대표 1장)
-    img = soup.select_one("img")
-    image_url = img.get("src") if img and img.get("src") else None
-
-    # 판매자 정보(가능한 경우)
-    seller_name = None
-    seller_rating = None
-    sales_count = None
-    seller_block = soup.find(string=re.compile("出品者|評価|出品数"))  # heuristics
-    if seller_block:
-        # 아주 단순한 휴리스틱
-        near = seller_block.parent
-        txt = _clean_text(near) if near else ""
-        # rating 4.8 같은 숫자 추출 시도
-        m = re.search(r"(\d\.\d)\s*/\s*5", txt)
-        if m:
-            try:
-                seller_rating = float(m.group(1))
-            except Exception:  # noqa: BLE001
-                seller_rating = None
-        m2 = re.search(r"出品数\s*:?(\d+)", txt)
-        if m2:
-            try:
-                sales_count = int(m2.group(1))
-            except Exception:  # noqa: BLE001
-                sales_count = None
-
-    listing = Listing(
-        title=title,
-        price_jpy=price or 0,
-        condition=condition,
-        shipping=shipping,
-        url=url,
-        image_url=image_url,
-        seller=SellerInfo(name=seller_name, rating=seller_rating, sales_count=sales_count),
-        sold=None,
-        likes=None,
-        description_snippet=None,
-    )
-    return listing
+
+    def __init__(
+        self,
+        q: SearchQuery,
+        limit: Optional[int],
+        max_pages: Optional[int],
+        time_budget: Optional[float],
+    ):
+        s = get_settings()
+        self.pipeline = compile_pipeline(q)
+        self.price_desc = _PRICE_SORTS.get(q.sort)  # None이면 사이트 순서 그대로
+        self.hold = False
+        self.held: List[ListingRecord] = []
+        self.limit = max(1, limit or q.limit)
+        self.max_pages = max(1, max_pages or s.search_max_pages)
+        budget = s.search_time_budget_seconds if time_budget is None else time_budget
+        self.deadline = time.monotonic() + budget
+        self.window = max(1, s.search_seen_window)
+        self.seen: "OrderedDict[str, None]" = OrderedDict()
+        self.tokens: set[str] = set()  # 최대 max_pages개
+        self.passed = 0
+        self.pages = 0
+        self.page_new = 0
+        self.stop_reason: Optional[str] = None
+
+    def accept(self, records: List[ListingRecord], site_sorted: bool = False) -> List[ListingRecord]:
+        """
+        한 페이지 레코드 중 처음 보는 + 필터 통과 항목(limit까지).
+        site_sorted: 이 페이지가 사이트에서 이미 q.sort대로 정렬돼 왔는지(정렬 푸시다운)
+        """
+        out: List[ListingRecord] = []
+        self.page_new = 0
+        self.hold = self.hold or (self.price_desc is not None and not site_sorted)
+        try:
+            for rec in records:
+                if self.passed >= self.limit and not self.hold:
+                    break
+                if rec.url in self.seen:
+                    continue
+                self.seen[rec.url] = None
+                if len(self.seen) > self.window:
+                    self.seen.popitem(last=False)
+                self.page_new += 1
+                if self.pipeline.keep(rec):
+                    self.passed += 1
+                    out.append(rec)
+        finally:
+            self.pipeline.flush()
+        if self.hold:
+            # 사이트 순서로 limit개에서 끊으면 가장 싼/비싼 N개가 아니므로 페이지를 끝까지 본다
+            self.held = sorted(self.held + out, key=_price_key, reverse=bool(self.price_desc))[: self.limit]
+            return []
+        return out
+
+    def finish(self) -> List[ListingRecord]:
+        """크롤 종료 시 들고 있던 가격순 상위 항목."""
+        held, self.held = self.held, []
+        return held
+
+    def next_token(self, token: Optional[str]) -> Optional[str]:
+        """다음 페이지를 요청할지 결정. 멈출 때는 None(사유는 stop_reason)."""
+        self.pages += 1
+        if self.passed >= self.limit and not self.hold:
+            reason = "limit"
+        elif not token:
+            reason = "last_page"
+        elif token in self.tokens:
+            reason = "token_loop"
+        elif self.page_new == 0:
+            reason = "no_new_items"
+        elif self.pages >= self.max_pages:
+            reason = "max_pages"
+        elif time.monotonic() >= self.deadline:
+            reason = "time_budget"
+        else:
+            self.tokens.add(token)
+            return token
+        self.stop_reason = reason
+        logger.info("search crawl stopped: %s (pages=%d, passed=%d)", reason, self.pages, self.passed)
+        return None
 
 
 # ──────────────────────────────────────────────────────────────────────────────
 # 공개 API
 # ──────────────────────────────────────────────────────────────────────────────
-def search(session: Optional[requests.Session], q: SearchQuery) -> List[Listing]:
+def iter_search(
+    session: Optional[HttpClient],
+    q: SearchQuery,
+    *,
+    limit: Optional[int] = None,
+    max_pages: Optional[int] = None,
+    time_budget: Optional[float] = None,
+) -> Iterator[ListingRecord]:
+    """
+    페이지 토큰을 따라가며 필터를 통과한 항목을 페이지 단위로 흘려보내는 제너레이터.
+    - 항목은 경량 ListingRecord(랭킹까지 그대로 사용, Listing 변환은 to_listing/API 경계에서)
+    - limit(기본 q.limit)개가 통과하거나, max_pages/time_budget(초)을 다 쓰면 종료
+    - relevance/new는 사이트 순서 그대로. 소비자가 중간에 멈추면 이후 페이지는 요청하지 않음
+    - price_asc/price_desc는 사이트가 정렬해 준(푸시다운) 페이지만 바로 흘려보내고,
+      아니면 예산 안의 페이지를 다 본 뒤 가격순 상위 limit개를 마지막에 한 번에 내보냄
+    - 보관 상태는 최근 URL 윈도뿐이라 수천 건을 훑어도 메모리가 늘지 않는다
+    """
+    session = session or get_http_client()
+    crawl = _Crawl(q, limit, max_pages, time_budget)
+    token: Optional[str] = None
+    while True:
+        url = build_search_url(q, token)
+        resp = _request(session, url)
+        result = parse_search_records(resp.text, url)
+        violations = verify_pushdown(url, result.records)
+        yield from crawl.accept(result.records, _sort_pushed(url, violations))
+        token = crawl.next_token(result.next_page_token)
+        if token is None:
+            yield from crawl.finish()
+            return
+
+
+def search(session: Optional[HttpClient], q: SearchQuery) -> List[Listing]:
     """
     키워드 기반 검색 → Listing 목록 반환.
     - 서버 필터가 불확실하므로 client-side에서 budget/brand/color/condition을 2차 필터링.
+    - q.limit개가 모일 때까지 다음 페이지를 따라감(iter_search).
+    - session=None이면 프로세스 공용 클라이언트(utils.http.get_http_client) 사용.
     """
-    url = build_search_url(q)
-    owns_session = False
-    if session is None:
-        session = requests.Session()
-        owns_session = True
+    return [rec.to_listing() for rec in sort_limit(list(iter_search(session, q)), q)]
 
-    try:
-        resp = _request(session, url)
-        soup = BeautifulSoup(resp.text, "lxml")
-        items = _parse_listing_cards(soup)
-
-        # 클라이언트 사이드 필터링 (best-effort)
-        def ok_budget(x: Listing) -> bool:
-            if q.budget_min is not None and x.price_jpy < q.budget_min:
-                return False
-            if q.budget_max is not None and x.price_jpy > q.budget_max:
-                return False
-            return True
-
-        def ok_condition(x: Listing) -> bool:
-            if not q.condition:
-                return True
-            return any(c in (x.condition or "") for c in q.condition)
-
-        def ok_brand_color(x: Listing) -> bool:
-            title = (x.title or "").lower()
-            desc = (x.description_snippet or "").lower()
-            hay = f"{title} {desc}"
-            for b in q.brand or []:
-                if b.lower() not in hay:
-                    return False
-            for c in q.color or []:
-                if c.lower() not in hay:
-                    return False
-            return True
-
-        items = [it for it in items if ok_budget(it) and ok_condition(it) and ok_brand_color(it)]
-
-        # 간단 정렬 (best-effort)
-        if q.sort == "price_asc":
-            items.sort(key=lambda x: x.price_jpy)
-        elif q.sort == "price_desc":
-            items.sort(key=lambda x: x.price_jpy, reverse=True)
-        elif q.sort == "new":
-            # 신상 기준 정보가 없으므로 일단 상단 결과 유지
-            pass
-        else:
-            # relevance: 검색 결과 순서를 그대로 둔다
-            pass
 
-        # limit 적용 (안전상 최대 100)
-        limit = max(1, min(100, q.limit))
-        return items[:limit]
+def fetch_detail(session: Optional[HttpClient], url: str) -> Listing:
+    """
+    단일 상세 정보 요청.
+    """
+    session = session or get_http_client()
+    resp = _request(session, url, params=None)
+    return parse_detail_page(resp.text, url).items[0]
+
+
+async def aiter_search(
+    q: SearchQuery,
+    client: Optional[httpx.AsyncClient] = None,
+    *,
+    limit: Optional[int] = None,
+    max_pages: Optional[int] = None,
+    time_budget: Optional[float] = None,
+) -> AsyncIterator[ListingRecord]:
+    """
+    iter_search()의 asyncio 버전(async 제너레이터).
+    HTML 파싱은 스레드에서 수행해 한 페이지가 느려도 다른 요청을 막지 않음.
+    """
+    client = client or get_async_http_client()
+    crawl = _Crawl(q, limit, max_pages, time_budget)
+    token: Optional[str] = None
+    while True:
+        url = build_search_url(q, token)
+        resp = await _arequest(client, url)
+        result = await asyncio.to_thread(parse_search_records, resp.text, url)
+        violations = verify_pushdown(url, result.records)
+        for it in crawl.accept(result.records, _sort_pushed(url, violations)):
+            yield it
+        token = crawl.next_token(result.next_page_token)
+        if token is None:
+            for it in crawl.finish():
+                yield it
+            return
+
+
+async def async_search(q: SearchQuery, client: Optional[httpx.AsyncClient] = None) -> List[Listing]:
+    """
+    search()의 asyncio 버전.
+    - client=None이면 현재 루프의 공용 AsyncClient(utils.http.get_async_http_client) 사용
+    """
+    return [rec.to_listing() for rec in sort_limit([it async for it in aiter_search(q, client)], q)]
 
-    finally:
-        if owns_session:
-            session.close()
 
+async def async_fetch_detail(url: str, client: Optional[httpx.AsyncClient] = None) -> Listing:
+    """
+    fetch_detail()의 asyncio 버전.
+    """
+    client = client or get_async_http_client()
+    resp = await _arequest(client, url, params=None)
+    result = await asyncio.to_thread(parse_detail_page, resp.text, url)
+    return result.items[0]
 
-def fetch_detail(session: Optional[requests.Session], url: str) -> Listing:
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 상세 일괄 조회
+# ──────────────────────────────────────────────────────────────────────────────
+@dataclass
+class DetailResult:
+    """fetch_details 결과 1건. 실패 시 listing=None, error에 사유."""
+
+    url: str
+    listing: Optional[Listing] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.listing is not None
+
+
+def _host(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+
+def fetch_details(
+    urls: Sequence[str],
+    max_concurrency: Optional[int] = None,
+    session: Optional[HttpClient] = None,
+    per_host_limit: Optional[int] = None,
+) -> List[DetailResult]:
     """
-    단일 상세 정보 요청.
+    여러 /item/ 상세 페이지를 병렬로 조회·파싱.
+    - 결과는 입력 순서 그대로(중복 URL은 한 번만 요청)
+    - 한 건의 실패가 전체를 막지 않음(DetailResult.error로 보고)
+    - 전체 동시성 max_concurrency + 호스트별 상한 per_host_limit
     """
-    owns_session = False
-    if session is None:
-        session = requests.Session()
-        owns_session = True
-
-    try:
-        resp = _request(session, url, params=None)
-        return _parse_listing_detail(resp.text, url)
-    finally:
-        if owns_session:
-            session.close()
+    s = get_settings()
+    max_concurrency = max(1, max_concurrency or s.detail_max_concurrency)
+    per_host = max(1, per_host_limit or s.http_per_host_concurrency)
+    session = session or get_http_client()
+    unique = list(dict.fromkeys(urls))
+    if not unique:
+        return []
+
+    host_sems: Dict[str, threading.BoundedSemaphore] = {
+        h: threading.BoundedSemaphore(per_host) for h in {_host(u) for u in unique}
+    }
+
+    def one(url: str) -> DetailResult:
+        try:
+            with host_sems[_host(url)]:
+                return DetailResult(url=url, listing=fetch_detail(session, url))
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("detail fetch failed: %s (%s)", url, exc)
+            return DetailResult(url=url, error=f"{type(exc).__name__}: {exc}")
+
+    with ThreadPoolExecutor(max_workers=min(max_concurrency, len(unique))) as pool:
+        by_url = dict(zip(unique, pool.map(one, unique)))
+    return [by_url[u] for u in urls]
+
+
+async def async_fetch_details(
+    urls: Sequence[str],
+    max_concurrency: Optional[int] = None,
+    client: Optional[httpx.AsyncClient] = None,
+    per_host_limit: Optional[int] = None,
+) -> List[DetailResult]:
+    """
+    fetch_details의 asyncio 버전(세마포어로 전체/호스트별 동시성 제한).
+    """
+    s = get_settings()
+    total_sem = asyncio.Semaphore(max(1, max_concurrency or s.detail_max_concurrency))
+    per_host = max(1, per_host_limit or s.http_per_host_concurrency)
+    client = client or get_async_http_client()
+    unique = list(dict.fromkeys(urls))
+    host_sems = {h: asyncio.Semaphore(per_host) for h in {_host(u) for u in unique}}
+
+    async def one(url: str) -> DetailResult:
+        try:
+            async with total_sem, host_sems[_host(url)]:
+                return DetailResult(url=url, listing=await async_fetch_detail(url, client=client))
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("detail fetch failed: %s (%s)", url, exc)
+            return DetailResult(url=url, error=f"{type(exc).__name__}: {exc}")
+
+    results = await asyncio.gather(*(one(u) for u in unique))
+    by_url = dict(zip(unique, results))
+    return [by_url[u] for u in urls]
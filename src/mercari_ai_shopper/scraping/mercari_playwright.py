@@ -2,89 +2,172 @@ from __future__ import annotations
 
 import os
 import logging
-from typing import List
-
-from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, List, Optional
 
+from mercari_ai_shopper.config import get_settings
 from mercari_ai_shopper.models.query import SearchQuery
 from mercari_ai_shopper.models.listing import Listing
-from .mercari_client import build_search_url, _parse_listing_cards  # 재활용
+from .browser_pool import get_browser_pool
+from .mercari_client import build_search_url  # 재활용
+from .parsers import SearchRecords, parse_search_api_records, parse_search_records
+from .pipeline import filter_sort_limit
+from .pushdown import verify_pushdown
 
 logger = logging.getLogger(__name__)
 
-PLAYWRIGHT_HEADLESS = os.getenv("PLAYWRIGHT_HEADLESS", "true").lower() in ("1", "true", "yes")
+PLAYWRIGHT_TIMEOUT_SECONDS = float(os.getenv("PLAYWRIGHT_TIMEOUT_SECONDS", "60"))
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 경량 렌더링 (요청 차단 + 조기 완료)
+# ──────────────────────────────────────────────────────────────────────────────
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+# 서드파티 분석/광고 (URL 부분 문자열)
+BLOCKED_URL_PATTERNS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "facebook.net",
+    "connect.facebook",
+    "criteo.",
+    "yimg.jp/images/listing",
+    "/gtag/js",
+    "/gtm.js",
+)
+# 머카리 프론트가 호출하는 검색 API (예: https://api.mercari.jp/v2/entities:search)
+SEARCH_API_RE = re.compile(r"/v\d+/entities:search")
+
+_ANCHOR_COUNT_JS = "() => document.querySelectorAll('a[href*=\"/item/\"]').length"
+_POLL_MS = 50
+# 앵커 수가 이만큼 변하지 않으면(결과가 min_items보다 적은 검색) 완료로 본다
+_STABLE_SECONDS = 0.5
+
+
+def _should_block(resource_type: str, url: str) -> bool:
+    if resource_type in BLOCKED_RESOURCE_TYPES:
+        return True
+    return any(p in url for p in BLOCKED_URL_PATTERNS)
+
+
+def _route_handler(route) -> None:
+    req = route.request
+    if _should_block(req.resource_type, req.url):
+        route.abort()
+    else:
+        route.continue_()
+
+
+@dataclass
+class RenderResult:
+    """렌더링 결과. api_json이 있으면 HTML 대신 그것을 파싱한다."""
+
+    html: Optional[str] = None
+    api_json: Any = None
+    ready: str = "timeout"  # api | anchors | stable | selector | timeout
+
+
+def _wait_ready(page, captured: List[Any], min_items: int, timeout: float) -> str:
+    """
+    검색 API 응답이 잡히거나, 상품 앵커가 min_items개 이상이거나,
+    앵커 수가 잠시 안정되면 즉시 반환. page.wait_for_timeout 동안 응답 이벤트가 처리된다.
+    """
+    deadline = time.monotonic() + timeout
+    last_count, last_change = -1, time.monotonic()
+    while True:
+        if captured:
+            return "api"
+        count = int(page.evaluate(_ANCHOR_COUNT_JS) or 0)
+        now = time.monotonic()
+        if count >= min_items:
+            return "anchors"
+        if count != last_count:
+            last_count, last_change = count, now
+        elif count > 0 and now - last_change >= _STABLE_SECONDS:
+            return "stable"
+        if now >= deadline:
+            return "timeout"
+        page.wait_for_timeout(_POLL_MS)
+
+
+def render_search(
+    page,
+    url: str,
+    *,
+    lean: bool = True,
+    min_items: int = 20,
+    timeout: float = 7.0,
+    wait_selector: str = "img",
+) -> RenderResult:
+    """
+    검색 페이지 렌더링.
+    - lean=True: 이미지/미디어/폰트/분석 요청 차단, 검색 API 응답 캡처, 조기 완료
+    - lean=False: 기존 방식(domcontentloaded + wait_for_selector(wait_selector))
+    """
+    if not lean:
+        page.goto(url, wait_until="domcontentloaded")
+        page.wait_for_selector(wait_selector, timeout=int(timeout * 1000))
+        return RenderResult(html=page.content(), ready="selector")
 
+    captured: List[Any] = []
 
-def _launch():
-    p = sync_playwright().start()
-    browser = p.chromium.launch(headless=PLAYWRIGHT_HEADLESS)
-    context = browser.new_context(locale="ja-JP")
-    page = context.new_page()
-    return p, browser, context, page
+    def on_response(resp) -> None:
+        # 이벤트 핸들러 안에서는 Playwright 호출을 하지 않고 응답 객체만 보관
+        if SEARCH_API_RE.search(resp.url) and resp.status == 200:
+            captured.append(resp)
 
+    page.route("**/*", _route_handler)
+    page.on("response", on_response)
+    try:
+        page.goto(url, wait_until="commit")
+        ready = _wait_ready(page, captured, min_items, timeout)
+        if captured:
+            try:
+                return RenderResult(api_json=captured[0].json(), ready=ready)
+            except Exception as exc:  # noqa: BLE001
+                logger.debug("search API body unreadable, falling back to DOM: %s", exc)
+        return RenderResult(html=page.content(), ready=ready)
+    finally:
+        page.remove_listener("response", on_response)
+        page.unroute("**/*", _route_handler)
 
-def search_playwright(q: SearchQuery, wait_selector: str = "img") -> List[Listing]:
+
+def _parse_render(result: RenderResult, url: str) -> SearchRecords:
+    if result.api_json is not None:
+        parsed = parse_search_api_records(result.api_json, url)
+        if parsed.records:
+            return parsed
+    return parse_search_records(result.html or "", url)
+
+
+def search_playwright(q: SearchQuery, wait_selector: str = "img", lean: Optional[bool] = None) -> List[Listing]:
     """
     Playwright 기반 검색 (동적 로딩 대비).
-    - wait_selector: 결과 안정화 대기용 셀렉터 (기본 이미지 로드)
+    - 브라우저는 매번 띄우지 않고 공용 풀(browser_pool)의 웜 페이지를 빌려 쓴다
+    - lean(기본 PLAYWRIGHT_LEAN_MODE): 불필요한 리소스 차단 + 조기 완료 + 검색 API JSON 직접 사용
+    - wait_selector: lean=False일 때 결과 안정화 대기용 셀렉터 (기본 이미지 로드)
     """
+    s = get_settings()
+    lean = s.playwright_lean_mode if lean is None else lean
     url = build_search_url(q)
-    logger.info("Playwright search: %s", url)
-
-    p = browser = context = page = None
-    try:
-        p, browser, context, page = _launch()
-        page.goto(url, wait_until="domcontentloaded")
-        page.wait_for_selector(wait_selector, timeout=7000)
-        html = page.content()
-        soup = BeautifulSoup(html, "lxml")
-        items = _parse_listing_cards(soup)
-
-        # client-side 필터는 mercari_client.search와 동일 정책
-        def ok_budget(x: Listing) -> bool:
-            if q.budget_min is not None and x.price_jpy < q.budget_min:
-                return False
-            if q.budget_max is not None and x.price_jpy > q.budget_max:
-                return False
-            return True
-
-        def ok_condition(x: Listing) -> bool:
-            if not q.condition:
-                return True
-            return any(c in (x.condition or "") for c in q.condition)
-
-        def ok_brand_color(x: Listing) -> bool:
-            title = (x.title or "").lower()
-            desc = (x.description_snippet or "").lower()
-            hay = f"{title} {desc}"
-            for b in q.brand or []:
-                if b.lower() not in hay:
-                    return False
-            for c in q.color or []:
-                if c.lower() not in hay:
-                    return False
-            return True
-
-        items = [it for it in items if ok_budget(it) and ok_condition(it) and ok_brand_color(it)]
-
-        if q.sort == "price_asc":
-            items.sort(key=lambda x: x.price_jpy)
-        elif q.sort == "price_desc":
-            items.sort(key=lambda x: x.price_jpy, reverse=True)
-        # relevance/new → 그대로
-
-        limit = max(1, min(100, q.limit))
-        return items[:limit]
-    finally:
-        try:
-            if page:
-                page.close()
-            if context:
-                context.close()
-            if browser:
-                browser.close()
-            if p:
-                p.stop()
-        except Exception:  # noqa: BLE001
-            pass
+    logger.info("Playwright search: %s (lean=%s)", url, lean)
+
+    result = get_browser_pool().run(
+        lambda page: render_search(
+            page,
+            url,
+            lean=lean,
+            min_items=s.playwright_ready_min_items,
+            timeout=s.playwright_ready_timeout_seconds,
+            wait_selector=wait_selector,
+        ),
+        timeout=PLAYWRIGHT_TIMEOUT_SECONDS,
+    )
+    parsed = _parse_render(result, url)
+    logger.info("Playwright ready via %s, parsed via %s", result.ready, parsed.source)
+    verify_pushdown(url, parsed.records)
+
+    # client-side 필터/정렬은 모든 엔진 공용 파이프라인(scraping.pipeline)
+    return filter_sort_limit(parsed.records, q)
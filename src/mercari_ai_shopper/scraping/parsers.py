@@ -0,0 +1,680 @@
+from __future__ import annotations
+
+import json
+import logging
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+from urllib.parse import unquote, urljoin, urlsplit
+
+import lxml.html
+from bs4 import BeautifulSoup
+
+from mercari_ai_shopper.models.listing import Listing, ListingRecord, SellerInfo, SellerRecord
+
+logger = logging.getLogger(__name__)
+
+MERCARI_ORIGIN = "https://jp.mercari.com"
+ITEM_URL_PREFIX = "https://jp.mercari.com/item/"
+
+# Yen price pattern (ex: ¥12,345)
+YEN_PRICE_RE = re.compile(r"[¥￥]\s?([\d,]+)")
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 공통 헬퍼
+# ──────────────────────────────────────────────────────────────────────────────
+def _extract_price_int(text: str) -> Optional[int]:
+    """
+    텍스트에서 '¥12,345' 형태를 찾아 int로 변환.
+    """
+    if not text:
+        return None
+    m = YEN_PRICE_RE.search(text)
+    if not m:
+        return None
+    try:
+        return int(m.group(1).replace(",", ""))
+    except Exception:  # noqa: BLE001
+        return None
+
+
+def _first_non_empty(*values: Optional[str]) -> Optional[str]:
+    for v in values:
+        if isinstance(v, str) and v.strip():
+            return v.strip()
+    return None
+
+
+def item_id_from_url(url: str) -> Optional[str]:
+    """
+    'https://jp.mercari.com/item/m123?x=1' → 'm123'. 상품 URL이 아니면 None.
+    """
+    if not url.startswith(ITEM_URL_PREFIX):
+        return None
+    path = urlsplit(url).path
+    item_id = path[len("/item/"):].strip("/")
+    return item_id or None
+
+
+def _clean_text(el) -> str:
+    return " ".join(el.get_text(" ", strip=True).split()) if el else ""
+
+
+def _to_doc(html: Union[str, bytes]):
+    """lxml 문서로 파싱. XML 인코딩 선언이 붙은 str은 bytes로 바꿔 재시도."""
+    try:
+        return lxml.html.document_fromstring(html)
+    except ValueError:
+        if isinstance(html, str):
+            return lxml.html.document_fromstring(html.encode("utf-8"))
+        raise
+
+
+def _text(el) -> str:
+    """BeautifulSoup의 get_text(' ', strip=True) + 공백 정규화와 같은 결과."""
+    return " ".join(" ".join(el.itertext()).split()) if el is not None else ""
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 단일 패스 카드 파서 (검색결과)
+# ──────────────────────────────────────────────────────────────────────────────
+def _iter_item_anchors(doc) -> Iterator[tuple]:
+    """
+    문서의 <a>를 한 번만 순회하면서 상품 링크만 (item_id, url, anchor)로 내보낸다.
+    """
+    for a in doc.iter("a"):
+        href = a.get("href")
+        if not href:
+            continue
+        url = href if href.startswith("http") else urljoin(MERCARI_ORIGIN, href)
+        item_id = item_id_from_url(url)
+        if item_id is None:
+            continue
+        yield item_id, url, a
+
+
+def _card_price(a) -> Optional[int]:
+    # 가격 후보: ItemPrice → '¥'를 포함한 첫 div → 링크 전체
+    candidates = [a.find(".//*[@data-testid='ItemPrice']")]
+    candidates.append(next((d for d in a.iter("div") if "¥" in _text(d)), None))
+    candidates.append(a)
+    for pc in candidates:
+        if pc is None:
+            continue
+        t = _text(pc)
+        if "¥" in t or "￥" in t:
+            return _extract_price_int(t)
+    return None
+
+
+def _card_meta(a) -> tuple[Optional[str], Optional[str]]:
+    condition = None
+    shipping = None
+    meta_candidates = [
+        a.find(".//*[@data-testid='ItemStatus']"),
+        a.find(".//*[@data-testid='ItemShipping']"),
+        a.getparent(),
+    ]
+    for mc in meta_candidates:
+        if mc is None:
+            continue
+        txt = _text(mc)
+        if "未使用" in txt or "傷" in txt or "汚れ" in txt:
+            condition = condition or txt
+        if "送料込" in txt or "送料込み" in txt or "着払い" in txt:
+            shipping = shipping or txt
+    return condition, shipping
+
+
+def _card_records(html: Union[str, bytes]) -> List[ListingRecord]:
+    """
+    검색 결과 HTML에서 상품 카드를 단일 패스로 파싱해 경량 레코드(ListingRecord)로 반환.
+    - lxml로 한 번 파싱한 뒤 <a>만 문서 순서대로 한 번씩 방문
+    - 상품 ID 기준으로 먼저 중복을 거른 뒤에만 필드 추출
+    - 필드 추출은 해당 앵커 서브트리(+상태/배송용 부모 텍스트)만 본다
+    필드 규칙은 mercari_client._parse_listing_cards와 동일.
+    """
+    doc = _to_doc(html)
+    seen: set[str] = set()
+    out: List[ListingRecord] = []
+    for item_id, url, a in _iter_item_anchors(doc):
+        if item_id in seen:
+            continue
+
+        # 가격이 없으면 스킵(같은 상품의 다른 앵커에 가격이 있을 수 있으므로 seen 처리 안 함)
+        price = _card_price(a)
+        if price is None:
+            continue
+        seen.add(item_id)
+
+        title = _first_non_empty(a.get("aria-label"), a.get("title"), _text(a))
+        img_el = a.find(".//img")
+        image_url = img_el.get("src") if img_el is not None and img_el.get("src") else None
+        condition, shipping = _card_meta(a)
+
+        rec = ListingRecord.create(
+            title=title or "No title",
+            price_jpy=price,
+            condition=condition,
+            shipping=shipping,
+            url=url,
+            image_url=image_url,
+        )
+        if rec:
+            out.append(rec)
+    return out
+
+
+def parse_listing_cards(html: Union[str, bytes]) -> List[Listing]:
+    """검색 결과 HTML의 상품 카드 → Listing 목록(_card_records + 검증)."""
+    return build_listings(_card_records(html))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 상세 페이지 파서 (선택적)
+# ──────────────────────────────────────────────────────────────────────────────
+def _parse_listing_detail(html: str, url: str) -> Listing:
+    """
+    단일 상세 페이지에서 Listing을 완성(가능한 필드 보강).
+    """
+    soup = BeautifulSoup(html, "lxml")
+
+    # 타이틀
+    title_el = soup.select_one("h1, [data-testid='ItemTitle']")
+    title = _clean_text(title_el) if title_el else "No title"
+
+    # 가격
+    price_el = soup.select_one("[data-testid='Price'], [class*='price'], span:contains('¥')")
+    price = _extract_price_int(_clean_text(price_el) if price_el else "")
+
+    # 상태/배송
+    condition = None
+    shipping = None
+    detail_text = _clean_text(soup)
+    if "未使用" in detail_text or "傷" in detail_text or "汚れ" in detail_text:
+        # 너무 길면 일부만 보관
+        condition = detail_text[:120]
+    if "送料込" in detail_text or "送料込み" in detail_text or "着払い" in detail_text:
+        shipping = "送料込み" if "送料" in detail_text else None
+
+    # 이미지(대표 1장)
+    img = soup.select_one("img")
+    image_url = img.get("src") if img and img.get("src") else None
+
+    # 판매자 정보(가능한 경우)
+    seller_name = None
+    seller_rating = None
+    sales_count = None
+    seller_block = soup.find(string=re.compile("出品者|評価|出品数"))  # heuristics
+    if seller_block:
+        # 아주 단순한 휴리스틱
+        near = seller_block.parent
+        txt = _clean_text(near) if near else ""
+        # rating 4.8 같은 숫자 추출 시도
+        m = re.search(r"(\d\.\d)\s*/\s*5", txt)
+        if m:
+            try:
+                seller_rating = float(m.group(1))
+            except Exception:  # noqa: BLE001
+                seller_rating = None
+        m2 = re.search(r"出品数\s*:?(\d+)", txt)
+        if m2:
+            try:
+                sales_count = int(m2.group(1))
+            except Exception:  # noqa: BLE001
+                sales_count = None
+
+    listing = Listing(
+        title=title,
+        price_jpy=price or 0,
+        condition=condition,
+        shipping=shipping,
+        url=url,
+        image_url=image_url,
+        seller=SellerInfo(name=seller_name, rating=seller_rating, sales_count=sales_count),
+        sold=None,
+        likes=None,
+        description_snippet=None,
+    )
+    return listing
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 임베디드 JSON 추출 (JSON-LD / Next.js 상태)
+# ──────────────────────────────────────────────────────────────────────────────
+SOURCE_JSONLD = "jsonld"
+SOURCE_NEXT_DATA = "next_data"
+SOURCE_DOM = "dom"
+SOURCE_API = "api"  # 브라우저가 받은 검색 API(JSON) 응답을 그대로 사용
+
+# 머카리 item_condition_id → 표준 라벨
+CONDITION_BY_ID = {
+    "1": "新品、未使用",
+    "2": "未使用に近い",
+    "3": "目立った傷や汚れなし",
+    "4": "やや傷や汚れあり",
+    "5": "傷や汚れあり",
+    "6": "全体的に状態が悪い",
+}
+
+_SCHEMA_CONDITION = {
+    "newcondition": "新品、未使用",
+}
+
+_ITEM_ID_RE = re.compile(r"^m\d+$")
+
+_LD_JSON_MARKER = "application/ld+json"
+_NEXT_DATA_MARKER = 'id="__NEXT_DATA__"'
+
+# 어떤 경로로 페이지를 파싱했는지 누적 집계 (page kind, source) → count
+_parse_source_counts: Counter = Counter()
+
+
+@dataclass
+class ParseResult:
+    """페이지 파싱 결과 + 실제로 사용된 추출 경로(jsonld | next_data | api | dom)."""
+
+    items: List[Listing] = field(default_factory=list)
+    source: str = SOURCE_DOM
+    # 검색 페이지 한정: 다음 페이지 토큰(없으면 마지막 페이지)
+    next_page_token: Optional[str] = None
+
+
+def parse_source_stats() -> Dict[str, int]:
+    """'search:jsonld' 형태 키로 경로별 처리 페이지 수 반환."""
+    return {f"{kind}:{src}": n for (kind, src), n in _parse_source_counts.items()}
+
+
+def _script_bodies(html: str, marker: str) -> Iterator[str]:
+    """
+    marker가 들어 있는 <script ...> 태그의 본문을 문자열 검색만으로 잘라낸다.
+    (DOM 트리를 만들지 않음)
+    """
+    pos = 0
+    while True:
+        i = html.find(marker, pos)
+        if i < 0:
+            return
+        pos = i + len(marker)
+        tag_start = html.rfind("<script", 0, i)
+        body_start = html.find(">", tag_start) if tag_start >= 0 else -1
+        # marker가 script 여는 태그 안에 있을 때만 유효(본문 문자열 등은 무시)
+        if body_start < i:
+            continue
+        body_end = html.find("</script>", body_start)
+        if body_end < 0:
+            return
+        pos = body_end + len("</script>")
+        yield html[body_start + 1:body_end]
+
+
+def _load_json(text: str) -> Any:
+    try:
+        return json.loads(text)
+    except ValueError:
+        return None
+
+
+def _pick(d: Dict[str, Any], *keys: str) -> Any:
+    for k in keys:
+        v = d.get(k)
+        if v not in (None, "", [], {}):
+            return v
+    return None
+
+
+def _to_int(v: Any) -> Optional[int]:
+    if v is None or isinstance(v, bool):
+        return None
+    try:
+        return int(float(str(v).replace(",", "").replace("¥", "").replace("￥", "").strip()))
+    except (ValueError, OverflowError):  # "nan" / "1e400", "Infinity"
+        return None
+
+
+def _to_float(v: Any) -> Optional[float]:
+    try:
+        return float(v) if v is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _first_url(v: Any) -> Optional[str]:
+    if isinstance(v, str):
+        return v or None
+    if isinstance(v, list) and v:
+        return _first_url(v[0])
+    if isinstance(v, dict):
+        return _first_url(_pick(v, "url", "contentUrl", "imageUrl", "image_url"))
+    return None
+
+
+def _name(v: Any) -> Optional[str]:
+    if isinstance(v, dict):
+        v = _pick(v, "name", "label")
+    return v.strip() if isinstance(v, str) and v.strip() else None
+
+
+def _snippet(v: Any, limit: int = 300) -> Optional[str]:
+    s = _name(v)
+    return s[:limit] if s else None
+
+
+def _has_type(node: Dict[str, Any], name: str) -> bool:
+    t = node.get("@type")
+    return t == name or (isinstance(t, list) and name in t)
+
+
+def build_listings(records: Iterable[ListingRecord]) -> List[Listing]:
+    """레코드 → Listing(검사 끝난 값이므로 model_construct 경로)."""
+    return [rec.to_listing() for rec in records]
+
+
+def _ld_product_record(node: Dict[str, Any], url: Optional[str]) -> Optional[ListingRecord]:
+    offers = node.get("offers") or {}
+    if isinstance(offers, list):
+        offers = offers[0] if offers else {}
+    price = _to_int(_pick(offers, "price", "lowPrice")) if isinstance(offers, dict) else None
+    item_url = _pick(node, "url") or (offers.get("url") if isinstance(offers, dict) else None) or url
+    if price is None or not item_url:
+        return None
+
+    cond_raw = _pick(node, "itemCondition") or (offers.get("itemCondition") if isinstance(offers, dict) else None)
+    condition = None
+    if isinstance(cond_raw, str):
+        tail = cond_raw.rsplit("/", 1)[-1]
+        condition = _SCHEMA_CONDITION.get(tail.lower(), None if tail.endswith("Condition") else cond_raw)
+
+    availability = str(offers.get("availability", "")) if isinstance(offers, dict) else ""
+    sold = None
+    if availability:
+        sold = any(s in availability for s in ("SoldOut", "OutOfStock"))
+
+    seller = None
+    seller_node = offers.get("seller") if isinstance(offers, dict) else None
+    if isinstance(seller_node, dict):
+        rating_node = seller_node.get("aggregateRating") or {}
+        seller = SellerRecord(
+            name=_name(seller_node),
+            rating=_to_float(rating_node.get("ratingValue")),
+            sales_count=_to_int(rating_node.get("ratingCount") or rating_node.get("reviewCount")),
+        )
+
+    return ListingRecord.create(
+        title=_name(node) or "No title",
+        price_jpy=price,
+        condition=condition,
+        shipping=None,
+        url=item_url,
+        image_url=_first_url(node.get("image")),
+        seller=seller,
+        sold=sold,
+        likes=None,
+        description_snippet=_snippet(node.get("description")),
+    )
+
+
+def _iter_ld_nodes(data: Any) -> Iterator[Dict[str, Any]]:
+    if isinstance(data, list):
+        for d in data:
+            yield from _iter_ld_nodes(d)
+    elif isinstance(data, dict):
+        yield data
+        if "@graph" in data:
+            yield from _iter_ld_nodes(data["@graph"])
+
+
+def _jsonld_records(html: str, url: Optional[str] = None) -> Optional[List[ListingRecord]]:
+    found = False
+    out: List[ListingRecord] = []
+    for body in _script_bodies(html, _LD_JSON_MARKER):
+        data = _load_json(body)
+        if data is None:
+            continue
+        for node in _iter_ld_nodes(data):
+            if _has_type(node, "Product"):
+                found = True
+                rec = _ld_product_record(node, url)
+                if rec:
+                    out.append(rec)
+            elif _has_type(node, "ItemList"):
+                found = True
+                for el in node.get("itemListElement") or []:
+                    if not isinstance(el, dict):
+                        continue
+                    product = el.get("item") if isinstance(el.get("item"), dict) else el
+                    rec = _ld_product_record(product, _pick(el, "url"))
+                    if rec:
+                        out.append(rec)
+    return out if found else None
+
+
+def extract_jsonld(html: str, url: Optional[str] = None) -> Optional[List[Listing]]:
+    """
+    JSON-LD(Product / ItemList)에서 Listing 추출. 블롭이 없으면 None.
+    """
+    records = _jsonld_records(html, url)
+    return None if records is None else build_listings(records)
+
+
+def _state_item_record(d: Dict[str, Any]) -> Optional[ListingRecord]:
+    price = _to_int(d.get("price"))
+    if price is None:
+        return None
+
+    cond = d.get("itemCondition") or d.get("item_condition")
+    condition = _name(cond)
+    if condition is None:
+        cond_id = _pick(d, "itemConditionId", "item_condition_id")
+        if cond_id is None and isinstance(cond, dict):
+            cond_id = cond.get("id")
+        condition = CONDITION_BY_ID.get(str(cond_id)) if cond_id is not None else None
+
+    status = str(d.get("status", "")).lower()
+    sold = ("sold" in status or "trading" in status) if status else None
+
+    seller = None
+    s = d.get("seller")
+    if isinstance(s, dict):
+        rating = _to_float(_pick(s, "star_rating_score", "starRatingScore", "score", "rating"))
+        if rating is None and isinstance(s.get("ratings"), dict):
+            r = s["ratings"]
+            good, normal, bad = (_to_int(r.get(k)) or 0 for k in ("good", "normal", "bad"))
+            total = good + normal + bad
+            rating = round((good * 5 + normal * 3 + bad * 1) / total, 2) if total else None
+        seller = SellerRecord(
+            name=_name(s),
+            rating=rating,
+            sales_count=_to_int(_pick(s, "num_sell_items", "numSellItems", "sales_count")),
+        )
+
+    return ListingRecord.create(
+        title=_name(d) or "No title",
+        price_jpy=price,
+        condition=condition,
+        shipping=_name(_pick(d, "shippingPayer", "shipping_payer")),
+        url=ITEM_URL_PREFIX + d["id"],
+        image_url=_first_url(_pick(d, "thumbnails", "photos", "thumbnail")),
+        seller=seller,
+        sold=sold,
+        likes=_to_int(_pick(d, "numLikes", "num_likes")),
+        description_snippet=_snippet(d.get("description")),
+    )
+
+
+def _iter_state_items(data: Any) -> Iterator[Dict[str, Any]]:
+    """Next.js 상태 트리에서 머카리 상품처럼 보이는 dict(id=m\\d+, name, price)를 찾는다."""
+    stack = [data]
+    while stack:
+        cur = stack.pop()
+        if isinstance(cur, dict):
+            item_id = cur.get("id")
+            if isinstance(item_id, str) and _ITEM_ID_RE.match(item_id) and "name" in cur and "price" in cur:
+                yield cur
+                continue
+            stack.extend(reversed(list(cur.values())))
+        elif isinstance(cur, list):
+            stack.extend(reversed(cur))
+
+
+def _next_data_blob(html: str) -> Any:
+    """<script id="__NEXT_DATA__"> 의 첫 번째 디코딩 가능한 JSON. 없으면 None."""
+    for body in _script_bodies(html, _NEXT_DATA_MARKER):
+        data = _load_json(body)
+        if data is not None:
+            return data
+    return None
+
+
+def _state_records(data: Any) -> List[ListingRecord]:
+    seen: set[str] = set()
+    out: List[ListingRecord] = []
+    for d in _iter_state_items(data):
+        if d["id"] in seen:
+            continue
+        seen.add(d["id"])
+        rec = _state_item_record(d)
+        if rec:
+            out.append(rec)
+    return out
+
+
+def _listings_from_state(data: Any) -> List[Listing]:
+    return build_listings(_state_records(data))
+
+
+def extract_next_data(html: str) -> Optional[List[Listing]]:
+    """
+    <script id="__NEXT_DATA__"> 상태 블롭에서 Listing 추출. 블롭이 없으면 None.
+    """
+    data = _next_data_blob(html)
+    return None if data is None else _listings_from_state(data)
+
+
+# ── 페이지네이션 ──────────────────────────────────────────────────────────────
+_PAGE_TOKEN_KEYS = ("nextPageToken", "next_page_token")
+_PAGE_TOKEN_RE = re.compile(r"[?&](?:amp;)?page_token=([^\"'&<>\s]+)")
+_NEXT_BUTTON_MARKER = 'data-testid="pagination-next-button"'
+
+
+def _state_page_token(data: Any) -> Optional[str]:
+    """상태 트리에서 nextPageToken 값을 찾는다(빈 문자열이면 마지막 페이지)."""
+    stack = [data]
+    while stack:
+        cur = stack.pop()
+        if isinstance(cur, dict):
+            for k in _PAGE_TOKEN_KEYS:
+                v = cur.get(k)
+                if isinstance(v, str) and v:
+                    return v
+            stack.extend(v for v in cur.values() if isinstance(v, (dict, list)))
+        elif isinstance(cur, list):
+            stack.extend(v for v in cur if isinstance(v, (dict, list)))
+    return None
+
+
+def _dom_page_token(html: str) -> Optional[str]:
+    """'다음' 페이지 버튼 근처 링크의 page_token 쿼리 파라미터."""
+    i = html.find(_NEXT_BUTTON_MARKER)
+    if i < 0:
+        return None
+    m = _PAGE_TOKEN_RE.search(html, i, i + 2000)
+    return unquote(m.group(1)) if m else None
+
+
+def _extract_embedded(html: str, url: Optional[str] = None) -> Optional[ParseResult]:
+    items = extract_jsonld(html, url)
+    if items:
+        return ParseResult(items=items, source=SOURCE_JSONLD)
+    items = extract_next_data(html)
+    if items:
+        return ParseResult(items=items, source=SOURCE_NEXT_DATA)
+    return None
+
+
+def _record(kind: str, result: ParseResult, url: Optional[str]) -> ParseResult:
+    _parse_source_counts[(kind, result.source)] += 1
+    logger.info("parsed %s page via %s (%d items) %s", kind, result.source, len(result.items), url or "")
+    return result
+
+
+@dataclass
+class SearchRecords:
+    """
+    검색 페이지의 경량 레코드(ListingRecord).
+    필터(scraping.pipeline)/랭킹을 레코드로 진행하고, 경계에서만 Listing으로 만든다.
+    """
+
+    records: List[ListingRecord] = field(default_factory=list)
+    source: str = SOURCE_DOM
+    next_page_token: Optional[str] = None
+
+    def to_result(self) -> ParseResult:
+        return ParseResult(items=build_listings(self.records), source=self.source, next_page_token=self.next_page_token)
+
+
+def _count_search(page: SearchRecords, url: Optional[str]) -> SearchRecords:
+    _parse_source_counts[("search", page.source)] += 1
+    logger.info("parsed search page via %s (%d records) %s", page.source, len(page.records), url or "")
+    return page
+
+
+def parse_search_records(html: str, url: Optional[str] = None) -> SearchRecords:
+    """
+    검색 결과 페이지 파싱(원시 레코드): 임베디드 JSON 우선, 없으면 DOM 카드 파서로 폴백.
+    다음 페이지 토큰(상태 블롭의 nextPageToken 또는 '다음' 버튼 링크)도 함께 채운다.
+    """
+    data = None
+    records = _jsonld_records(html)
+    if records:
+        page = SearchRecords(records=records, source=SOURCE_JSONLD)
+    else:
+        data = _next_data_blob(html)
+        records = _state_records(data) if data is not None else None
+        if records:
+            page = SearchRecords(records=records, source=SOURCE_NEXT_DATA)
+        else:
+            page = SearchRecords(records=_card_records(html), source=SOURCE_DOM)
+    page.next_page_token = (_state_page_token(data) if data is not None else None) or _dom_page_token(html)
+    return _count_search(page, url)
+
+
+def parse_search_api_records(data: Any, url: Optional[str] = None) -> SearchRecords:
+    """
+    검색 API JSON 응답(Playwright가 가로챈 XHR 본문) 파싱. 상품/토큰 구조는 __NEXT_DATA__ 상태와 같다.
+    """
+    page = SearchRecords(
+        records=_state_records(data) if data is not None else [],
+        source=SOURCE_API,
+        next_page_token=_state_page_token(data) if data is not None else None,
+    )
+    return _count_search(page, url)
+
+
+def parse_search_page(html: str, url: Optional[str] = None) -> ParseResult:
+    """검색 결과 페이지 → Listing 목록(parse_search_records + 검증)."""
+    return parse_search_records(html, url).to_result()
+
+
+def parse_search_api(data: Any, url: Optional[str] = None) -> ParseResult:
+    """검색 API JSON → Listing 목록(parse_search_api_records + 검증)."""
+    return parse_search_api_records(data, url).to_result()
+
+
+def parse_detail_page(html: str, url: str) -> ParseResult:
+    """
+    상세 페이지 파싱: 임베디드 JSON 우선, 없으면 DOM 휴리스틱(_parse_listing_detail)으로 폴백.
+    반환 items는 항상 1개.
+    """
+    result = _extract_embedded(html, url)
+    if result is not None:
+        # 상세 페이지의 추천/연관 상품이 섞여 있을 수 있으므로 URL이 같은 항목 우선
+        item_id = item_id_from_url(url)
+        main = next((x for x in result.items if item_id_from_url(str(x.url)) == item_id), None)
+        if main is None and result.source == SOURCE_JSONLD:
+            main = result.items[0]
+        if main is not None:
+            return _record("detail", ParseResult(items=[main], source=result.source), url)
+    return _record("detail", ParseResult(items=[_parse_listing_detail(html, url)], source=SOURCE_DOM), url)
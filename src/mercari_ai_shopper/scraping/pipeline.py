@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from mercari_ai_shopper.models.listing import Listing, ListingRecord
+from mercari_ai_shopper.models.query import SearchQuery
+from mercari_ai_shopper.utils.matcher import matcher_for
+
+Record = ListingRecord
+
+# 단계별 상대 비용(정수 비교 < 짧은 라벨 부분 문자열 < 제목/설명 정규화+스캔)
+STAGE_COSTS = {"price": 1.0, "condition": 2.0, "text": 10.0}
+# 누적 관측이 이만큼 쌓인 단계만 관측 선택도로 순서를 조정(그 전에는 비용 순)
+MIN_SAMPLES_FOR_REORDER = 200
+
+# 프로세스 누적 단계별 카운터: (stage, "seen" | "rejected") → count
+_stage_counts: Counter = Counter()
+_counts_lock = threading.Lock()
+
+
+@dataclass
+class Stage:
+    """필터 단계 1개(레코드 술어) + 이 파이프라인 안에서의 통과/탈락 수."""
+
+    name: str
+    pred: Callable[[Record], bool]
+    seen: int = 0
+    rejected: int = 0
+
+
+def _rejection_rate(name: str) -> Optional[float]:
+    seen = _stage_counts[(name, "seen")]
+    if seen < MIN_SAMPLES_FOR_REORDER:
+        return None
+    return _stage_counts[(name, "rejected")] / seen
+
+
+def _stage_rank(name: str) -> float:
+    """
+    작을수록 앞에 둔다: 비용 / 탈락률(싸고 많이 거르는 단계 우선).
+    관측이 부족하면 탈락률 0.5로 가정해 비용 순서를 따른다.
+    """
+    rate = _rejection_rate(name)
+    return STAGE_COSTS[name] / max(0.05, 0.5 if rate is None else rate)
+
+
+def _price_stage(q: SearchQuery) -> Optional[Callable[[Record], bool]]:
+    lo, hi = q.budget_min, q.budget_max
+    if lo is None and hi is None:
+        return None
+    if lo is None:
+        return lambda r: r.price_jpy <= hi
+    if hi is None:
+        return lambda r: r.price_jpy >= lo
+    return lambda r: lo <= r.price_jpy <= hi
+
+
+def _condition_stage(q: SearchQuery) -> Optional[Callable[[Record], bool]]:
+    if not q.condition:
+        return None
+    wanted = tuple(q.condition)
+    return lambda r: any(c in (r.condition or "") for c in wanted)
+
+
+def _text_stage(q: SearchQuery) -> Optional[Callable[[Record], bool]]:
+    if not q.brand and not q.color:
+        return None
+    scan = matcher_for(q).scan
+
+    def ok(r: Record) -> bool:
+        m = scan(r.title, r.description_snippet)
+        return m.brand_ok and m.color_ok
+
+    return ok
+
+
+class FilterPipeline:
+    """
+    SearchQuery를 레코드(parsers.SearchRecords.records) 술어 체인으로 컴파일.
+    - 질의에 없는 조건은 단계 자체를 만들지 않음
+    - 가격(정수 범위) → 상태 → 브랜드/색상(텍스트) 순, 누적 선택도가 쌓이면 비용/탈락률로 재정렬
+    - 통과한 레코드는 그대로 흘려보내고 Listing 변환은 API 경계에서 한다
+    HTTP/Playwright 등 모든 엔진이 이 파이프라인을 거친다.
+    """
+
+    def __init__(self, q: SearchQuery):
+        builders = {"price": _price_stage, "condition": _condition_stage, "text": _text_stage}
+        stages = [Stage(name, pred) for name, build in builders.items() if (pred := build(q)) is not None]
+        self.stages: List[Stage] = sorted(stages, key=lambda st: _stage_rank(st.name))
+
+    def keep(self, rec: Record) -> bool:
+        for st in self.stages:
+            st.seen += 1
+            if not st.pred(rec):
+                st.rejected += 1
+                return False
+        return True
+
+    def run(self, records: Iterable[Record]) -> Iterator[Record]:
+        """스트리밍 단계: 레코드를 흘려 넣으면 통과한 레코드를 차례로 내보낸다."""
+        try:
+            for rec in records:
+                if self.keep(rec):
+                    yield rec
+        finally:
+            self.flush()
+
+    def flush(self) -> None:
+        """이 파이프라인의 단계별 카운터를 프로세스 누적 통계에 반영."""
+        with _counts_lock:
+            for st in self.stages:
+                _stage_counts[(st.name, "seen")] += st.seen
+                _stage_counts[(st.name, "rejected")] += st.rejected
+                st.seen = st.rejected = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "order": [st.name for st in self.stages],
+            "stages": {st.name: {"seen": st.seen, "rejected": st.rejected} for st in self.stages},
+        }
+
+
+def compile_pipeline(q: SearchQuery) -> FilterPipeline:
+    return FilterPipeline(q)
+
+
+def sort_limit(items: List[Any], q: SearchQuery) -> List[Any]:
+    """정렬(best-effort) + limit(안전상 최대 100). 모든 엔진 공용."""
+    if q.sort == "price_asc":
+        items.sort(key=lambda x: x.price_jpy)
+    elif q.sort == "price_desc":
+        items.sort(key=lambda x: x.price_jpy, reverse=True)
+    # new: 신상 기준 정보가 없으므로 사이트 순서 유지 / relevance: 검색 결과 순서 그대로
+    limit = max(1, min(100, q.limit))
+    return items[:limit]
+
+
+def filter_sort_limit(records: Iterable[Record], q: SearchQuery) -> List[Listing]:
+    """한 번에 받은 레코드 묶음(Playwright 등)에 필터 → 정렬/limit → Listing(경계)."""
+    return [rec.to_listing() for rec in sort_limit(list(compile_pipeline(q).run(records)), q)]
+
+
+def pipeline_stats() -> Dict[str, Dict[str, Any]]:
+    """단계별 누적 통과/탈락 수와 탈락률(/stats 노출, 순서 튜닝용)."""
+    out: Dict[str, Dict[str, Any]] = {}
+    with _counts_lock:
+        for name in STAGE_COSTS:
+            seen = _stage_counts[(name, "seen")]
+            rejected = _stage_counts[(name, "rejected")]
+            out[name] = {
+                "seen": seen,
+                "rejected": rejected,
+                "rejection_rate": round(rejected / seen, 4) if seen else None,
+            }
+    return out
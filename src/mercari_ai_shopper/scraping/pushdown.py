@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from mercari_ai_shopper.config import get_settings
+from mercari_ai_shopper.models.listing import ListingRecord
+from mercari_ai_shopper.models.query import SearchQuery
+from .parsers import CONDITION_BY_ID
+
+logger = logging.getLogger(__name__)
+
+Record = ListingRecord
+
+# 상태 라벨 → 머카리 item_condition_id
+CONDITION_ID_BY_LABEL = {label: cid for cid, label in CONDITION_BY_ID.items()}
+
+# q.sort → (sort, order). relevance는 사이트 기본값이므로 보내지 않는다.
+_SORT_PARAMS = {
+    "price_asc": ("price", "asc"),
+    "price_desc": ("price", "desc"),
+    "new": ("created_time", "desc"),
+}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 검증 함수: 한 페이지 레코드가 실어 보낸 조건을 얼마나 지켰는지 (판정 대상 수, 만족 수)
+# ──────────────────────────────────────────────────────────────────────────────
+def _check_price(records: Sequence[Record], params: Mapping[str, str]) -> Tuple[int, int]:
+    lo = int(params["price_min"]) if "price_min" in params else None
+    hi = int(params["price_max"]) if "price_max" in params else None
+    ok = sum(
+        1 for r in records
+        if (lo is None or r.price_jpy >= lo) and (hi is None or r.price_jpy <= hi)
+    )
+    return len(records), ok
+
+
+def _check_sort(records: Sequence[Record], params: Mapping[str, str]) -> Tuple[int, int]:
+    # 가격 정렬만 판정 가능(등록 시각은 검색 결과에 없음): 인접 쌍이 순서를 지키는 비율
+    if params.get("sort") != "price":
+        return 0, 0
+    prices = [r.price_jpy for r in records]
+    desc = params.get("order") == "desc"
+    pairs = list(zip(prices, prices[1:]))
+    ok = sum(1 for a, b in pairs if (a >= b if desc else a <= b))
+    return len(pairs), ok
+
+
+def _check_condition(records: Sequence[Record], params: Mapping[str, str]) -> Tuple[int, int]:
+    wanted = [w for cid in params["item_condition_id"].split(",") if (w := CONDITION_BY_ID.get(cid))]
+    # DOM 카드 등 상태 정보가 없는 레코드는 판정 대상에서 제외.
+    # DOM 카드의 상태는 카드 텍스트 통째라 클라이언트 측 단계(pipeline._condition_stage)처럼 부분 일치로 본다
+    known = [r.condition for r in records if r.condition]
+    return len(known), sum(1 for c in known if any(w in c for w in wanted))
+
+
+@dataclass
+class Capability:
+    """
+    푸시다운 가능한 조건 1종.
+    - params(q): URL에 실을 파라미터(해당 조건이 없으면 빈 dict)
+    - keys: 이 조건이 URL에 실렸는지 판단하는 파라미터 이름
+    - check(records, params): 검증(판정 대상 수, 만족 수)
+    """
+
+    name: str
+    keys: Tuple[str, ...]
+    params: Callable[[SearchQuery], Dict[str, str]]
+    check: Callable[[Sequence[Record], Mapping[str, str]], Tuple[int, int]]
+
+
+def _price_params(q: SearchQuery) -> Dict[str, str]:
+    out: Dict[str, str] = {}
+    if q.budget_min is not None:
+        out["price_min"] = str(q.budget_min)
+    if q.budget_max is not None:
+        out["price_max"] = str(q.budget_max)
+    return out
+
+
+def _sort_params(q: SearchQuery) -> Dict[str, str]:
+    pair = _SORT_PARAMS.get(q.sort)
+    return {"sort": pair[0], "order": pair[1]} if pair else {}
+
+
+def _condition_params(q: SearchQuery) -> Dict[str, str]:
+    ids = sorted({CONDITION_ID_BY_LABEL[c] for c in q.condition if c in CONDITION_ID_BY_LABEL})
+    return {"item_condition_id": ",".join(ids)} if ids else {}
+
+
+CAPABILITIES: Dict[str, Capability] = {
+    c.name: c
+    for c in (
+        Capability("price", ("price_min", "price_max"), _price_params, _check_price),
+        Capability("sort", ("sort", "order"), _sort_params, _check_sort),
+        Capability("condition", ("item_condition_id",), _condition_params, _check_condition),
+    )
+}
+
+
+class PushdownState:
+    """
+    조건별 푸시다운 on/off 상태(프로세스 공용).
+    검증에서 strikes번 연속 위반하면 cooldown 동안 끄고, 지나면 다시 시도한다.
+    """
+
+    def __init__(self, enabled: Sequence[str], strikes: int = 2, cooldown: float = 3600.0):
+        self.enabled = {name for name in enabled if name in CAPABILITIES}
+        self.strikes = max(1, strikes)
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._violations: Dict[str, int] = {}
+        self._disabled_until: Dict[str, float] = {}
+        self._counts: Dict[str, Dict[str, int]] = {
+            name: {"pushed": 0, "verified": 0, "violations": 0, "disabled": 0} for name in CAPABILITIES
+        }
+
+    def active(self, name: str) -> bool:
+        if name not in self.enabled:
+            return False
+        until = self._disabled_until.get(name)
+        return until is None or time.monotonic() >= until
+
+    def params(self, q: SearchQuery) -> Dict[str, str]:
+        out: Dict[str, str] = {}
+        for name, cap in CAPABILITIES.items():
+            if not self.active(name):
+                continue
+            p = cap.params(q)
+            if p:
+                out.update(p)
+                with self._lock:
+                    self._counts[name]["pushed"] += 1
+        return out
+
+    def verify(self, url: str, records: Sequence[Record], min_checked: int, tolerance: float) -> List[str]:
+        """
+        url에 실렸던 조건별로 결과를 검증. 위반으로 판정된 조건 이름 목록을 반환.
+        판정 대상이 min_checked건 미만이면 판단을 보류한다.
+        """
+        params = {k: v[0] for k, v in parse_qs(urlsplit(url).query).items()}
+        violated: List[str] = []
+        for name, cap in CAPABILITIES.items():
+            if not any(k in params for k in cap.keys):
+                continue
+            checked, ok = cap.check(records, params)
+            if checked < min_checked:
+                continue
+            good = ok / checked >= tolerance
+            with self._lock:
+                counts = self._counts[name]
+                counts["verified"] += 1
+                if good:
+                    self._violations[name] = 0
+                    continue
+                counts["violations"] += 1
+                self._violations[name] = self._violations.get(name, 0) + 1
+                if self._violations[name] >= self.strikes:
+                    self._violations[name] = 0
+                    self._disabled_until[name] = time.monotonic() + self.cooldown
+                    counts["disabled"] += 1
+                    logger.warning(
+                        "search pushdown '%s' disabled for %.0fs: site ignored it (%d/%d ok)",
+                        name, self.cooldown, ok, checked,
+                    )
+            violated.append(name)
+        return violated
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                name: {**counts, "active": self.active(name)}
+                for name, counts in self._counts.items()
+            }
+
+
+_state: Optional[PushdownState] = None
+_state_lock = threading.Lock()
+
+
+def get_pushdown_state() -> PushdownState:
+    global _state
+    if _state is None:
+        with _state_lock:
+            if _state is None:
+                s = get_settings()
+                names = [n.strip() for n in s.search_pushdown.split(",") if n.strip()]
+                _state = PushdownState(names, s.search_pushdown_strikes, s.search_pushdown_cooldown_seconds)
+    return _state
+
+
+def pushdown_params(q: SearchQuery) -> Dict[str, str]:
+    """현재 켜져 있는 조건 중 질의에 해당하는 URL 파라미터."""
+    return get_pushdown_state().params(q)
+
+
+def verify_pushdown(url: str, records: Sequence[Record]) -> List[str]:
+    """검색 결과 페이지가 URL에 실은 조건을 지켰는지 확인(SEARCH_PUSHDOWN_VERIFY=false면 생략)."""
+    s = get_settings()
+    if not s.search_pushdown_verify:
+        return []
+    return get_pushdown_state().verify(url, records, s.search_pushdown_min_checked, s.search_pushdown_tolerance)
+
+
+def pushdown_stats() -> Dict[str, Any]:
+    return get_pushdown_state().stats()
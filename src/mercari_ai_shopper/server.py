@@ -1,25 +1,75 @@
 from __future__ import annotations
 
 import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List
 
-from fastapi import FastAPI, Body
-from pydantic import BaseModel
+from fastapi import FastAPI, Body, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 
+from mercari_ai_shopper.config import get_settings
 from mercari_ai_shopper.models.query import SearchQuery
-from mercari_ai_shopper.models.recommendation import RecommendationResponse
-from mercari_ai_shopper.scraping.mercari_client import search as http_search
+from mercari_ai_shopper.models.recommendation import RankedListing, RecommendationResponse
+from mercari_ai_shopper.scraping.engine import asearch_auto, engine_stats
+from mercari_ai_shopper.scraping.browser_pool import browser_pool_stats, close_browser_pool, get_browser_pool
+from mercari_ai_shopper.scraping.mercari_client import aiter_search as aiter_http_search
 from mercari_ai_shopper.scraping.mercari_playwright import search_playwright
-from mercari_ai_shopper.agent.reasoning import rank_and_explain
+from mercari_ai_shopper.scraping.parsers import parse_source_stats
+from mercari_ai_shopper.scraping.pipeline import pipeline_stats
+from mercari_ai_shopper.scraping.pushdown import pushdown_stats
+from mercari_ai_shopper.agent.agent import Agent, agent_route_stats
+from mercari_ai_shopper.agent.enrichment import aenrich_and_rank
+from mercari_ai_shopper.agent.query_cache import get_query_cache
+from mercari_ai_shopper.llm.shared import aclose_llm_clients, llm_client_stats
+from mercari_ai_shopper.llm.tool_executor import tool_executor_stats
+from mercari_ai_shopper.utils.http import close_async_http_client, close_http_client, http_client_info
+from mercari_ai_shopper.utils.http_cache import get_response_cache
+from mercari_ai_shopper.utils.ratelimit import get_rate_limiter
+from mercari_ai_shopper.utils.result_cache import SingleFlightCache
+from mercari_ai_shopper.utils.serialization import FastJSONResponse, dumps
 
 logger = logging.getLogger(__name__)
-app = FastAPI(title="Mercari AI Shopper", version="0.1.0")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if get_settings().playwright_pool_prestart:
+        # 브라우저 기동(수 초)을 첫 요청이 아니라 서버 시작 시점에 지불
+        get_browser_pool()
+    yield
+    await run_in_threadpool(close_browser_pool)
+    # 공용 커넥션 풀 정리
+    await close_async_http_client()
+    close_http_client()
+    await aclose_llm_clients()
+
+
+app = FastAPI(title="Mercari AI Shopper", version="0.1.0", lifespan=lifespan)
+
+
+def _ranked_size(items: List[RankedListing]) -> int:
+    """캐시 바이트 상한용 대략적 크기(JSON 길이 기준)."""
+    return sum(len(dumps(r)) for r in items)
+
+
+_settings = get_settings()
+# 인기 질의 동시 폭주 대비: 정규화 질의 키 → 랭킹 결과 (single-flight)
+_search_cache: SingleFlightCache[List[RankedListing]] = SingleFlightCache(
+    max_entries=_settings.search_cache_max_entries,
+    max_bytes=_settings.search_cache_max_bytes,
+    ttl_seconds=_settings.search_cache_ttl_seconds,
+    sizeof=_ranked_size,
+)
 
 
 class SearchRequest(BaseModel):
     """간단한 구조화 입력. LLM을 거치지 않아도 테스트 가능."""
     query: SearchQuery
     top_k: int = 3
-    engine: str = "http"  # "http" | "playwright"
+    engine: str = "http"  # "http" | "playwright" | "auto"
+    enrich_top_n: int = 0  # >0 이면 상위 N개 상세 보강 후 재랭킹
 
 
 @app.get("/health")
@@ -27,12 +77,103 @@ def health():
     return {"status": "ok"}
 
 
-@app.post("/search", response_model=RecommendationResponse)
-def search_endpoint(req: SearchRequest = Body(...)) -> RecommendationResponse:
+@app.get("/stats")
+def stats():
+    """캐시/파서 경로 등 런타임 지표."""
+    http_cache = get_response_cache()
+    limiter = get_rate_limiter()
+    query_cache = get_query_cache()
+    return {
+        "search_cache": _search_cache.stats(),
+        "http_cache": http_cache.stats() if http_cache is not None else None,
+        "parse_sources": parse_source_stats(),
+        "filter_pipeline": pipeline_stats(),
+        "search_pushdown": pushdown_stats(),
+        "http_client": http_client_info(),
+        "browser_pool": browser_pool_stats(),
+        "engines": engine_stats.snapshot(),
+        "rate_limiter": limiter.stats() if limiter is not None else None,
+        "agent_tools": tool_executor_stats(),
+        "llm": llm_client_stats(),
+        "agent_routes": agent_route_stats(),
+        "agent_query_cache": query_cache.stats() if query_cache is not None else None,
+    }
+
+
+async def _search_and_rank(req: SearchRequest) -> List[RankedListing]:
     if req.engine == "playwright":
-        items = search_playwright(req.query)
+        # Playwright sync API는 스레드에서 실행
+        items = await run_in_threadpool(search_playwright, req.query)
+    elif req.engine == "auto":
+        items = (await asearch_auto(req.query)).items
     else:
-        items = http_search(None, req.query)
+        # 페이지가 파싱되는 대로 1차 랭킹 진행(크롤 완료를 기다리지 않음)
+        items = aiter_http_search(req.query)
+    return await aenrich_and_rank(items, req.query, top_k=req.top_k, top_n=req.enrich_top_n)
+
+
+# 응답 모델은 문서(OpenAPI)용으로만 선언하고, 직렬화는 FastJSONResponse가 바로 한다
+# (방금 만든 RecommendationResponse를 response_model로 다시 검증/인코딩하지 않음)
+@app.post(
+    "/search",
+    response_model=None,
+    response_class=FastJSONResponse,
+    responses={200: {"model": RecommendationResponse}},
+)
+async def search_endpoint(req: SearchRequest = Body(...)) -> FastJSONResponse:
+    key = (req.engine, req.top_k, req.enrich_top_n, req.query.cache_key())
+    ranked = await _search_cache.aget_or_compute(key, lambda: _search_and_rank(req))
+    return FastJSONResponse(RecommendationResponse(query=req.query, top_k=req.top_k, items=ranked))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# /agent: LLM 도구 호출 루프 스트리밍 (NDJSON 기본, Accept: text/event-stream이면 SSE)
+# ──────────────────────────────────────────────────────────────────────────────
+class AgentRequest(BaseModel):
+    text: str = Field(..., min_length=1, description="자연어 요청(ko/en/ja)")
+    max_steps: int = Field(3, ge=1, le=8)
+
+
+def _encode_event(event: Dict[str, Any], sse: bool) -> bytes:
+    if sse:
+        return b"event: " + event["type"].encode() + b"\ndata: " + dumps(event) + b"\n\n"
+    return dumps(event) + b"\n"
+
+
+async def _agent_events(agent: Agent, req: AgentRequest, sse: bool) -> AsyncIterator[bytes]:
+    """
+    첫 바이트(start)를 LLM 호출 전에 바로 보내고, 이후 이벤트를 도착하는 대로 흘려보낸다.
+    LLM/도구 오류는 스트림 안의 error 이벤트로 알린다(이미 200을 보낸 뒤이므로).
+    대화마다 스레드를 잡지 않으므로(비동기 LLM 클라이언트 + async 도구) 워커당 동시 대화 수는
+    스레드풀 크기가 아니라 제공자별 LLM 동시 호출 상한(OPENAI/ANTHROPIC_MAX_CONCURRENCY)이 정한다.
+    """
+    yield _encode_event({"type": "start"}, sse)
+    try:
+        async for event in agent.astream(req.text, max_steps=req.max_steps):
+            yield _encode_event(event, sse)
+    except Exception as e:  # noqa: BLE001
+        logger.exception("agent stream failed")
+        yield _encode_event({"type": "error", "message": str(e)}, sse)
+
 
-    ranked = rank_and_explain(items, req.query, top_k=req.top_k)
-    return RecommendationResponse(query=req.query, top_k=req.top_k, items=ranked)
+@app.post("/agent")
+async def agent_endpoint(request: Request, req: AgentRequest = Body(...)) -> StreamingResponse:
+    """
+    자연어 요청 → LLM tool-calling 루프를 이벤트 스트림으로.
+    이벤트: start, parsed(규칙 파서로 해석 — LLM 없이 검색+랭킹, done.steps=0),
+    cache_hit(질의 캐시 적중 — 첫 LLM 호출 생략), step, token(최종 답변 조각),
+    usage(단계별 토큰 — 프롬프트 캐시 읽기/쓰기 포함), tool_start, tool_end, done(전체 답변), error
+    """
+    agent = Agent(asynchronous=True)
+    try:
+        # 규칙 파서로 끝나는 요청은 LLM 클라이언트 없이(API 키 미설정이어도) 응답
+        agent.check_llm(req.text)
+    except RuntimeError as e:  # API 키/SDK 미설정
+        raise HTTPException(status_code=503, detail=str(e))
+    sse = "text/event-stream" in request.headers.get("accept", "")
+    return StreamingResponse(
+        _agent_events(agent, req, sse),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
+        # 프록시 버퍼링 없이 바로 흘려보내기
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
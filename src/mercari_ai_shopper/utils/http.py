@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import asyncio
+import atexit
+import logging
+import threading
+from typing import Any, Dict, Optional, Union
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from mercari_ai_shopper.config import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+# 스크래핑 모듈이 받는 세션 타입. 둘 다 get(url, params=, headers=, timeout=) 인터페이스를 공유한다.
+HttpClient = Union[requests.Session, httpx.Client]
+
+_client: Optional[HttpClient] = None
+_lock = threading.Lock()
+_atexit_registered = False
+
+# httpx.AsyncClient는 생성된 이벤트 루프에 묶이므로 루프별로 하나씩 보관
+_async_clients: Dict[int, tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+
+
+def _h2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _no_proxy_hosts(s: Settings) -> list[str]:
+    return [h.strip() for h in s.no_proxy.split(",") if h.strip()]
+
+
+def _build_requests_session(s: Settings) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=s.http_pool_size, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    proxies: Dict[str, str] = {}
+    if s.http_proxy:
+        proxies["http"] = s.http_proxy
+    if s.https_proxy:
+        proxies["https"] = s.https_proxy
+    if proxies and s.no_proxy:
+        proxies["no_proxy"] = s.no_proxy
+    session.proxies.update(proxies)
+    return session
+
+
+def _build_httpx_client(s: Settings) -> httpx.Client:
+    limits = httpx.Limits(
+        max_connections=s.http_pool_size,
+        max_keepalive_connections=s.http_pool_size,
+        keepalive_expiry=s.http_keepalive_seconds,
+    )
+    mounts: Dict[str, Optional[httpx.HTTPTransport]] = {}
+    if s.http_proxy:
+        mounts["http://"] = httpx.HTTPTransport(proxy=s.http_proxy, http2=True, limits=limits)
+    if s.https_proxy:
+        mounts["https://"] = httpx.HTTPTransport(proxy=s.https_proxy, http2=True, limits=limits)
+    if mounts:
+        for host in _no_proxy_hosts(s):
+            mounts[f"all://{host}"] = None
+    return httpx.Client(
+        http2=True,
+        limits=limits,
+        mounts=mounts or None,
+        timeout=s.http_timeout,
+        follow_redirects=True,
+    )
+
+
+def _build_async_client(s: Settings) -> httpx.AsyncClient:
+    http2 = s.http2 and _h2_available()
+    limits = httpx.Limits(
+        max_connections=s.http_async_max_connections,
+        max_keepalive_connections=s.http_async_max_connections,
+        keepalive_expiry=s.http_keepalive_seconds,
+    )
+    mounts: Dict[str, Optional[httpx.AsyncHTTPTransport]] = {}
+    if s.http_proxy:
+        mounts["http://"] = httpx.AsyncHTTPTransport(proxy=s.http_proxy, http2=http2, limits=limits)
+    if s.https_proxy:
+        mounts["https://"] = httpx.AsyncHTTPTransport(proxy=s.https_proxy, http2=http2, limits=limits)
+    if mounts:
+        for host in _no_proxy_hosts(s):
+            mounts[f"all://{host}"] = None
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=limits,
+        mounts=mounts or None,
+        timeout=s.http_timeout,
+        follow_redirects=True,
+    )
+
+
+def get_http_client() -> HttpClient:
+    """
+    프로세스 공용 HTTP 클라이언트(커넥션 풀/keep-alive 재사용).
+    - 기본: requests.Session + 풀 크기 HTTP_POOL_SIZE
+    - HTTP2=true 이고 h2 패키지가 있으면 httpx.Client(http2=True)
+    - 프록시: Settings.http_proxy / https_proxy / no_proxy
+    서버 스레드풀에서 동시에 호출해도 안전(최초 생성만 락으로 보호).
+    """
+    global _client, _atexit_registered
+    if _client is not None:
+        return _client
+    with _lock:
+        if _client is not None:
+            return _client
+        s = get_settings()
+        if s.http2 and _h2_available():
+            _client = _build_httpx_client(s)
+        else:
+            if s.http2:
+                logger.warning("HTTP2=true but 'h2' is not installed; falling back to HTTP/1.1 requests.Session")
+            _client = _build_requests_session(s)
+        if not _atexit_registered:
+            atexit.register(close_http_client)
+            _atexit_registered = True
+        return _client
+
+
+def close_http_client() -> None:
+    """공용 클라이언트 종료(앱 shutdown/프로세스 종료 시). 이후 호출 시 새로 생성된다."""
+    global _client
+    with _lock:
+        client, _client = _client, None
+    if client is not None:
+        try:
+            client.close()
+        except Exception:  # noqa: BLE001
+            logger.debug("http client close failed", exc_info=True)
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    현재 이벤트 루프용 공용 httpx.AsyncClient.
+    커넥션 상한은 HTTP_ASYNC_MAX_CONNECTIONS (워커당 수백 건 동시 검색 대비).
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        entry = _async_clients.get(id(loop))
+        if entry is not None and entry[0] is loop and not entry[1].is_closed:
+            return entry[1]
+        # 닫힌 루프의 클라이언트는 정리 대상에서 제외(그 루프에서만 aclose 가능)
+        for key in [k for k, (lp, _) in _async_clients.items() if lp.is_closed()]:
+            del _async_clients[key]
+        client = _build_async_client(get_settings())
+        _async_clients[id(loop)] = (loop, client)
+        return client
+
+
+async def close_async_http_client() -> None:
+    """현재 루프의 공용 AsyncClient 종료(앱 shutdown 시)."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        entry = _async_clients.pop(id(loop), None)
+    if entry is not None:
+        await entry[1].aclose()
+
+
+def http_client_info() -> Dict[str, Any]:
+    s = get_settings()
+    c = _client
+    return {
+        "initialized": c is not None,
+        "impl": type(c).__name__ if c is not None else None,
+        "pool_size": s.http_pool_size,
+        "http2": isinstance(c, httpx.Client),
+        "proxy": bool(s.http_proxy or s.https_proxy),
+        "async_clients": len(_async_clients),
+        "async_max_connections": s.http_async_max_connections,
+    }
@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from requests.structures import CaseInsensitiveDict
+
+from mercari_ai_shopper.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key           TEXT PRIMARY KEY,
+    url           TEXT NOT NULL,
+    status        INTEGER NOT NULL,
+    headers       TEXT NOT NULL,
+    body          BLOB NOT NULL,
+    etag          TEXT,
+    last_modified TEXT,
+    stored_at     REAL NOT NULL,
+    expires_at    REAL NOT NULL,
+    last_access   REAL NOT NULL,
+    size          INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access);
+"""
+
+# 캐시에 보관할 응답 헤더(나머지는 버림)
+_KEEP_HEADERS = ("content-type", "etag", "last-modified", "date")
+
+
+def normalize_url(url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+    """
+    캐시 키용 URL 정규화.
+    - scheme/host 소문자, fragment 제거
+    - URL 쿼리 + params를 합쳐 키 순으로 정렬
+    """
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        query.extend((str(k), str(v)) for k, v in params.items() if v is not None)
+    query.sort()
+    return urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", urlencode(query), "")
+    )
+
+
+class CachedResponse:
+    """
+    캐시에서 꺼낸 응답. _request 호출부가 쓰는 requests.Response 인터페이스만 흉내낸다.
+    """
+
+    def __init__(self, url: str, status_code: int, headers: Dict[str, str], content: bytes):
+        self.url = url
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.from_cache = True
+
+    @property
+    def text(self) -> str:
+        ctype = self.headers.get("content-type", "")
+        enc = "utf-8"
+        if "charset=" in ctype:
+            enc = ctype.split("charset=", 1)[1].split(";", 1)[0].strip() or "utf-8"
+        return self.content.decode(enc, errors="replace")
+
+    def raise_for_status(self) -> None:
+        return None
+
+
+@dataclass
+class CacheEntry:
+    key: str
+    url: str
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    def validators(self) -> Dict[str, str]:
+        """조건부 재검증용 헤더(If-None-Match / If-Modified-Since)."""
+        h: Dict[str, str] = {}
+        if self.etag:
+            h["If-None-Match"] = self.etag
+        if self.last_modified:
+            h["If-Modified-Since"] = self.last_modified
+        return h
+
+    def response(self) -> CachedResponse:
+        return CachedResponse(self.url, self.status, self.headers, self.body)
+
+
+class ResponseCache:
+    """
+    SQLite 기반 HTTP 응답 캐시.
+    - 키: 정규화 URL(+params)의 sha1
+    - 경로별 TTL: /item/ 상세 vs 검색
+    - 만료 항목은 ETag/Last-Modified로 조건부 재검증
+    - 전체 크기 상한 초과 시 last_access 기준 LRU 삭제
+    - WAL 모드라 여러 uvicorn 워커가 같은 파일을 공유해도 된다
+    """
+
+    def __init__(
+        self,
+        path: str,
+        search_ttl: int = 600,
+        item_ttl: int = 3600,
+        default_ttl: int = 3600,
+        max_bytes: int = 256 * 1024 * 1024,
+    ):
+        self.path = path
+        self.search_ttl = search_ttl
+        self.item_ttl = item_ttl
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=10.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._stats = {"hits": 0, "misses": 0, "revalidated": 0, "stores": 0, "evictions": 0}
+
+    # ── 키/TTL ────────────────────────────────────────────────────────────────
+    @staticmethod
+    def key_for(url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+        return hashlib.sha1(normalize_url(url, params).encode("utf-8")).hexdigest()
+
+    def ttl_for(self, url: str) -> int:
+        path = urlsplit(url).path
+        if path.startswith("/item/"):
+            return self.item_ttl
+        if path.startswith("/search"):
+            return self.search_ttl
+        return self.default_ttl
+
+    # ── 조회/저장 ─────────────────────────────────────────────────────────────
+    def lookup(self, url: str, params: Optional[Mapping[str, Any]] = None) -> Optional[CacheEntry]:
+        """
+        캐시 항목 조회(만료 여부와 무관). 신선하면 hit, 없거나 만료면 miss로 집계.
+        """
+        key = self.key_for(url, params)
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT url, status, headers, body, etag, last_modified, expires_at "
+                    "FROM responses WHERE key = ?",
+                    (key,),
+                ).fetchone()
+            except sqlite3.Error as exc:
+                logger.warning("HTTP cache lookup failed: %s", exc)
+                row = None
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+            entry = CacheEntry(key, row[0], row[1], json.loads(row[2]), row[3], row[4], row[5], row[6])
+            if entry.fresh:
+                self._stats["hits"] += 1
+                try:
+                    self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+                except sqlite3.Error:
+                    pass  # LRU 순서만 조금 부정확해짐
+            else:
+                self._stats["misses"] += 1
+            return entry
+
+    def store(self, url: str, params: Optional[Mapping[str, Any]], resp: Any) -> None:
+        """200 응답만 저장."""
+        if getattr(resp, "status_code", None) != 200:
+            return
+        body = resp.content
+        headers = {k.lower(): v for k, v in resp.headers.items() if k.lower() in _KEEP_HEADERS}
+        now = time.time()
+        full_url = str(getattr(resp, "url", "") or url)
+        with self._lock:
+            try:
+                self._store_locked(url, params, full_url, headers, body, now)
+            except sqlite3.Error as exc:
+                logger.warning("HTTP cache store failed: %s", exc)
+
+    def _store_locked(
+        self,
+        url: str,
+        params: Optional[Mapping[str, Any]],
+        full_url: str,
+        headers: Dict[str, str],
+        body: bytes,
+        now: float,
+    ) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO responses "
+            "(key, url, status, headers, body, etag, last_modified, stored_at, expires_at, last_access, size) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                self.key_for(url, params),
+                full_url,
+                200,
+                json.dumps(headers),
+                body,
+                headers.get("etag"),
+                headers.get("last-modified"),
+                now,
+                now + self.ttl_for(url),
+                now,
+                len(body),
+            ),
+        )
+        self._stats["stores"] += 1
+        self._evict_locked()
+
+    def revalidated(self, entry: CacheEntry, resp_headers: Optional[Mapping[str, str]] = None) -> CachedResponse:
+        """304 Not Modified 수신 시 만료 시각만 갱신하고 캐시 본문을 돌려준다."""
+        now = time.time()
+        etag = (resp_headers or {}).get("etag") or entry.etag
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "UPDATE responses SET expires_at = ?, last_access = ?, etag = ? WHERE key = ?",
+                    (now + self.ttl_for(entry.url), now, etag, entry.key),
+                )
+            except sqlite3.Error as exc:
+                logger.warning("HTTP cache revalidate failed: %s", exc)
+            self._stats["revalidated"] += 1
+        return entry.response()
+
+    def _evict_locked(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # 상한의 90%까지 오래 안 쓴 항목부터 삭제
+        target = int(self.max_bytes * 0.9)
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY last_access ASC").fetchall()
+        doomed = []
+        for key, size in rows:
+            if total <= target:
+                break
+            doomed.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+        self._stats["evictions"] += len(doomed)
+
+    # ── 관측 ──────────────────────────────────────────────────────────────────
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            out: Dict[str, Any] = dict(self._stats)
+        lookups = out["hits"] + out["misses"]
+        out.update(entries=entries, bytes=total, hit_ratio=round(out["hits"] / lookups, 4) if lookups else 0.0)
+        return out
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+_cache_disabled = False
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Settings 기반 프로세스 공용 캐시. 비활성화되었거나 cache_dir을 쓸 수 없으면 None.
+    """
+    global _cache, _cache_disabled
+    if _cache is not None or _cache_disabled:
+        return _cache
+    with _cache_lock:
+        if _cache is not None or _cache_disabled:
+            return _cache
+        s = get_settings()
+        if not s.http_cache_enabled:
+            _cache_disabled = True
+            return None
+        try:
+            os.makedirs(s.cache_dir, exist_ok=True)
+            _cache = ResponseCache(
+                os.path.join(s.cache_dir, "http_responses.sqlite"),
+                search_ttl=s.cache_ttl_search_seconds,
+                item_ttl=s.cache_ttl_item_seconds,
+                default_ttl=s.requests_cache_expire_seconds,
+                max_bytes=s.cache_max_bytes,
+            )
+        except (OSError, sqlite3.Error) as exc:
+            logger.warning("HTTP cache disabled (cache_dir=%s): %s", s.cache_dir, exc)
+            _cache_disabled = True
+        return _cache
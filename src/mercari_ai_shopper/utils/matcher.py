@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from mercari_ai_shopper.agent.query_parser import alias_group
+from mercari_ai_shopper.models.query import SearchQuery
+from mercari_ai_shopper.utils.text import normalize_text
+
+# 같은 (제목, 설명) 재검사 결과 보관 개수(필터 → 랭킹 재사용)
+SCAN_CACHE_SIZE = 4096
+# 이 개수 이상의 패턴은 오토마톤 한 번 순회가 패턴별 `in` 반복보다 빠름(scripts/bench_matcher.py 기준 약 200개)
+AUTOMATON_MIN_PATTERNS = 200
+
+
+@dataclass(frozen=True)
+class TextMatch:
+    """
+    한 리스팅 텍스트의 매칭 결과.
+    - keyword_hits: 제목에 나온 키워드 수(중복 키워드는 각각 셈)
+    - brand_ok / color_ok: 모든 브랜드/색상이 (별칭 중 하나로) 제목+설명에 있음(요청 없으면 True)
+    """
+
+    keyword_hits: int
+    brand_ok: bool
+    color_ok: bool
+
+
+class _Automaton:
+    """
+    Aho-Corasick 오토마톤. 패턴 수와 무관하게 텍스트 한 번 순회로
+    (패턴 번호, 끝 위치)를 모두 보고한다(겹치는 매칭 포함).
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[Tuple[int, ...]] = [()]
+        for pid, p in enumerate(patterns):
+            s = 0
+            for ch in p:
+                nxt = self.goto[s].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[s][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append(())
+                s = nxt
+            self.out[s] += (pid,)
+        # BFS로 실패 링크 + 출력 병합
+        queue = deque(self.goto[0].values())
+        while queue:
+            s = queue.popleft()
+            for ch, nxt in self.goto[s].items():
+                queue.append(nxt)
+                f = self.fail[s]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                target = self.goto[f].get(ch, 0)
+                self.fail[nxt] = target if target != nxt else 0
+                self.out[nxt] += self.out[self.fail[nxt]]
+
+    def scan(self, text: str, title_end: int) -> Tuple[Set[int], Set[int]]:
+        """(전체에서 나온 패턴, title_end 이전에 끝난 패턴) 번호 집합."""
+        goto, fail, out = self.goto, self.fail, self.out
+        found: Set[int] = set()
+        in_title: Set[int] = set()
+        s = 0
+        for i, ch in enumerate(text):
+            while s and ch not in goto[s]:
+                s = fail[s]
+            s = goto[s].get(ch, 0)
+            if out[s]:
+                found.update(out[s])
+                if i < title_end:
+                    in_title.update(out[s])
+        return found, in_title
+
+
+class QueryMatcher:
+    """
+    SearchQuery의 keywords/brand/color를 한 번 컴파일해 두고
+    리스팅마다 정규화 텍스트(normalize_text)를 한 번만 만들어 결과를 낸다.
+    - 키워드: 제목 구간 안에서 끝나는 매칭만 인정(기존 `kw in title`과 동일)
+    - 브랜드/색상: 제목+설명 전체. 사전에 있는 값은 별칭 중 하나만 나와도 인정(query_parser.alias_group)
+    - 패턴이 AUTOMATON_MIN_PATTERNS개 이상이면 Aho-Corasick 한 번 순회,
+      그보다 적으면 C 구현 부분 문자열 검색이 더 빨라 그쪽을 쓴다(결과는 동일)
+    필터(mercari_client)와 랭킹(reasoning/batch_ranker)이 같은 인스턴스를 쓰므로
+    같은 리스팅의 재검사는 scan 캐시에서 바로 나온다.
+    """
+
+    def __init__(self, keywords: Sequence[str], brands: Sequence[str], colors: Sequence[str]):
+        self.n_keywords = len(keywords)
+        index: Dict[str, int] = {}
+
+        def ids(terms: Sequence[str]) -> List[int]:
+            return [index.setdefault(normalize_text(t), len(index)) for t in terms]
+
+        self._kw = ids(keywords)
+        self._brand = [frozenset(ids(alias_group(b))) for b in brands]
+        self._color = [frozenset(ids(alias_group(c))) for c in colors]
+        self.patterns: List[str] = list(index)
+        self._automaton = _Automaton(self.patterns) if len(self.patterns) >= AUTOMATON_MIN_PATTERNS else None
+        self.scan = lru_cache(maxsize=SCAN_CACHE_SIZE)(self._scan)
+
+    def _scan(self, title: str, desc: Optional[str]) -> TextMatch:
+        t = normalize_text(title or "")
+        hay = f"{t} {normalize_text(desc)}" if desc else t
+        if self._automaton is not None:
+            found, in_title = self._automaton.scan(hay, len(t))
+            # 빈 패턴(공백뿐인 키워드 등)은 `"" in s`처럼 항상 일치
+            for pid, p in enumerate(self.patterns):
+                if not p:
+                    found.add(pid)
+                    in_title.add(pid)
+        else:
+            found = {pid for pid, p in enumerate(self.patterns) if p in hay}
+            in_title = {pid for pid in found if self.patterns[pid] in t}
+        return TextMatch(
+            keyword_hits=sum(1 for pid in self._kw if pid in in_title),
+            brand_ok=all(g & found for g in self._brand),
+            color_ok=all(g & found for g in self._color),
+        )
+
+
+@lru_cache(maxsize=256)
+def _compiled(keywords: Tuple[str, ...], brands: Tuple[str, ...], colors: Tuple[str, ...]) -> QueryMatcher:
+    return QueryMatcher(keywords, brands, colors)
+
+
+def matcher_for(q: SearchQuery) -> QueryMatcher:
+    """질의별 컴파일된 매처(같은 키워드/브랜드/색상이면 같은 인스턴스)."""
+    return _compiled(tuple(q.keywords), tuple(q.brand or ()), tuple(q.color or ()))
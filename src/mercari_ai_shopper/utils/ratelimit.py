@@ -0,0 +1,321 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+from mercari_ai_shopper.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    host          TEXT PRIMARY KEY,
+    tokens        REAL NOT NULL,
+    rate          REAL NOT NULL,
+    updated       REAL NOT NULL,
+    blocked_until REAL NOT NULL DEFAULT 0
+);
+"""
+
+# 토큰이 없을 때 한 번에 자는 최대 시간(다른 프로세스의 변경을 다시 읽도록)
+_MAX_SLEEP = 1.0
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Retry-After 헤더(초 또는 HTTP-date) → 대기 초. 해석 불가면 None."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, dt.timestamp() - (now if now is not None else time.time()))
+
+
+def backoff_delay(attempt: int, base: float, retry_after: Optional[float] = None, cap: float = 30.0) -> float:
+    """
+    재시도 대기 시간.
+    - Retry-After가 있으면 그 값 + 약간의 지터(동시에 깨어나는 재시도 폭주 방지)
+    - 없으면 full jitter 지수 백오프: U(0, min(cap, base·2^(attempt-1)))
+    """
+    if retry_after is not None:
+        return min(cap, retry_after) + random.uniform(0, base)
+    return random.uniform(0, min(cap, base * (2 ** max(0, attempt - 1))))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 토큰 버킷 저장소
+# ──────────────────────────────────────────────────────────────────────────────
+class _MemoryBuckets:
+    """프로세스 내 토큰 버킷(SQLite를 못 쓸 때 폴백)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._rows: Dict[str, list] = {}  # host → [tokens, rate, updated, blocked_until]
+
+    def update(self, host: str, fn) -> Any:
+        with self._lock:
+            row = self._rows.get(host)
+            out, row = fn(row)
+            self._rows[host] = row
+            return out
+
+    def close(self) -> None:
+        pass
+
+
+class _SqliteBuckets:
+    """
+    SQLite 토큰 버킷. BEGIN IMMEDIATE로 갱신을 직렬화하므로
+    같은 파일을 쓰는 모든 스레드/uvicorn 워커 프로세스가 하나의 버킷을 공유한다.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=10.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def update(self, host: str, fn) -> Any:
+        with self._lock:
+            cur = self._conn
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                r = cur.execute(
+                    "SELECT tokens, rate, updated, blocked_until FROM buckets WHERE host = ?", (host,)
+                ).fetchone()
+                out, row = fn(list(r) if r else None)
+                cur.execute(
+                    "INSERT OR REPLACE INTO buckets (host, tokens, rate, updated, blocked_until) VALUES (?, ?, ?, ?, ?)",
+                    (host, *row),
+                )
+                cur.execute("COMMIT")
+            except BaseException:
+                cur.execute("ROLLBACK")
+                raise
+            return out
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 리미터
+# ──────────────────────────────────────────────────────────────────────────────
+class RateLimiter:
+    """
+    호스트별 토큰 버킷 + AIMD 동시성 제한.
+    - 요청 속도(rate, 초당 토큰)와 Retry-After 차단 시각은 저장소(SQLite)로 프로세스 간 공유
+    - 429/403/503 → rate 절반, Retry-After 동안 해당 호스트 전체 차단
+    - 성공 → rate += rate_step (max_rps까지)
+    - 동시 요청 수 상한도 AIMD: 성공·지연 양호 시 +1/limit, 스로틀/지연 초과 시 절반
+    """
+
+    def __init__(
+        self,
+        backend: Any = None,
+        rps: float = 2.0,
+        burst: float = 5.0,
+        min_rps: float = 0.2,
+        max_rps: float = 10.0,
+        rate_step: float = 0.05,
+        concurrency: int = 8,
+        min_concurrency: int = 1,
+        max_concurrency: int = 64,
+        latency_target: float = 2.0,
+    ):
+        self._backend = backend or _MemoryBuckets()
+        self.rps = rps
+        self.burst = max(1.0, burst)
+        self.min_rps = min_rps
+        self.max_rps = max_rps
+        self.rate_step = rate_step
+        self.min_concurrency = max(1, min_concurrency)
+        self.max_concurrency = max(self.min_concurrency, max_concurrency)
+        self.latency_target = latency_target
+        self._limit = float(min(max(concurrency, self.min_concurrency), self.max_concurrency))
+        self._inflight = 0
+        self._cond = threading.Condition()
+        self._stats = {"acquired": 0, "throttled": 0, "waited_seconds": 0.0}
+
+    # ── 토큰 ──────────────────────────────────────────────────────────────────
+    def _try_take(self, host: str) -> float:
+        """토큰 1개를 가져오면 0, 아니면 다시 시도하기까지 대기할 초."""
+        now = time.time()
+
+        def fn(row):
+            if row is None:
+                row = [self.burst, self.rps, now, 0.0]
+            tokens, rate, updated, blocked_until = row
+            tokens = min(self.burst, tokens + max(0.0, now - updated) * rate)
+            if now < blocked_until:
+                return blocked_until - now, [tokens, rate, now, blocked_until]
+            if tokens >= 1.0:
+                return 0.0, [tokens - 1.0, rate, now, blocked_until]
+            return (1.0 - tokens) / rate, [tokens, rate, now, blocked_until]
+
+        return self._backend.update(host, fn)
+
+    def _adjust_rate(self, host: str, throttled: bool, retry_after: Optional[float]) -> None:
+        now = time.time()
+
+        def fn(row):
+            if row is None:
+                row = [self.burst, self.rps, now, 0.0]
+            tokens, rate, updated, blocked_until = row
+            if throttled:
+                rate = max(self.min_rps, rate * 0.5)
+                tokens = 0.0
+                if retry_after:
+                    blocked_until = max(blocked_until, now + retry_after)
+            else:
+                rate = min(self.max_rps, rate + self.rate_step)
+            return None, [tokens, rate, updated, blocked_until]
+
+        self._backend.update(host, fn)
+
+    # ── 동시성 ────────────────────────────────────────────────────────────────
+    def _enter(self, block: bool = True) -> bool:
+        with self._cond:
+            while self._inflight >= int(self._limit):
+                if not block:
+                    return False
+                self._cond.wait()
+            self._inflight += 1
+            return True
+
+    def _leave(self) -> None:
+        with self._cond:
+            self._inflight -= 1
+            self._cond.notify()
+
+    # ── 공개 API ──────────────────────────────────────────────────────────────
+    @staticmethod
+    def host_of(url: str) -> str:
+        return urlsplit(url).netloc.lower()
+
+    @contextmanager
+    def slot(self, url: str) -> Iterator[None]:
+        """토큰과 동시성 슬롯을 얻을 때까지 대기(스레드용)."""
+        host = self.host_of(url)
+        t0 = time.monotonic()
+        self._enter()
+        try:
+            while True:
+                wait = self._try_take(host)
+                if wait <= 0:
+                    break
+                time.sleep(min(wait, _MAX_SLEEP))
+            self._count(time.monotonic() - t0)
+            yield
+        finally:
+            self._leave()
+
+    @asynccontextmanager
+    async def aslot(self, url: str) -> AsyncIterator[None]:
+        """slot()의 asyncio 버전(이벤트 루프를 막지 않음)."""
+        host = self.host_of(url)
+        t0 = time.monotonic()
+        delay = 0.005
+        while not self._enter(block=False):
+            await asyncio.sleep(delay)
+            delay = min(0.1, delay * 2)
+        try:
+            while True:
+                wait = await asyncio.to_thread(self._try_take, host)
+                if wait <= 0:
+                    break
+                await asyncio.sleep(min(wait, _MAX_SLEEP))
+            self._count(time.monotonic() - t0)
+            yield
+        finally:
+            self._leave()
+
+    def on_success(self, url: str, latency: float) -> None:
+        with self._cond:
+            if latency > self.latency_target * 2:
+                self._limit = max(self.min_concurrency, self._limit * 0.5)
+            elif latency <= self.latency_target:
+                self._limit = min(self.max_concurrency, self._limit + 1.0 / self._limit)
+            self._cond.notify_all()
+        if latency <= self.latency_target:
+            self._adjust_rate(self.host_of(url), False, None)
+
+    def on_throttle(self, url: str, retry_after: Optional[float] = None) -> None:
+        with self._cond:
+            self._limit = max(self.min_concurrency, self._limit * 0.5)
+            self._stats["throttled"] += 1
+        self._adjust_rate(self.host_of(url), True, retry_after)
+        logger.info("throttled by %s (retry_after=%s); limit=%d", self.host_of(url), retry_after, int(self._limit))
+
+    def _count(self, waited: float) -> None:
+        with self._cond:
+            self._stats["acquired"] += 1
+            self._stats["waited_seconds"] += waited
+
+    # ── 관측 ──────────────────────────────────────────────────────────────────
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            out: Dict[str, Any] = dict(self._stats)
+            out.update(concurrency_limit=int(self._limit), inflight=self._inflight)
+        out["waited_seconds"] = round(out["waited_seconds"], 3)
+        out["shared"] = isinstance(self._backend, _SqliteBuckets)
+        return out
+
+    def close(self) -> None:
+        self._backend.close()
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+_limiter_disabled = False
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """
+    Settings 기반 프로세스 공용 리미터. RATE_LIMIT_ENABLED=false면 None.
+    cache_dir에 SQLite를 만들 수 없으면 프로세스 내(메모리) 버킷으로 폴백.
+    """
+    global _limiter, _limiter_disabled
+    if _limiter is not None or _limiter_disabled:
+        return _limiter
+    with _limiter_lock:
+        if _limiter is not None or _limiter_disabled:
+            return _limiter
+        s = get_settings()
+        if not s.rate_limit_enabled:
+            _limiter_disabled = True
+            return None
+        backend: Any
+        try:
+            os.makedirs(s.cache_dir, exist_ok=True)
+            backend = _SqliteBuckets(os.path.join(s.cache_dir, "ratelimit.sqlite"))
+        except (OSError, sqlite3.Error) as exc:
+            logger.warning("rate limiter falls back to in-process buckets (cache_dir=%s): %s", s.cache_dir, exc)
+            backend = _MemoryBuckets()
+        _limiter = RateLimiter(
+            backend,
+            rps=s.rate_limit_rps,
+            burst=s.rate_limit_burst,
+            min_rps=s.rate_limit_min_rps,
+            max_rps=s.rate_limit_max_rps,
+            concurrency=s.rate_limit_concurrency,
+            max_concurrency=s.rate_limit_max_concurrency,
+            latency_target=s.rate_limit_latency_target_seconds,
+        )
+        return _limiter
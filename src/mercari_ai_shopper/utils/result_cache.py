@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+V = TypeVar("V")
+
+
+class _Flight:
+    """진행 중인 계산 1건. 같은 키의 후발 호출자는 event를 기다린다."""
+
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _LeaderCancelled(Exception):
+    """asyncio 선발 호출자가 취소됨 → 대기자는 다시 시도(공유 Future 취소 대신)."""
+
+
+class SingleFlightCache(Generic[V]):
+    """
+    인메모리 LRU + TTL 캐시 + single-flight.
+    - 항목 수(max_entries)와 대략적 바이트(max_bytes) 두 기준으로 제한
+    - 같은 키의 동시 miss는 한 번만 계산하고 나머지는 그 결과를 기다림
+    - 예외는 캐시하지 않고 대기 중인 호출자에게 그대로 전파
+    - 스레드용 get_or_compute / asyncio용 aget_or_compute 제공
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float = 300.0,
+        sizeof: Optional[Callable[[V], int]] = None,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._sizeof = sizeof or (lambda v: 1)
+        self._lock = threading.Lock()
+        # key → (expires_at, size, value)
+        self._data: "OrderedDict[Hashable, tuple[float, int, V]]" = OrderedDict()
+        self._inflight: Dict[Hashable, _Flight] = {}
+        self._ainflight: Dict[Hashable, "asyncio.Future[V]"] = {}
+        self._bytes = 0
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0}
+
+    # ── 조회 ──────────────────────────────────────────────────────────────────
+    def _get_locked(self, key: Hashable) -> tuple[bool, Optional[V]]:
+        item = self._data.get(key)
+        if item is None:
+            return False, None
+        expires_at, size, value = item
+        if time.monotonic() >= expires_at:
+            del self._data[key]
+            self._bytes -= size
+            return False, None
+        self._data.move_to_end(key)
+        return True, value
+
+    def get(self, key: Hashable) -> Optional[V]:
+        with self._lock:
+            return self._get_locked(key)[1]
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], V]) -> V:
+        with self._lock:
+            found, value = self._get_locked(key)
+            if found:
+                self._stats["hits"] += 1
+                return value  # type: ignore[return-value]
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+                self._stats["misses"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = compute()
+        except BaseException as exc:  # noqa: BLE001
+            flight.error = exc
+            raise
+        else:
+            self.put(key, flight.value)
+            return flight.value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.event.set()
+
+    async def aget_or_compute(self, key: Hashable, compute: Callable[[], Awaitable[V]]) -> V:
+        """
+        get_or_compute의 asyncio 버전. 후발 호출자는 선발 호출자의 Future를 await.
+        (같은 이벤트 루프 안에서만 합쳐짐)
+        선발 호출자가 취소되면(클라이언트 연결 끊김 등) 공유 Future를 취소하지 않고,
+        대기자 중 하나가 새 선발 호출자로 다시 계산한다.
+        """
+        while True:
+            with self._lock:
+                found, value = self._get_locked(key)
+                if found:
+                    self._stats["hits"] += 1
+                    return value  # type: ignore[return-value]
+                fut = self._ainflight.get(key)
+                leader = fut is None
+                if leader:
+                    fut = self._ainflight[key] = asyncio.get_running_loop().create_future()
+                    self._stats["misses"] += 1
+                else:
+                    self._stats["coalesced"] += 1
+
+            if not leader:
+                try:
+                    # shield: 대기자 한 명이 취소돼도 공유 Future는 취소되지 않게
+                    return await asyncio.shield(fut)
+                except _LeaderCancelled:
+                    continue
+            return await self._alead(key, fut, compute)
+
+    async def _alead(self, key: Hashable, fut: "asyncio.Future[V]", compute: Callable[[], Awaitable[V]]) -> V:
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            self._adone(key, fut)
+            fut.set_exception(_LeaderCancelled())
+            fut.exception()
+            raise
+        except BaseException as exc:  # noqa: BLE001
+            self._adone(key, fut)
+            fut.set_exception(exc)
+            fut.exception()  # 대기자가 없을 때 'never retrieved' 경고 방지
+            raise
+        self.put(key, value)
+        self._adone(key, fut)
+        fut.set_result(value)
+        return value
+
+    def _adone(self, key: Hashable, fut: "asyncio.Future[V]") -> None:
+        # 대기자를 깨우기 전에 빼 둬야 재시도하는 대기자가 새 선발 호출자가 된다
+        with self._lock:
+            if self._ainflight.get(key) is fut:
+                del self._ainflight[key]
+
+    # ── 저장/제거 ─────────────────────────────────────────────────────────────
+    def put(self, key: Hashable, value: V) -> None:
+        size = max(0, int(self._sizeof(value)))
+        if size > self.max_bytes:
+            return  # 단일 항목이 상한보다 크면 캐시하지 않음
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._data[key] = (time.monotonic() + self.ttl_seconds, size, value)
+            self._bytes += size
+            while self._data and (len(self._data) > self.max_entries or self._bytes > self.max_bytes):
+                _, (_, sz, _) = self._data.popitem(last=False)
+                self._bytes -= sz
+                self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    # ── 관측 ──────────────────────────────────────────────────────────────────
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._stats)
+            out.update(
+                entries=len(self._data),
+                bytes=self._bytes,
+                inflight=len(self._inflight) + len(self._ainflight),
+            )
+        lookups = out["hits"] + out["misses"] + out["coalesced"]
+        out["hit_ratio"] = round(out["hits"] / lookups, 4) if lookups else 0.0
+        return out
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from pydantic import BaseModel
+from starlette.responses import Response
+
+# orjson은 선택 의존성: 없으면 표준 json으로 같은 출력(UTF-8, 공백 없음)을 만든다
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 설치 환경에 따라
+    orjson = None  # type: ignore[assignment]
+
+
+def _default(obj: Any) -> Any:
+    """orjson/json이 모르는 타입: pydantic 모델은 JSON 모드 dump, 그 외(HttpUrl 등)는 문자열."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    return str(obj)
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    JSON 바이트 직렬화.
+    - pydantic 모델 1개: pydantic-core 직렬화기로 곧바로 바이트(중간 dict 없음, 재검증 없음)
+    - 그 외(dict/list, 모델이 섞인 컨테이너): orjson + default 훅(없으면 표준 json)
+    """
+    if isinstance(obj, BaseModel):
+        return obj.__pydantic_serializer__.to_json(obj)
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default)
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_str(obj: Any) -> str:
+    return dumps(obj).decode("utf-8")
+
+
+def tool_result_json(result: Any) -> str:
+    """
+    LLM에 돌려줄 도구 결과 문자열. str(dict)(파이썬 repr)이 아니라 실제 JSON.
+    이미 문자열이면 그대로 둔다.
+    """
+    if isinstance(result, str):
+        return result
+    return dumps_str(result)
+
+
+class FastJSONResponse(Response):
+    """
+    dumps() 기반 JSON 응답. 핸들러가 이미 만든 모델을 그대로 넘기면
+    FastAPI response_model 재검증/jsonable_encoder 단계를 건너뛴다.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import re
+import unicodedata
 from typing import List
 
 
@@ -14,3 +15,12 @@ def normalize_keywords(raw_text: str) -> List[str]:
     s = re.sub(r"[^\w\s\-]+", " ", raw_text)
     toks = [t.strip() for t in re.split(r"[\s,]+", s) if len(t.strip()) >= 2]
     return list(dict.fromkeys(toks))  # 순서 유지 중복 제거
+
+
+def normalize_text(s: str) -> str:
+    """
+    비교/캐시 키용 정규화.
+    - NFKC(전각/반각 통일), 소문자화
+    - 연속 공백(전각 공백 포함) → 공백 1개
+    """
+    return " ".join(unicodedata.normalize("NFKC", s).lower().split())
@@ -48,3 +48,20 @@ def test_cli_e2e_monkeypatched(monkeypatch, capsys):
     assert "1. Nintendo Switch OLED White" in out
     assert "¥29800" in out or "¥29,800" in out
     assert "점수" in out or "근거" in out
+
+
+def test_cli_uses_rule_parser_only_when_confident(monkeypatch, capsys):
+    seen = []
+
+    def fake_search(session, q: SearchQuery):
+        seen.append(q)
+        return []
+
+    monkeypatch.setattr("mercari_ai_shopper.run.http_search", fake_search)
+    assert main(["--query", "닌텐도 스위치 화이트 30000엔 이하"]) == 0
+    assert main(["--query", "switch without joycon"]) == 0
+    confident, ambiguous = seen
+    assert confident.keywords == ["Nintendo", "スイッチ"] and confident.budget_max == 30000
+    assert confident.color == ["ホワイト"]
+    # 확신도가 낮은 해석(부정 표현)은 쓰지 않고 요청문 그대로 검색
+    assert ambiguous.keywords == ["switch without joycon"] and ambiguous.budget_max is None
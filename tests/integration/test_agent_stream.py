@@ -0,0 +1,305 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from fastapi.testclient import TestClient
+
+import mercari_ai_shopper.agent.agent as agent_mod
+import mercari_ai_shopper.scraping.mercari_client as mc
+from mercari_ai_shopper.agent.query_cache import QueryCache
+from mercari_ai_shopper.models.listing import ListingRecord
+from mercari_ai_shopper.server import app
+
+SEARCH_ARGS = '{"keywords": ["スイッチ"], "budget_max": 30000}'
+
+
+def _openai_chunks(step):
+    def chunk(delta, finish=None):
+        return {"id": "c", "object": "chat.completion.chunk", "created": 0, "model": "fake",
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}]}
+
+    if step == 1:
+        yield chunk({"role": "assistant", "tool_calls": [{"index": 0, "id": "call_1", "type": "function",
+                                                          "function": {"name": "search_mercari", "arguments": ""}}]})
+        for piece in (SEARCH_ARGS[:10], SEARCH_ARGS[10:]):
+            yield chunk({"tool_calls": [{"index": 0, "function": {"arguments": piece}}]})
+        yield chunk({}, "tool_calls")
+    else:
+        for piece in ("추천 ", "1위: ", "i1"):
+            yield chunk({"content": piece})
+        yield chunk({}, "stop")
+    # stream_options.include_usage: choices 없는 마지막 청크
+    yield {"id": "c", "object": "chat.completion.chunk", "created": 0, "model": "fake", "choices": [],
+           "usage": {"prompt_tokens": 1200, "completion_tokens": 20, "total_tokens": 1220,
+                     "prompt_tokens_details": {"cached_tokens": 1024 if step == 2 else 0}}}
+
+
+def _anthropic_events(step):
+    yield {"type": "message_start", "message": {
+        "id": "msg", "type": "message", "role": "assistant", "model": "fake", "content": [],
+        "stop_reason": None, "stop_sequence": None,
+        "usage": {"input_tokens": 40, "output_tokens": 1, "cache_creation_input_tokens": 1500 if step == 1 else 600,
+                  "cache_read_input_tokens": 0 if step == 1 else 1500}}}
+    if step == 1:
+        yield {"type": "content_block_start", "index": 0,
+               "content_block": {"type": "tool_use", "id": "tu_1", "name": "search_mercari", "input": {}}}
+        for piece in (SEARCH_ARGS[:10], SEARCH_ARGS[10:]):
+            yield {"type": "content_block_delta", "index": 0, "delta": {"type": "input_json_delta", "partial_json": piece}}
+        yield {"type": "content_block_stop", "index": 0}
+        stop = "tool_use"
+    else:
+        yield {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}}
+        for piece in ("추천 ", "1위: ", "i1"):
+            yield {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": piece}}
+        yield {"type": "content_block_stop", "index": 0}
+        stop = "end_turn"
+    yield {"type": "message_delta", "delta": {"stop_reason": stop, "stop_sequence": None}, "usage": {"output_tokens": 3}}
+    yield {"type": "message_stop"}
+
+
+def _openai_completion(step):
+    if step == 1:
+        message = {"role": "assistant", "content": None, "tool_calls": [
+            {"id": "call_1", "type": "function", "function": {"name": "search_mercari", "arguments": SEARCH_ARGS}}]}
+    else:
+        message = {"role": "assistant", "content": "추천 1위: i1"}
+    return {"id": "c", "object": "chat.completion", "created": 0, "model": "fake",
+            "choices": [{"index": 0, "message": message, "finish_reason": "stop"}]}
+
+
+def _anthropic_message(step):
+    if step == 1:
+        content = [{"type": "tool_use", "id": "tu_1", "name": "search_mercari", "input": json.loads(SEARCH_ARGS)}]
+    else:
+        content = [{"type": "text", "text": "추천 1위: i1"}]
+    return {"id": "msg", "type": "message", "role": "assistant", "model": "fake", "content": content,
+            "stop_reason": "tool_use" if step == 1 else "end_turn", "stop_sequence": None,
+            "usage": {"input_tokens": 1, "output_tokens": 1}}
+
+
+@pytest.fixture
+def fake_llm():
+    """OpenAI(/v1/chat/completions)·Anthropic(/v1/messages) 스트리밍 응답을 흉내 내는 로컬 서버."""
+    requests_seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            requests_seen.append((self.path, body))
+            # 도구 결과가 이미 대화에 있으면 2단계(최종 답변) — 동시 대화에서도 요청만 보고 판단
+            last = body["messages"][-1]
+            blocks = last["content"] if isinstance(last.get("content"), list) else []
+            step = 2 if last["role"] == "tool" or any(b.get("type") == "tool_result" for b in blocks) else 1
+            if not body.get("stream"):
+                if self.path.endswith("/chat/completions"):
+                    return self._json(_openai_completion(step))
+                return self._json(_anthropic_message(step))
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            if self.path.endswith("/chat/completions"):
+                for c in _openai_chunks(step):
+                    self.wfile.write(f"data: {json.dumps(c)}\n\n".encode())
+                self.wfile.write(b"data: [DONE]\n\n")
+            else:
+                for e in _anthropic_events(step):
+                    self.wfile.write(f"event: {e['type']}\ndata: {json.dumps(e)}\n\n".encode())
+
+        def _json(self, payload):
+            data = json.dumps(payload).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}", requests_seen
+    srv.shutdown()
+
+
+@pytest.fixture
+def fake_search(monkeypatch):
+    async def aiter_search(q, client=None, **kw):
+        yield ListingRecord.create(title="Switch 有機EL スイッチ", price_jpy=25000,
+                                   url="https://jp.mercari.com/item/m1", shipping="送料込み")
+        yield ListingRecord.create(title="スイッチ ライト", price_jpy=12000, url="https://jp.mercari.com/item/m2")
+
+    monkeypatch.setattr(mc, "aiter_search", aiter_search)
+
+
+@pytest.fixture(autouse=True)
+def query_cache(tmp_path, monkeypatch):
+    """테스트마다 빈 질의 캐시(CACHE_DIR의 공용 캐시를 건드리지 않음)."""
+    c = QueryCache(str(tmp_path / "queries.sqlite"))
+    monkeypatch.setattr(agent_mod, "get_query_cache", lambda: c)
+    yield c
+    c.close()
+
+
+@pytest.fixture(autouse=True)
+def rule_parser(monkeypatch):
+    """LLM 경로를 검증하는 테스트에서는 규칙 파서 우회를 끈다(우회 테스트가 원래 함수로 되돌림)."""
+    original = agent_mod._rule_parse
+    monkeypatch.setattr(agent_mod, "_rule_parse", lambda raw_text: None)
+    return original
+
+
+def _ndjson(resp):
+    return [json.loads(line) for line in resp.text.splitlines() if line]
+
+
+def test_agent_streams_openai_tokens_and_tool_progress(monkeypatch, fake_llm, fake_search):
+    base, seen = fake_llm
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("OPENAI_BASE_URL", f"{base}/v1")
+
+    r = TestClient(app).post("/agent", json={"text": "스위치 3만엔 이하"})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    events = _ndjson(r)
+    types = [e["type"] for e in events]
+    assert types == [
+        "start", "step", "usage", "tool_start", "tool_end", "step", "token", "token", "token", "usage", "done",
+    ]
+    assert events[3]["args"] == json.loads(SEARCH_ARGS)
+    assert events[4]["ok"] is True
+    # prompt_tokens에 포함된 캐시 적중분은 cache_read_input_tokens로 분리
+    assert events[-2] == {"type": "usage", "step": 2, "input_tokens": 176, "output_tokens": 20,
+                          "cache_read_input_tokens": 1024, "cache_creation_input_tokens": 0}
+    assert seen[0][1]["stream_options"] == {"include_usage": True}
+    assert events[-1]["text"] == "추천 1위: i1"
+
+    # 두 번째 LLM 요청에 압축된 도구 결과가 tool 메시지로 실려 간다
+    tool_msg = seen[1][1]["messages"][-1]
+    assert tool_msg["role"] == "tool" and tool_msg["tool_call_id"] == "call_1"
+    assert json.loads(tool_msg["content"])["result"]["shown"] == 2
+
+
+def test_agent_streams_anthropic_as_sse(monkeypatch, fake_llm, fake_search):
+    base, seen = fake_llm
+    monkeypatch.setenv("LLM_PROVIDER", "anthropic")
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test")
+    monkeypatch.setenv("ANTHROPIC_BASE_URL", base)
+    monkeypatch.setenv("ANTHROPIC_MODEL", "fake")
+
+    r = TestClient(app).post("/agent", json={"text": "switch"}, headers={"Accept": "text/event-stream"})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/event-stream")
+    events = [json.loads(line[len("data: "):]) for line in r.text.splitlines() if line.startswith("data: ")]
+    assert [e["type"] for e in events if e["type"] != "token"] == [
+        "start", "step", "usage", "tool_start", "tool_end", "step", "usage", "done",
+    ]
+    assert events[-1]["text"] == "추천 1위: i1"
+    usage = [e for e in events if e["type"] == "usage"]
+    assert [(u["cache_creation_input_tokens"], u["cache_read_input_tokens"], u["output_tokens"]) for u in usage] == [
+        (1500, 0, 3), (600, 1500, 3),
+    ]
+
+    first, second = seen[0][1], seen[1][1]
+    assert all(m["role"] != "system" for m in first["messages"])
+    # 프롬프트 캐시: 도구 목록 끝, system 블록, 마지막 메시지 끝에 breakpoint
+    assert first["system"][0]["cache_control"] == {"type": "ephemeral"}
+    assert first["tools"][-1]["cache_control"] == {"type": "ephemeral"}
+    assert "cache_control" not in first["tools"][0]
+    assert first["messages"][-1]["content"][-1]["cache_control"] == {"type": "ephemeral"}
+    # 다음 단계는 tool_result 쪽으로 breakpoint가 옮겨 가고, 앞선 대화에는 남지 않는다
+    result_block = second["messages"][-1]["content"][0]
+    assert result_block["type"] == "tool_result" and result_block["tool_use_id"] == "tu_1"
+    assert result_block["cache_control"] == {"type": "ephemeral"}
+    assert isinstance(second["messages"][0]["content"], str)
+    assert second["tools"] == first["tools"] and second["system"] == first["system"]
+
+
+def test_async_agent_runs_many_conversations_concurrently(monkeypatch, fake_llm, fake_search):
+    import asyncio
+
+    from mercari_ai_shopper.agent.agent import Agent
+
+    base, seen = fake_llm
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("OPENAI_BASE_URL", f"{base}/v1")
+
+    async def main():
+        return await asyncio.gather(*(Agent(asynchronous=True).arun("switch") for _ in range(10)))
+
+    results = asyncio.run(main())
+    assert all(msgs[-1]["content"] == "추천 1위: i1" for msgs in results)
+    # 대화마다 ID 표가 따로라 모두 i1부터
+    assert all(json.loads(msgs[-2]["content"])["result"]["rows"][0][0] == "i1" for msgs in results)
+    assert len(seen) == 20
+
+
+def test_query_cache_hit_skips_first_llm_step(monkeypatch, fake_llm, fake_search, query_cache):
+    base, seen = fake_llm
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("OPENAI_BASE_URL", f"{base}/v1")
+    client = TestClient(app)
+
+    # 1회차: LLM이 만든 검색 인자가 요청문 키로 저장된다
+    first = _ndjson(client.post("/agent", json={"text": "닌텐도 스위치 3만엔 이하"}))
+    assert first[-1]["type"] == "done" and len(seen) == 2
+    assert query_cache.lookup("닌텐도 스위치 3만엔 이하").args == json.loads(SEARCH_ARGS)
+
+    # 2회차(근사 일치 — 띄어쓰기만 다름): 첫 LLM 호출 없이 바로 검색 → LLM은 최종 답변 1번만
+    events = _ndjson(client.post("/agent", json={"text": "닌텐도스위치 3만엔이하"}))
+    assert [e["type"] for e in events if e["type"] != "token"] == [
+        "start", "cache_hit", "tool_start", "tool_end", "step", "usage", "done",
+    ]
+    assert events[1]["text"] == "닌텐도 스위치 3만엔 이하" and events[2]["args"] == json.loads(SEARCH_ARGS)
+    assert events[-1]["text"] == "추천 1위: i1"
+    assert len(seen) == 3
+    sent = seen[2][1]["messages"]
+    assert sent[-2]["tool_calls"][0]["function"]["name"] == "search_mercari"
+    assert sent[-1]["role"] == "tool" and json.loads(sent[-1]["content"])["result"]["shown"] == 2
+
+
+def test_query_cache_hit_seeds_anthropic_tool_turn(monkeypatch, fake_llm, fake_search, query_cache):
+    import asyncio
+
+    from mercari_ai_shopper.agent.agent import Agent
+
+    base, seen = fake_llm
+    monkeypatch.setenv("LLM_PROVIDER", "anthropic")
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test")
+    monkeypatch.setenv("ANTHROPIC_BASE_URL", base)
+    monkeypatch.setenv("ANTHROPIC_MODEL", "fake")
+    query_cache.store("switch", json.loads(SEARCH_ARGS))
+
+    msgs = asyncio.run(Agent(asynchronous=True).arun("switch"))
+    assert len(seen) == 1
+    sent = seen[0][1]["messages"]
+    assert sent[1]["content"][0]["type"] == "tool_use" and sent[1]["content"][0]["name"] == "search_mercari"
+    assert sent[2]["content"][0]["tool_use_id"] == sent[1]["content"][0]["id"]
+    assert msgs[-1]["role"] == "assistant" and msgs[-1]["content"][0].text == "추천 1위: i1"
+
+
+def test_rule_parser_answers_simple_requests_without_llm(monkeypatch, fake_llm, fake_search, rule_parser):
+    base, seen = fake_llm
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)  # LLM을 안 부르므로 API 키도 필요 없다
+    monkeypatch.setenv("OPENAI_BASE_URL", f"{base}/v1")
+    monkeypatch.setattr(agent_mod, "_rule_parse", rule_parser)
+    before = agent_mod.agent_route_stats()["rules"]
+
+    events = _ndjson(TestClient(app).post("/agent", json={"text": "닌텐도 스위치 OLED 30000엔 이하"}))
+    assert [e["type"] for e in events] == ["start", "parsed", "tool_start", "tool_end", "token", "done"]
+    assert events[1]["args"]["budget_max"] == 30000 and events[1]["confidence"] >= 0.8
+    assert events[2]["args"] == events[1]["args"]
+    # 요약은 압축 결과의 ID가 아니라 실제 URL로
+    assert "¥25,000" in events[-1]["text"] and "https://jp.mercari.com/item/m1" in events[-1]["text"]
+    assert events[-1]["steps"] == 0 and seen == []
+    assert agent_mod.agent_route_stats()["rules"] == before + 1
+
+    # 부정 표현처럼 모호한 요청은 LLM으로 → API 키가 없으면 스트림 시작 전에 503
+    assert rule_parser("스위치 말고 PS5, 너무 비싸지 않은 걸로") is None
+    r = TestClient(app).post("/agent", json={"text": "스위치 말고 PS5, 너무 비싸지 않은 걸로"})
+    assert r.status_code == 503 and "OPENAI_API_KEY" in r.json()["detail"]
@@ -13,15 +13,13 @@ def test_health():
 
 
 def test_search_endpoint_monkeypatch(monkeypatch):
-    def fake_search(session, q: SearchQuery):
-        return [
-            Listing(title="A", price_jpy=1000, condition="未使用に近い", shipping="送料込み",
-                    url="https://jp.mercari.com/item/abc"),
-            Listing(title="B", price_jpy=2000, condition=None, shipping=None,
-                    url="https://jp.mercari.com/item/def"),
-        ]
+    async def fake_search(q: SearchQuery):
+        yield Listing(title="A", price_jpy=1000, condition="未使用に近い", shipping="送料込み",
+                      url="https://jp.mercari.com/item/abc")
+        yield Listing(title="B", price_jpy=2000, condition=None, shipping=None,
+                      url="https://jp.mercari.com/item/def")
 
-    monkeypatch.setattr("mercari_ai_shopper.server.http_search", fake_search)
+    monkeypatch.setattr("mercari_ai_shopper.server.aiter_http_search", fake_search)
 
     c = TestClient(app)
     payload = {
@@ -40,3 +38,34 @@ def test_search_endpoint_monkeypatch(monkeypatch):
     assert data["top_k"] == 2
     assert len(data["items"]) >= 1
     assert data["items"][0]["listing"]["url"].startswith("https://jp.mercari.com/item/")
+
+
+def test_search_endpoint_caches_equivalent_queries(monkeypatch):
+    from mercari_ai_shopper import server
+
+    calls = []
+
+    async def fake_search(q: SearchQuery):
+        calls.append(q.keywords)
+        yield Listing(title="Switch OLED", price_jpy=1000, url="https://jp.mercari.com/item/m1")
+
+    monkeypatch.setattr("mercari_ai_shopper.server.aiter_http_search", fake_search)
+    server._search_cache.clear()
+
+    c = TestClient(app)
+    base = {"top_k": 1, "engine": "http"}
+    r1 = c.post("/search", json={**base, "query": {"raw_text": "a", "keywords": ["switch", "OLED"]}})
+    r2 = c.post("/search", json={**base, "query": {"raw_text": "b", "keywords": ["ＯＬＥＤ", "Switch"]}})
+    assert r1.status_code == r2.status_code == 200
+    assert len(calls) == 1
+    assert r2.json()["query"]["raw_text"] == "b"  # 응답의 query는 요청자 것
+
+    st = c.get("/stats").json()["search_cache"]
+    assert st["hits"] >= 1 and 0.0 < st["hit_ratio"] <= 1.0
+
+
+def test_search_openapi_keeps_response_schema():
+    c = TestClient(app)
+    spec = c.get("/openapi.json").json()
+    schema = spec["paths"]["/search"]["post"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert schema["$ref"].endswith("/RecommendationResponse")
@@ -0,0 +1,46 @@
+import pytest
+
+from mercari_ai_shopper.agent.tool_schema import get_tool_schemas
+from mercari_ai_shopper.llm.anthropic_client import AnthropicClient, _usage_dict, _with_breakpoint
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test")
+    return AnthropicClient(model="fake")
+
+
+def test_tool_schemas_are_converted_once_and_shared(client, monkeypatch):
+    first = client._tools_for(get_tool_schemas())
+    monkeypatch.setattr(client, "_to_anthropic_tools", lambda tools: pytest.fail("converted again"))
+    # 다른 세션(새 클라이언트, 새 리스트)이어도 내용이 같으면 같은 객체 → 같은 캐시 접두부
+    assert client._tools_for(list(get_tool_schemas())) is first
+    assert [t["name"] for t in first] == ["search_mercari", "fetch_listing_detail"]
+    assert first[-1]["cache_control"] == {"type": "ephemeral"} and "cache_control" not in first[0]
+
+
+def test_prepare_moves_system_into_cacheable_block(client):
+    messages = [{"role": "system", "content": "sys"}, {"role": "user", "content": "hi"}]
+    system, tools = client._prepare(messages, get_tool_schemas())
+    assert system == [{"type": "text", "text": "sys", "cache_control": {"type": "ephemeral"}}]
+    assert messages == [{"role": "user", "content": "hi"}]
+
+    client.prompt_cache = False
+    messages = [{"role": "system", "content": "sys"}, {"role": "user", "content": "hi"}]
+    system, tools = client._prepare(messages, get_tool_schemas())
+    assert system == "sys" and all("cache_control" not in t for t in tools)
+    assert client._request(messages, tools, system)["messages"] is messages
+
+
+def test_breakpoint_is_added_to_a_copy_of_the_last_block():
+    result = {"role": "user", "content": [{"type": "tool_result", "tool_use_id": "t1", "content": "{}"}]}
+    messages = [{"role": "user", "content": "hi"}, {"role": "assistant", "content": []}, result]
+    sent = _with_breakpoint(messages)
+    assert sent[-1]["content"][-1]["cache_control"] == {"type": "ephemeral"}
+    assert "cache_control" not in result["content"][-1] and sent[0] is messages[0]
+
+
+def test_usage_dict_treats_missing_cache_fields_as_zero():
+    assert _usage_dict({"input_tokens": 10, "output_tokens": 5, "cache_read_input_tokens": None}) == {
+        "input_tokens": 10, "output_tokens": 5, "cache_read_input_tokens": 0, "cache_creation_input_tokens": 0,
+    }
@@ -0,0 +1,85 @@
+import asyncio
+import time
+from pathlib import Path
+
+import httpx
+
+import mercari_ai_shopper.scraping.mercari_client as mc
+from mercari_ai_shopper.models.query import SearchQuery
+from mercari_ai_shopper.utils.result_cache import SingleFlightCache
+
+FIXTURES = Path(__file__).resolve().parents[1] / "fixtures"
+
+
+def _client(delay: float = 0.0, status: int = 200) -> httpx.AsyncClient:
+    html = (FIXTURES / "mercari_search.html").read_text(encoding="utf-8")
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(delay)
+        return httpx.Response(status, text=html, headers={"Content-Type": "text/html; charset=utf-8"})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_async_search_parses_and_filters(monkeypatch):
+    monkeypatch.setattr(mc, "get_response_cache", lambda: None)
+    monkeypatch.setattr(mc, "get_rate_limiter", lambda: None)
+    q = SearchQuery(raw_text="t", keywords=["switch"], budget_max=30000, sort="price_asc")
+
+    async def run():
+        async with _client() as client:
+            return await mc.async_search(q, client=client)
+
+    items = asyncio.run(run())
+    assert [x.price_jpy for x in items] == [21000, 27500, 29800]
+
+
+def test_async_search_runs_concurrently(monkeypatch):
+    monkeypatch.setattr(mc, "get_response_cache", lambda: None)
+    monkeypatch.setattr(mc, "get_rate_limiter", lambda: None)
+    q = SearchQuery(raw_text="t", keywords=["switch"])
+
+    async def run():
+        async with _client(delay=0.2) as client:
+            t0 = time.perf_counter()
+            results = await asyncio.gather(*(mc.async_search(q, client=client) for _ in range(50)))
+            return time.perf_counter() - t0, results
+
+    elapsed, results = asyncio.run(run())
+    assert all(len(r) == 5 for r in results)
+    assert elapsed < 2.0  # 50 × 0.2s 순차였다면 10초
+
+
+def test_async_backoff_retries_without_blocking(monkeypatch):
+    monkeypatch.setattr(mc, "get_response_cache", lambda: None)
+    monkeypatch.setattr(mc, "get_rate_limiter", lambda: None)
+    monkeypatch.setattr(mc, "HTTP_BACKOFF_SECONDS", 0.01)
+    attempts = []
+
+    async def handler(request):
+        attempts.append(1)
+        return httpx.Response(429 if len(attempts) == 1 else 200, text="<html></html>")
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await mc._arequest(client, "https://jp.mercari.com/search?keyword=a")
+
+    assert asyncio.run(run()).status_code == 200
+    assert len(attempts) == 2
+
+
+def test_async_single_flight_coalesces():
+    cache = SingleFlightCache()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "v"
+
+    async def run():
+        return await asyncio.gather(*(cache.aget_or_compute("k", compute) for _ in range(20)))
+
+    assert asyncio.run(run()) == ["v"] * 20
+    assert calls == [1]
+    assert cache.stats()["coalesced"] == 19
@@ -0,0 +1,65 @@
+import random
+
+import numpy as np
+import pytest
+
+from mercari_ai_shopper.agent.batch_ranker import CandidateColumns, batch_scores, rank_batch, top_k_indices
+from mercari_ai_shopper.agent.reasoning import TopKRanker, score_listing
+from mercari_ai_shopper.models.listing import Listing, SellerInfo
+from mercari_ai_shopper.models.query import MERCARI_CONDITION_WHITELIST, SearchQuery
+
+CONDITIONS = sorted(MERCARI_CONDITION_WHITELIST) + [None]
+WORDS = ["Nintendo", "Switch", "OLED", "ホワイト", "Sony", "PS5", "black", "限定", "ケース"]
+
+
+def _candidates(n: int, seed: int = 0):
+    rnd = random.Random(seed)
+    items = []
+    for i in range(n):
+        seller = None
+        if rnd.random() < 0.5:
+            seller = SellerInfo(
+                rating=rnd.choice([None, 3.2, 4.5, 4.9, 5.0]),
+                sales_count=rnd.choice([None, 0, 10, 120]),
+            )
+        items.append(Listing(
+            title=" ".join(rnd.sample(WORDS, 3)),
+            price_jpy=rnd.randrange(0, 80000, 500),
+            condition=rnd.choice(CONDITIONS),
+            url=f"https://jp.mercari.com/item/m{i}",
+            description_snippet=rnd.choice([None, "white 本体", "ブラック"]),
+            seller=seller,
+        ))
+    return items
+
+
+QUERIES = [
+    SearchQuery(raw_text="a", keywords=["switch", "oled"]),
+    SearchQuery(raw_text="b", keywords=["Switch"], budget_max=30000, condition=["未使用に近い"], brand=["nintendo"]),
+    SearchQuery(raw_text="c", keywords=["PS5", "限定"], budget_min=20000, color=["black"]),
+    SearchQuery(raw_text="d", keywords=["ケース"], budget_min=1000, budget_max=5000, brand=["sony"], color=["white"]),
+]
+
+
+@pytest.mark.parametrize("q", QUERIES)
+def test_batch_scores_match_scalar_scores(q):
+    items = _candidates(500)
+    got = batch_scores(CandidateColumns.from_listings(items, q), q)
+    want = np.array([score_listing(it, q).score for it in items])
+    assert np.allclose(got, want, atol=1e-4)
+
+
+@pytest.mark.parametrize("q", QUERIES)
+def test_rank_batch_matches_streaming_ranker(q):
+    items = _candidates(800, seed=1)
+    want = TopKRanker(q, 5).extend(items).result()
+    got = rank_batch(items, q, top_k=5)
+    assert [str(r.listing.url) for r in got] == [str(r.listing.url) for r in want]
+    assert [r.reasons for r in got] == [r.reasons for r in want]
+
+
+def test_top_k_indices_breaks_ties_by_input_order():
+    scores = np.array([0.5, 0.9, 0.5, 0.9, 0.1, 0.9])
+    assert top_k_indices(scores, 2).tolist() == [1, 3]
+    assert top_k_indices(scores, 4).tolist() == [1, 3, 5, 0]
+    assert top_k_indices(scores, 10).tolist() == [1, 3, 5, 0, 2, 4]
@@ -0,0 +1,178 @@
+import threading
+import time
+
+import pytest
+
+from mercari_ai_shopper.scraping.browser_pool import BrowserPool, _Job
+
+
+class FakePage:
+    def __init__(self, heap: int = 0):
+        self.heap = heap
+        self.visited = []
+        self.closed = False
+
+    def goto(self, url, **kw):
+        self.visited.append(url)
+
+    def evaluate(self, js):
+        return self.heap
+
+    def content(self):
+        return "<html></html>"
+
+    def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self, heap: int):
+        self.heap = heap
+        self.cookies_cleared = 0
+
+    def new_page(self):
+        return FakePage(self.heap)
+
+    def clear_cookies(self):
+        self.cookies_cleared += 1
+
+    def close(self):
+        pass
+
+
+class FakeBrowser:
+    def __init__(self, heap: int = 0):
+        self.heap = heap
+        self.connected = True
+        self.contexts = 0
+        self.thread = threading.get_ident()
+
+    def new_context(self, **kw):
+        self.contexts += 1
+        return FakeContext(self.heap)
+
+    def is_connected(self):
+        return self.connected
+
+    def close(self):
+        self.connected = False
+
+
+def _launcher(browsers, heap: int = 0):
+    def launch():
+        b = FakeBrowser(heap)
+        browsers.append(b)
+        return None, b
+
+    return launch
+
+
+def test_pool_reuses_warm_page_and_resets_between_uses():
+    browsers = []
+    pool = BrowserPool(size=1, recycle_after=100, launcher=_launcher(browsers)).start()
+    try:
+        pages = [pool.run(lambda page: page) for _ in range(3)]
+        assert len(browsers) == 1 and browsers[0].contexts == 1
+        assert pages[0] is pages[1] is pages[2]
+        assert pages[0].visited.count("about:blank") == 3
+        # 브라우저 객체는 워커 스레드에서만 다뤄짐
+        assert pool.run(lambda page: threading.get_ident()) == browsers[0].thread
+    finally:
+        pool.close()
+
+
+def test_pool_recycles_after_k_uses_and_heap_threshold():
+    browsers = []
+    pool = BrowserPool(size=1, recycle_after=2, launcher=_launcher(browsers)).start()
+    try:
+        for _ in range(5):
+            pool.run(lambda page: None)
+        assert len(browsers) == 3
+        assert pool.stats()["recycles"] == 2
+    finally:
+        pool.close()
+
+    browsers = []
+    pool = BrowserPool(size=1, max_heap_mb=1, launcher=_launcher(browsers, heap=2 * 1024 * 1024)).start()
+    try:
+        pool.run(lambda page: None)
+        pool.run(lambda page: None)
+        assert len(browsers) == 2
+    finally:
+        pool.close()
+
+
+def test_pool_health_check_and_failures():
+    browsers = []
+    pool = BrowserPool(size=1, launcher=_launcher(browsers)).start()
+    try:
+        pool.run(lambda page: None)
+        browsers[0].connected = False  # 크래시 흉내
+        pool.run(lambda page: None)
+        assert len(browsers) == 2
+
+        def boom(page):
+            raise RuntimeError("selector timeout")
+
+        with pytest.raises(RuntimeError):
+            pool.run(boom)
+        pool.run(lambda page: None)
+        # 작업 실패는 컨텍스트만 새로 만들고 브라우저는 유지
+        assert len(browsers) == 2 and browsers[1].contexts == 2
+        assert pool.stats()["failures"] == 1
+    finally:
+        pool.close()
+
+
+def test_pool_runs_in_parallel_and_reports_wait():
+    browsers = []
+    pool = BrowserPool(size=2, launcher=_launcher(browsers)).start()
+    try:
+        threads = [threading.Thread(target=pool.run, args=(lambda page: time.sleep(0.05),)) for _ in range(4)]
+        t0 = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert time.perf_counter() - t0 < 0.18
+        st = pool.stats()
+        assert st["jobs"] == 4 and st["max_wait_ms"] > 0 and 0 < st["utilization"] <= 1
+    finally:
+        pool.close()
+
+
+def test_pool_timeout_is_total_and_cancels_abandoned_jobs():
+    browsers = []
+    pool = BrowserPool(size=1, queue_size=1, launcher=_launcher(browsers)).start()
+    gate = threading.Event()
+    ran = []
+    try:
+        blocker = threading.Thread(target=pool.run, args=(lambda page: gate.wait(2),))
+        blocker.start()
+        time.sleep(0.05)
+        t0 = time.perf_counter()
+        with pytest.raises(TimeoutError):
+            pool.run(lambda page: ran.append(1), timeout=0.1)
+        assert time.perf_counter() - t0 < 0.18
+        gate.set()
+        blocker.join()
+        pool.run(lambda page: None)
+        # 포기한 작업은 나중에 웜 페이지를 차지하지 않는다
+        assert ran == []
+    finally:
+        pool.close()
+
+
+def test_pool_close_does_not_hang_on_full_queue():
+    browsers = []
+    pool = BrowserPool(size=1, queue_size=1, launcher=_launcher(browsers)).start()
+    gate = threading.Event()
+    threading.Thread(target=pool.run, args=(lambda page: gate.wait(2),), daemon=True).start()
+    time.sleep(0.05)
+    queued = _Job(lambda page: None)
+    pool._jobs.put(queued)  # 큐(크기 1)가 가득 찬 상태
+    t0 = time.perf_counter()
+    pool.close(timeout=0.2)
+    assert time.perf_counter() - t0 < 0.5
+    assert queued.future.cancelled()
+    gate.set()
@@ -0,0 +1,54 @@
+import json
+
+from mercari_ai_shopper.agent.compaction import ItemRefs, compact_search_result, estimate_tokens, expand_refs
+from mercari_ai_shopper.models.listing import ListingRecord
+from mercari_ai_shopper.models.query import SearchQuery
+from mercari_ai_shopper.utils.serialization import dumps_str
+
+
+def _records(n):
+    return [
+        ListingRecord.create(
+            title=f"ニンテンドースイッチ 有機EL ホワイト 本体 {i}",
+            price_jpy=20000 + i * 500,
+            url=f"https://jp.mercari.com/item/m{i:011d}",
+            shipping="送料込み",
+            condition="未使用に近い" if i % 2 else "目立った傷や汚れなし",
+        )
+        for i in range(n)
+    ]
+
+
+def test_compact_keeps_top_n_as_table_with_short_ids():
+    q = SearchQuery(raw_text="switch", keywords=["スイッチ"], budget_max=30000)
+    refs = ItemRefs()
+    out = compact_search_result(_records(40), q, refs, top_n=5, token_budget=10_000)
+
+    assert out["total"] == 40 and out["shown"] == 5
+    assert out["cols"][0] == "id" and "price" in out["cols"]
+    # 전부 null인 열은 빠지고, 모든 행이 같은 값은 common으로
+    assert "likes" not in out["cols"] and "rating" not in out["cols"]
+    assert out["common"] == {"shipping": "送料込み", "why": "예산 이내/키워드 일치"}
+    ids = [row[0] for row in out["rows"]]
+    assert ids == ["i1", "i2", "i3", "i4", "i5"]
+    # 예산 이내 → 가장 싼(점수 높은) 항목이 먼저
+    prices = [row[out["cols"].index("price")] for row in out["rows"]]
+    assert prices == sorted(prices)
+    assert expand_refs(["i1", "https://x.example/item/1"], refs) == [
+        "https://jp.mercari.com/item/m00000000000",
+        "https://x.example/item/1",
+    ]
+
+
+def test_compact_respects_token_budget_and_beats_full_dump():
+    q = SearchQuery(raw_text="switch", keywords=["スイッチ"])
+    recs = _records(30)
+    full = dumps_str([r.to_listing() for r in recs])
+    out = compact_search_result(recs, q, ItemRefs(), top_n=30, token_budget=300)
+
+    assert 1 <= out["shown"] < 30
+    assert estimate_tokens(dumps_str(out)) <= 300
+    assert estimate_tokens(dumps_str(out)) < estimate_tokens(full) / 5
+    # 잘린 행은 ID를 소모하지 않는다
+    assert out["rows"][-1][0] == f"i{out['shown']}"
+    json.loads(dumps_str(out))
@@ -0,0 +1,67 @@
+import asyncio
+
+from mercari_ai_shopper.models.listing import Listing
+from mercari_ai_shopper.models.query import SearchQuery
+from mercari_ai_shopper.scraping.engine import EngineStats, asearch_auto
+
+Q = SearchQuery(raw_text="t", keywords=["switch"], limit=10)
+
+
+def _items(n: int):
+    return [Listing(title=f"i{i}", price_jpy=100, url=f"https://jp.mercari.com/item/m{i}") for i in range(n)]
+
+
+def _engine(n: int, delay: float = 0.0, calls: list | None = None, name: str = "", fail: bool = False):
+    async def run(q):
+        if calls is not None:
+            calls.append(name)
+        await asyncio.sleep(delay)
+        if fail:
+            raise RuntimeError("down")
+        return _items(n)
+
+    return run
+
+
+def test_fast_sufficient_http_skips_browser():
+    calls = []
+    stats = EngineStats(hedge_initial=0.5)
+    res = asyncio.run(asearch_auto(Q, http=_engine(5, calls=calls, name="http"),
+                                   browser=_engine(10, calls=calls, name="pw"), stats=stats))
+    assert res.engine == "http" and not res.hedged and calls == ["http"]
+    assert stats.snapshot()["http"]["successes"] == 1
+
+
+def test_empty_or_failed_http_falls_back_to_browser():
+    for http in (_engine(0), _engine(0, fail=True)):
+        res = asyncio.run(asearch_auto(Q, http=http, browser=_engine(4), stats=EngineStats()))
+        assert res.engine == "playwright" and res.hedged and len(res.items) == 4
+
+
+def test_slow_http_is_hedged_and_first_sufficient_wins():
+    stats = EngineStats(hedge_initial=0.05)
+    res = asyncio.run(asearch_auto(Q, http=_engine(5, delay=1.0), browser=_engine(5, delay=0.1), stats=stats))
+    assert res.engine == "playwright" and res.hedged
+    # 취소된 HTTP는 통계에 남지 않음
+    assert "http" not in stats.snapshot()
+
+    # 헤지 후에도 HTTP가 먼저 끝나면 HTTP 채택
+    res = asyncio.run(asearch_auto(Q, http=_engine(5, delay=0.1), browser=_engine(5, delay=1.0),
+                                   stats=EngineStats(hedge_initial=0.05)))
+    assert res.engine == "http" and res.hedged
+
+
+def test_both_insufficient_returns_larger_set():
+    res = asyncio.run(asearch_auto(Q, http=_engine(1), browser=_engine(2), stats=EngineStats()))
+    assert res.engine == "playwright" and len(res.items) == 2
+
+
+def test_hedge_delay_adapts_to_http_latency_and_failures():
+    st = EngineStats(hedge_min=0.1, hedge_max=5.0, hedge_initial=3.0)
+    assert st.hedge_delay() == 3.0
+    for _ in range(10):
+        st.record("http", 0.4, True)
+    assert 0.1 <= st.hedge_delay() < 1.0
+    for _ in range(10):
+        st.record("http", 0.01, False)
+    assert st.hedge_delay() == 0.0  # HTTP가 계속 실패 → 바로 병행
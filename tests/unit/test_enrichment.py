@@ -0,0 +1,67 @@
+import threading
+import time
+
+import mercari_ai_shopper.scraping.mercari_client as mc
+from mercari_ai_shopper.agent.enrichment import enrich_and_rank
+from mercari_ai_shopper.models.listing import Listing, SellerInfo
+from mercari_ai_shopper.models.query import SearchQuery
+
+
+def _item(i: int, price: int = 10000, seller: SellerInfo | None = None) -> Listing:
+    return Listing(title=f"Switch {i}", price_jpy=price, url=f"https://jp.mercari.com/item/m{i}", seller=seller)
+
+
+def test_fetch_details_keeps_order_and_reports_failures(monkeypatch):
+    active = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def fake_fetch_detail(session, url):
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.02)
+        with lock:
+            active["now"] -= 1
+        if url.endswith("m3"):
+            raise RuntimeError("boom")
+        return _item(int(url.rsplit("m", 1)[1]))
+
+    monkeypatch.setattr(mc, "fetch_detail", fake_fetch_detail)
+    urls = [f"https://jp.mercari.com/item/m{i}" for i in range(6)]
+    results = mc.fetch_details(urls, max_concurrency=6, session=object(), per_host_limit=2)
+
+    assert [r.url for r in results] == urls
+    assert [r.ok for r in results] == [True, True, True, False, True, True]
+    assert "boom" in results[3].error
+    assert active["peak"] <= 2  # 호스트별 상한
+
+
+def test_enrich_and_rank_reranks_with_seller_info():
+    q = SearchQuery(raw_text="switch", keywords=["switch"])
+    items = [_item(1), _item(2), _item(3)]
+    details = {
+        "https://jp.mercari.com/item/m1": _item(1, seller=SellerInfo(rating=3.0, sales_count=0)),
+        "https://jp.mercari.com/item/m3": _item(3, seller=SellerInfo(rating=5.0, sales_count=120)),
+    }
+    seen = []
+
+    def fake_fetch(urls):
+        seen.extend(urls)
+        return [mc.DetailResult(url=u, listing=details.get(u), error=None if u in details else "x") for u in urls]
+
+    ranked = enrich_and_rank(items, q, top_k=3, top_n=3, fetch=fake_fetch)
+    assert len(seen) == 3
+    assert str(ranked[0].listing.url).endswith("/m3")
+    assert str(ranked[-1].listing.url).endswith("/m1")
+    assert any("판매자 평가 우수" in r for r in ranked[0].reasons)
+    # 상세 조회 실패 후보는 카드 정보 그대로 유지
+    assert any(str(r.listing.url).endswith("/m2") and r.listing.seller is None for r in ranked)
+
+
+def test_enrich_disabled_skips_fetch():
+    q = SearchQuery(raw_text="switch", keywords=["switch"])
+
+    def fail_fetch(urls):
+        raise AssertionError("should not fetch")
+
+    assert len(enrich_and_rank([_item(1)], q, top_k=3, top_n=0, fetch=fail_fetch)) == 1
@@ -0,0 +1,83 @@
+import time
+
+import pytest
+from requests.structures import CaseInsensitiveDict
+
+import mercari_ai_shopper.scraping.mercari_client as mc
+from mercari_ai_shopper.utils.http_cache import ResponseCache, normalize_url
+
+
+class FakeResp:
+    def __init__(self, status_code=200, body=b"<html>ok</html>", headers=None, url=""):
+        self.status_code = status_code
+        self.content = body
+        self.text = body.decode()
+        self.headers = CaseInsensitiveDict(headers or {"Content-Type": "text/html; charset=utf-8"})
+        self.url = url
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.calls.append(dict(headers or {}))
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    c = ResponseCache(str(tmp_path / "http.sqlite"), search_ttl=60, item_ttl=3600)
+    monkeypatch.setattr(mc, "get_response_cache", lambda: c)
+    monkeypatch.setattr(mc, "get_rate_limiter", lambda: None)
+    yield c
+    c.close()
+
+
+def test_normalize_url_sorts_params_and_drops_fragment():
+    a = normalize_url("HTTPS://JP.mercari.com/search?keyword=a&b=1#x")
+    b = normalize_url("https://jp.mercari.com/search", {"b": 1, "keyword": "a"})
+    assert a == b
+
+
+def test_request_serves_fresh_hit_from_disk(cache):
+    url = "https://jp.mercari.com/search?keyword=switch"
+    sess = FakeSession([FakeResp(url=url)])
+    assert mc._request(sess, url).text == "<html>ok</html>"
+    again = mc._request(sess, url)
+    assert again.text == "<html>ok</html>" and getattr(again, "from_cache", False)
+    assert len(sess.calls) == 1
+    st = cache.stats()
+    assert st["hits"] == 1 and st["misses"] == 1 and st["entries"] == 1
+
+
+def test_stale_entry_revalidates_with_etag(cache):
+    url = "https://jp.mercari.com/item/m1"
+    headers = {"Content-Type": "text/html", "ETag": '"v1"'}
+    sess = FakeSession([FakeResp(headers=headers, url=url), FakeResp(status_code=304, body=b"")])
+    mc._request(sess, url)
+    cache._conn.execute("UPDATE responses SET expires_at = ?", (time.time() - 1,))
+
+    resp = mc._request(sess, url)
+    assert resp.text == "<html>ok</html>"
+    assert sess.calls[1]["If-None-Match"] == '"v1"'
+    assert cache.stats()["revalidated"] == 1
+
+
+def test_per_route_ttl_and_lru_eviction(tmp_path):
+    c = ResponseCache(str(tmp_path / "h.sqlite"), search_ttl=10, item_ttl=1000, max_bytes=250)
+    assert c.ttl_for("https://jp.mercari.com/search?keyword=a") == 10
+    assert c.ttl_for("https://jp.mercari.com/item/m1") == 1000
+
+    for i in range(3):
+        c.store(f"https://jp.mercari.com/item/m{i}", None, FakeResp(body=b"x" * 100))
+    st = c.stats()
+    assert st["evictions"] >= 1 and st["bytes"] <= 250
+    assert c.lookup("https://jp.mercari.com/item/m0") is None  # 가장 오래된 항목부터 삭제
+    assert c.lookup("https://jp.mercari.com/item/m2") is not None
+    c.close()
@@ -0,0 +1,37 @@
+import threading
+
+import requests
+
+import mercari_ai_shopper.utils.http as http
+from mercari_ai_shopper.config import Settings
+
+
+def test_shared_client_is_singleton_across_threads(monkeypatch):
+    monkeypatch.setattr(http, "get_settings", lambda: Settings(http_pool_size=7))
+    http.close_http_client()
+    seen = []
+    threads = [threading.Thread(target=lambda: seen.append(http.get_http_client())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len({id(c) for c in seen}) == 1
+    client = seen[0]
+    assert isinstance(client, requests.Session)
+    assert client.get_adapter("https://jp.mercari.com")._pool_maxsize == 7
+
+    http.close_http_client()
+    assert http.get_http_client() is not client
+    http.close_http_client()
+
+
+def test_proxy_settings_applied(monkeypatch):
+    s = Settings(http_proxy="http://proxy:3128", https_proxy="http://proxy:3129", no_proxy="localhost")
+    monkeypatch.setattr(http, "get_settings", lambda: s)
+    http.close_http_client()
+    client = http.get_http_client()
+    assert client.proxies["https"] == "http://proxy:3129"
+    assert client.proxies["no_proxy"] == "localhost"
+    assert http.http_client_info()["proxy"] is True
+    http.close_http_client()
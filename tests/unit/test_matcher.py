@@ -0,0 +1,50 @@
+import random
+
+import mercari_ai_shopper.utils.matcher as mt
+from mercari_ai_shopper.models.query import SearchQuery
+from mercari_ai_shopper.utils.matcher import QueryMatcher, matcher_for
+
+
+def test_keywords_count_only_in_title_brand_color_anywhere():
+    m = QueryMatcher(["switch", "oled", "switch"], ["Nintendo"], ["ホワイト"])
+    r = m.scan("Nintendo Switch 本体", "OLED ホワイト")
+    assert r.keyword_hits == 2  # oled는 설명에만 있음, 중복 키워드는 각각 셈
+    assert r.brand_ok and r.color_ok
+    r = m.scan("Switch OLED", None)
+    assert r.keyword_hits == 3 and not r.brand_ok and not r.color_ok
+
+
+def test_normalization_fullwidth_and_spaces():
+    m = QueryMatcher(["switch lite"], ["SONY"], [])
+    r = m.scan("ＳＷＩＴＣＨ　 Lite", "ｓｏｎｙ")
+    assert r.keyword_hits == 1 and r.brand_ok
+
+
+def test_brand_and_color_accept_known_aliases():
+    m = QueryMatcher(["スイッチ"], ["Nintendo"], ["ホワイト"])
+    assert m.scan("任天堂スイッチ 白", None).brand_ok
+    assert m.scan("ニンテンドースイッチ", "white").color_ok
+    assert m.scan("iPhone 白", None).color_ok
+    r = m.scan("PS5 ブラック", None)
+    assert not r.brand_ok and not r.color_ok
+    assert not QueryMatcher([], ["Foo"], []).scan("Bar", None).brand_ok  # 사전 밖 값은 그대로
+
+
+def test_automaton_matches_substring_path(monkeypatch):
+    rnd = random.Random(0)
+    alphabet = "abcアイウ "
+    terms = ["".join(rnd.choice(alphabet) for _ in range(rnd.randint(1, 4))) for _ in range(40)]
+    texts = [("".join(rnd.choice(alphabet) for _ in range(30)), rnd.choice([None, "abc アイ", "ウウ"])) for _ in range(300)]
+    monkeypatch.setattr(mt, "AUTOMATON_MIN_PATTERNS", 10**9)
+    plain = QueryMatcher(terms[:20], terms[20:30], terms[30:])
+    monkeypatch.setattr(mt, "AUTOMATON_MIN_PATTERNS", 0)
+    auto = QueryMatcher(terms[:20], terms[20:30], terms[30:])
+    assert auto._automaton is not None and plain._automaton is None
+    for title, desc in texts:
+        assert auto.scan(title, desc) == plain.scan(title, desc)
+
+
+def test_matcher_is_shared_per_query():
+    a = SearchQuery(raw_text="a", keywords=["switch"], brand=["nintendo"])
+    b = SearchQuery(raw_text="b", keywords=["switch"], brand=["nintendo"], budget_max=100)
+    assert matcher_for(a) is matcher_for(b)
@@ -22,3 +22,22 @@ def test_condition_whitelist():
         condition=["未使用に近い", "INVALID"],
     )
     assert q.condition == ["未使用に近い"]
+
+
+def test_listing_record_materializes_same_as_validated_listing():
+    from mercari_ai_shopper.models.listing import Listing, ListingRecord, SellerRecord
+
+    rec = ListingRecord.create(
+        title="  Switch OLED ", price_jpy=29800, condition=" 未使用に近い", url="https://jp.mercari.com/item/m1",
+        image_url="https://static.mercdn.net/m1.jpg", seller=SellerRecord("shop", 4.9, 12), likes=3,
+    )
+    want = Listing(
+        title="Switch OLED", price_jpy=29800, condition="未使用に近い", url="https://jp.mercari.com/item/m1",
+        image_url="https://static.mercdn.net/m1.jpg", seller={"name": "shop", "rating": 4.9, "sales_count": 12},
+        likes=3,
+    )
+    assert rec.to_listing().model_dump(mode="json") == want.model_dump(mode="json")
+    # Listing 검증에서 버려지던 값은 레코드 생성 단계에서 걸러진다
+    assert ListingRecord.create(title="x", price_jpy=-1, url="https://jp.mercari.com/item/m1") is None
+    assert ListingRecord.create(title="x", price_jpy=1, url="/item/m1") is None
+    assert SellerRecord(rating=7.0, sales_count=-2).rating is None
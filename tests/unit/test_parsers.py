@@ -0,0 +1,93 @@
+import warnings
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from mercari_ai_shopper.scraping.mercari_client import _parse_listing_cards
+from mercari_ai_shopper.scraping.parsers import _to_int, item_id_from_url, parse_listing_cards
+
+FIXTURES = Path(__file__).resolve().parents[1] / "fixtures"
+
+
+def _search_html() -> str:
+    return (FIXTURES / "mercari_search.html").read_text(encoding="utf-8")
+
+
+def test_single_pass_matches_legacy_parser():
+    html = _search_html()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        legacy = _parse_listing_cards(BeautifulSoup(html, "lxml"))
+    new = parse_listing_cards(html)
+
+    assert {str(x.url): x.model_dump() for x in new} == {str(x.url): x.model_dump() for x in legacy}
+
+
+def test_single_pass_keeps_document_order_and_dedupes_by_item_id():
+    items = parse_listing_cards(_search_html())
+    ids = [item_id_from_url(str(x.url)) for x in items]
+    assert ids == ["m10000000001", "m10000000002", "m10000000003", "m10000000004", "m10000000006"]
+    # 가격 없는 썸네일 앵커는 건너뛰고, 같은 상품의 가격 있는 앵커를 사용
+    dup = items[3]
+    assert dup.price_jpy == 31000 and dup.condition == "目立った傷や汚れなし"
+
+
+def test_item_id_from_url():
+    assert item_id_from_url("https://jp.mercari.com/item/m123?ref=x") == "m123"
+    assert item_id_from_url("https://jp.mercari.com/search?keyword=a") is None
+
+
+def test_to_int_rejects_non_finite_prices():
+    assert _to_int("¥1,200") == 1200
+    assert _to_int("1e400") is None and _to_int("Infinity") is None and _to_int("nan") is None
+
+
+def test_search_page_uses_next_data_blob():
+    from mercari_ai_shopper.scraping.parsers import parse_search_page
+
+    html = (FIXTURES / "mercari_search_next_data.html").read_text(encoding="utf-8")
+    res = parse_search_page(html)
+    assert res.source == "next_data"
+    assert [str(x.url) for x in res.items] == [
+        "https://jp.mercari.com/item/m20000000001",
+        "https://jp.mercari.com/item/m20000000002",
+    ]
+    first, second = res.items
+    assert first.price_jpy == 28000 and first.condition == "未使用に近い"
+    assert first.shipping == "送料込み" and first.likes == 12 and first.sold is False
+    assert second.sold is True and second.condition == "目立った傷や汚れなし"
+
+
+def test_search_page_falls_back_to_dom_without_blob():
+    from mercari_ai_shopper.scraping.parsers import parse_search_page
+
+    res = parse_search_page(_search_html())
+    assert res.source == "dom"
+    assert len(res.items) == 5
+
+
+def test_detail_page_uses_jsonld_product():
+    from mercari_ai_shopper.scraping.parsers import parse_detail_page
+
+    url = "https://jp.mercari.com/item/m30000000001"
+    html = (FIXTURES / "mercari_item_jsonld.html").read_text(encoding="utf-8")
+    res = parse_detail_page(html, url)
+    assert res.source == "jsonld"
+    (it,) = res.items
+    assert it.title == "Nintendo Switch 有機ELモデル ホワイト"
+    assert it.price_jpy == 29800 and it.sold is False
+    assert it.seller.name == "ゲームショップ太郎"
+    assert it.seller.rating == 4.9 and it.seller.sales_count == 321
+    assert it.description_snippet.startswith("購入後数回")
+
+
+def test_detail_page_falls_back_to_dom():
+    from mercari_ai_shopper.scraping.parsers import parse_detail_page, parse_source_stats
+
+    url = "https://jp.mercari.com/item/m30000000002"
+    html = (FIXTURES / "mercari_item_dom.html").read_text(encoding="utf-8")
+    res = parse_detail_page(html, url)
+    assert res.source == "dom"
+    (it,) = res.items
+    assert it.title == "Switch Lite イエロー" and it.price_jpy == 15000
+    assert parse_source_stats()["detail:dom"] >= 1
@@ -0,0 +1,45 @@
+import mercari_ai_shopper.scraping.pipeline as pl
+from mercari_ai_shopper.models.listing import Listing, ListingRecord
+from mercari_ai_shopper.models.query import SearchQuery
+from mercari_ai_shopper.scraping.pipeline import compile_pipeline, filter_sort_limit
+
+
+def _rec(i, price, title="Nintendo Switch", condition="未使用に近い", desc=None):
+    return ListingRecord.create(title=title, price_jpy=price, condition=condition,
+                                url=f"https://jp.mercari.com/item/m{i}", description_snippet=desc)
+
+
+def test_stages_compiled_from_query_cheapest_first(monkeypatch):
+    monkeypatch.setattr(pl, "_stage_counts", pl.Counter())
+    assert compile_pipeline(SearchQuery(raw_text="a", keywords=["x"])).stages == []
+    q = SearchQuery(raw_text="a", keywords=["x"], budget_max=100, condition=["新品、未使用"], color=["white"])
+    assert [st.name for st in compile_pipeline(q).stages] == ["price", "condition", "text"]
+
+
+def test_reorders_by_observed_rejection_rate(monkeypatch):
+    counts = pl.Counter({("price", "seen"): 1000, ("price", "rejected"): 10,
+                         ("text", "seen"): 1000, ("text", "rejected"): 990})
+    monkeypatch.setattr(pl, "_stage_counts", counts)
+    q = SearchQuery(raw_text="a", keywords=["x"], budget_max=100, brand=["sony"])
+    assert [st.name for st in compile_pipeline(q).stages] == ["text", "price"]
+
+
+def test_filters_records_and_materializes_at_boundary(monkeypatch):
+    monkeypatch.setattr(pl, "_stage_counts", pl.Counter())
+    q = SearchQuery(raw_text="a", keywords=["switch"], budget_min=1000, budget_max=5000,
+                    condition=["未使用に近い"], brand=["nintendo"], sort="price_asc", limit=2)
+    records = [
+        _rec(1, 4000),
+        _rec(2, 9000),                       # 가격 탈락
+        _rec(3, 2000, condition="傷や汚れあり"),  # 상태 탈락
+        _rec(4, 3000, title="Sony PS5"),     # 브랜드 탈락
+        _rec(5, 1500, title="Switch", desc="ＮＩＮＴＥＮＤＯ 純正"),
+        _rec(7, 2500),
+    ]
+    pipe = compile_pipeline(q)
+    got = list(pipe.run(records))
+    assert [x.url[-2:] for x in got] == ["m1", "m5", "m7"]
+    assert pipe.stats()["order"] == ["price", "condition", "text"]
+    assert pl.pipeline_stats()["price"] == {"seen": 6, "rejected": 1, "rejection_rate": 0.1667}
+    out = filter_sort_limit(records, q)
+    assert all(isinstance(x, Listing) for x in out) and [x.price_jpy for x in out] == [1500, 2500]
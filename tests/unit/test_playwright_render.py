@@ -0,0 +1,109 @@
+from pathlib import Path
+
+from mercari_ai_shopper.scraping import mercari_playwright as mp
+
+FIXTURES = Path(__file__).resolve().parents[1] / "fixtures"
+
+REQUESTS = [
+    ("document", "https://jp.mercari.com/search?keyword=x"),
+    ("script", "https://jp.mercari.com/_next/static/app.js"),
+    ("image", "https://static.mercdn.net/thumb/m1.jpg"),
+    ("font", "https://jp.mercari.com/fonts/a.woff2"),
+    ("script", "https://www.googletagmanager.com/gtm.js?id=GTM-1"),
+    ("xhr", "https://api.mercari.jp/v2/entities:search"),
+]
+
+
+class FakeRequest:
+    def __init__(self, resource_type, url):
+        self.resource_type, self.url = resource_type, url
+
+
+class FakeRoute:
+    def __init__(self, req, log):
+        self.request, self.log = req, log
+
+    def abort(self):
+        self.log.append(("abort", self.request.url))
+
+    def continue_(self):
+        self.log.append(("continue", self.request.url))
+
+
+class FakeResponse:
+    status = 200
+
+    def __init__(self, url, body):
+        self.url, self.body = url, body
+
+    def json(self):
+        return self.body
+
+
+class FakePage:
+    def __init__(self, anchor_counts, api_body=None, api_after_polls=None, html="<html></html>"):
+        self.anchor_counts = list(anchor_counts)
+        self.api_body = api_body
+        self.api_after_polls = api_after_polls
+        self.html = html
+        self.route_log = []
+        self.handlers = {}
+        self.polls = 0
+        self.routed = False
+
+    def route(self, pattern, handler):
+        self.routed = True
+        self._route = handler
+
+    def unroute(self, pattern, handler):
+        self.routed = False
+
+    def on(self, event, cb):
+        self.handlers[event] = cb
+
+    def remove_listener(self, event, cb):
+        self.handlers.pop(event, None)
+
+    def goto(self, url, wait_until=None):
+        for rt, u in REQUESTS:
+            self._route(FakeRoute(FakeRequest(rt, u), self.route_log))
+
+    def evaluate(self, js):
+        return self.anchor_counts[min(self.polls, len(self.anchor_counts) - 1)]
+
+    def wait_for_timeout(self, ms):
+        self.polls += 1
+        if self.api_after_polls is not None and self.polls == self.api_after_polls:
+            self.handlers["response"](FakeResponse("https://api.mercari.jp/v2/entities:search", self.api_body))
+
+    def content(self):
+        return self.html
+
+
+def test_lean_mode_blocks_heavy_and_third_party_requests():
+    page = FakePage(anchor_counts=[0, 30])
+    result = mp.render_search(page, "https://jp.mercari.com/search?keyword=x", min_items=20)
+    aborted = {u for action, u in page.route_log if action == "abort"}
+    assert aborted == {REQUESTS[2][1], REQUESTS[3][1], REQUESTS[4][1]}
+    assert result.ready == "anchors" and page.polls == 1
+    assert not page.routed and not page.handlers  # 풀에 돌려주기 전 정리
+
+
+def test_lean_mode_prefers_captured_search_api_json():
+    api = {"items": [{"id": "m123", "name": "Switch OLED", "price": "29800", "itemConditionId": 2}],
+           "meta": {"nextPageToken": "v1:1"}}
+    page = FakePage(anchor_counts=[0], api_body=api, api_after_polls=2)
+    result = mp.render_search(page, "https://jp.mercari.com/search?keyword=x", min_items=20)
+    assert result.ready == "api" and result.html is None
+    parsed = mp._parse_render(result, "https://jp.mercari.com/search?keyword=x")
+    assert parsed.source == "api" and parsed.next_page_token == "v1:1"
+    assert parsed.records[0].price_jpy == 29800 and parsed.records[0].condition == "未使用に近い"
+
+
+def test_lean_mode_resolves_small_result_sets_when_stable(monkeypatch):
+    monkeypatch.setattr(mp, "_STABLE_SECONDS", 0.0)
+    html = (FIXTURES / "mercari_search.html").read_text(encoding="utf-8")
+    page = FakePage(anchor_counts=[0, 5, 5], html=html)
+    result = mp.render_search(page, "https://jp.mercari.com/search?keyword=x", min_items=20, timeout=5)
+    assert result.ready == "stable"
+    assert mp._parse_render(result, "u").records
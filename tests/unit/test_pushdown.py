@@ -0,0 +1,116 @@
+import json
+from urllib.parse import parse_qs, urlsplit
+
+import mercari_ai_shopper.scraping.mercari_client as mc
+import mercari_ai_shopper.scraping.pushdown as pd
+from mercari_ai_shopper.models.listing import ListingRecord
+from mercari_ai_shopper.models.query import SearchQuery
+from mercari_ai_shopper.scraping.pushdown import PushdownState
+
+
+def _params(url):
+    return {k: v[0] for k, v in parse_qs(urlsplit(url).query).items()}
+
+
+def _recs(prices, condition="未使用に近い"):
+    return [
+        ListingRecord.create(title="x", price_jpy=p, condition=condition, url=f"https://jp.mercari.com/item/m{i}")
+        for i, p in enumerate(prices)
+    ]
+
+
+def test_build_search_url_pushes_enabled_capabilities(monkeypatch):
+    q = SearchQuery(raw_text="a", keywords=["switch"], budget_min=1000, budget_max=30000,
+                    condition=["新品、未使用", "未使用に近い"], sort="price_asc")
+    monkeypatch.setattr(pd, "_state", PushdownState(["price", "sort", "condition"]))
+    assert _params(mc.build_search_url(q, "v1:1")) == {
+        "keyword": "switch", "price_min": "1000", "price_max": "30000",
+        "sort": "price", "order": "asc", "item_condition_id": "1,2", "page_token": "v1:1",
+    }
+    monkeypatch.setattr(pd, "_state", PushdownState(["price"]))
+    assert set(_params(mc.build_search_url(q))) == {"keyword", "price_min", "price_max"}
+    monkeypatch.setattr(pd, "_state", PushdownState([]))
+    assert _params(mc.build_search_url(q)) == {"keyword": "switch"}
+
+
+def test_verify_disables_ignored_parameter_after_strikes():
+    state = PushdownState(["price", "sort", "condition"], strikes=2, cooldown=60)
+    url = "https://jp.mercari.com/search?keyword=a&price_max=5000&sort=price&order=asc&item_condition_id=2"
+    honored = _recs([1000, 2000, 3000, 4000, 5000, 5000])
+    assert state.verify(url, honored, min_checked=5, tolerance=0.9) == []
+
+    ignored = _recs([9000, 1000, 8000, 2000, 7000, 3000])  # 가격/정렬 무시, 상태는 지킴
+    assert state.verify(url, ignored, 5, 0.9) == ["price", "sort"]
+    assert state.active("price")  # 한 번은 봐준다
+    state.verify(url, ignored, 5, 0.9)
+    assert not state.active("price") and not state.active("sort") and state.active("condition")
+    st = state.stats()
+    assert st["price"]["disabled"] == 1 and st["condition"]["violations"] == 0
+
+    state._disabled_until["price"] = 0.0  # cooldown 경과 → 다시 시도
+    assert state.active("price")
+
+
+def test_verify_skips_pages_without_enough_evidence():
+    state = PushdownState(["condition"], strikes=1)
+    url = "https://jp.mercari.com/search?keyword=a&item_condition_id=1"
+    assert state.verify(url, _recs([1, 2, 3], condition="傷や汚れあり"), 5, 0.9) == []
+    assert state.verify(url, _recs([1] * 10, condition=None), 5, 0.9) == []  # 상태 정보 없는 카드
+    assert state.active("condition")
+
+
+def test_verify_condition_accepts_dom_card_text():
+    # DOM 카드는 ItemStatus/카드 텍스트 통째가 condition에 들어간다
+    state = PushdownState(["condition"], strikes=1)
+    url = "https://jp.mercari.com/search?keyword=a&item_condition_id=1,2"
+    cards = _recs([1000] * 3, condition="商品の状態 未使用に近い") + _recs([1000] * 3, condition="新品、未使用 送料込み")
+    assert state.verify(url, cards, 5, 0.9) == []
+    assert state.verify(url, _recs([1000] * 6, condition="商品の状態 傷や汚れあり"), 5, 0.9) == ["condition"]
+
+
+class _Resp:
+    status_code = 200
+    headers: dict = {}
+
+    def __init__(self, text):
+        self.text = text
+        self.content = text.encode()
+
+    def raise_for_status(self):
+        return None
+
+
+class _Site:
+    """price_max를 지킬지 선택 가능한 가짜 검색 사이트(페이지당 10건, 1,000~10,000엔)."""
+
+    def __init__(self, honor_price):
+        self.honor_price = honor_price
+        self.calls = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.calls.append(url)
+        p = _params(url)
+        n = len(self.calls)
+        prices = [1000 * (i + 1) for i in range(10)]
+        if self.honor_price and "price_max" in p:
+            prices = [x * int(p["price_max"]) // 10000 for x in prices]
+        items = [{"id": f"m{n}{i:02d}", "name": f"Switch {n}-{i}", "price": x} for i, x in enumerate(prices)]
+        state = {"props": {"pageProps": {"items": items, "meta": {"nextPageToken": f"v1:{n}"}}}}
+        return _Resp(f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(state)}</script>')
+
+
+def test_pushdown_improves_yield_and_backs_off_when_ignored(monkeypatch):
+    monkeypatch.setattr(mc, "get_response_cache", lambda: None)
+    monkeypatch.setattr(mc, "get_rate_limiter", lambda: None)
+    q = SearchQuery(raw_text="t", keywords=["switch"], budget_max=3000, limit=20)
+
+    monkeypatch.setattr(pd, "_state", PushdownState(["price"], strikes=2))
+    site = _Site(honor_price=True)
+    assert len(list(mc.iter_search(site, q, max_pages=10))) == 20
+    assert len(site.calls) == 2  # 페이지당 10건 모두 통과
+
+    monkeypatch.setattr(pd, "_state", PushdownState(["price"], strikes=2))
+    site = _Site(honor_price=False)
+    assert len(list(mc.iter_search(site, q, max_pages=10))) == 20
+    assert len(site.calls) == 7  # 페이지당 3건
+    assert ["price_max" in _params(u) for u in site.calls[:3]] == [True, True, False]
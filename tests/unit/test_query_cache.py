@@ -0,0 +1,77 @@
+import time
+
+import pytest
+
+from mercari_ai_shopper.agent.query_cache import QueryCache
+
+ARGS = {"keywords": ["닌텐도 스위치", "oled"], "color": ["white"], "budget_max": 30000}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = QueryCache(str(tmp_path / "q.sqlite"), ttl=60, max_entries=100, threshold=0.75)
+    yield c
+    c.close()
+
+
+def test_exact_hit_is_keyed_by_normalized_text(cache):
+    cache.store("닌텐도 스위치 OLED 화이트 30000엔 이하", ARGS)
+    # 전각 영숫자/대소문자/공백 차이는 정규화로 같은 키
+    hit = cache.lookup("  닌텐도  스위치 ＯＬＥＤ 화이트 ３００００엔 이하 ")
+    assert hit is not None and hit.similarity == 1.0 and hit.args == ARGS
+    assert cache.stats()["exact_hits"] == 1
+
+
+def test_near_duplicate_hit_requires_same_numbers(cache):
+    cache.store("닌텐도 스위치 OLED 화이트 30000엔 이하", ARGS)
+    hit = cache.lookup("닌텐도 스위치 OLED 화이트 30000엔 이하로")
+    assert hit is not None and 0.75 <= hit.similarity < 1.0 and hit.args == ARGS
+    # 띄어쓰기만 다른 경우도 근사 일치
+    assert cache.lookup("닌텐도스위치 OLED 화이트 30000엔이하") is not None
+    # 예산이 다르면 문장이 비슷해도 다른 요청
+    assert cache.lookup("닌텐도 스위치 OLED 화이트 20000엔 이하") is None
+    assert cache.lookup("아이폰 15 프로 케이스") is None
+    s = cache.stats()
+    assert (s["near_hits"], s["misses"]) == (2, 2)
+
+
+def test_near_duplicate_hit_requires_same_attributes(cache):
+    text = "닌텐도 스위치 OLED 화이트 30000엔 이하 상태 좋은 것으로 찾아주세요 박스 있는 거면 더 좋아요"
+    cache.store(text, ARGS)
+    assert cache.lookup(text.replace("찾아주세요", "찾아 주세요")) is not None
+    # 문장 유사도는 임계값을 넘지만 색상/상태가 다르면 다른 요청
+    assert cache.lookup(text.replace("화이트", "블랙")) is None
+    assert cache.lookup(text.replace("상태 좋은 것", "정크")) is None
+
+
+def test_expired_entries_miss_and_are_dropped(tmp_path):
+    c = QueryCache(str(tmp_path / "q.sqlite"), ttl=0)
+    c.store("switch lite", ARGS)
+    time.sleep(0.01)
+    assert c.lookup("switch lite") is None
+    assert c.stats()["entries"] == 0 and c.stats()["indexed"] == 0
+    c.close()
+
+
+def test_size_eviction_drops_least_recently_used(tmp_path):
+    c = QueryCache(str(tmp_path / "q.sqlite"), ttl=60, max_entries=2)
+    c.store("ps5 본체", {"keywords": ["ps5"]})
+    c.store("switch lite", {"keywords": ["switch"]})
+    assert c.lookup("ps5 본체") is not None  # 최근 사용으로 갱신
+    c.store("ipad mini", {"keywords": ["ipad"]})
+    assert c.lookup("switch lite") is None
+    assert c.lookup("ps5 본체") is not None and c.lookup("ipad mini") is not None
+    assert c.stats()["evictions"] == 1
+    c.close()
+
+
+def test_persisted_entries_are_reindexed_on_open(tmp_path):
+    path = str(tmp_path / "q.sqlite")
+    c = QueryCache(path, threshold=0.75)
+    c.store("닌텐도 스위치 OLED 화이트 30000엔 이하", ARGS)
+    c.close()
+
+    reopened = QueryCache(path, threshold=0.75)
+    hit = reopened.lookup("닌텐도 스위치 OLED 화이트 30000엔 이하로")
+    assert hit is not None and hit.args == ARGS
+    reopened.close()
@@ -0,0 +1,85 @@
+import pytest
+
+from mercari_ai_shopper.agent.query_parser import parse_query
+
+
+@pytest.mark.parametrize(
+    "text, budget",
+    [
+        ("닌텐도 스위치 30000엔 이하", (None, 30000)),
+        ("ps5 3만~5만엔", (30000, 50000)),
+        ("スイッチ 2万円以下", (None, 20000)),
+        ("between 10000 and 20000 yen lego", (10000, 20000)),
+        ("에어팟 프로 1만엔대", (10000, 19999)),
+        ("switch lite over 8000 yen", (8000, None)),
+    ],
+)
+def test_budget_forms(text, budget):
+    args = parse_query(text).args
+    assert (args.get("budget_min"), args.get("budget_max")) == budget
+
+
+def test_full_request_is_mapped_to_search_args():
+    p = parse_query("닌텐도 스위치 OLED 화이트 30000엔 이하 미개봉")
+    assert p.args == {
+        "keywords": ["Nintendo", "スイッチ", "有機EL"],
+        "budget_max": 30000,
+        "condition": ["新品、未使用"],
+        "brand": ["Nintendo"],
+        "color": ["ホワイト"],
+    }
+    assert p.confidence == 1.0
+    assert p.to_query().budget_max == 30000
+
+
+def test_units_and_model_numbers_are_not_prices():
+    p = parse_query("iphone 13 128gb black cheapest")
+    assert p.args["keywords"] == ["iPhone", "13", "128gb"]
+    assert "budget_max" not in p.args and p.args["sort"] == "price_asc"
+    assert p.args["color"] == ["ブラック"]
+
+
+@pytest.mark.parametrize(
+    "text, args",
+    [
+        ("3万円以下でスイッチが欲しい", {"keywords": ["スイッチ"], "budget_max": 30000}),
+        ("任天堂スイッチを探しています", {"keywords": ["Nintendo", "スイッチ"], "brand": ["Nintendo"]}),
+        ("1万円以下のゲーム", {"keywords": ["ゲーム"], "budget_max": 10000}),
+        ("新品のiPhone 13が欲しいです", {"keywords": ["iPhone", "13"], "condition": ["新品、未使用"]}),
+    ],
+)
+def test_unsegmented_japanese_sentences(text, args):
+    # 일본어 표준 표기도 사전 별칭, 조사(で/が/を/の)에서 잘라 낸다
+    p = parse_query(text)
+    assert p.args == args and p.confidence == 1.0
+
+
+def test_japanese_leftovers_with_hiragana_are_unresolved():
+    p = parse_query("昔のかわいいぬいぐるみ")
+    assert p.args["keywords"] == ["昔のかわいい", "ぬいぐるみ"]
+    assert p.confidence < 0.8 and "unresolved:昔のかわいい" in p.notes
+
+
+def test_phrases_respect_ascii_word_boundaries():
+    # "red"가 "shredder" 안에서 색상으로 잡히면 안 됨
+    assert "color" not in parse_query("paper shredder").args
+    assert parse_query("캐논카메라").args["keywords"] == ["Canon", "カメラ"]
+
+
+@pytest.mark.parametrize(
+    "text, note",
+    [
+        ("스위치 말고 PS5", "negation_or_question"),
+        ("아이패드 50만원 이하", "krw"),
+        ("스위치 3만엔 정도 괜찮은 거 추천해줘요 빨리", "unresolved"),
+        ("switch 30000", "unresolved"),
+        # 영어 색상/상태어가 상품명 일부인 경우
+        ("red dead redemption 2 ps4", "unresolved:red"),
+        ("new 3ds ll", "unresolved:new"),
+        ("gold ship plush", "unresolved:gold"),
+    ],
+)
+def test_ambiguous_requests_get_low_confidence(text, note):
+    p = parse_query(text)
+    assert p.confidence < 0.8
+    assert any(n.startswith(note) for n in p.notes)
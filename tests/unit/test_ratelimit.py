@@ -0,0 +1,88 @@
+import time
+from email.utils import formatdate
+
+import mercari_ai_shopper.scraping.mercari_client as mc
+from mercari_ai_shopper.utils.ratelimit import (
+    RateLimiter,
+    _SqliteBuckets,
+    backoff_delay,
+    parse_retry_after,
+)
+
+URL = "https://jp.mercari.com/search?keyword=a"
+
+
+def _acquire(limiter: RateLimiter, n: int) -> float:
+    t0 = time.monotonic()
+    for _ in range(n):
+        with limiter.slot(URL):
+            pass
+    return time.monotonic() - t0
+
+
+def test_parse_retry_after_and_backoff():
+    assert parse_retry_after("3") == 3.0
+    assert 8 < parse_retry_after(formatdate(time.time() + 10, usegmt=True)) <= 10
+    assert parse_retry_after("soon") is None and parse_retry_after(None) is None
+    assert 2.0 <= backoff_delay(1, 0.5, retry_after=2.0) <= 2.5
+    assert all(0 <= backoff_delay(4, 0.5) <= 4.0 for _ in range(50))
+
+
+def test_token_bucket_limits_rate():
+    limiter = RateLimiter(rps=20, burst=2)
+    assert _acquire(limiter, 2) < 0.03  # 버스트
+    assert _acquire(limiter, 2) >= 0.08  # 이후 초당 20개
+
+
+def test_sqlite_bucket_is_shared_between_limiters(tmp_path):
+    path = str(tmp_path / "rl.sqlite")
+    a = RateLimiter(_SqliteBuckets(path), rps=10, burst=2)
+    b = RateLimiter(_SqliteBuckets(path), rps=10, burst=2)  # 다른 워커 프로세스 역할
+    try:
+        assert _acquire(a, 2) < 0.05
+        assert _acquire(b, 1) >= 0.08
+        # 한쪽이 받은 Retry-After가 다른 쪽도 막는다
+        a.on_throttle(URL, retry_after=0.3)
+        assert _acquire(b, 1) >= 0.25
+    finally:
+        a.close()
+        b.close()
+
+
+def test_aimd_concurrency():
+    limiter = RateLimiter(concurrency=8, latency_target=1.0)
+    limiter.on_throttle(URL)
+    assert limiter.stats()["concurrency_limit"] == 4
+    for _ in range(20):
+        limiter.on_success(URL, 0.1)
+    assert limiter.stats()["concurrency_limit"] > 4
+    limiter.on_success(URL, 5.0)  # 지연 과다 → 절반
+    assert limiter.stats()["concurrency_limit"] <= 4
+
+
+class FakeResp:
+    def __init__(self, status, headers=None):
+        self.status_code = status
+        self.headers = headers or {}
+        self.text = "<html></html>"
+        self.content = b"<html></html>"
+
+    def raise_for_status(self):
+        return None
+
+
+def test_request_honors_retry_after(monkeypatch):
+    limiter = RateLimiter(rps=100, burst=10)
+    monkeypatch.setattr(mc, "get_response_cache", lambda: None)
+    monkeypatch.setattr(mc, "get_rate_limiter", lambda: limiter)
+    monkeypatch.setattr(mc, "HTTP_BACKOFF_SECONDS", 0.0)
+    responses = [FakeResp(429, {"Retry-After": "0.2"}), FakeResp(200)]
+
+    class Sess:
+        def get(self, url, params=None, headers=None, timeout=None):
+            return responses.pop(0)
+
+    t0 = time.monotonic()
+    assert mc._request(Sess(), URL).status_code == 200
+    assert time.monotonic() - t0 >= 0.2
+    assert limiter.stats()["throttled"] == 1
@@ -0,0 +1,95 @@
+import threading
+import time
+
+import pytest
+
+from mercari_ai_shopper.models.query import SearchQuery
+from mercari_ai_shopper.utils.result_cache import SingleFlightCache
+
+
+def test_concurrent_misses_are_coalesced():
+    cache = SingleFlightCache(max_entries=10, ttl_seconds=60)
+    calls = []
+    gate = threading.Event()
+
+    def compute():
+        calls.append(1)
+        gate.wait(2)
+        return "value"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute("k", compute))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    time.sleep(0.05)
+    gate.set()
+    for t in threads:
+        t.join()
+
+    assert calls == [1]
+    assert results == ["value"] * 8
+    st = cache.stats()
+    assert st["misses"] == 1 and st["coalesced"] == 7
+    assert cache.get_or_compute("k", compute) == "value"
+    assert cache.stats()["hits"] == 1
+
+
+def test_errors_are_not_cached_and_reach_waiters():
+    cache = SingleFlightCache()
+
+    def boom():
+        raise RuntimeError("upstream down")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute("k", boom)
+    assert cache.get_or_compute("k", lambda: 1) == 1
+
+
+def test_cancelled_async_leader_hands_off_to_a_waiter():
+    import asyncio
+
+    cache = SingleFlightCache()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return len(calls)
+
+    async def main():
+        leader = asyncio.create_task(cache.aget_or_compute("k", compute))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(cache.aget_or_compute("k", compute)) for _ in range(5)]
+        await asyncio.sleep(0.01)
+        leader.cancel()  # 클라이언트 연결 끊김
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.gather(*waiters)
+
+    # 대기자는 취소되지 않고, 그중 하나만 다시 계산해 나머지가 그 결과를 받는다
+    assert asyncio.run(main()) == [2] * 5
+    assert calls == [1, 1] and cache.stats()["inflight"] == 0
+
+
+def test_lru_bounded_by_entries_and_bytes_with_ttl():
+    cache = SingleFlightCache(max_entries=2, max_bytes=10, ttl_seconds=60, sizeof=len)
+    cache.put("a", "xxxx")
+    cache.put("b", "xxxx")
+    cache.get("a")  # a를 최근 사용으로
+    cache.put("c", "xxxx")  # 항목 수 초과 → b 제거
+    assert cache.get("b") is None and cache.get("a") == "xxxx"
+    cache.put("d", "xxxxxxxx")  # 바이트 초과 → 오래된 것부터 제거
+    assert cache.stats()["bytes"] <= 10
+
+    short = SingleFlightCache(ttl_seconds=0.01)
+    short.put("k", 1)
+    time.sleep(0.02)
+    assert short.get("k") is None
+
+
+def test_search_query_cache_key_is_canonical():
+    a = SearchQuery(raw_text="x", keywords=["Switch", "ＯＬＥＤ"], brand=["Nintendo "])
+    b = SearchQuery(raw_text="y", keywords=["oled", "switch  "], brand=["nintendo"])
+    c = SearchQuery(raw_text="x", keywords=["switch", "oled"], budget_max=1000)
+    assert a.cache_key() == b.cache_key()
+    assert a.cache_key() != c.cache_key()
@@ -0,0 +1,124 @@
+import json
+
+import mercari_ai_shopper.scraping.mercari_client as mc
+import mercari_ai_shopper.scraping.pushdown as pd
+from mercari_ai_shopper.agent.reasoning import rank_and_explain
+from mercari_ai_shopper.models.query import SearchQuery
+from mercari_ai_shopper.scraping.parsers import parse_search_page
+from mercari_ai_shopper.scraping.pushdown import PushdownState
+
+PER_PAGE = 10
+
+
+def _page(n: int, last: int) -> str:
+    items = [
+        {"id": f"m{n * PER_PAGE + i}", "name": f"Switch {n}-{i}", "price": 1000 * (i + 1), "status": "on_sale"}
+        for i in range(PER_PAGE)
+    ]
+    state = {"props": {"pageProps": {"items": items, "meta": {"nextPageToken": f"v1:{n + 1}" if n < last else ""}}}}
+    return f'<html><script id="__NEXT_DATA__" type="application/json">{json.dumps(state)}</script></html>'
+
+
+class FakeResp:
+    status_code = 200
+    headers: dict = {}
+
+    def __init__(self, text: str):
+        self.text = text
+        self.content = text.encode()
+
+    def raise_for_status(self):
+        return None
+
+
+class PagedSession:
+    def __init__(self, last: int = 9):
+        self.last = last
+        self.calls = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.calls.append(url)
+        token = url.split("page_token=v1%3A", 1)[1] if "page_token=" in url else "0"
+        return FakeResp(_page(int(token), self.last))
+
+
+def test_parse_search_page_reads_page_tokens():
+    assert parse_search_page(_page(0, 3)).next_page_token == "v1:1"
+    assert parse_search_page(_page(3, 3)).next_page_token is None
+    dom = '<div data-testid="pagination-next-button"><a href="/search?keyword=x&amp;page_token=v1%3A2">次へ</a></div>'
+    assert parse_search_page(dom).next_page_token == "v1:2"
+
+
+def test_iter_search_follows_pages_and_stops_at_limit(monkeypatch):
+    monkeypatch.setattr(mc, "get_response_cache", lambda: None)
+    monkeypatch.setattr(mc, "get_rate_limiter", lambda: None)
+    session = PagedSession()
+    # 페이지당 5,000엔 이하는 5개 → 12개를 모으려면 3페이지 필요
+    q = SearchQuery(raw_text="t", keywords=["switch"], budget_max=5000, limit=12)
+    items = list(mc.iter_search(session, q, max_pages=10))
+    assert len(items) == 12
+    assert len(session.calls) == 3
+    assert "page_token" not in session.calls[0] and "page_token=v1%3A2" in session.calls[2]
+
+
+def test_iter_search_respects_page_budget_and_last_page(monkeypatch):
+    monkeypatch.setattr(mc, "get_response_cache", lambda: None)
+    monkeypatch.setattr(mc, "get_rate_limiter", lambda: None)
+    q = SearchQuery(raw_text="t", keywords=["switch"], limit=100)
+
+    session = PagedSession()
+    assert len(list(mc.iter_search(session, q, max_pages=2))) == 20
+    assert len(session.calls) == 2
+
+    session = PagedSession(last=1)
+    assert len(list(mc.iter_search(session, q, max_pages=10))) == 20
+    assert len(session.calls) == 2
+
+
+def test_iter_search_is_lazy_and_feeds_ranker(monkeypatch):
+    monkeypatch.setattr(mc, "get_response_cache", lambda: None)
+    monkeypatch.setattr(mc, "get_rate_limiter", lambda: None)
+    session = PagedSession()
+    q = SearchQuery(raw_text="t", keywords=["switch"], budget_max=3000, limit=100)
+    gen = mc.iter_search(session, q, max_pages=10)
+    next(gen)
+    assert len(session.calls) == 1  # 첫 항목은 첫 페이지만으로 나옴
+    ranked = rank_and_explain(gen, q, top_k=3)
+    assert len(ranked) == 3 and ranked[0].score >= ranked[-1].score
+
+
+class OnePageSession:
+    def __init__(self, prices):
+        items = [{"id": f"m{i}", "name": f"Switch {i}", "price": p, "status": "on_sale"} for i, p in enumerate(prices)]
+        state = {"props": {"pageProps": {"items": items, "meta": {"nextPageToken": ""}}}}
+        self.text = f'<html><script id="__NEXT_DATA__" type="application/json">{json.dumps(state)}</script></html>'
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        return FakeResp(self.text)
+
+
+def test_price_sort_without_pushdown_scans_whole_pages(monkeypatch):
+    monkeypatch.setattr(mc, "get_response_cache", lambda: None)
+    monkeypatch.setattr(mc, "get_rate_limiter", lambda: None)
+    monkeypatch.setattr(pd, "_state", PushdownState([]))
+    # 사이트 순서로 limit개에서 끊으면 4000/5000이 나온다
+    session = OnePageSession([5000, 4000, 3000, 2000, 1000])
+    asc = SearchQuery(raw_text="t", keywords=["switch"], sort="price_asc", limit=2)
+    assert [it.price_jpy for it in mc.search(session, asc)] == [1000, 2000]
+    desc = SearchQuery(raw_text="t", keywords=["switch"], sort="price_desc", limit=2)
+    assert [it.price_jpy for it in mc.search(OnePageSession([1000, 2000, 3000, 4000, 5000]), desc)] == [5000, 4000]
+
+    session = PagedSession()
+    q = SearchQuery(raw_text="t", keywords=["switch"], sort="price_desc", limit=3)
+    assert [it.price_jpy for it in mc.iter_search(session, q, max_pages=3)] == [10000] * 3
+    assert len(session.calls) == 3  # limit에서 멈추지 않고 페이지 예산을 다 씀
+
+
+def test_pushed_down_price_sort_stops_at_limit(monkeypatch):
+    monkeypatch.setattr(mc, "get_response_cache", lambda: None)
+    monkeypatch.setattr(mc, "get_rate_limiter", lambda: None)
+    monkeypatch.setattr(pd, "_state", PushdownState(["sort"]))
+    session = PagedSession()  # 페이지 안은 가격 오름차순 → 정렬 검증 통과
+    q = SearchQuery(raw_text="t", keywords=["switch"], sort="price_asc", limit=3)
+    assert [it.price_jpy for it in mc.iter_search(session, q, max_pages=10)] == [1000, 2000, 3000]
+    assert len(session.calls) == 1 and "sort=price" in session.calls[0]
@@ -0,0 +1,35 @@
+import json
+
+from mercari_ai_shopper.models.listing import Listing
+from mercari_ai_shopper.models.recommendation import RankedListing, RecommendationResponse
+from mercari_ai_shopper.models.query import SearchQuery
+from mercari_ai_shopper.utils import serialization as ser
+
+
+def _listing(title="ニンテンドースイッチ 有機EL"):
+    return Listing(title=title, price_jpy=30000, url="https://jp.mercari.com/item/m1")
+
+
+def test_dumps_model_matches_pydantic():
+    resp = RecommendationResponse(
+        query=SearchQuery(raw_text="switch", keywords=["switch"]),
+        top_k=1,
+        items=[RankedListing(listing=_listing(), score=1.5, reasons=["키워드 일치"])],
+    )
+    assert ser.dumps(resp) == resp.model_dump_json().encode("utf-8")
+
+
+def test_tool_result_is_real_json_with_raw_utf8():
+    out = ser.tool_result_json([_listing()])
+    data = json.loads(out)
+    assert data[0]["title"] == "ニンテンドースイッチ 有機EL"
+    assert data[0]["url"] == "https://jp.mercari.com/item/m1"
+    assert "ニンテンドー" in out  # \uXXXX 이스케이프 없음
+    assert ser.tool_result_json("error: x") == "error: x"
+
+
+def test_stdlib_fallback_matches_orjson(monkeypatch):
+    payload = {"items": [_listing()], "tags": ("a", "b"), "n": 1}
+    fast = json.loads(ser.dumps(payload))
+    monkeypatch.setattr(ser, "orjson", None)
+    assert json.loads(ser.dumps(payload)) == fast
@@ -0,0 +1,122 @@
+import time
+from types import SimpleNamespace
+
+from mercari_ai_shopper.llm.anthropic_client import AnthropicClient
+from mercari_ai_shopper.llm.tool_executor import ToolCall, ToolExecutor, ToolStats
+
+
+def _slow(args):
+    time.sleep(args.get("sleep", 0.2))
+    return args["v"]
+
+
+def _boom(args):
+    raise ValueError("bad input")
+
+
+def test_parallel_calls_keep_order_ids_and_isolate_failures():
+    stats = ToolStats()
+    ex = ToolExecutor({"slow": _slow, "boom": _boom}, timeout=0.5, stats=stats)
+    calls = [
+        ToolCall("c1", "slow", {"v": 1}),
+        ToolCall("c2", "boom", {}),
+        ToolCall("c3", "slow", {"v": 3}),
+        ToolCall("c4", "slow", {"v": 4, "sleep": 2.0}),
+        ToolCall("c5", "missing", {}),
+    ]
+    t0 = time.perf_counter()
+    out = ex.run(calls)
+    elapsed = time.perf_counter() - t0
+
+    assert [o.id for o in out] == ["c1", "c2", "c3", "c4", "c5"]
+    assert [o.ok for o in out] == [True, False, True, False, False]
+    assert out[0].payload() == {"ok": True, "result": 1}
+    assert out[1].payload() == {"ok": False, "error": "bad input"}
+    assert "timeout" in out[3].error
+    assert "not implemented" in out[4].error
+    # 0.2s 호출 2건 + 타임아웃 0.5s: 순차(2.4s+)가 아니라 타임아웃 근처에서 끝난다
+    assert elapsed < 1.0
+
+    snap = stats.snapshot()
+    assert snap["slow"]["calls"] == 3 and snap["slow"]["timeouts"] == 1
+    assert snap["boom"]["errors"] == 1
+    assert snap["slow"]["latency_ms"] > 0
+
+
+def test_anthropic_loop_runs_sdk_blocks_through_executor():
+    blocks = [
+        SimpleNamespace(type="text", text="searching"),
+        SimpleNamespace(type="tool_use", id="tu1", name="slow", input={"v": "a", "sleep": 0}),
+        SimpleNamespace(type="tool_use", id="tu2", name="boom", input={}),
+    ]
+    responses = iter([SimpleNamespace(content=blocks), SimpleNamespace(content=[SimpleNamespace(type="text", text="done")])])
+    client = object.__new__(AnthropicClient)
+    client.model, client.max_tokens, client.prompt_cache = "m", 16, False
+    client.client = SimpleNamespace(messages=SimpleNamespace(create=lambda **kw: next(responses)))
+
+    msgs = client.run_loop([{"role": "user", "content": "hi"}], [], {"slow": _slow, "boom": _boom}, max_steps=2)
+    results = msgs[2]["content"]
+    assert [b["tool_use_id"] for b in results] == ["tu1", "tu2"]
+    assert results[0]["content"] == '{"ok":true,"result":"a"}'
+    assert results[1]["is_error"] is True
+    assert msgs[-1]["content"][0].text == "done"
+
+
+def test_async_executor_runs_coroutines_and_threads_without_blocking():
+    import asyncio
+
+    from mercari_ai_shopper.llm.tool_executor import AsyncToolExecutor
+
+    async def aslow(args):
+        await asyncio.sleep(args["sleep"])
+        return args["v"]
+
+    async def main():
+        ex = AsyncToolExecutor({"aslow": aslow, "slow": _slow}, timeout=0.5, stats=ToolStats())
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        t = asyncio.ensure_future(ticker())
+        out = await ex.arun([
+            ToolCall("a", "aslow", {"v": 1, "sleep": 0.2}),
+            ToolCall("b", "slow", {"v": 2}),
+            ToolCall("c", "aslow", {"v": 3, "sleep": 5}),
+        ])
+        t.cancel()
+        return out, ticks
+
+    out, ticks = asyncio.run(main())
+    assert [(o.id, o.ok) for o in out] == [("a", True), ("b", True), ("c", False)]
+    assert "timeout" in out[2].error
+    # 동기 도구(0.2s sleep)가 스레드에서 도는 동안에도 루프는 계속 돈다
+    assert ticks >= 20
+
+
+def test_llm_slot_caps_in_flight_calls(monkeypatch):
+    import asyncio
+
+    from mercari_ai_shopper.llm import shared
+
+    monkeypatch.setattr(shared, "_limit", lambda provider: 2)
+    peak = 0
+    active = 0
+
+    async def call():
+        nonlocal peak, active
+        async with shared.llm_slot("openai"):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+
+    async def main():
+        await asyncio.gather(*(call() for _ in range(8)))
+
+    asyncio.run(main())
+    assert peak == 2
+    assert shared.llm_client_stats()["openai"]["in_flight"] == 0